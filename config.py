@@ -83,7 +83,15 @@ MIN_EXPECTED_PROFIT_ENTRY_USD = 0.25  # Entry-EV Gate (2h Default) nach Fees/Bas
 MIN_MAINTENANCE_APY = 0.30  # Exit wenn APY < 30% (vorher 20%)
 MAX_HOLD_HOURS = 72.0       # ERHÖHT: 72h max (vorher 48h) - mehr Zeit für Funding
 EXIT_SLIPPAGE_BUFFER_PCT = 0.0010 # 0.10% Buffer for Bid/Ask Spread at Exit (straffer für bessere Netto-PnL)
+EXIT_EVAL_CONCURRENCY = 16         # Trades scored in parallel per manage_open_trades pass
+EXIT_MAX_CONCURRENT_CLOSES = 4     # Close workers (one per symbol, max parallel closes)
 EXIT_COST_SAFETY_MARGIN = 1.1      # Safety multiplier on estimated exit costs
+PNL_SETTLEMENT_ENABLED = True      # Book estimate at close, settle exact fills/fees in background
+PNL_SETTLEMENT_BATCH_WINDOW = 1.0  # Seconds before first settle attempt (batches closes of a cycle)
+PNL_SETTLEMENT_MAX_ATTEMPTS = 6    # Attempts before booking best available numbers
+PNL_SETTLEMENT_RETRY_BASE = 2.0    # Backoff base (s), doubles per attempt
+PNL_SETTLEMENT_RETRY_MAX = 60.0    # Backoff cap (s)
+PNL_SETTLEMENT_FLUSH_TIMEOUT = 10.0  # Shutdown: max seconds for the final settle round
 
 # Entry-Basis Engine (Quantzilla/DegeniusQ alignment)
 REQUIRE_FAVORABLE_BASIS_ENTRY = False  # CHANGED: Allow negative basis if funding compensates
@@ -211,6 +219,19 @@ LIGHTER_WS_MARKET_STATS_STALE_SECONDS = 15.0
 LIGHTER_SKIP_REST_POLL_WHEN_WS_HEALTHY = True
 # Orderbook deltas are disabled; avoid subscribing to order_book/* to save rate-limit budget.
 LIGHTER_WS_ORDERBOOKS_ENABLED = False
+# account_all/{account_index} + user_stats/{account_index} (no auth): position updates feed the
+# order state tracker, collateral / buying power feed the balance service.
+LIGHTER_WS_ACCOUNT_ENABLED = True
+# Order state tracker: fills/cancels come from the streams, REST only as slow safety net.
+ORDER_TRACKER_REST_INTERVAL = 5.0  # seconds between REST checks while waiting on an order
+# Balance service: balances come from the account streams, REST only when older than this.
+BALANCE_MAX_AGE_SECONDS = 30.0
+# Price bootstrap: tradeable once this share of common symbols has price + funding on both
+# exchanges; gaps left after the grace period are filled via REST (bulk first, then books).
+PRICE_BOOTSTRAP_COVERAGE = 0.95
+PRICE_BOOTSTRAP_GRACE_SECONDS = 1.5
+PRICE_BOOTSTRAP_CONCURRENCY = 8
+PRICE_BOOTSTRAP_MAX_WAIT_SECONDS = 30.0  # logic_loop starts scanning after this at the latest
 
 # X10 candles stream (optional, only when adapter stream clients are enabled).
 X10_CANDLE_STREAM_ENABLED = False
@@ -318,6 +339,10 @@ FUNDING_TRACK_INTERVAL_SECONDS = 30
 # Extra verbose FundingTracker logs (timestamps, scheduling, per-trade windows)
 FUNDING_TRACKER_DEBUG = True
 
+# Funding Ledger: incremental ingestion from a per-exchange high-water mark
+FUNDING_LEDGER_OVERLAP_SECONDS = 120     # Re-read window behind the cursor (late-posted payments)
+FUNDING_LEDGER_LIGHTER_CONCURRENCY = 4   # Parallel Lighter positionFunding calls (rate limiter still applies)
+
 # --- Farm Mode Settings ---
 # ═══════════════════════════════════════════════════════════════════════════════
 # VOLUME FARM MODE: Sinnvoll für Rebates/Points auf beiden Exchanges!
@@ -369,12 +394,63 @@ LOG_FILE = "logs/funding_bot.log"
 LOG_LEVEL = logging.INFO  # Changed from DEBUG to INFO to reduce log spam
 CONCURRENT_REQUEST_LIMIT = 10
 REFRESH_DELAY_SECONDS = 3
+# Per-cycle MarketSnapshot: positions/balances/books older than this are re-read before entry
+MARKET_SNAPSHOT_MAX_AGE_SECONDS = 3.0
+# Pre-trade AdmissionGate: in-memory positions/exposure/margin, refreshed in the background
+ADMISSION_REFRESH_INTERVAL_SECONDS = 5.0
+ADMISSION_MAX_STATE_AGE_SECONDS = 30.0   # older parts are re-read on the entry path
+# Task scheduler: LOW/NORMAL tasks pause while CRITICAL/HIGH work waits (or the loop lags)
+SCHEDULER_ENABLED = True
+SCHEDULER_LAG_THRESHOLD_MS = 50.0        # LOW tasks pause above this event-loop lag
+SCHEDULER_MAX_PAUSE_SECONDS = 0.5        # a paused step runs after this at the latest
+SCHEDULER_BUDGET_WINDOW_SECONDS = 1.0
+SCHEDULER_CPU_BUDGETS = {"NORMAL": 0.25, "LOW": 0.05}  # max CPU share per window and task
+# Event bus: bounded queue + worker per subscriber; full-queue policy per event type
+# (block = publisher waits up to EVENT_BUS_BLOCK_TIMEOUT_SECONDS, drop, coalesce = newest wins)
+EVENT_BUS_QUEUE_SIZE = 1000
+EVENT_BUS_BLOCK_TIMEOUT_SECONDS = 1.0
+EVENT_BUS_DRAIN_TIMEOUT_SECONDS = 2.0    # queued events delivered on stop()
+EVENT_BUS_POLICIES = {"NotificationEvent": "drop"}  # unlisted event types: block
+# Market data ingest process: public streams parsed in a separate process into a
+# shared-memory seqlock table, pumped into the adapter caches of the strategy process
+MD_INGEST_PROCESS_ENABLED = False
+MD_INGEST_SLOTS = 1024                   # markets per table (both exchanges)
+MD_INGEST_DEPTH_LEVELS = 5               # orderbook levels per side in the table
+MD_INGEST_PUMP_INTERVAL_MS = 5.0
+MD_INGEST_RESTART_DELAY_SECONDS = 5.0    # restart delay after the ingest process died
+# Benchmark mode (scripts/run_benchmarks.py): baseline file + allowed p50/p99/throughput drift
+BENCHMARK_BASELINE_FILE = "data/benchmark_baseline.json"
+BENCHMARK_REGRESSION_TOLERANCE = 0.25
+# DB maintenance (LOW task): expired rows deleted in small chunks through the writer,
+# freed pages returned with paced incremental_vacuum steps, online backups via the backup API
+DB_MAINTENANCE_INTERVAL_SECONDS = 3600
+DB_AUTO_VACUUM_INCREMENTAL = True
+DB_RETENTION_DAYS = {                    # per table, unlisted tables are not pruned
+    "execution_log": 30,
+    "funding_history": 90,
+    "pnl_snapshots": 90,
+    "funding_rate_history": 30,
+}
+DB_PRUNE_CHUNK_ROWS = 500                # rows per DELETE (halved while chunks exceed the max)
+DB_PRUNE_CHUNK_MAX_MS = 50.0
+DB_PRUNE_PAUSE_SECONDS = 0.05            # between chunks / vacuum steps, queued writes go first
+DB_PRUNE_MAX_SECONDS = 30.0              # per run for pruning and vacuum each; the rest follows next run
+DB_VACUUM_PAGES_PER_STEP = 256
+DB_VACUUM_MIN_FREE_PAGES = 1024          # below this the freelist is left for reuse
+DB_BACKUP_DIR = "backups/db"
+DB_BACKUP_INTERVAL_HOURS = 24            # 0 = no automatic backups
+DB_BACKUP_KEEP = 7
 TRADE_COOLDOWN_SECONDS = 120
 
 # --- Structured JSON Logging (B5: For Grafana/ELK Integration) ---
 JSON_LOGGING_ENABLED = True                    # Master switch for JSON logging
 JSON_LOG_FILE = "logs/funding_bot_json.jsonl"  # JSON Lines format (one JSON per line)
 JSON_LOG_MIN_LEVEL = "INFO"                    # Minimum level: DEBUG, INFO, WARNING, ERROR
+JSON_LOG_FLUSH_INTERVAL = 1.0                  # Seconds before batched (websocket/metric) lines are flushed
+JSON_LOG_FLUSH_BYTES = 64 * 1024               # Flush earlier once this many bytes are buffered
+JSON_LOG_MAX_BYTES = 50 * 1024 * 1024          # Rotate file at 50MB (0 = never)
+JSON_LOG_BACKUP_COUNT = 5                      # Rotated files to keep
+JSON_LOG_MAX_QUEUE = 10000                     # Bulk entries queued before oldest are dropped
 
 # Reconnect / Watchdog (Enhanced for 1006 disconnect handling)
 WS_PING_INTERVAL = 15              # Default ping interval for X10
@@ -473,6 +549,7 @@ LIGHTER_PRICE_EPSILON_PCT = 0.10  # 10% tolerance for shutdown close orders (was
 
 # API Keys
 LIGHTER_BASE_URL = "https://mainnet.zklighter.elliot.ai"
+LIGHTER_WS_URL = None  # /stream override (e.g. local exchange simulator); None = derived from LIGHTER_BASE_URL
 LIGHTER_PRIVATE_KEY = os.getenv("LIGHTER_PRIVATE_KEY")
 LIGHTER_API_PRIVATE_KEY = os.getenv("LIGHTER_API_PRIVATE_KEY")
 LIGHTER_ACCOUNT_INDEX = 60113
@@ -491,8 +568,21 @@ LIGHTER_WS_STARTUP_GRACE_SECONDS = 15.0
 LIGHTER_WAIT_FOR_WS_MARKET_STATS_SECONDS = 60.0
 LIGHTER_STARTUP_REST_FALLBACK = False
 LIGHTER_REST_REFRESH_MIN_SECONDS = 60.0
+LIGHTER_FAST_REST_ENABLED = True  # Raw-JSON fast path for account/orderBookDetails/funding-rates/nextNonce (SDK = fallback)
+
+# Shared HTTP transport (one tuned keep-alive session per exchange host, also used by both SDKs)
+HTTP_TRANSPORT_ENABLED = True
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 32
+HTTP_KEEPALIVE_TIMEOUT = 60.0     # Seconds an idle connection stays in the pool
+HTTP_DNS_CACHE_TTL = 300          # Seconds
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_WARMUP_CONNECTIONS = 2       # Connections opened per host at startup (0 = off)
+LIGHTER_WARMUP_PATH = "/"
+X10_WARMUP_PATH = "/api/v1/info/markets/BTC-USD/stats"
 
 X10_API_BASE_URL = "https://api.starknet.extended.exchange"
+X10_STREAM_BASE_URL = None  # override of wss://.../stream.extended.exchange/v1 (e.g. local exchange simulator)
 X10_PRIVATE_KEY = os.getenv("X10_PRIVATE_KEY")
 X10_PUBLIC_KEY = os.getenv("X10_PUBLIC_KEY")
 X10_API_KEY = os.getenv("X10_API_KEY")
@@ -505,6 +595,7 @@ X10_WS_ORDER_URL = "wss://api.starknet.extended.exchange/stream.extended.exchang
 # WebSocket Order Retry Configuration
 WS_ORDER_MAX_RETRIES = 2  # Maximum retry attempts for WebSocket order submission
 WS_ORDER_RETRY_BACKOFF_BASE = 0.1  # Base backoff time in seconds (exponential: 0.1s, 0.2s, 0.4s...)
+WS_ORDER_POOL_SIZE = 2  # Pre-opened order connections per exchange (primary + warm standby)
 
 TELEGRAM_ENABLED = False
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
@@ -524,6 +615,12 @@ LATENCY_ARB_MIN_RATE_DIFF = 0.0002 # 0.02% minimum rate difference for entry
 # Shutdown
 CLOSE_ALL_ON_SHUTDOWN = True
 SHUTDOWN_CLOSE_TIMEOUT = 60
+# Batched emergency flatten (Lighter): alle Close-Orders als sendTxBatch statt einzeln
+LIGHTER_FLATTEN_BATCH_ENABLED = True
+LIGHTER_FLATTEN_BATCH_SIZE = 50       # Max TXs per sendTxBatch call (exchange limit)
+LIGHTER_FLATTEN_MAX_ROUNDS = 3        # Submit + verify rounds (only residuals are resent)
+LIGHTER_FLATTEN_VERIFY_DELAY = 0.5    # Seconds before re-reading the account after a round
+LIGHTER_FLATTEN_SLIPPAGE_PCT = 2.5    # IOC limit vs mark (Lighter accidental-price guard ~3%)
 
 # ═══════════════════════════════════════════════════════════════
 # DUST HANDLING
@@ -623,6 +720,14 @@ OB_MARGINAL_DEPTH_MULTIPLE = 2.0      # 2x trade size = marginal (minimum)
 # --- GLOBAL SETTINGS ---
 OB_FALLBACK_TO_MARKET_ORDER = True    # Use Market order if Maker conditions not met
 OB_REST_FALLBACK_ENABLED = True       # Use REST API if WebSocket data stale
+OB_GAP_AWARE_RESYNC = True            # Reconnect/gap: resync affected symbols only (no blanket cooldown)
+OB_REFRESH_ENABLED = True             # Background REST refresher for stale/unverified books
+OB_REFRESH_LIGHTER_CONCURRENCY = 6    # Parallel refresh requests (Lighter)
+OB_REFRESH_LIGHTER_RPS = 10.0         # Refresh request budget per second (Lighter)
+OB_REFRESH_X10_CONCURRENCY = 8        # Parallel refresh requests (X10)
+OB_REFRESH_X10_RPS = 15.0             # Refresh request budget per second (X10)
+OB_REFRESH_TOP_CANDIDATES = 20        # Top-ranked opportunities refreshed right after positions
+OB_REFRESH_SWEEP_INTERVAL = 2.0       # Seconds between freshness sweeps of relevant symbols
 OB_VALIDATION_RETRY_COUNT = 2         # Number of retries before giving up
 OB_VALIDATION_RETRY_DELAY = 2.0       # Seconds between retries
 OB_VALIDATION_ENABLED = True          # Master switch to enable/disable validation
@@ -47,7 +47,12 @@ if getattr(config, 'JSON_LOGGING_ENABLED', False):
     json_logger = JSONLogger.get_instance(
         log_file=json_log_file,
         enabled=True,
-        min_level=log_level
+        min_level=log_level,
+        flush_interval=getattr(config, 'JSON_LOG_FLUSH_INTERVAL', 1.0),
+        flush_bytes=getattr(config, 'JSON_LOG_FLUSH_BYTES', 64 * 1024),
+        max_bytes=getattr(config, 'JSON_LOG_MAX_BYTES', 50 * 1024 * 1024),
+        backup_count=getattr(config, 'JSON_LOG_BACKUP_COUNT', 5),
+        max_queue=getattr(config, 'JSON_LOG_MAX_QUEUE', 10000)
     )
     logger.info(f"✅ JSON Logger initialized: {json_log_file or 'default'}")
 
@@ -126,7 +131,7 @@ from src.core import (
     migrate_database,
     close_all_open_positions_on_start,
 )
-from src.infrastructure.event_bus import EventBus
+from src.infrastructure.event_bus import get_event_bus
 from src.core.events import CriticalError, NotificationEvent
 
 async def main_entry():
@@ -137,8 +142,8 @@ async def main_entry():
     
     logger.info("🚀 main_entry() called - setting up EventBus...")
     
-    # 1. Setup EventBus
-    event_bus = EventBus()
+    # 1. Setup EventBus (shared with src.core.trading.publish_event)
+    event_bus = get_event_bus()
     await event_bus.start()
     
     # 2. Setup Telegram handler
@@ -4,12 +4,14 @@ Robustes Backup- und Cleanup-Tool für FundingBot
 
 Usage: 
     python backup.py              # Erstellt ein vollständiges Backup
+    python backup.py db           # Nur Online-Backup der Datenbank (SQLite Backup API)
     python backup.py list         # Zeigt alle Backups
     python backup.py restore <timestamp>  # Stellt Backup wieder her
     python backup.py cleanup      # Räumt alte Logs und Backups auf
     python backup.py cleanup --dry-run   # Zeigt was gelöscht würde
 """
 
+import asyncio
 import os
 import sys
 import shutil
@@ -22,9 +24,19 @@ from typing import List, Set
 # ═══════════════════════════════════════════════════════════════════════════════
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import config  # noqa: E402
+
 BACKUP_DIR = BASE_DIR / "backups"
 LOGS_DIR = BASE_DIR / "logs"
 
+# Live Datenbank: wird NICHT als Datei kopiert (WAL!), sondern per SQLite Backup API
+DB_PATH = BASE_DIR / config.DB_FILE
+DB_LIVE_FILES = {DB_PATH, Path(f"{DB_PATH}-wal"), Path(f"{DB_PATH}-shm")}
+# DB-Snapshots des Bots (DB_BACKUP_DIR) liegen unter backups/, sind aber keine Ordner-Backups
+DB_BACKUP_DIR = BASE_DIR / getattr(config, "DB_BACKUP_DIR", "backups/db")
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # WICHTIGE DATEIEN - Diese werden IMMER gesichert
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -36,7 +48,9 @@ IMPORTANT_FILES = [
     ".env",                # Environment Variables (IMPORTANT)
     ".gitignore",          # Git Ignite
     "funding.db",          # Primary Database (if in root)
-    "state_snapshot.json", # Current State Snapshot
+    "state_snapshot.json", # Legacy State Snapshot
+    "state_snapshot.ckpt.jsonl",  # State Snapshot Checkpoint
+    "state_snapshot.delta.jsonl", # State Snapshot Deltas
     "docs/summary.md",     # Project Summary
     "pytest.ini",          # Pytest Config
 ]
@@ -87,6 +101,29 @@ IGNORE_PATTERNS = [
 ]
 
 
+def _folder_backups() -> List[Path]:
+    """Ordner-Backups in BACKUP_DIR (ohne den DB-Snapshot-Ordner)."""
+    if not BACKUP_DIR.exists():
+        return []
+    return [d for d in BACKUP_DIR.iterdir() if d.is_dir() and d != DB_BACKUP_DIR]
+
+
+def snapshot_database(dest: Path) -> bool:
+    """Online-Backup der laufenden Datenbank (konsistent, auch während der Bot schreibt)."""
+    if not DB_PATH.exists():
+        print(f"   ⚠️  Keine Datenbank gefunden: {DB_PATH}")
+        return False
+    from src.infrastructure.db_maintenance import online_backup
+
+    try:
+        result = asyncio.run(online_backup(str(DB_PATH), str(dest)))
+    except Exception as e:
+        print(f"   ❌ Datenbank-Backup fehlgeschlagen: {e}")
+        return False
+    print(f"   ✅ Datenbank: {dest.name} ({result['bytes'] / 1024 / 1024:.2f} MB, {result['seconds']}s, quick_check ok)")
+    return True
+
+
 def create_backup(include_logs: bool = False, description: str = None):
     """Erstellt ein vollständiges Backup des Bot-Ordners.
     
@@ -134,6 +171,10 @@ def create_backup(include_logs: bool = False, description: str = None):
             for pattern in IGNORE_PATTERNS:
                 if path.match(pattern):
                     return True
+
+            # Live-DB wird separat per Backup API gesichert
+            if path in DB_LIVE_FILES:
+                return True
             
             return False
         
@@ -179,6 +220,7 @@ def create_backup(include_logs: bool = False, description: str = None):
                     print(f"   ⚠️  Fehler beim Kopieren von {src_file.name}: {e}")
         
         print(f"   ✅ {copied_files} Dateien, {copied_dirs} Ordner kopiert")
+        snapshot_database(dest_folder / config.DB_FILE)
         print()
         
         # Backup-Info erstellen
@@ -248,7 +290,7 @@ def list_recent_backups(n: int = 10):
         print("📁 Noch keine Backups vorhanden.")
         return []
         
-    backups = sorted([d for d in BACKUP_DIR.iterdir() if d.is_dir()], reverse=True)
+    backups = sorted(_folder_backups(), reverse=True)
     
     if not backups:
         print("📁 Noch keine Backups vorhanden.")
@@ -277,7 +319,7 @@ def list_recent_backups(n: int = 10):
 def restore_backup(timestamp: str):
     """Stellt ein Backup wieder her."""
     # Suche nach passendem Backup
-    matching = [d for d in BACKUP_DIR.iterdir() if d.is_dir() and timestamp in d.name]
+    matching = [d for d in _folder_backups() if timestamp in d.name]
     
     if not matching:
         print(f"❌ Kein Backup gefunden das '{timestamp}' enthält!")
@@ -305,6 +347,12 @@ def restore_backup(timestamp: str):
     print("\n⏳ Restore läuft...")
     
     try:
+        # Alte WAL/SHM der Live-DB würden auf die wiederhergestellte DB angewendet
+        if (backup_folder / config.DB_FILE).exists():
+            for stale in (Path(f"{DB_PATH}-wal"), Path(f"{DB_PATH}-shm")):
+                if stale.exists():
+                    stale.unlink()
+
         # Kopiere alles außer backups-Ordner
         for item in backup_folder.iterdir():
             if item.name == "backups":
@@ -369,7 +417,7 @@ def cleanup(dry_run: bool = False):
     # ═══════════════════════════════════════════════════════════════════════
     if BACKUP_DIR.exists():
         backups = sorted(
-            [d for d in BACKUP_DIR.iterdir() if d.is_dir()],
+            _folder_backups(),
             key=lambda d: d.stat().st_mtime,
             reverse=True
         )
@@ -454,6 +502,7 @@ def print_usage():
     print(__doc__)
     print("Beispiele:")
     print("  python backup.py                    # Backup erstellen")
+    print("  python backup.py db                 # Nur Datenbank (Online-Backup)")
     print("  python backup.py --with-logs        # Backup mit Logs")
     print("  python backup.py --desc 'Vor Fix'   # Backup mit Beschreibung")
     print("  python backup.py list               # Backups anzeigen")
@@ -473,6 +522,11 @@ if __name__ == "__main__":
         print()
         create_backup()
     
+    elif args[0] == "db":
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        print("💾 Online-Backup der Datenbank...")
+        snapshot_database(DB_BACKUP_DIR / f"{DB_PATH.stem}_{ts}.db")
+    
     elif args[0] == "list":
         list_recent_backups(20)
     
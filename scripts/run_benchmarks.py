@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Self-benchmark: hot paths on a recorded or synthetic workload
+
+Usage:
+    python scripts/run_benchmarks.py
+        Synthetic workload (seeded), all stages, compared against
+        BENCHMARK_BASELINE_FILE if it exists
+    python scripts/run_benchmarks.py --save-baseline
+        Same run, result stored as the new baseline
+    python scripts/run_benchmarks.py --record data/workload.jsonl --record-seconds 120
+        Record the public Lighter + X10 streams into a workload file
+    python scripts/run_benchmarks.py --workload data/workload.jsonl --stages ws_decode,lighter_orderbook
+        Replay a recording through selected stages
+
+Exit code 1 with --fail-on-regression if any stage regressed beyond the
+tolerance (p50 / p99 growth or throughput drop).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import config  # noqa: E402
+from src.infrastructure.benchmark import (  # noqa: E402
+    STAGES,
+    compare_to_baseline,
+    format_report,
+    load_baseline,
+    load_workload,
+    record_workload,
+    run_benchmarks,
+    save_baseline,
+    synthetic_workload,
+)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the bot's hot paths")
+    parser.add_argument("--workload", default=None, help="recorded workload (JSONL); default: synthetic")
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=20000, help="synthetic stream frames after the snapshots")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--stages", default=None, help=f"comma separated subset of: {', '.join(STAGES)}")
+    parser.add_argument("--scans", type=int, default=20, help="find_opportunities runs")
+    parser.add_argument("--db-batches", type=int, default=50)
+    parser.add_argument("--baseline", default=getattr(config, "BENCHMARK_BASELINE_FILE", "data/benchmark_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=None, help="default: BENCHMARK_REGRESSION_TOLERANCE")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--record", default=None, help="record the public streams into this file and exit")
+    parser.add_argument("--record-seconds", type=float, default=60.0)
+    parser.add_argument("--record-books", type=int, default=10, help="Lighter order_book channels to record")
+    args = parser.parse_args()
+
+    # Stage code logs per message / per opportunity; keep the report readable
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.record:
+        count = await record_workload(args.record, args.record_seconds, args.record_books)
+        print(f"Recorded {count} frames -> {args.record}")
+        return 0
+
+    if args.workload:
+        workload = load_workload(args.workload, depth=args.depth)
+    else:
+        workload = synthetic_workload(args.symbols, args.depth, args.updates, args.seed)
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()] if args.stages else None
+    results = await run_benchmarks(workload, stages, scans=args.scans, db_batches=args.db_batches)
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    comparisons = compare_to_baseline(results, baseline, args.tolerance) if baseline else None
+    if args.json:
+        print(json.dumps({
+            "workload": workload.source,
+            "stages": [r.to_dict() for r in results],
+            "comparisons": [c.__dict__ for c in comparisons or []],
+        }, indent=2))
+    else:
+        print(format_report(results, comparisons, workload, baseline))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, workload)
+        print(f"\nBaseline saved -> {args.baseline}")
+    if args.fail_on_regression and comparisons and any(c.regression for c in comparisons):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Exchange simulator: local Lighter + X10 endpoints, optional load run
+
+Usage:
+    python scripts/run_exchange_simulator.py --serve --port 8765
+        Simulator only; prints the config overrides to point the bot at it
+    python scripts/run_exchange_simulator.py --symbols 200 --hz 20 --duration 30
+        Load run: WebSocketManager + Lighter fast REST against the simulator,
+        reports throughput and end-to-end latency (p50 / p99 / max)
+    python scripts/run_exchange_simulator.py --connect http://127.0.0.1:8765
+        Load run against a simulator started with --serve in another process
+        (the in-process run shares one event loop between bot and simulator)
+
+Fault injection: --latency-median/--latency-p99 (ms), --rate-limit (share of
+429s), --partial-fill, --reject, --disconnect-interval (seconds).
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import config  # noqa: E402
+from src.infrastructure.exchange_simulator import (  # noqa: E402
+    ExchangeSimulator,
+    SimulatorConfig,
+    apply_endpoints,
+    simulator_endpoints,
+)
+
+
+def _pct(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+
+def _summary(name, values):
+    return (f"{name:<14} n={len(values):<8} p50={_pct(values, 50) * 1000:8.3f}ms "
+            f"p99={_pct(values, 99) * 1000:8.3f}ms max={max(values, default=0) * 1000:8.3f}ms")
+
+
+async def _load_run(args, overrides, sim=None) -> None:
+    import aiohttp
+
+    from src.adapters.lighter_fast_rest import LighterFastRest, LighterFastRestRateLimited
+    from src.infrastructure.websocket_manager import WebSocketManager
+
+    apply_endpoints(config, overrides)
+    manager = WebSocketManager()
+    ws_latency = {"lighter": [], "x10": []}
+
+    def _recorder(source):
+        async def _record(msg):
+            sent = msg.get("sim_ts") if isinstance(msg, dict) else None
+            if sent:
+                ws_latency[source].append(time.time() - sent)
+        return _record
+
+    manager.register_handler("lighter", _recorder("lighter"))
+    manager.register_handler("x10", _recorder("x10"))
+    await manager.start()
+    await manager.subscribe_lighter(["market_stats/all"])
+
+    rest_latency, rest_429 = [], 0
+    session = aiohttp.ClientSession()
+
+    async def _session():
+        return session
+
+    rest = LighterFastRest(config.LIGHTER_BASE_URL, _session)
+
+    async def _rest_load():
+        nonlocal rest_429
+        interval = 1.0 / args.rest_rps
+        while True:
+            started = time.perf_counter()
+            try:
+                await rest.order_book_details()
+                rest_latency.append(time.perf_counter() - started)
+            except LighterFastRestRateLimited:
+                rest_429 += 1
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+    rest_task = asyncio.create_task(_rest_load()) if args.rest_rps > 0 else None
+    started = time.time()
+    await asyncio.sleep(args.duration)
+    elapsed = time.time() - started
+
+    if rest_task:
+        rest_task.cancel()
+    reconnects = sum(s["metrics"]["reconnect_count"] for s in manager.get_connection_status().values())
+    await manager.stop()
+    await session.close()
+
+    received = sum(len(v) for v in ws_latency.values())
+    print(f"\n── Load run against {config.LIGHTER_BASE_URL.rsplit('/', 1)[0]} for {elapsed:.1f}s ──")
+    print(f"WS messages    {received} ({received / elapsed:,.0f}/s), reconnects {reconnects}")
+    for source, values in ws_latency.items():
+        print(_summary(f"ws {source}", values))
+    print(_summary("rest", rest_latency) + f"  429s={rest_429}")
+    if sim is not None:
+        print(f"simulator      {dict((k, v) for k, v in sim.get_stats().items() if k != 'routes')}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Lighter + X10 exchange simulator")
+    parser.add_argument("--serve", action="store_true", help="only run the simulator")
+    parser.add_argument("--connect", default=None, help="load run against a running simulator (http://host:port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--hz", type=float, default=10.0, help="updates per symbol and second")
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--rest-rps", type=float, default=20.0)
+    parser.add_argument("--latency-median", type=float, default=2.0)
+    parser.add_argument("--latency-p99", type=float, default=20.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--partial-fill", type=float, default=0.0)
+    parser.add_argument("--reject", type=float, default=0.0)
+    parser.add_argument("--disconnect-interval", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.connect:
+        await _load_run(args, simulator_endpoints(args.connect))
+        return
+
+    sim = ExchangeSimulator(SimulatorConfig(
+        symbols=args.symbols, update_hz=args.hz, depth=args.depth,
+        latency_median_ms=args.latency_median, latency_p99_ms=args.latency_p99,
+        rate_limit_rate=args.rate_limit, partial_fill_rate=args.partial_fill, reject_rate=args.reject,
+        disconnect_interval=args.disconnect_interval, seed=args.seed,
+    ))
+    await sim.start(args.host, args.port)
+    try:
+        if args.serve:
+            print("Exchange simulator running - config overrides:")
+            for key, value in sim.config_overrides().items():
+                print(f"  {key} = {value!r}")
+            await asyncio.Event().wait()
+        else:
+            await _load_run(args, sim.config_overrides(), sim)
+    finally:
+        await sim.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
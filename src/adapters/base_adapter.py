@@ -7,6 +7,7 @@ from decimal import Decimal
 import aiohttp
 from src.core.interfaces import ExchangeAdapter, Position, OrderResult
 from src.utils import safe_decimal
+from src.infrastructure.http_transport import HostTransport, get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +22,17 @@ class BaseAdapter(ExchangeAdapter):
         # Wird von den konkreten Adaptern überschrieben
         self.rate_limiter = None
         self._session: Optional[aiohttp.ClientSession] = None
+        # Shared per-host transport (owned by http_transport, never closed here)
+        self._transport: Optional[HostTransport] = None
+
+    def _init_transport(self, transport_name: str) -> None:
+        if getattr(config, "HTTP_TRANSPORT_ENABLED", True):
+            self._transport = get_transport(transport_name)
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get existing session or create a new one if missing/closed."""
+        """Shared host transport session, or a private one if the transport is disabled."""
+        if self._transport is not None:
+            return await self._transport.session()
         if self._session is None or self._session.closed:
             # Use a slightly larger pool limit if needed, or default
             # TCP Keep-Alive prevents connection drops and improves performance
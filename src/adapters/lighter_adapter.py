@@ -132,9 +132,14 @@ except ImportError as e:
 
 from .base_adapter import BaseAdapter, Position, OrderResult
 from src.infrastructure.rate_limiter import LIGHTER_RATE_LIMITER, rate_limited, Exchange, with_rate_limit
+from src.infrastructure.order_tracker import get_order_tracker
+from src.infrastructure.balance_service import get_balance_service
+from src.infrastructure.market_registry import get_market_registry, lighter_market_meta
 from src.adapters.lighter_client_fix import SaferSignerClient
 from src.application.batch_manager import LighterBatchManager
 from src.adapters.ws_order_client import WebSocketOrderClient, WsOrderConfig
+from src.adapters.lighter_fast_rest import LighterFastRest, LighterFastRestRateLimited
+from src.adapters.lighter_flatten import LighterFlattenEngine, FlattenResult
 from .lighter_stream_client import LighterStreamClient
 
 
@@ -205,12 +210,20 @@ class LighterAdapter(BaseAdapter):
         self._balance_cache = 0.0
         self._last_balance_update = 0.0
         self.base_url = self._get_base_url()
+        self._init_transport("lighter")
+        # Raw-JSON fast path for hot REST reads (SDK stays as fallback)
+        self._fast_rest: Optional[LighterFastRest] = (
+            LighterFastRest(self.base_url, self._get_session)
+            if getattr(config, "LIGHTER_FAST_REST_ENABLED", True) else None
+        )
         self._pending_positions = {}  # Ghost Guardian Cache
         self._dust_logged = set()  # Track dust positions that have been logged (to reduce spam)
         
         # NEU: Lock für thread-sichere Order-Erstellung (Fix für Invalid Nonce)
         self.order_lock = asyncio.Lock()
-        
+        # Batched emergency flatten (lazy, see flatten_positions)
+        self._flatten_engine: Optional[LighterFlattenEngine] = None
+
         # Lock für thread-sichere Orderbook Cache Updates (WebSocket + REST können gleichzeitig schreiben)
         self._orderbook_cache_lock = asyncio.Lock()
         
@@ -265,6 +278,8 @@ class LighterAdapter(BaseAdapter):
         self._ws_url = "wss://mainnet.zklighter.elliot.ai/stream"
         if getattr(config, "LIGHTER_BASE_URL", "").startswith("https://testnet"):
             self._ws_url = "wss://testnet.zklighter.elliot.ai/stream"
+        if getattr(config, "LIGHTER_WS_URL", None):
+            self._ws_url = config.LIGHTER_WS_URL
 
         # ═══════════════════════════════════════════════════════════════
         # BATCH ORDERS (New Implementation)
@@ -279,10 +294,11 @@ class LighterAdapter(BaseAdapter):
         # NOTE: Uses /stream endpoint (same as market data WS)
         #       /jsonapi endpoint returns 404 on mainnet
         # ═══════════════════════════════════════════════════════════════
-        ws_order_url = "wss://mainnet.zklighter.elliot.ai/stream"
-        if getattr(config, "LIGHTER_BASE_URL", "").startswith("https://testnet"):
-            ws_order_url = "wss://testnet.zklighter.elliot.ai/stream"
-        self.ws_order_client = WebSocketOrderClient(WsOrderConfig(url=ws_order_url))
+        ws_order_url = self._ws_url
+        self.ws_order_client = WebSocketOrderClient(WsOrderConfig(
+            url=ws_order_url,
+            pool_size=int(getattr(config, "WS_ORDER_POOL_SIZE", 2)),
+        ))
         self._ws_order_enabled = getattr(config, "LIGHTER_WS_ORDERS", True)
         
         # ═══════════════════════════════════════════════════════════════
@@ -360,17 +376,11 @@ class LighterAdapter(BaseAdapter):
         
         for attempt in range(max_retries):
             try:
-                # Check connection health before each attempt
+                # No inline reconnect: the pool fails over to its warm standby and
+                # re-opens dropped connections in the background. Nothing up -> REST.
                 if not self.ws_order_client.is_connected:
-                    logger.debug(f"[WS-ORDER] Attempt {attempt+1}: Reconnecting...")
-                    connected = await self.ws_order_client.connect()
-                    if not connected:
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(backoff_base * (2 ** attempt))
-                            continue
-                        else:
-                            logger.warning(f"[WS-ORDER] Failed to connect after {max_retries} attempts")
-                            return None
+                    logger.debug(f"[WS-ORDER] Attempt {attempt+1}: no order connection up - using REST")
+                    return None
                 
                 # Submit via WebSocket
                 result = await self.ws_order_client.send_transaction(
@@ -384,12 +394,7 @@ class LighterAdapter(BaseAdapter):
             except ConnectionError as e:
                 logger.warning(f"[WS-ORDER] Attempt {attempt+1}: Connection error: {e}")
                 if attempt < max_retries - 1:
-                    # Try to reconnect
-                    try:
-                        await self.ws_order_client.connect()
-                    except Exception:
-                        pass
-                    await asyncio.sleep(backoff_base * (2 ** attempt))
+                    # Next attempt goes out on the standby connection (if any)
                     continue
                 else:
                     logger.warning(f"[WS-ORDER] All {max_retries} retries failed (ConnectionError)")
@@ -588,7 +593,21 @@ class LighterAdapter(BaseAdapter):
                 "api_key_index": self._resolved_api_key_index
             }
             
-            # Fetch the first nonce from API
+            # Fetch the first nonce from API (fast path: plain int, else raw dict below)
+            first_nonce = None
+            if self._fast_rest is not None:
+                try:
+                    first_nonce = await self._fast_rest.next_nonce(**nonce_params)
+                except LighterFastRestRateLimited:
+                    logger.warning("[LIGHTER] 429 from /api/v1/nextNonce")
+                    self.rate_limiter.penalize_429()
+                    return
+            if first_nonce is not None:
+                self._nonce_pool = [first_nonce + i for i in range(self.NONCE_BATCH_SIZE)]
+                self._nonce_pool_fetch_time = time.time()
+                logger.debug(f"🔄 Nonce pool refilled: {len(self._nonce_pool)} nonces starting at {first_nonce}")
+                return
+            
             nonce_resp = await self._rest_get_internal("/api/v1/nextNonce", params=nonce_params)
             
             if nonce_resp is None:
@@ -684,7 +703,8 @@ class LighterAdapter(BaseAdapter):
     # 
     # Features:
     # - send_batch_orders(): Send multiple orders in one API call
-    # - close_all_positions_batch(): Close all positions in one TX
+    # - flatten_positions(): Close all positions via sendTxBatch (lighter_flatten.py)
+    # - close_all_positions_batch(): (closed, failed) wrapper for flatten_positions
     # - Reduces API calls and latency during shutdown
     # ═══════════════════════════════════════════════════════════════
     
@@ -784,95 +804,32 @@ class LighterAdapter(BaseAdapter):
             logger.error(f"❌ send_batch_orders error: {e}")
             return False, []
     
+    async def flatten_positions(self, positions: Optional[List[Any]] = None) -> FlattenResult:
+        """
+        Emergency flatten: reduce-only IOC orders for every open market, signed
+        with consecutive nonces and sent in sendTxBatch chunks; only residual
+        positions are retried after a fresh account read.
+
+        Args:
+            positions: Position dicts to close (default: fresh account read)
+
+        Returns:
+            FlattenResult (closed symbols, residual sizes, skipped symbols)
+        """
+        if self._flatten_engine is None:
+            self._flatten_engine = LighterFlattenEngine(self)
+        return await self._flatten_engine.flatten(positions)
+
     async def close_all_positions_batch(self) -> Tuple[int, int]:
         """
-        Close all open positions using concurrent close calls.
-        Optimized for shutdown - faster than fully sequential close calls.
-        
-        Note: True TX-batching via /api/v1/sendTxBatch requires raw signing
-        which the Python SDK doesn't expose. This uses parallelism instead.
+        Close all open positions in one (or a few) transaction batches.
+        Optimized for shutdown - one round trip instead of one per position.
         
         Returns:
             Tuple[int, int]: (closed_count, failed_count)
         """
-        positions = await self.fetch_open_positions()
-        if not positions:
-            logger.info("📦 No positions to batch-close")
-            return 0, 0
-        
-        # Filter positions with actual size
-        positions_to_close = [
-            p for p in positions 
-            if abs(safe_float(p.get("size", 0))) > 1e-8
-        ]
-        
-        if not positions_to_close:
-            logger.info("📦 No non-zero positions to batch-close")
-            return 0, 0
-        
-        logger.info(f"📦 Parallel-closing {len(positions_to_close)} Lighter positions...")
-        
-        closed_count = 0
-        failed_count = 0
-        
-        # Create close tasks for parallel execution
-        async def close_single_position(pos: dict) -> bool:
-            try:
-                symbol = pos.get("symbol", "")
-                size = safe_float(pos.get("size", 0))
-                
-                if abs(size) < 1e-8:
-                    return True  # Already closed
-                
-                # Determine close side (opposite of position)
-                original_side = "BUY" if size > 0 else "SELL"
-                
-                # Use close_live_position for proper handling
-                success, _ = await self.close_live_position(
-                    symbol=symbol,
-                    original_side=original_side,
-                    notional_usd=0  # Will be calculated from position size
-                )
-                
-                if success:
-                    logger.debug(f"✅ Closed {symbol}")
-                    return True
-                else:
-                    logger.warning(f"⚠️ Failed to close {symbol}")
-                    return False
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ Error closing {pos.get('symbol')}: {e}")
-                return False
-        
-        # Execute closes in parallel with limited concurrency
-        # Use batches of 3 to respect rate limits
-        batch_size = 3
-        for i in range(0, len(positions_to_close), batch_size):
-            batch = positions_to_close[i:i+batch_size]
-            tasks = [close_single_position(pos) for pos in batch]
-            
-            try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                for result in results:
-                    if isinstance(result, Exception):
-                        failed_count += 1
-                    elif result:
-                        closed_count += 1
-                    else:
-                        failed_count += 1
-                        
-            except Exception as e:
-                logger.error(f"❌ Batch close error: {e}")
-                failed_count += len(batch)
-            
-            # Small delay between batches for rate limiting
-            if i + batch_size < len(positions_to_close):
-                await asyncio.sleep(0.3)
-        
-        logger.info(f"📦 Parallel close complete: {closed_count} closed, {failed_count} failed")
-        return closed_count, failed_count
+        result = await self.flatten_positions()
+        return len(result.closed), len(result.residual) + len(result.skipped)
 
     # ═══════════════════════════════════════════════════════════════
     # CANDLESTICK API: Pattern from lighter-ts-main/src/api/candlestick-api.ts
@@ -1247,10 +1204,6 @@ class LighterAdapter(BaseAdapter):
                      
         except Exception as e:
             pass
-        """Get or create aiohttp session"""
-        if not hasattr(self, '_session') or self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
 
     async def _rest_get_internal(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
         """REST GET WITHOUT rate limiting - for internal use only (e.g., nonce fetch inside order lock).
@@ -1415,46 +1368,51 @@ class LighterAdapter(BaseAdapter):
                 return self. market_info. get(symbol, {})
             
             url = f"{self. base_url}/api/v1/market? market_index={market_index}"
-            async with aiohttp.ClientSession() as session:
-                async with session. get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response. json()
-                        if data:
-                            old_info = self.market_info.get(symbol, {})
+            session = await self._get_session()
+            async with session. get(url, timeout=10) as response:
+                if response.status == 200:
+                    data = await response. json()
+                    if data:
+                        old_info = self.market_info.get(symbol, {})
+                        info = dict(old_info)
                             
-                            # ═══════════════════════════════════════════════════════════════
-                            # CRITICAL FIX: Cast API response values to correct types
-                            # ═══════════════════════════════════════════════════════════════
-                            if 'min_notional' in data:
-                                self.market_info[symbol]['min_notional'] = safe_float(data['min_notional'], 10.0)
-                            if 'min_base_amount' in data:
-                                min_base_val = safe_float(data['min_base_amount'], 0.01)
-                                self.market_info[symbol]['min_base_amount'] = min_base_val
-                                self.market_info[symbol]['min_quantity'] = min_base_val
-                            if 'min_quote_amount' in data:
-                                self.market_info[symbol]['min_quote'] = safe_float(data['min_quote_amount'], 0.01)
-                            if 'tick_size' in data:
-                                self.market_info[symbol]['tick_size'] = safe_float(data['tick_size'], 0.01)
-                            if 'lot_size' in data:
-                                self.market_info[symbol]['lot_size'] = safe_float(data['lot_size'], 0.0001)
-                            if 'size_decimals' in data:
-                                self.market_info[symbol]['sd'] = safe_int(data['size_decimals'], 8)
-                                self.market_info[symbol]['size_decimals'] = safe_int(data['size_decimals'], 8)
-                            if 'price_decimals' in data:
-                                self.market_info[symbol]['pd'] = safe_int(data['price_decimals'], 6)
-                                self.market_info[symbol]['price_decimals'] = safe_int(data['price_decimals'], 6)
+                        # ═══════════════════════════════════════════════════════════════
+                        # CRITICAL FIX: Cast API response values to correct types
+                        # ═══════════════════════════════════════════════════════════════
+                        if 'min_notional' in data:
+                            info['min_notional'] = safe_float(data['min_notional'], 10.0)
+                        if 'min_base_amount' in data:
+                            min_base_val = safe_float(data['min_base_amount'], 0.01)
+                            info['min_base_amount'] = min_base_val
+                            info['min_quantity'] = min_base_val
+                        if 'min_quote_amount' in data:
+                            info['min_quote'] = safe_float(data['min_quote_amount'], 0.01)
+                        if 'tick_size' in data:
+                            info['tick_size'] = safe_float(data['tick_size'], 0.01)
+                        if 'lot_size' in data:
+                            info['lot_size'] = safe_float(data['lot_size'], 0.0001)
+                        if 'size_decimals' in data:
+                            info['sd'] = safe_int(data['size_decimals'], 8)
+                            info['size_decimals'] = safe_int(data['size_decimals'], 8)
+                        if 'price_decimals' in data:
+                            info['pd'] = safe_int(data['price_decimals'], 6)
+                            info['price_decimals'] = safe_int(data['price_decimals'], 6)
                             
-                            new_min_base = safe_float(data.get('min_base_amount'), None)
-                            old_min_base = safe_float(old_info.get('min_base_amount'), None)
-                            if new_min_base is not None and old_min_base is not None and new_min_base != old_min_base:
-                                logger.warning(
-                                    f"⚠️ {symbol} min_base_amount changed: {old_min_base} -> {new_min_base}"
-                                )
+                        new_min_base = safe_float(data.get('min_base_amount'), None)
+                        old_min_base = safe_float(old_info.get('min_base_amount'), None)
+                        if new_min_base is not None and old_min_base is not None and new_min_base != old_min_base:
+                            logger.warning(
+                                f"⚠️ {symbol} min_base_amount changed: {old_min_base} -> {new_min_base}"
+                            )
                             
-                            logger.info(f"✅ Refreshed market limits for {symbol}")
-                            return self.market_info. get(symbol, {})
-                    else:
-                        logger.warning(f"Failed to refresh {symbol} limits: HTTP {response.status}")
+                        # Copy-on-write: readers keep the old entry until the swap
+                        self.market_info = {**self.market_info, symbol: info}
+                        get_market_registry().apply("lighter", [lighter_market_meta(symbol, info)], partial=True)
+
+                        logger.info(f"✅ Refreshed market limits for {symbol}")
+                        return info
+                else:
+                    logger.warning(f"Failed to refresh {symbol} limits: HTTP {response.status}")
                         
         except asyncio.TimeoutError:
             logger. warning(f"Timeout refreshing market limits for {symbol}")
@@ -2693,11 +2651,9 @@ class LighterAdapter(BaseAdapter):
                     continue
 
                 await self. rate_limiter.acquire()
-                signer = await self._get_signer()
-                order_api = OrderApi(signer.api_client)
 
                 try:
-                    market_list = await order_api.order_book_details()
+                    market_list = await self._read_order_book_details()
                     if market_list and market_list.order_book_details:
                         updated = 0
                         for m in market_list. order_book_details:
@@ -2763,18 +2719,12 @@ class LighterAdapter(BaseAdapter):
             if not HAVE_LIGHTER_SDK:
                 return
 
-            signer = await self._get_signer()
-            funding_api = FundingApi(signer.api_client)
-
-            fd_response = await funding_api.funding_rates()
+            fd_response = await self._read_funding_rates()
             if fd_response and fd_response.funding_rates:
                 for fr in fd_response. funding_rates:
-                    market_id = fr. market_id
-                    rate = safe_float(fr.rate, 0.0)
-                    for symbol, data in self.market_info.items():
-                        if data.get("i") == market_id:
-                            self.funding_cache[symbol] = rate
-                            break
+                    symbol = self._symbol_for_market_id(fr.market_id)
+                    if symbol is not None:
+                        self.funding_cache[symbol] = safe_float(fr.rate, 0.0)
                 logger.debug(
                     f"Lighter: Refreshed {len(fd_response.funding_rates)} funding rates via REST"
                 )
@@ -2785,6 +2735,54 @@ class LighterAdapter(BaseAdapter):
     def _get_base_url(self) -> str:
         return getattr(config, "LIGHTER_BASE_URL", "https://mainnet.zklighter.elliot.ai")
 
+    # ═══════════════════════════════════════════════════════════════
+    # HOT REST READS: fast path first, SDK as fallback.
+    # Both return objects with the same attribute names
+    # (response.accounts[0].positions, .order_book_details, .funding_rates).
+    # 429 from the fast path is raised, not retried via the SDK.
+    # ═══════════════════════════════════════════════════════════════
+    async def _read_account(self):
+        if self._resolved_account_index is None:
+            await self._resolve_account_index()
+        if self._fast_rest is not None:
+            response = await self._fast_rest.account(self._resolved_account_index)
+            if response is not None:
+                return response
+        signer = await self._get_signer()
+        return await AccountApi(signer.api_client).account(
+            by="index", value=str(self._resolved_account_index)
+        )
+
+    async def _read_order_book_details(self, market_id: Optional[int] = None):
+        if self._fast_rest is not None:
+            response = await self._fast_rest.order_book_details(market_id=market_id)
+            if response is not None:
+                return response
+        signer = await self._get_signer()
+        order_api = OrderApi(signer.api_client)
+        if market_id is not None:
+            return await order_api.order_book_details(market_id=market_id)
+        return await order_api.order_book_details()
+
+    async def _read_funding_rates(self):
+        if self._fast_rest is not None:
+            response = await self._fast_rest.funding_rates()
+            if response is not None:
+                return response
+        signer = await self._get_signer()
+        return await FundingApi(signer.api_client).funding_rates()
+
+    def _symbol_for_market_id(self, market_id) -> Optional[str]:
+        """market_id -> symbol via the market registry (scan only before the first registry load)."""
+        registry = get_market_registry()
+        if registry.current("lighter").version:
+            symbol = registry.symbol_for_id("lighter", market_id)
+            return symbol if symbol in self.market_info else None
+        for symbol, info in self.market_info.items():
+            if info.get("i") == market_id or info.get("market_id") == market_id:
+                return symbol
+        return None
+
     async def _auto_resolve_indices(self) -> Tuple[int, int]:
         return int(config.LIGHTER_ACCOUNT_INDEX), int(config.LIGHTER_API_KEY_INDEX)
 
@@ -2817,8 +2815,29 @@ class LighterAdapter(BaseAdapter):
                 account_index=self._resolved_account_index,
                 api_private_keys=api_private_keys,
             )
+        await self._attach_transport(getattr(self._signer, "api_client", None))
         return self._signer
 
+    async def _attach_transport(self, api_client) -> None:
+        """Route SDK REST calls (ApiClient.rest_client) through the shared host transport."""
+        rest_client = getattr(api_client, "rest_client", None)
+        if self._transport is None or rest_client is None or not hasattr(rest_client, "pool_manager"):
+            return
+        session = await self._transport.session()
+        own = rest_client.pool_manager
+        if own is session:
+            return
+        if own is not None and not own.closed:
+            await own.close()
+        rest_client.pool_manager = session
+
+    def _detach_transport(self, api_client) -> None:
+        """Hand the shared session back before SDK close() (the transport owns it)."""
+        rest_client = getattr(api_client, "rest_client", None)
+        if self._transport is not None and rest_client is not None and hasattr(rest_client, "pool_manager"):
+            if self._transport.owns(rest_client.pool_manager):
+                rest_client.pool_manager = None
+
     async def _fetch_single_market(self, order_api, market_id: int):
         """Fetch market data with safe type conversion for API responses."""
         async with self.semaphore:
@@ -2865,7 +2884,10 @@ class LighterAdapter(BaseAdapter):
                     if normalized_symbol in MARKET_OVERRIDES:
                         market_data.update(MARKET_OVERRIDES[normalized_symbol])
 
-                    self.market_info[normalized_symbol] = market_data
+                    self.market_info = {**self.market_info, normalized_symbol: market_data}
+                    get_market_registry().apply(
+                        "lighter", [lighter_market_meta(normalized_symbol, market_data)], partial=True
+                    )
 
                     price = getattr(m, 'last_trade_price', None)
                     if price is not None:
@@ -2888,28 +2910,28 @@ class LighterAdapter(BaseAdapter):
     async def _load_funding_rates(self):
         """Load funding rates from Lighter API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self._get_base_url()}/api/v1/funding-rates"
-                async with session.get(url) as resp:
-                    if resp. status == 200:
-                        data = await resp.json()
-                        funding_rates = data. get('funding_rates', [])
+            session = await self._get_session()
+            url = f"{self._get_base_url()}/api/v1/funding-rates"
+            async with session.get(url) as resp:
+                if resp. status == 200:
+                    data = await resp.json()
+                    funding_rates = data. get('funding_rates', [])
                         
-                        for fr in funding_rates:
-                            if fr.get('exchange') == 'lighter':
-                                symbol = fr.get('symbol', '')
-                                rate = fr.get('rate')
+                    for fr in funding_rates:
+                        if fr.get('exchange') == 'lighter':
+                            symbol = fr.get('symbol', '')
+                            rate = fr.get('rate')
                                 
-                                if symbol and rate is not None:
-                                    if not symbol.endswith('-USD'):
-                                        symbol = f"{symbol}-USD"
-                                    # Die Rate ist bereits STÜNDLICH (Lighter verwendet 1-hour funding intervals)
-                                    hourly_rate = safe_float(rate, 0.0)
-                                    self.funding_cache[symbol] = hourly_rate
-                                    self._funding_cache[symbol] = hourly_rate
+                            if symbol and rate is not None:
+                                if not symbol.endswith('-USD'):
+                                    symbol = f"{symbol}-USD"
+                                # Die Rate ist bereits STÜNDLICH (Lighter verwendet 1-hour funding intervals)
+                                hourly_rate = safe_float(rate, 0.0)
+                                self.funding_cache[symbol] = hourly_rate
+                                self._funding_cache[symbol] = hourly_rate
                         
-                        logger.debug(f"Lighter: Loaded {len(self.funding_cache)} funding rates")
-                        return True
+                    logger.debug(f"Lighter: Loaded {len(self.funding_cache)} funding rates")
+                    return True
         except Exception as e:
             logger.error(f"Failed to load Lighter funding rates: {e}")
         return False
@@ -3051,7 +3073,9 @@ class LighterAdapter(BaseAdapter):
         side: str = "all",
         limit: int = 100,
         cursor: Optional[str] = None,
-        max_pages: int = 10
+        max_pages: int = 10,
+        since_timestamp: Optional[int] = None,
+        strict: bool = False,
     ) -> List[dict]:
         """
         Fetch position funding history from Lighter API.
@@ -3065,6 +3089,11 @@ class LighterAdapter(BaseAdapter):
             market_id: Optional filter by market (default: 255 = all)
             side: Filter by position side ("long", "short", "all")
             limit: Max records to return (1-100)
+            since_timestamp: Optional high-water mark in ms. Pages are returned
+                newest first, so paging stops at the first page that contains
+                no payment at or after this timestamp.
+            strict: Raise on auth / HTTP errors instead of returning what was
+                fetched so far (only a real 404 or an empty page means "no payments")
             
         Returns:
             List of funding payment records:
@@ -3086,6 +3115,8 @@ class LighterAdapter(BaseAdapter):
             
             if self._resolved_account_index is None:
                 logger.debug("Lighter Position Funding API: No account index resolved")
+                if strict:
+                    raise RuntimeError("Lighter position funding: no account index resolved")
                 return []
             
             # Build auth token (required for private endpoint)
@@ -3097,12 +3128,16 @@ class LighterAdapter(BaseAdapter):
                 auth_token, auth_error = auth_result
                 if auth_error:
                     logger.warning(f"Lighter Position Funding API: Auth token error: {auth_error}")
+                    if strict:
+                        raise RuntimeError(f"Lighter position funding: auth token error: {auth_error}")
                     return []
             else:
                 auth_token = auth_result
             
             if not auth_token:
                 logger.warning("Lighter Position Funding API: Failed to create auth token")
+                if strict:
+                    raise RuntimeError("Lighter position funding: failed to create auth token")
                 return []
             
             base_url = self._get_base_url()
@@ -3148,6 +3183,8 @@ class LighterAdapter(BaseAdapter):
                             logger.debug(f"🔍 [LIGHTER_FUNDING_DEBUG] No fundings in response list.")
                             break
 
+                        page_has_new = since_timestamp is None
+
                         for f in raw_fundings:
                             # change: positive = received, negative = paid (Balance Change)
                             # AUDIT FIX: Lighter API returns Balance Change directly.
@@ -3182,9 +3219,14 @@ class LighterAdapter(BaseAdapter):
                                 "position_side": f.get("position_side", "unknown")
                             })
 
+                            if not page_has_new:
+                                ts = safe_float(f.get("timestamp"), 0.0)
+                                ts_ms = int(ts) if ts >= 1e12 else int(ts * 1000)
+                                page_has_new = ts_ms >= since_timestamp
+
                         pages += 1
                         next_cursor = data.get("next_cursor")
-                        if not next_cursor:
+                        if not next_cursor or not page_has_new:
                             break
                     elif resp.status == 404:
                         logger.info("🔍 [LIGHTER_FUNDING_DEBUG] HTTP 404 (No data found)")
@@ -3192,6 +3234,8 @@ class LighterAdapter(BaseAdapter):
                     else:
                         body = await resp.text()
                         logger.warning(f"🔍 [LIGHTER_FUNDING_DEBUG] HTTP {resp.status} - {body[:200]}")
+                        if strict:
+                            raise RuntimeError(f"Lighter position funding: HTTP {resp.status}")
                         break
 
             # Detailed per-payment debug output
@@ -3213,19 +3257,18 @@ class LighterAdapter(BaseAdapter):
             return all_fundings
                     
         except asyncio.CancelledError:
-            return []
+            raise
         except Exception as e:
             logger.warning(f"Lighter Position Funding API error: {e}")
+            if strict:
+                raise
             return []
 
     def _market_id_to_symbol(self, market_id: Optional[int]) -> str:
         """Convert market_id to symbol using cached market_info."""
         if market_id is None:
             return "UNKNOWN"
-        for symbol, info in self.market_info.items():
-            if info.get("i") == market_id:
-                return symbol
-        return f"MARKET_{market_id}"
+        return self._symbol_for_market_id(market_id) or f"MARKET_{market_id}"
 
     async def get_funding_for_symbol(
         self,
@@ -3288,6 +3331,30 @@ class LighterAdapter(BaseAdapter):
             logger.warning(f"Lighter get_funding_for_symbol error: {e}")
             return 0.0
 
+    def _swap_market_info(self, market_info: Dict[str, dict], keep_previous: bool = False) -> None:
+        """
+        Install a freshly parsed market cache with one assignment.
+
+        Entries equal to the previous ones keep their dict object, the market
+        registry is updated by diff. ``keep_previous``: the details request
+        failed, so known markets keep their previous (detailed) metadata
+        instead of the base defaults.
+        """
+        previous = self.market_info
+        for symbol, info in market_info.items():
+            old = previous.get(symbol)
+            if old is not None and (keep_previous or old == info):
+                market_info[symbol] = old
+        self.market_info = market_info
+        diff = get_market_registry().apply(
+            "lighter", [lighter_market_meta(symbol, info) for symbol, info in market_info.items()]
+        )
+        if diff:
+            logger.debug(
+                f"{self.name} market registry v{diff.version}: +{len(diff.added)} "
+                f"~{len(diff.changed)} -{len(diff.removed)}"
+            )
+
     async def load_market_cache(self, force: bool = False):
         """Load all market metadata from Lighter API - FIXED VERSION"""
         if self. market_info and not force:
@@ -3336,7 +3403,9 @@ class LighterAdapter(BaseAdapter):
             if isinstance(markets, dict):
                 markets = list(markets.values())
 
-            market_id_to_symbol = {}
+            # Build the new cache completely, then swap it in (readers never see a partial dict)
+            market_info: Dict[str, dict] = {}
+            details_loaded = False
 
             for m in markets:
                 try:
@@ -3388,7 +3457,7 @@ class LighterAdapter(BaseAdapter):
                     # CRITICAL FIX: Cast ALL market metadata to correct types
                     # This prevents TypeError when comparing values later
                     # ═══════════════════════════════════════════════════════════════
-                    self.market_info[symbol] = {
+                    market_info[symbol] = {
                         "i": real_id,
                         "market_id": market_id_int,
                         "market_index": market_index_int,
@@ -3408,8 +3477,8 @@ class LighterAdapter(BaseAdapter):
                     # ═══════════════════════════════════════════════════════════════
                     # FIX: Derive tick_size from decimals if missing
                     # ═══════════════════════════════════════════════════════════════
-                    if self.market_info[symbol]["tick_size"] <= 0:
-                        s_pd = self.market_info[symbol].get("supported_price_decimals")
+                    if market_info[symbol]["tick_size"] <= 0:
+                        s_pd = market_info[symbol].get("supported_price_decimals")
                         pd = m.get("price_decimals")
                         
                         decimals = None
@@ -3419,17 +3488,16 @@ class LighterAdapter(BaseAdapter):
                             decimals = to_int(pd)
                             
                         if decimals is not None:
-                            self.market_info[symbol]["tick_size"] = float(pow(10, -decimals))
+                            market_info[symbol]["tick_size"] = float(pow(10, -decimals))
                         else:
                              # Default fallback
-                            self.market_info[symbol]["tick_size"] = 0.01
+                            market_info[symbol]["tick_size"] = 0.01
                     
-                    market_id_to_symbol[real_id] = symbol
 
                 except Exception as e:
                     logger.debug(f"{self.name} market parse error: {e}")
 
-            logger.info(f"✅ {self.name}: Loaded {len(self.market_info)} markets (base data)")
+            logger.info(f"✅ {self.name}: Loaded {len(market_info)} markets (base data)")
 
             # SCHRITT 2: Lade DETAILS mit size_decimals vom SDK/API
             if HAVE_LIGHTER_SDK:
@@ -3450,7 +3518,7 @@ class LighterAdapter(BaseAdapter):
                             
                             symbol = f"{symbol_raw}-USD" if not symbol_raw.endswith("-USD") else symbol_raw
                             
-                            if symbol not in self.market_info:
+                            if symbol not in market_info:
                                 continue
                             
                             # ═══════════════════════════════════════════════════════════════
@@ -3464,12 +3532,12 @@ class LighterAdapter(BaseAdapter):
                                 min_base_float = safe_float(min_base, 0.01)
                             else:
                                 # Ensure we get float, not string from existing data
-                                existing_val = self.market_info[symbol].get('min_base_amount', 0.01)
+                                existing_val = market_info[symbol].get('min_base_amount', 0.01)
                                 min_base_float = safe_float(existing_val, 0.01)
                             
                             # Get other values with safe casting
                             min_quote = safe_float(getattr(detail, 'min_quote_amount', None), 
-                                                  safe_float(self.market_info[symbol].get('min_quote', 0.01), 0.01))
+                                                  safe_float(market_info[symbol].get('min_quote', 0.01), 0.01))
                                                   
                             # ═══════════════════════════════════════════════════════════════
                             # AGGRESSIVE TICK SIZE DISCOVERY
@@ -3516,7 +3584,7 @@ class LighterAdapter(BaseAdapter):
                                 default_tick = 0.0001 # Ignored if api_tick is set
 
                             tick_size = safe_float(api_tick, 
-                                safe_float(self.market_info[symbol].get('tick_size', default_tick), default_tick)
+                                safe_float(market_info[symbol].get('tick_size', default_tick), default_tick)
                             )
                             
                             # Logging Warnung, wenn Tick Size verdächtig groß ist für kleinen Preis
@@ -3525,9 +3593,9 @@ class LighterAdapter(BaseAdapter):
                                 logger.warning(f"⚠️ CRITICAL: {symbol} Tick Size {tick_size} seems huge for price {mark_price_check}. Forcing 0.0001")
                                 tick_size = 0.0001 # Force override
                             lot_size = safe_float(getattr(detail, 'lot_size', None),
-                                                 safe_float(self.market_info[symbol].get('lot_size', 0.0001), 0.0001))
+                                                 safe_float(market_info[symbol].get('lot_size', 0.0001), 0.0001))
                             
-                            self.market_info[symbol].update({
+                            market_info[symbol].update({
                                 'sd': int(size_decimals),  # Enforce int type
                                 'pd': int(price_decimals),  # Enforce int type
                                 'size_decimals': int(size_decimals),
@@ -3552,6 +3620,7 @@ class LighterAdapter(BaseAdapter):
                                     self._price_cache_time[symbol] = time. time()
                         
                         self.rate_limiter.on_success()
+                        details_loaded = True
                         logger. info(f"✅ {self. name}: Updated {updated_count} markets with size_decimals from API")
                         
                 except asyncio.CancelledError:
@@ -3561,6 +3630,8 @@ class LighterAdapter(BaseAdapter):
                     logger.warning(f"⚠️ Could not load order_book_details: {e}")
                     logger.warning("   Using default size_decimals=8 (may cause order errors!)")
 
+            self._swap_market_info(market_info, keep_previous=not details_loaded)
+
             # DEBUG: Zeige die geladenen Werte für Test-Symbole
             for symbol in ['ADA-USD', 'SEI-USD', 'RESOLV-USD', 'TIA-USD']:
                 if symbol in self.market_info:
@@ -3609,6 +3680,7 @@ class LighterAdapter(BaseAdapter):
 
             self. api_client = ApiClient()
             self.api_client.configuration. host = self._get_base_url()
+            await self._attach_transport(self.api_client)
 
             await self.load_market_cache()
 
@@ -3669,12 +3741,9 @@ class LighterAdapter(BaseAdapter):
         self._rest_refresh_ts = time.time()
 
         try:
-            signer = await self._get_signer()
-            
             # 1.  FUNDING RATES laden
-            funding_api = FundingApi(signer.api_client)
             await self.rate_limiter.acquire()
-            fd_response = await funding_api.funding_rates()
+            fd_response = await self._read_funding_rates()
 
             if fd_response and fd_response.funding_rates:
                 # Ensure market_info is populated before mapping
@@ -3693,12 +3762,11 @@ class LighterAdapter(BaseAdapter):
                     # REST API gibt 8-Stunden Rate zurück - teile durch 8 für stündliche Rate
                     hourly_rate = raw_rate / 8.0
 
-                    for symbol, data in self.market_info.items():
-                        if data.get("i") == market_id:
-                            self.funding_cache[symbol] = hourly_rate
-                            self._funding_cache[symbol] = hourly_rate
-                            updated += 1
-                            break
+                    symbol = self._symbol_for_market_id(market_id)
+                    if symbol is not None:
+                        self.funding_cache[symbol] = hourly_rate
+                        self._funding_cache[symbol] = hourly_rate
+                        updated += 1
 
                 self.rate_limiter.on_success()
                 if updated > 0:
@@ -3709,11 +3777,10 @@ class LighterAdapter(BaseAdapter):
             # 2.  PREISE laden via order_book_details
             await asyncio.sleep(0.5)
             
-            order_api = OrderApi(signer.api_client)
             await self.rate_limiter.acquire()
             
             try:
-                market_list = await order_api.order_book_details()
+                market_list = await self._read_order_book_details()
                 if market_list and market_list.order_book_details:
                     price_count = 0
                     now = time.time()
@@ -3753,55 +3820,55 @@ class LighterAdapter(BaseAdapter):
         """Lädt Funding Rates einmalig per REST API, um den Cache sofort zu füllen."""
         try:
             url = f"{self. base_url}/api/v1/info/markets"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=15) as resp:
-                    if resp. status == 200:
-                        data = await resp.json()
-                        markets = []
-                        if isinstance(data, dict):
-                            if 'result' in data and isinstance(data['result'], list):
-                                markets = data['result']
-                            elif 'data' in data and isinstance(data['data'], list):
-                                markets = data['data']
-                            elif 'markets' in data and isinstance(data['markets'], list):
-                                markets = data['markets']
-                            else:
-                                markets = [v for v in data.values() if isinstance(v, dict) and 'symbol' in v]
-                        elif isinstance(data, list):
-                            markets = data
+            session = await self._get_session()
+            async with session.get(url, timeout=15) as resp:
+                if resp. status == 200:
+                    data = await resp.json()
+                    markets = []
+                    if isinstance(data, dict):
+                        if 'result' in data and isinstance(data['result'], list):
+                            markets = data['result']
+                        elif 'data' in data and isinstance(data['data'], list):
+                            markets = data['data']
+                        elif 'markets' in data and isinstance(data['markets'], list):
+                            markets = data['markets']
+                        else:
+                            markets = [v for v in data.values() if isinstance(v, dict) and 'symbol' in v]
+                    elif isinstance(data, list):
+                        markets = data
 
-                        loaded = 0
-                        for m in markets:
+                    loaded = 0
+                    for m in markets:
+                        try:
+                            symbol_raw = m.get('symbol') or m.get('market') or m.get('ticker')
+                            if not symbol_raw:
+                                continue
+                            symbol = symbol_raw if symbol_raw.endswith('-USD') else f"{symbol_raw}-USD"
+                            rate_val = (
+                                m. get('hourlyFundingRate') or
+                                m. get('fundingRateHourly') or
+                                m.get('fundingRate') or
+                                m.get('hourly_funding_rate') or
+                                m.get('funding_rate_hourly')
+                            )
+                            if rate_val is None:
+                                continue
                             try:
-                                symbol_raw = m.get('symbol') or m.get('market') or m.get('ticker')
-                                if not symbol_raw:
-                                    continue
-                                symbol = symbol_raw if symbol_raw.endswith('-USD') else f"{symbol_raw}-USD"
-                                rate_val = (
-                                    m. get('hourlyFundingRate') or
-                                    m. get('fundingRateHourly') or
-                                    m.get('fundingRate') or
-                                    m.get('hourly_funding_rate') or
-                                    m.get('funding_rate_hourly')
-                                )
-                                if rate_val is None:
-                                    continue
-                                try:
-                                    rate_float = float(rate_val)
-                                except (ValueError, TypeError):
-                                    continue
-                                if rate_float != 0:
-                                    self._funding_cache[symbol] = rate_float
-                                    self. funding_cache[symbol] = rate_float
-                                    loaded += 1
-                            except Exception:
+                                rate_float = float(rate_val)
+                            except (ValueError, TypeError):
                                 continue
-                        if loaded > 0:
-                            logger.info(f"✅ Lighter: Pre-fetched {loaded} funding rates via REST.")
-                        else:
-                            logger. warning("Lighter initial funding fetch: no rates parsed.")
+                            if rate_float != 0:
+                                self._funding_cache[symbol] = rate_float
+                                self. funding_cache[symbol] = rate_float
+                                loaded += 1
+                        except Exception:
+                            continue
+                    if loaded > 0:
+                        logger.info(f"✅ Lighter: Pre-fetched {loaded} funding rates via REST.")
                     else:
-                        logger. warning(f"Lighter initial funding fetch HTTP {resp.status}")
+                        logger. warning("Lighter initial funding fetch: no rates parsed.")
+                else:
+                    logger. warning(f"Lighter initial funding fetch HTTP {resp.status}")
         except Exception as e:
             logger.warning(f"Konnte initiale Funding Rates nicht laden: {e}")
 
@@ -4213,9 +4280,7 @@ class LighterAdapter(BaseAdapter):
                 return 0.0
 
             await self.rate_limiter.acquire()
-            signer = await self._get_signer()
-            order_api = OrderApi(signer.api_client)
-            response = await order_api.order_book_details(market_id=market_id)
+            response = await self._read_order_book_details(market_id=market_id)
 
             if response and response.order_book_details:
                 details = response.order_book_details[0]
@@ -4453,34 +4518,34 @@ class LighterAdapter(BaseAdapter):
             # This endpoint returns ALL markets, so we filter for our symbol
             url = f"{self.base_url}/api/v1/orderBookDetails"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status != 200:
-                        logger.debug(f"fetch_fresh_mark_price: HTTP {resp.status} for {symbol}")
-                        return None
+            session = await self._get_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status != 200:
+                    logger.debug(f"fetch_fresh_mark_price: HTTP {resp.status} for {symbol}")
+                    return None
                     
-                    data = await resp.json()
+                data = await resp.json()
                     
-                    # Find our market in the response
-                    order_book_details = data.get('order_book_details', [])
+                # Find our market in the response
+                order_book_details = data.get('order_book_details', [])
                     
-                    for market in order_book_details:
-                        market_symbol = market.get('symbol', '')
-                        if market_symbol == lighter_symbol:
-                            # Get last trade price (most recent execution price)
-                            last_price = safe_float(market.get('last_trade_price', 0))
+                for market in order_book_details:
+                    market_symbol = market.get('symbol', '')
+                    if market_symbol == lighter_symbol:
+                        # Get last trade price (most recent execution price)
+                        last_price = safe_float(market.get('last_trade_price', 0))
                             
-                            if last_price and last_price > 0:
-                                logger.debug(f"✅ fetch_fresh_mark_price: {symbol} = ${last_price:.6f} (fresh via REST)")
-                                # Update caches
-                                self._price_cache[symbol] = last_price
-                                self.price_cache[symbol] = last_price
-                                return last_price
+                        if last_price and last_price > 0:
+                            logger.debug(f"✅ fetch_fresh_mark_price: {symbol} = ${last_price:.6f} (fresh via REST)")
+                            # Update caches
+                            self._price_cache[symbol] = last_price
+                            self.price_cache[symbol] = last_price
+                            return last_price
                             
-                            break
+                        break
                     
-                    logger.debug(f"fetch_fresh_mark_price: Symbol {lighter_symbol} not found in orderBookDetails")
-                    return None
+                logger.debug(f"fetch_fresh_mark_price: Symbol {lighter_symbol} not found in orderBookDetails")
+                return None
             
         except asyncio.TimeoutError:
             logger.debug(f"fetch_fresh_mark_price: Timeout for {symbol}")
@@ -4521,53 +4586,43 @@ class LighterAdapter(BaseAdapter):
             logger.error(f"Error during {self.name} adapter shutdown: {e}")
 
     async def get_real_available_balance(self) -> float:
-        if time.time() - self._last_balance_update < 2.0:
-            return self._balance_cache
+        """
+        Verfügbare Balance (95% der Buying Power) aus dem BalanceService
+        (user_stats Stream). REST nur wenn der letzte Stand älter als
+        BALANCE_MAX_AGE_SECONDS ist; bei REST-Fehlern bleibt der letzte Wert.
+        """
+        buying = await get_balance_service().get_available("lighter", self._fetch_buying_power_rest)
+        if buying:
+            self._balance_cache = buying * 0.95
+            self._last_balance_update = time.time()
+        return self._balance_cache
 
+    async def _fetch_buying_power_rest(self) -> Optional[float]:
+        """AccountApi.account -> buying power (None if the request failed)."""
         if not HAVE_LIGHTER_SDK:
-            return 0.0
+            return None
 
         try:
             await self.rate_limiter.acquire()
-            signer = await self._get_signer()
-            account_api = AccountApi(signer.api_client)
-            await asyncio.sleep(0.5)
-
-            for _ in range(2):
-                try:
-                    response = await account_api.account(
-                        by="index", value=str(self._resolved_account_index)
-                    )
-                    val = 0.0
-                    if response and getattr(response, "accounts", None) and response.accounts[0]:
-                        acc = response.accounts[0]
-                        buying = getattr(acc, "buying_power", None) or getattr(acc, "total_asset_value", "0")
-                        # SAFE CONVERSION: API may return string
-                        val = safe_float(buying, 0.0)
-
-                    safe_balance = val * 0.95
-
-                    self._balance_cache = safe_balance
-                    self._last_balance_update = time.time()
-
-                    logger.debug(f"Lighter Balance: Raw=${val:.2f}, Safe=${safe_balance:.2f}")
-                    break
-                except Exception as e:
-                    if "429" in str(e):
-                        await asyncio.sleep(2)
-                        continue
-                    if isinstance(e, (asyncio.TimeoutError, ConnectionError, OSError)):
-                        await asyncio.sleep(1)
-                        continue
-                    raise
+            response = await self._read_account()
+            val = 0.0
+            if response and getattr(response, "accounts", None) and response.accounts[0]:
+                acc = response.accounts[0]
+                buying = getattr(acc, "buying_power", None) or getattr(acc, "total_asset_value", "0")
+                # SAFE CONVERSION: API may return string
+                val = safe_float(buying, 0.0)
+            logger.debug(f"Lighter Balance: Raw=${val:.2f}, Safe=${val * 0.95:.2f}")
+            return val
         except asyncio.CancelledError:
-            logger.debug(f"{self.name}: get_real_available_balance cancelled during shutdown")
-            return self._balance_cache
+            logger.debug(f"{self.name}: balance fetch cancelled during shutdown")
+            raise
         except Exception as e:
-            if "429" not in str(e):
+            # 429: no inline retry - the rate limiter backs off, callers keep the last value
+            if "429" in str(e):
+                self.rate_limiter.penalize_429()
+            else:
                 logger.error(f"❌ Lighter Balance Error: {e}")
-
-        return self._balance_cache
+            return None
 
     async def fetch_open_positions(self) -> List[Position]:
         """Fetch open positions from Lighter and return as Position objects."""
@@ -4621,9 +4676,6 @@ class LighterAdapter(BaseAdapter):
             # If no cache, allow the request through
 
         try:
-            signer = await self._get_signer()
-            account_api = AccountApi(signer.api_client)
-
             result = await self.rate_limiter.acquire()
             # Check if rate limiter was cancelled (shutdown)
             if result < 0:
@@ -4633,9 +4685,7 @@ class LighterAdapter(BaseAdapter):
                 return []
             await asyncio.sleep(0.2)
 
-            response = await account_api.account(
-                by="index", value=str(self._resolved_account_index)
-            )
+            response = await self._read_account()
 
             if not response or not response.accounts or not response.accounts[0]:
                 self._positions_cache = []
@@ -6748,8 +6798,20 @@ class LighterAdapter(BaseAdapter):
         """
         Trigger all registered position callbacks.
         Called after fetch_open_positions returns.
+        Also feeds the order state tracker (fills of Lighter orders are
+        attributed via the position of their symbol).
         """
-        if not self._position_callbacks or not positions:
+        if not positions:
+            return
+        tracker = get_order_tracker()
+        for pos in positions:
+            symbol = pos.get("symbol")
+            if symbol:
+                tracker.update_position(
+                    "lighter", symbol, safe_float(pos.get("size"), 0.0),
+                    is_ghost=bool(pos.get("is_ghost", False)), source="rest",
+                )
+        if not self._position_callbacks:
             return
         
         for pos in positions:
@@ -6807,6 +6869,7 @@ class LighterAdapter(BaseAdapter):
             try:
                 if hasattr(self._signer, "api_client"):
                     api_client = self._signer.api_client
+                    self._detach_transport(api_client)
                     try:
                         if hasattr(api_client, "close"):
                             maybe = api_client.close()
@@ -7194,11 +7257,8 @@ class LighterAdapter(BaseAdapter):
             return 0
 
         try:
-            signer = await self._get_signer()
-            order_api = OrderApi(signer.api_client)
-            
             await self.rate_limiter.acquire()
-            market_list = await order_api.order_book_details()
+            market_list = await self._read_order_book_details()
             
             if not market_list or not market_list. order_book_details:
                 return 0
@@ -0,0 +1,253 @@
+# src/adapters/lighter_fast_rest.py
+"""
+Raw-JSON fast path for the Lighter REST endpoints we poll constantly
+(account, orderBookDetails, funding-rates, nextNonce). /api/v1/orders is
+already read as plain JSON via LighterAdapter._rest_get.
+
+The generated SDK deserializes every response into pydantic models before
+the adapter picks a handful of attributes with getattr(). For the hot
+endpoints this client reads the raw body, json-decodes it once and copies
+only the fields the adapter uses into slotted records.
+
+Record attribute names match the SDK models, so adapter code written
+against the SDK (getattr(p, "avg_entry_price"), response.accounts[0], ...)
+works unchanged with either source.
+
+Error contract:
+- 429 raises LighterFastRestRateLimited (message contains "429", so the
+  adapter's existing `"429" in str(e)` handling applies).
+- Anything else unexpected (HTTP error, bad JSON, unknown shape) returns
+  None and the caller falls back to the SDK.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+from src.utils import safe_float, safe_int
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+
+class LighterFastRestRateLimited(Exception):
+    """HTTP 429 from a fast-path endpoint."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SLOTTED RECORDS (attribute names follow the SDK models)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True, frozen=True)
+class PositionRecord:
+    market_id: int
+    symbol: str
+    sign: int
+    position: float
+    avg_entry_price: float
+    position_value: float
+    unrealized_pnl: float
+    realized_pnl: float
+    liquidation_price: float
+    total_funding_paid_out: float
+    allocated_margin: float
+
+
+@dataclass(slots=True, frozen=True)
+class AccountRecord:
+    index: int
+    collateral: float
+    available_balance: float
+    total_asset_value: float
+    buying_power: Optional[float]
+    positions: Tuple[PositionRecord, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class AccountsResponse:
+    accounts: Tuple[AccountRecord, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class OrderBookDetailRecord:
+    market_id: int
+    symbol: str
+    status: str
+    last_trade_price: float
+    mark_price: Optional[float]
+    open_interest: float
+    size_decimals: int
+    price_decimals: int
+    min_base_amount: float
+    min_quote_amount: float
+
+
+@dataclass(slots=True, frozen=True)
+class OrderBookDetailsResponse:
+    order_book_details: Tuple[OrderBookDetailRecord, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class FundingRateRecord:
+    market_id: int
+    exchange: str
+    symbol: str
+    rate: float
+
+
+@dataclass(slots=True, frozen=True)
+class FundingRatesResponse:
+    funding_rates: Tuple[FundingRateRecord, ...]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARSERS (dict -> records; raise KeyError/TypeError/ValueError on bad shape)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _opt_float(v: Any) -> Optional[float]:
+    return None if v is None or v == "" else safe_float(v, 0.0)
+
+
+def parse_account(data: Dict[str, Any]) -> AccountsResponse:
+    accounts = []
+    for acc in data.get("accounts") or ():
+        positions = tuple(
+            PositionRecord(
+                market_id=safe_int(p.get("market_id"), -1),
+                symbol=p.get("symbol") or "",
+                sign=safe_int(p.get("sign"), 0),
+                position=safe_float(p.get("position"), 0.0),
+                avg_entry_price=safe_float(p.get("avg_entry_price"), 0.0),
+                position_value=safe_float(p.get("position_value"), 0.0),
+                unrealized_pnl=safe_float(p.get("unrealized_pnl"), 0.0),
+                realized_pnl=safe_float(p.get("realized_pnl"), 0.0),
+                liquidation_price=safe_float(p.get("liquidation_price"), 0.0),
+                total_funding_paid_out=safe_float(p.get("total_funding_paid_out"), 0.0),
+                allocated_margin=safe_float(p.get("allocated_margin"), 0.0),
+            )
+            for p in acc.get("positions") or ()
+        )
+        accounts.append(AccountRecord(
+            index=safe_int(acc.get("index"), -1),
+            collateral=safe_float(acc.get("collateral"), 0.0),
+            available_balance=safe_float(acc.get("available_balance"), 0.0),
+            total_asset_value=safe_float(acc.get("total_asset_value"), 0.0),
+            buying_power=_opt_float(acc.get("buying_power")),
+            positions=positions,
+        ))
+    return AccountsResponse(accounts=tuple(accounts))
+
+
+def parse_order_book_details(data: Dict[str, Any]) -> OrderBookDetailsResponse:
+    return OrderBookDetailsResponse(order_book_details=tuple(
+        OrderBookDetailRecord(
+            market_id=safe_int(m.get("market_id"), -1),
+            symbol=m.get("symbol") or "",
+            status=m.get("status") or "",
+            last_trade_price=safe_float(m.get("last_trade_price"), 0.0),
+            mark_price=_opt_float(m.get("mark_price")),
+            open_interest=safe_float(m.get("open_interest"), 0.0),
+            size_decimals=safe_int(m.get("size_decimals", m.get("supported_size_decimals")), 0),
+            price_decimals=safe_int(m.get("price_decimals", m.get("supported_price_decimals")), 0),
+            min_base_amount=safe_float(m.get("min_base_amount"), 0.0),
+            min_quote_amount=safe_float(m.get("min_quote_amount"), 0.0),
+        )
+        for m in data["order_book_details"] or ()
+    ))
+
+
+def parse_funding_rates(data: Dict[str, Any]) -> FundingRatesResponse:
+    return FundingRatesResponse(funding_rates=tuple(
+        FundingRateRecord(
+            market_id=safe_int(fr.get("market_id"), -1),
+            exchange=fr.get("exchange") or "",
+            symbol=fr.get("symbol") or "",
+            rate=safe_float(fr.get("rate"), 0.0),
+        )
+        for fr in data["funding_rates"] or ()
+    ))
+
+
+def parse_next_nonce(data: Any) -> int:
+    if isinstance(data, dict):
+        return int(data["nonce"])
+    return int(str(data).strip())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLIENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LighterFastRest:
+    """
+    Thin typed client over the adapter's shared aiohttp session.
+
+    Rate limiting stays with the caller (the adapter already acquires its
+    token bucket before each of these reads).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session_getter: Callable[[], Awaitable[aiohttp.ClientSession]],
+    ):
+        self.base_url = base_url.rstrip("/")
+        self._get_session = session_getter
+        self._stats = {"requests": 0, "parsed": 0, "fallbacks": 0, "rate_limited": 0}
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        self._stats["requests"] += 1
+        session = await self._get_session()
+        async with session.get(f"{self.base_url}{path}", params=params, timeout=DEFAULT_TIMEOUT) as resp:
+            if resp.status == 429:
+                self._stats["rate_limited"] += 1
+                raise LighterFastRestRateLimited(f"429 Too Many Requests from {path}")
+            if resp.status != 200:
+                logger.debug(f"Lighter fast REST {path} returned {resp.status}")
+                return None
+            body = await resp.read()
+        return json.loads(body)
+
+    async def _fetch(self, path: str, params: Optional[Dict[str, Any]], parser: Callable[[Any], Any]) -> Optional[Any]:
+        try:
+            data = await self._get_json(path, params)
+            if data is None:
+                self._stats["fallbacks"] += 1
+                return None
+            record = parser(data)
+            self._stats["parsed"] += 1
+            return record
+        except LighterFastRestRateLimited:
+            raise
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.debug(f"Lighter fast REST {path}: unexpected payload ({e}), using SDK")
+        except (aiohttp.ClientError, OSError) as e:
+            logger.debug(f"Lighter fast REST {path}: {e}, using SDK")
+        self._stats["fallbacks"] += 1
+        return None
+
+    async def account(self, account_index: int) -> Optional[AccountsResponse]:
+        return await self._fetch(
+            "/api/v1/account", {"by": "index", "value": str(account_index)}, parse_account
+        )
+
+    async def order_book_details(self, market_id: Optional[int] = None) -> Optional[OrderBookDetailsResponse]:
+        params = {"market_id": int(market_id)} if market_id is not None else None
+        return await self._fetch("/api/v1/orderBookDetails", params, parse_order_book_details)
+
+    async def funding_rates(self) -> Optional[FundingRatesResponse]:
+        return await self._fetch("/api/v1/funding-rates", None, parse_funding_rates)
+
+    async def next_nonce(self, account_index: int, api_key_index: int) -> Optional[int]:
+        return await self._fetch(
+            "/api/v1/nextNonce",
+            {"account_index": account_index, "api_key_index": api_key_index},
+            parse_next_nonce,
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats)
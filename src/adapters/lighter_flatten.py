@@ -0,0 +1,308 @@
+# src/adapters/lighter_flatten.py
+"""
+Transaction-batched emergency flatten for Lighter.
+
+Instead of closing positions one by one (cancel -> sleep -> fetch -> sign ->
+send per symbol), the engine:
+1. signs one reduce-only IOC limit order per open market, with consecutive
+   nonces taken from the adapter's nonce pool under order_lock
+2. submits them in one (or a few, max LIGHTER_FLATTEN_BATCH_SIZE each)
+   sendTxBatch calls via send_batch_orders (WS order pool first, REST fallback)
+3. re-reads the account once and retries only the residual positions
+
+Shutdown flatten is one round trip for the whole book instead of seconds
+per position.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_DOWN, ROUND_UP
+from typing import Any, Dict, Iterable, List, Optional
+
+import config
+from src.adapters.ws_order_client import TransactionType
+from src.utils import safe_float, safe_int, quantize_value
+
+logger = logging.getLogger(__name__)
+
+# sendTxBatch accepts at most 50 transactions per call
+MAX_TX_PER_BATCH = 50
+_MIN_SIZE = 1e-8
+
+
+@dataclass
+class FlattenOrder:
+    """One signed close order (position size is signed: >0 long, <0 short)."""
+    symbol: str
+    size: float
+    market_id: int
+    base_amount: int
+    price: int
+    is_ask: bool
+    nonce: Optional[int] = None
+    tx_info: Optional[str] = None
+
+
+@dataclass
+class FlattenResult:
+    closed: List[str] = field(default_factory=list)
+    residual: Dict[str, float] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)  # no market data / no price
+    rounds: int = 0
+    batches: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.residual and not self.skipped
+
+
+def _unwrap_signed(signed: Any) -> Optional[str]:
+    """SDK versions return either the tx_info string or a tuple ending in an error."""
+    if isinstance(signed, tuple):
+        if signed and signed[-1]:
+            raise ValueError(str(signed[-1]))
+        return next((s for s in signed if isinstance(s, str)), None)
+    return signed or None
+
+
+class LighterFlattenEngine:
+    """Close every open Lighter position with batched reduce-only IOC orders."""
+
+    def __init__(
+        self,
+        adapter,
+        batch_size: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+        verify_delay: Optional[float] = None,
+        slippage_pct: Optional[float] = None,
+    ):
+        self.adapter = adapter
+        self.batch_size = max(1, min(MAX_TX_PER_BATCH, int(
+            batch_size if batch_size is not None else getattr(config, "LIGHTER_FLATTEN_BATCH_SIZE", MAX_TX_PER_BATCH)
+        )))
+        self.max_rounds = max(1, int(
+            max_rounds if max_rounds is not None else getattr(config, "LIGHTER_FLATTEN_MAX_ROUNDS", 3)
+        ))
+        self.verify_delay = float(
+            verify_delay if verify_delay is not None else getattr(config, "LIGHTER_FLATTEN_VERIFY_DELAY", 0.5)
+        )
+        self.slippage_pct = float(
+            slippage_pct if slippage_pct is not None else getattr(config, "LIGHTER_FLATTEN_SLIPPAGE_PCT", 2.5)
+        )
+
+    # ═══════════════════════════════════════════════════════════════
+    # POSITIONS
+    # ═══════════════════════════════════════════════════════════════
+    @staticmethod
+    def _normalize(positions: Iterable[Any]) -> Dict[str, float]:
+        """Position dicts (or Position objects) -> {symbol: signed size}, zero sizes dropped."""
+        sizes: Dict[str, float] = {}
+        for p in positions or []:
+            if isinstance(p, dict):
+                symbol, size = p.get("symbol"), p.get("size", 0)
+                if p.get("is_ghost"):
+                    continue
+            else:
+                symbol, size = getattr(p, "symbol", None), getattr(p, "size", 0)
+            size = safe_float(size, 0.0)
+            if symbol and abs(size) > _MIN_SIZE:
+                sizes[symbol] = size
+        return sizes
+
+    async def read_positions(self) -> Optional[Dict[str, float]]:
+        """
+        Fresh account read -> {symbol: signed size}. Bypasses the shutdown
+        position cache of fetch_open_positions. None if the read failed.
+        """
+        try:
+            response = await self.adapter._read_account()
+        except Exception as e:
+            logger.warning(f"[FLATTEN] Account read failed: {e}")
+            return None
+        accounts = getattr(response, "accounts", None) if response is not None else None
+        if not accounts:
+            return None
+        sizes: Dict[str, float] = {}
+        for p in getattr(accounts[0], "positions", None) or []:
+            symbol_raw = getattr(p, "symbol", None)
+            qty = safe_float(getattr(p, "position", None), 0.0)
+            sign = safe_int(getattr(p, "sign", None), 0)
+            if not symbol_raw:
+                continue
+            size = abs(qty) * sign if sign != 0 else qty
+            if abs(size) > _MIN_SIZE:
+                symbol = symbol_raw if symbol_raw.endswith("-USD") else f"{symbol_raw}-USD"
+                sizes[symbol] = size
+        return sizes
+
+    # ═══════════════════════════════════════════════════════════════
+    # ORDERS
+    # ═══════════════════════════════════════════════════════════════
+    def build_order(self, symbol: str, size: float, ref_price: float = 0.0) -> Optional[FlattenOrder]:
+        """Exact-size reduce-only IOC order at mark ± slippage, on the tick grid."""
+        info = self.adapter.market_info.get(symbol) or {}
+        market_id = safe_int(info.get("i", info.get("market_id")), -1)
+        if market_id < 0:
+            logger.error(f"[FLATTEN] {symbol}: no market id")
+            return None
+
+        mark = safe_float(self.adapter.fetch_mark_price_sync(symbol), 0.0)
+        if mark <= 0:
+            mark = safe_float(ref_price, 0.0)
+        if mark <= 0:
+            logger.error(f"[FLATTEN] {symbol}: no price available")
+            return None
+
+        size_decimals = safe_int(info.get("sd"), safe_int(info.get("size_decimals"), 8))
+        price_decimals = safe_int(info.get("pd"), safe_int(info.get("price_decimals"), 6))
+        tick = safe_float(info.get("tick_size"), 0.0) or 10 ** -price_decimals
+
+        is_ask = size > 0  # long -> SELL, short -> BUY
+        slip = Decimal(str(self.slippage_pct)) / Decimal(100)
+        limit = Decimal(str(mark)) * (Decimal(1) - slip if is_ask else Decimal(1) + slip)
+        # Round towards mark so the limit stays inside the accidental-price band
+        limit = quantize_value(limit, tick, rounding=ROUND_UP if is_ask else ROUND_DOWN)
+
+        base_amount = int(round(abs(size) * 10 ** size_decimals))
+        price = int(round(limit * 10 ** price_decimals))
+        if base_amount <= 0 or price <= 0:
+            logger.error(f"[FLATTEN] {symbol}: invalid scaled order (base={base_amount}, price={price})")
+            return None
+        return FlattenOrder(symbol, size, market_id, base_amount, price, is_ask)
+
+    def _sign(self, signer, order: FlattenOrder, client_order_index: int) -> str:
+        from src.adapters.lighter_adapter import SignerClient
+
+        tx_info = _unwrap_signed(signer.sign_create_order(
+            market_index=order.market_id,
+            client_order_index=client_order_index,
+            base_amount=order.base_amount,
+            price=order.price,
+            is_ask=order.is_ask,
+            order_type=int(getattr(SignerClient, "ORDER_TYPE_LIMIT", 0)),
+            time_in_force=int(getattr(SignerClient, "ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL", 0)),
+            reduce_only=True,
+            trigger_price=int(getattr(SignerClient, "NIL_TRIGGER_PRICE", 0)),
+            order_expiry=0,  # IOC requires expiry=0
+            nonce=int(order.nonce),
+            api_key_index=int(self.adapter._resolved_api_key_index),
+        ))
+        if not tx_info:
+            raise ValueError(f"{order.symbol}: sign_create_order returned nothing")
+        return tx_info
+
+    async def _submit(self, orders: List[FlattenOrder], result: FlattenResult) -> None:
+        """Sign with consecutive nonces and send in sendTxBatch chunks (all under order_lock)."""
+        from src.adapters.lighter_adapter import SignerClient
+
+        adapter = self.adapter
+        signer = await adapter._get_signer()
+        tx_type = int(getattr(SignerClient, "TX_TYPE_CREATE_ORDER", TransactionType.CREATE_ORDER))
+        client_base = int(time.time() * 1000) + random.randint(0, 99999)
+
+        async with adapter.order_lock:
+            for start in range(0, len(orders), self.batch_size):
+                chunk = orders[start:start + self.batch_size]
+                nonces = await adapter.get_next_nonces(len(chunk))
+                if len(nonces) < len(chunk):
+                    logger.error(f"[FLATTEN] Only {len(nonces)}/{len(chunk)} nonces available")
+                    await adapter.hard_refresh_nonce()
+                    continue
+
+                signed: List[FlattenOrder] = []
+                for i, (order, nonce) in enumerate(zip(chunk, nonces)):
+                    order.nonce = nonce
+                    try:
+                        order.tx_info = self._sign(signer, order, client_base + start + i)
+                        signed.append(order)
+                    except Exception as e:
+                        logger.error(f"[FLATTEN] {order.symbol}: signing failed: {e}")
+                if len(signed) < len(chunk):
+                    # A hole in the nonce sequence would stall every later tx
+                    await adapter.hard_refresh_nonce()
+                    continue
+
+                result.batches += 1
+                ok, _ = await adapter.send_batch_orders(
+                    [tx_type] * len(signed), [o.tx_info for o in signed]
+                )
+                if not ok:
+                    logger.warning(f"[FLATTEN] Batch of {len(signed)} rejected - refreshing nonces")
+                    await adapter.hard_refresh_nonce()
+
+    # ═══════════════════════════════════════════════════════════════
+    # FLATTEN
+    # ═══════════════════════════════════════════════════════════════
+    async def flatten(self, positions: Optional[Iterable[Any]] = None) -> FlattenResult:
+        """
+        Close `positions` (default: fresh account read). Every round submits
+        all remaining positions in batches, then re-reads the account;
+        only what is still open is retried.
+        """
+        t0 = time.monotonic()
+        result = FlattenResult()
+        positions = list(positions) if positions is not None else None
+
+        remaining = self._normalize(positions) if positions is not None else await self.read_positions()
+        if remaining is None:
+            remaining = self._normalize(await self.adapter._fetch_open_positions_internal())
+        if not remaining:
+            return result
+
+        if not getattr(config, "LIVE_TRADING", False):
+            logger.info(f"[FLATTEN] Dry-Run → {len(remaining)} Lighter positions simuliert geschlossen")
+            result.closed = list(remaining)
+            return result
+
+        ref_prices = {
+            p.get("symbol"): safe_float(p.get("avg_entry_price") or p.get("mark_price"), 0.0)
+            for p in (positions or []) if isinstance(p, dict)
+        }
+        targets = set(remaining)
+
+        while remaining and result.rounds < self.max_rounds:
+            result.rounds += 1
+            orders = []
+            for symbol, size in remaining.items():
+                order = self.build_order(symbol, size, ref_prices.get(symbol, 0.0))
+                if order is None:
+                    if symbol not in result.skipped:
+                        result.skipped.append(symbol)
+                    continue
+                orders.append(order)
+            if not orders:
+                break
+
+            logger.info(
+                f"⚡ [FLATTEN] Round {result.rounds}/{self.max_rounds}: "
+                f"{len(orders)} reduce-only IOC orders in {-(-len(orders) // self.batch_size)} batch(es)"
+            )
+            await self._submit(orders, result)
+
+            await asyncio.sleep(self.verify_delay)
+            fresh = await self.read_positions()
+            if fresh is None:
+                # Unknown state: keep everything for the next round
+                continue
+            remaining = {s: fresh[s] for s in targets if s in fresh and s not in result.skipped}
+
+        result.residual = {s: size for s, size in remaining.items() if s not in result.skipped}
+        result.closed = [s for s in targets if s not in result.residual and s not in result.skipped]
+        result.elapsed_ms = (time.monotonic() - t0) * 1000.0
+
+        # Keep the shutdown position cache in sync with what was just closed
+        cache = getattr(self.adapter, "_positions_cache", None)
+        if cache:
+            closed = set(result.closed)
+            self.adapter._positions_cache = [p for p in cache if p.get("symbol") not in closed]
+
+        logger.info(
+            f"📦 [FLATTEN] {len(result.closed)} closed, {len(result.residual)} residual, "
+            f"{len(result.skipped)} skipped in {result.rounds} round(s) / {result.batches} batch(es), "
+            f"{result.elapsed_ms:.0f}ms"
+        )
+        return result
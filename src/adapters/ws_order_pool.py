@@ -0,0 +1,495 @@
+"""
+Shared connection layer for the WebSocket order clients (Lighter + X10).
+
+- TimerWheel: a single task drives all request timeouts (no task per request)
+- WsOrderConnection: one socket + receive loop, correlates responses by request id
+- WsOrderPool: primary + warm standby connections, opened (and authenticated
+  via headers) up front, health-checked in the background, with immediate
+  failover to a standby when the primary drops
+
+Order frames are built by the clients as ready-to-send strings; the pool
+never re-encodes them.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from websockets.exceptions import ConnectionClosed
+
+# Use the new asyncio API if available (same pattern as websocket_manager)
+try:
+    from websockets.asyncio.client import connect as ws_connect
+    WEBSOCKETS_NEW_API = True
+except ImportError:
+    import websockets
+    ws_connect = websockets.connect
+    WEBSOCKETS_NEW_API = False
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TIMER WHEEL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TimerWheel:
+    """
+    Hashed timing wheel for request timeouts.
+
+    schedule()/cancel() are O(1) dict operations. One background task ticks
+    every `resolution` seconds while timers are pending and exits when the
+    wheel is empty. Timeouts fire within one tick of their deadline.
+    """
+
+    def __init__(self, resolution: float = 0.05, slots: int = 512):
+        self.resolution = resolution
+        self._slots: List[Dict[int, list]] = [dict() for _ in range(slots)]
+        self._index: Dict[int, int] = {}  # timer id -> slot
+        self._cursor = 0
+        self._next_id = 0
+        self._task: Optional[asyncio.Task] = None
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> int:
+        """Run `callback()` after `delay` seconds. Returns a handle for cancel()."""
+        ticks = max(1, math.ceil(delay / self.resolution))
+        n = len(self._slots)
+        slot = (self._cursor + ticks) % n
+        rounds = (ticks - 1) // n
+
+        self._next_id += 1
+        timer_id = self._next_id
+        self._slots[slot][timer_id] = [rounds, callback]
+        self._index[timer_id] = slot
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="ws-order-timer-wheel")
+        return timer_id
+
+    def cancel(self, timer_id: int) -> None:
+        slot = self._index.pop(timer_id, None)
+        if slot is not None:
+            self._slots[slot].pop(timer_id, None)
+
+    def _advance(self) -> None:
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        bucket = self._slots[self._cursor]
+        if not bucket:
+            return
+        for timer_id, entry in list(bucket.items()):
+            if entry[0] > 0:
+                entry[0] -= 1
+                continue
+            del bucket[timer_id]
+            self._index.pop(timer_id, None)
+            self.fired += 1
+            try:
+                entry[1]()
+            except Exception as e:
+                logger.debug(f"[WS-ORDER] Timer callback error: {e}")
+
+    async def _run(self) -> None:
+        next_tick = time.monotonic() + self.resolution
+        try:
+            while self._index:
+                await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+                # Catch up on ticks missed while the loop was busy
+                now = time.monotonic()
+                while next_tick <= now and self._index:
+                    self._advance()
+                    next_tick += self.resolution
+        except asyncio.CancelledError:
+            pass
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for bucket in self._slots:
+            bucket.clear()
+        self._index.clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONNECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WsOrderConnection:
+    """One order socket with its own receive loop and pending requests."""
+
+    def __init__(self, pool: "WsOrderPool", slot: int):
+        self.pool = pool
+        self.slot = slot
+        self.ws = None
+        self.healthy = False
+        self.pending: Dict[str, asyncio.Future] = {}
+        self._timers: Dict[str, int] = {}
+        self._receive_task: Optional[asyncio.Task] = None
+        self._opening = False
+        self.connected_at = 0.0
+        self.last_keepalive = 0.0
+        self.failures = 0  # consecutive failed connect attempts
+        self.next_attempt_at = 0.0
+
+    async def open(self) -> bool:
+        if self.healthy or self._opening:
+            return self.healthy
+        cfg = self.pool
+        kwargs: Dict[str, Any] = {"ping_interval": None, "ping_timeout": None, "close_timeout": 5}
+        if cfg.headers:
+            kwargs["additional_headers" if WEBSOCKETS_NEW_API else "extra_headers"] = cfg.headers
+        self._opening = True
+        try:
+            ws = await asyncio.wait_for(ws_connect(cfg.url, **kwargs), timeout=cfg.connect_timeout)
+        except Exception as e:
+            self.failures += 1
+            delay = min(cfg.reconnect_interval * (2 ** (self.failures - 1)), 60.0)
+            self.next_attempt_at = time.monotonic() + delay
+            if self.failures == cfg.max_reconnect_attempts:
+                logger.error(f"[{cfg.name}] conn#{self.slot}: {self.failures} failed connects, retrying every {delay:.0f}s")
+            else:
+                logger.warning(f"[{cfg.name}] conn#{self.slot} connect failed: {e}")
+            return False
+        finally:
+            self._opening = False
+
+        self.ws = ws
+        self.healthy = True
+        self.failures = 0
+        self.connected_at = self.last_keepalive = time.monotonic()
+        self._receive_task = asyncio.create_task(self._receive_loop(ws), name=f"{cfg.name}:conn{self.slot}")
+        return True
+
+    def _detach(self, error: BaseException):
+        """Take the socket out of service; returns (ws, receive_task) for closing."""
+        ws, task = self.ws, self._receive_task
+        self.ws, self._receive_task, self.healthy = None, None, False
+        self._fail_all(error)
+        if task is not None and (task is asyncio.current_task() or task.done()):
+            task = None
+        return ws, task
+
+    def retire(self) -> None:
+        """Drop a broken socket now (pending requests fail), close it in the background."""
+        ws, task = self._detach(ConnectionError("WebSocket connection lost"))
+        if task is not None:
+            task.cancel()
+        if ws is not None:
+            asyncio.create_task(_close_quietly(ws))
+
+    async def close(self) -> None:
+        ws, task = self._detach(ConnectionError("WebSocket disconnected"))
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if ws is not None:
+            await _close_quietly(ws)
+
+    async def send(self, req_id: str, frame: str) -> asyncio.Future:
+        """Register the request, then send. Raises if the frame could not be written."""
+        if self.ws is None:
+            raise ConnectionError("WebSocket not connected")
+        future = asyncio.get_running_loop().create_future()
+        self.pending[req_id] = future
+        self._timers[req_id] = self.pool.wheel.schedule(
+            self.pool.request_timeout, lambda: self._expire(req_id)
+        )
+        try:
+            await self.ws.send(frame)
+        except BaseException:
+            self._discard(req_id)
+            raise
+        return future
+
+    def _discard(self, req_id: str) -> Optional[asyncio.Future]:
+        timer_id = self._timers.pop(req_id, None)
+        if timer_id is not None:
+            self.pool.wheel.cancel(timer_id)
+        return self.pending.pop(req_id, None)
+
+    def resolve(self, req_id: str, result: Any = None, error: Optional[BaseException] = None) -> None:
+        future = self._discard(req_id)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _expire(self, req_id: str) -> None:
+        self._timers.pop(req_id, None)
+        future = self.pending.pop(req_id, None)
+        if future is not None and not future.done():
+            self.pool.timeouts += 1
+            future.set_exception(asyncio.TimeoutError(f"Request timeout: {req_id}"))
+
+    def _fail_all(self, error: BaseException) -> None:
+        for req_id in list(self.pending):
+            self.resolve(req_id, error=error)
+
+    async def _receive_loop(self, ws) -> None:
+        try:
+            async for raw in ws:
+                await self.pool._on_message(self, raw)
+            logger.warning(f"[{self.pool.name}] conn#{self.slot} closed by server")
+        except asyncio.CancelledError:
+            return
+        except ConnectionClosed as e:
+            logger.warning(f"[{self.pool.name}] conn#{self.slot} closed: {e}")
+        except Exception as e:
+            logger.error(f"[{self.pool.name}] conn#{self.slot} receive error: {e}")
+        # Only act if this socket is still the connection's current one
+        if self.ws is ws:
+            self.retire()
+            self.pool._on_connection_lost(self)
+
+
+async def _close_quietly(ws) -> None:
+    try:
+        await ws.close()
+    except Exception:
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POOL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WsOrderPool:
+    """
+    Primary + warm standby order connections.
+
+    request() always uses the lowest-numbered healthy connection. If the
+    frame cannot be written there, it is sent once more on the next healthy
+    connection (a frame that was never written cannot double-submit).
+    Frames that were written before the socket died fail with ConnectionError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        size: int = 2,
+        request_timeout: float = 10.0,
+        connect_timeout: float = 10.0,
+        reconnect_interval: float = 5.0,
+        max_reconnect_attempts: int = 10,
+        health_interval: float = 5.0,
+        keepalive_interval: float = 0.0,
+        keepalive_frame: Optional[Callable[[], str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        uncorrelated_match: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        timer_resolution: float = 0.05,
+    ):
+        self.name = name
+        self.url = url
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.reconnect_interval = reconnect_interval
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.health_interval = health_interval
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_frame = keepalive_frame
+        self.headers = headers
+        self._uncorrelated_match = uncorrelated_match
+
+        self.wheel = TimerWheel(resolution=timer_resolution)
+        self.connections = [WsOrderConnection(self, i) for i in range(max(1, int(size)))]
+        self._running = False
+        self._health_task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._on_health_change: Optional[Callable[[bool], None]] = None
+        self._was_healthy = False
+
+        self.requests = 0
+        self.failovers = 0
+        self.timeouts = 0
+
+    # ─── state ───
+    @property
+    def is_connected(self) -> bool:
+        return any(c.healthy for c in self.connections)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(c.pending) for c in self.connections)
+
+    def primary(self) -> Optional[WsOrderConnection]:
+        for conn in self.connections:
+            if conn.healthy:
+                return conn
+        return None
+
+    def set_health_callback(self, callback: Callable[[bool], None]) -> None:
+        self._on_health_change = callback
+
+    def _notify_health(self) -> None:
+        healthy = self.is_connected
+        if healthy != self._was_healthy:
+            self._was_healthy = healthy
+            if self._on_health_change:
+                try:
+                    self._on_health_change(healthy)
+                except Exception as e:
+                    logger.warning(f"[{self.name}] Health callback error: {e}")
+
+    # ─── lifecycle ───
+    async def start(self) -> bool:
+        """Open all connections concurrently and start the health loop."""
+        if not self._running:
+            self._running = True
+            self._health_task = asyncio.create_task(self._health_loop(), name=f"{self.name}:health")
+        idle = [c for c in self.connections if not c.healthy]
+        if idle:
+            await asyncio.gather(*(c.open() for c in idle))
+        self._notify_health()
+        up = sum(1 for c in self.connections if c.healthy)
+        if up:
+            logger.info(f"✅ [{self.name}] {up}/{len(self.connections)} order connections up ({self.url})")
+        return up > 0
+
+    async def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+        if self._health_task and not self._health_task.done():
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+        self._health_task = None
+        await asyncio.gather(*(c.close() for c in self.connections))
+        await self.wheel.stop()
+        self._notify_health()
+
+    def _on_connection_lost(self, conn: WsOrderConnection) -> None:
+        if self._running:
+            standby = self.primary()
+            if standby is not None:
+                self.failovers += 1
+                logger.warning(f"[{self.name}] conn#{conn.slot} lost - failing over to conn#{standby.slot}")
+            conn.next_attempt_at = 0.0
+            self._wake.set()  # reconnect right away
+        self._notify_health()
+
+    async def _health_loop(self) -> None:
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.health_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if not self._running:
+                    break
+
+                now = time.monotonic()
+                reopen = [c for c in self.connections if not c.healthy and now >= c.next_attempt_at]
+                if reopen:
+                    await asyncio.gather(*(c.open() for c in reopen))
+                    self._notify_health()
+
+                if self.keepalive_frame and self.keepalive_interval > 0:
+                    for conn in self.connections:
+                        if conn.healthy and now - conn.last_keepalive >= self.keepalive_interval:
+                            conn.last_keepalive = now
+                            try:
+                                await conn.ws.send(self.keepalive_frame())
+                            except Exception as e:
+                                logger.debug(f"[{self.name}] conn#{conn.slot} keepalive error: {e}")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[{self.name}] Health loop error: {e}")
+
+    # ─── requests ───
+    async def request(self, req_id: str, frame: str) -> Any:
+        """Send a pre-built frame and wait for the correlated response."""
+        conn = self.primary()
+        if conn is None:
+            raise ConnectionError("WebSocket not connected")
+        self.requests += 1
+        try:
+            future = await conn.send(req_id, frame)
+        except (ConnectionClosed, ConnectionError, OSError) as e:
+            # Frame never left this socket: retire it and use the standby
+            conn.retire()
+            self._on_connection_lost(conn)
+            standby = self.primary()
+            if standby is None:
+                raise ConnectionError(f"WebSocket send failed: {e}") from e
+            future = await standby.send(req_id, frame)
+        return await future
+
+    async def _on_message(self, conn: WsOrderConnection, raw: Any) -> None:
+        try:
+            message = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"[{self.name}] Invalid JSON: {e}")
+            return
+        if not isinstance(message, dict):
+            logger.debug(f"[{self.name}] Unhandled message: {message}")
+            return
+
+        msg_type = message.get("type")
+        # Server PING -> PONG (per Lighter Python SDK); PONG/connected are ignored
+        if msg_type in ("ping", "PING"):
+            if conn.ws is not None:
+                await conn.ws.send('{"type":"pong"}')
+            return
+        if msg_type in ("pong", "PONG", "connected"):
+            return
+
+        req_id = message.get("id")
+        correlated = isinstance(req_id, str) and req_id in conn.pending
+
+        if "error" in message:
+            error_msg = message.get("error")
+            if isinstance(error_msg, dict):
+                error_msg = error_msg.get("message", str(error_msg))
+            if correlated:
+                conn.resolve(req_id, error=Exception(error_msg))
+            else:
+                logger.error(f"[{self.name}] Server error: {error_msg}")
+            return
+
+        if correlated:
+            conn.resolve(req_id, message)
+            return
+
+        # Result without our id: match the oldest request on this socket
+        if conn.pending and self._uncorrelated_match and self._uncorrelated_match(message):
+            conn.resolve(next(iter(conn.pending)), message)
+            return
+
+        logger.debug(f"[{self.name}] Unhandled message: {message}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        primary = self.primary()
+        return {
+            "is_connected": self.is_connected,
+            "primary": primary.slot if primary else None,
+            "connections": [
+                {"slot": c.slot, "healthy": c.healthy, "pending": len(c.pending), "failures": c.failures}
+                for c in self.connections
+            ],
+            "pending_requests": self.pending_count,
+            "requests": self.requests,
+            "failovers": self.failovers,
+            "timeouts": self.timeouts,
+            "timers": len(self.wheel),
+        }
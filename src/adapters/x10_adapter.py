@@ -13,6 +13,9 @@ from typing import Tuple, Optional, List, Any, Dict, Callable
 from enum import Enum
 
 from src.infrastructure.rate_limiter import X10_RATE_LIMITER, get_rate_limiter, Exchange
+from src.infrastructure.order_tracker import get_order_tracker
+from src.infrastructure.balance_service import get_balance_service
+from src.infrastructure.market_registry import get_market_registry, x10_market_meta
 import config
 from x10.perpetual.trading_client import PerpetualTradingClient
 from x10.perpetual.configuration import MAINNET_CONFIG
@@ -119,11 +122,13 @@ from src.utils import safe_float, safe_decimal, quantize_value
 class X10Adapter(BaseAdapter):
     def __init__(self):
         super().__init__("X10")
+        self._init_transport("x10")
         self.market_info = {}
         self.client_env = MAINNET_CONFIG
         self.stark_account = None
         self._auth_client = None
         self.trading_client = None
+        self._market_client = None
         self.price_cache = {}
         self.funding_cache = {}
         self.orderbook_cache = {}
@@ -213,7 +218,8 @@ class X10Adapter(BaseAdapter):
                 api_key = self.stark_account.api_key if self.stark_account else None
                 ws_config = X10WsOrderConfig(
                     url=ws_order_url or "wss://api.starknet.extended.exchange/stream.extended.exchange/v1/account",
-                    api_key=api_key
+                    api_key=api_key,
+                    pool_size=int(getattr(config, 'WS_ORDER_POOL_SIZE', 2)),
                 )
                 self.ws_order_client = X10WebSocketOrderClient(ws_config)
                 logger.info("✅ [X10] WebSocket Order Client initialized")
@@ -236,13 +242,14 @@ class X10Adapter(BaseAdapter):
         except Exception as e:
             logger.error(f" X10 Account Init Error: {e}")
 
-    async def get_order(self, order_id: str, symbol: Optional[str] = None) -> Optional[dict]:
+    async def get_order(self, order_id: str, symbol: Optional[str] = None, force_rest: bool = False) -> Optional[dict]:
         """
         Fetch order details - FIRST checks WebSocket cache (has avgFillPrice!), 
         then falls back to REST API.
         
         FIX (2025-12-19): The REST API only returns the limit price, not the actual
         fill price. The WebSocket cache contains the real avgFillPrice from FILL events.
+        force_rest=True skips the cache (REST safety net of the order tracker).
         """
         if not order_id or order_id == "DRY_RUN_ORDER_123":
             return None
@@ -254,7 +261,7 @@ class X10Adapter(BaseAdapter):
             # FIX: Check WebSocket cache FIRST - it has the real avgFillPrice!
             # The REST API only returns the limit order price, not the fill price.
             # ═══════════════════════════════════════════════════════════════
-            if hasattr(self, '_order_cache') and order_id_str in self._order_cache:
+            if not force_rest and hasattr(self, '_order_cache') and order_id_str in self._order_cache:
                 cached = self._order_cache[order_id_str]
                 
                 # Extract avgFillPrice from WebSocket data
@@ -698,6 +705,8 @@ class X10Adapter(BaseAdapter):
     async def _on_stream_disconnect(self) -> None:
         """Callback when stream disconnects"""
         logger.warning("⚠️ [X10 Stream] Connection lost")
+        # Balance updates may be missed until reconnect -> next lookup via REST
+        get_balance_service().invalidate("x10")
     
     async def _handle_account_stream_message(self, data: Dict[str, Any]) -> None:
         """
@@ -779,6 +788,9 @@ class X10Adapter(BaseAdapter):
             available = safe_float(data.get("available") or data.get("availableBalance"), 0.0)
             total = safe_float(data.get("total") or data.get("totalBalance"), 0.0)
             
+            if available > 0:
+                get_balance_service().update("x10", available=available, collateral=total or None)
+
             # Deduplicate balance updates (avoid spam)
             current_time = time.time()
             if available != self._balance_cache or (current_time - self._last_balance_update) > 5.0:
@@ -1013,6 +1025,7 @@ class X10Adapter(BaseAdapter):
                 self.client_env, 
                 self.stark_account
             )
+            await self._attach_transport(self._auth_client)
         return self._auth_client
 
     async def _get_trading_client(self) -> PerpetualTradingClient:
@@ -1025,8 +1038,42 @@ class X10Adapter(BaseAdapter):
                 self.client_env, 
                 self.stark_account
             )
+            await self._attach_transport(self.trading_client)
         return self.trading_client
 
+    async def _get_market_client(self) -> PerpetualTradingClient:
+        """Return the public client for market data (kept for the adapter's lifetime)."""
+        if not self._market_client:
+            self._market_client = PerpetualTradingClient(self.client_env)
+            await self._attach_transport(self._market_client)
+        return self._market_client
+
+    # SDK modules (BaseModule) keep a private lazily-created session each
+    _SDK_SESSION_ATTR = "_BaseModule__session"
+
+    async def _attach_transport(self, client) -> None:
+        """Route all SDK module sessions of a client through the shared host transport."""
+        if self._transport is None or client is None:
+            return
+        session = await self._transport.session()
+        for module in vars(client).values():
+            if not hasattr(module, self._SDK_SESSION_ATTR):
+                continue
+            own = getattr(module, self._SDK_SESSION_ATTR)
+            if own is session:
+                continue
+            if own is not None and not own.closed:
+                await own.close()
+            setattr(module, self._SDK_SESSION_ATTR, session)
+
+    def _detach_transport(self, client) -> None:
+        """Hand the shared session back before SDK close() (the transport owns it)."""
+        if self._transport is None or client is None:
+            return
+        for module in vars(client).values():
+            if self._transport.owns(getattr(module, self._SDK_SESSION_ATTR, None)):
+                setattr(module, self._SDK_SESSION_ATTR, None)
+
     async def _poll_funding_rates(self):
         """Polling fallback for funding rates"""
         interval = max(5, getattr(config, 'FUNDING_CACHE_TTL', 60) // 4)
@@ -1058,8 +1105,8 @@ class X10Adapter(BaseAdapter):
         if self.market_info and not force:
             return
 
-        client = PerpetualTradingClient(self.client_env)
         try:
+            client = await self._get_market_client()
             result = await self.rate_limiter.acquire()
             # FIX: Check if rate limiter was cancelled (shutdown)
             if result < 0:
@@ -1067,10 +1114,12 @@ class X10Adapter(BaseAdapter):
                 return
             resp = await client.markets_info.get_markets()
             if resp and resp.data:
+                # Build the new dict completely, then swap it in (readers never see a partial cache)
+                market_info = {}
                 for m in resp.data:
                     name = getattr(m, "name", "")
                     if name.endswith("-USD"):
-                        self.market_info[name] = m
+                        market_info[name] = m
 
                         if hasattr(m, 'market_stats') and hasattr(m.market_stats, 'funding_rate'):
                             rate = getattr(m.market_stats, 'funding_rate', None)
@@ -1093,6 +1142,16 @@ class X10Adapter(BaseAdapter):
                                     self._price_cache[name] = price
                                     self._price_cache_time[name] = time.time()
 
+                self.market_info = market_info
+                diff = get_market_registry().apply(
+                    "x10", [x10_market_meta(name, m) for name, m in market_info.items()]
+                )
+                if diff:
+                    logger.debug(
+                        f"X10 market registry v{diff.version}: +{len(diff.added)} "
+                        f"~{len(diff.changed)} -{len(diff.removed)}"
+                    )
+
             # FIX: Log which markets are missing prices
             missing_symbols = [s for s in self.market_info.keys() if s not in self.price_cache or self.price_cache.get(s, 0) == 0]
             if missing_symbols:
@@ -1104,15 +1163,6 @@ class X10Adapter(BaseAdapter):
             if "429" in str(e).lower():
                 self.rate_limiter.on_429()
             logger.error(f" X10 Market Cache Error: {e}")
-        finally:
-            # client.close() might be async or sync depending on version, handle safely
-            try:
-                if hasattr(client, 'close'):
-                    res = client.close()
-                    if inspect.isawaitable(res):
-                        await res
-            except Exception:
-                pass
 
     async def fetch_mark_price(self, symbol: str) -> Decimal:
         """Mark Price: Prioritize WebSocket Cache (_price_cache)"""
@@ -2641,12 +2691,38 @@ class X10Adapter(BaseAdapter):
         logger.info(f"⏳ [X10 FILL CHECK] {symbol}: Waiting for WebSocket event (max {timeout}s, order_id={order_id[:16]}...)")
         logger.info(f"   🔌 Using EVENT-DRIVEN detection (not polling!)")
 
-        # PHASE 1: Wait for WebSocket order update event
+        # PHASE 1: Wait for order/trade stream events via the order state tracker
+        # REST order status is only a slow safety net for missed stream messages
+        tracker = get_order_tracker()
+
+        async def _rest_check():
+            order = await self.get_order(order_id, symbol, force_rest=True)
+            if order and order.get("status"):
+                tracker.update_order(
+                    "x10", order_id, status=order.get("status"), symbol=symbol,
+                    filled_qty=safe_float(order.get("filledAmount"), 0.0), source="rest",
+                )
+
+        update = None
         try:
-            update = await self.wait_for_order_update(order_id, timeout=timeout)
+            state = await tracker.wait(
+                "x10", order_id, lambda s: s.is_terminal or s.filled_qty > 0, timeout,
+                symbol=symbol, rest_check=_rest_check,
+            )
+            if state is not None:
+                update = {
+                    "success": not state.is_dead,
+                    "data": {
+                        **state.data,
+                        "status": state.status,
+                        "filled_qty": state.filled_qty,
+                        "avg_fill_price": state.avg_price,
+                    },
+                }
         except Exception as e:
             logger.error(f"❌ [X10 FILL CHECK] {symbol}: Error waiting for order update: {e}")
-            update = None
+        finally:
+            tracker.forget("x10", order_id)
 
         elapsed = time.time() - start_time
 
@@ -2752,35 +2828,31 @@ class X10Adapter(BaseAdapter):
                 logger.info(f"⚠️ X10: Still missing prices for {len(still_missing)} symbols after cache refresh: {still_missing[:10]}{'...' if len(still_missing) > 10 else ''}")
 
             if still_missing and len(still_missing) <= 50:
-                try:
-                    for symbol in still_missing:
+                # Concurrent REST orderbooks (fetch_orderbook handles rate limiting and caching)
+                semaphore = asyncio.Semaphore(int(getattr(config, 'PRICE_BOOTSTRAP_CONCURRENCY', 8)))
+
+                async def _init_from_orderbook(symbol: str):
+                    async with semaphore:
                         try:
                             # Use fetch_orderbook (direct REST) instead of SDK, as SDK text failed for illiquid markets
-                            # fetch_orderbook handles rate limiting and caching internally
                             ob = await self.fetch_orderbook(symbol)
-                            
                             bids = ob.get('bids', [])
                             asks = ob.get('asks', [])
-                            
                             if bids and asks:
                                 # fetch_orderbook returns [[price, qty], ...] lists
                                 best_bid = float(bids[0][0])
                                 best_ask = float(asks[0][0])
-                                
                                 if best_bid > 0 and best_ask > 0:
                                     mid_price = (best_bid + best_ask) / 2.0
-                                    
                                     # Update both caches
                                     self.price_cache[symbol] = mid_price
                                     self._price_cache[symbol] = mid_price
                                     self._price_cache_time[symbol] = time.time()
                                     logger.info(f"✅ X10: Initialized {symbol} price via REST: {mid_price}")
-                                    
                         except Exception as e:
-                            logger.warn(f"X10: REST fallback failed for {symbol}: {e}")
-                            
-                except Exception as e:
-                    logger.error(f"X10: Bulk fallback error: {e}")
+                            logger.warning(f"X10: REST fallback failed for {symbol}: {e}")
+
+                await asyncio.gather(*(_init_from_orderbook(s) for s in still_missing))
         except Exception as e:
             logger.warning(f"X10 refresh_missing_prices error: {e}")
 
@@ -3892,18 +3964,18 @@ class X10Adapter(BaseAdapter):
             return False
     
     async def get_real_available_balance(self) -> float:
+        """
+        Verfügbare Balance aus dem BalanceService (x10_account Stream).
+        REST nur wenn der letzte Stand älter als BALANCE_MAX_AGE_SECONDS ist.
+        """
+        balance = await get_balance_service().get_available("x10", self._fetch_balance_rest)
+        return balance or 0.0
+
+    async def _fetch_balance_rest(self) -> float:
         """
         Korrekte Balance-Abfrage für X10 – funktioniert mit aktuellem SDK (Dezember 2025)
         Methode: trading_client.account.get_balance()
         """
-        # ═══════════════════════════════════════════════════════════════
-        # FIX: Balance cache to reduce redundant API calls (2s TTL)
-        # ═══════════════════════════════════════════════════════════════
-        import time
-        now = time.time()
-        if now - self._last_balance_update < 2.0 and self._balance_cache > 0:
-            return self._balance_cache
-        
         if not self.trading_client:
             try:
                 await self._get_trading_client()
@@ -4055,6 +4127,14 @@ class X10Adapter(BaseAdapter):
             # Update cache
             if order_id:
                 self._order_cache[order_id] = data
+                get_order_tracker().update_order(
+                    "x10", order_id, status=status, symbol=symbol,
+                    filled_qty=safe_float(data.get("filledQty") or data.get("filledQuantity") or data.get("filled_qty"), 0.0),
+                    avg_price=safe_float(
+                        data.get("averagePrice") or data.get("avgFillPrice") or data.get("avg_fill_price"), 0.0
+                    ),
+                    data=data,
+                )
             
             # Resolve pending order futures (for async order placement)
             if order_id in self._pending_orders:
@@ -4096,6 +4176,8 @@ class X10Adapter(BaseAdapter):
                 status = data.get("status", "UNKNOWN")
                 size = safe_float(data.get("size") or data.get("quantity") or data.get("qty") or 0)
                 
+                get_order_tracker().update_position("x10", symbol, 0.0 if status == "CLOSED" else size)
+                
                 # Initialize _positions_cache if it doesn't exist
                 if not hasattr(self, '_positions_cache'):
                     self._positions_cache = []
@@ -4363,6 +4445,17 @@ class X10Adapter(BaseAdapter):
                 except Exception as fill_err:
                     logger.debug(f"[X10] Error tracking fill for entry price calculation: {fill_err}")
             
+            # Feed the order state tracker (individual fill)
+            if order_id:
+                get_order_tracker().record_fill(
+                    "x10", order_id,
+                    qty=safe_float(data.get("qty") or data.get("quantity") or data.get("amount"), 0.0),
+                    price=safe_float(data.get("price") or data.get("p"), 0.0),
+                    symbol=symbol,
+                    fee=safe_float(data.get("fee") or data.get("feeAmount"), 0.0),
+                    trade_id=data.get("id") or data.get("tradeId"),
+                )
+            
             # Mark order as filled if we're tracking it
             if order_id in self._pending_orders:
                 future = self._pending_orders[order_id]
@@ -4503,6 +4596,7 @@ class X10Adapter(BaseAdapter):
         # Close trading client
         if self.trading_client:
             try:
+                self._detach_transport(self.trading_client)
                 if hasattr(self.trading_client, 'close'):
                     res = self.trading_client.close()
                     # Prüfen ob close() awaitable ist
@@ -4514,6 +4608,7 @@ class X10Adapter(BaseAdapter):
         # Close auth client
         if self._auth_client:
             try:
+                self._detach_transport(self._auth_client)
                 if hasattr(self._auth_client, 'close'):
                     res = self._auth_client.close()
                     if asyncio.iscoroutine(res) or inspect.isawaitable(res):
@@ -4521,8 +4616,20 @@ class X10Adapter(BaseAdapter):
             except Exception as e:
                 logger.debug(f"X10: Error closing auth_client: {e}")
         
+        # Close market data client
+        if self._market_client:
+            try:
+                self._detach_transport(self._market_client)
+                if hasattr(self._market_client, 'close'):
+                    res = self._market_client.close()
+                    if asyncio.iscoroutine(res) or inspect.isawaitable(res):
+                        await res
+            except Exception as e:
+                logger.debug(f"X10: Error closing market client: {e}")
+
         self.trading_client = None
         self._auth_client = None
+        self._market_client = None
         logger.info("✅ X10 Adapter geschlossen.")
 
     async def get_collateral_balance(self, account_index: int = 0) -> float:
@@ -4748,7 +4855,8 @@ class X10Adapter(BaseAdapter):
         logger.debug(f"🔍 [FUNDING BATCH] Processed {len(all_payments)} payments for {len(symbols)} symbols, found {len(result)} with funding")
         return result
 
-    async def fetch_funding_payments(self, symbol: Optional[str] = None, from_time: Optional[int] = None) -> List[dict]:
+    async def fetch_funding_payments(self, symbol: Optional[str] = None, from_time: Optional[int] = None,
+                                     strict: bool = False) -> List[dict]:
         """
         Fetch funding payment history from X10 API.
         
@@ -4760,6 +4868,8 @@ class X10Adapter(BaseAdapter):
         Args:
             symbol: Optional market filter (e.g., "BTC-USD")
             from_time: Starting timestamp in milliseconds (required by API, defaults to 24h ago)
+            strict: Raise on HTTP errors / unexpected responses instead of returning []
+                (only a real 404 or an empty list means "no payments")
             
         Returns:
             List of funding payment records:
@@ -4778,6 +4888,8 @@ class X10Adapter(BaseAdapter):
             ]
         """
         if not self.stark_account:
+            if strict:
+                raise RuntimeError("X10 funding history: no account")
             return []
         
         # Default to 24 hours ago if no from_time specified
@@ -4875,6 +4987,8 @@ class X10Adapter(BaseAdapter):
                         return filtered
                     else:
                         logger.warning(f"🔍 [X10_FUNDING_DEBUG] Unexpected response format: {data.keys()}")
+                        if strict:
+                            raise RuntimeError(f"X10 funding history: unexpected response format {list(data.keys())}")
                         return []
                 elif resp.status == 404:
                     # No funding history found - this is OK
@@ -4882,12 +4996,16 @@ class X10Adapter(BaseAdapter):
                     return []
                 else:
                     logger.warning(f"🔍 [X10_FUNDING_DEBUG] HTTP {resp.status}")
+                    if strict:
+                        raise RuntimeError(f"X10 funding history: HTTP {resp.status}")
                     return []
                         
         except asyncio.CancelledError:
-            return []
+            raise
         except Exception as e:
             logger.error(f"X10 fetch_funding_payments error: {e}")
+            if strict:
+                raise
             return []
 
     async def get_funding_for_symbol(self, symbol: str, since_timestamp: Optional[int] = None) -> float:
@@ -0,0 +1,348 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# FUNDING LEDGER - Incremental, deduplicated funding payment ingestion
+# ═══════════════════════════════════════════════════════════════════════════════
+# Keeps a per-exchange high-water mark (last paid_time + payment id) so every
+# cycle only asks the exchanges for payments newer than what we already have.
+#
+# ✓ X10: one account-wide /user/funding/history call from the high-water mark
+# ✓ Lighter: positionFunding per open market, fanned out concurrently (the
+#   adapter's rate limiter still gates every page)
+# ✓ Dedup by exchange payment id (in memory + INSERT OR IGNORE in DB)
+# ✓ Raw payments persisted in bulk (funding_payments table)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import config
+
+from src.utils import safe_decimal, safe_float
+
+logger = logging.getLogger(__name__)
+
+EXCHANGE_X10 = "X10"
+EXCHANGE_LIGHTER = "LIGHTER"
+
+
+def _to_ms(ts: Any) -> int:
+    """Normalize seconds/ms timestamps to milliseconds."""
+    v = safe_float(ts, 0.0)
+    if v <= 0:
+        return 0
+    if v >= 1e12:
+        return int(v)
+    return int(v * 1000)
+
+
+@dataclass(frozen=True)
+class FundingPayment:
+    """A single realized funding payment (profit-positive amount)."""
+    exchange: str
+    payment_id: str
+    symbol: str
+    amount: Decimal
+    paid_time: int  # ms
+    rate: float = 0.0
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "exchange": self.exchange,
+            "payment_id": self.payment_id,
+            "symbol": self.symbol,
+            "amount": self.amount,
+            "rate": self.rate,
+            "paid_time": self.paid_time,
+        }
+
+
+class FundingLedger:
+    """
+    Incremental funding ingestion with per-exchange high-water marks.
+
+    poll() returns only payments that were not seen before. The first poll
+    without a persisted cursor is a bootstrap: it fetches from the oldest open
+    trade and the caller reconciles totals instead of adding increments.
+    """
+
+    def __init__(
+        self,
+        x10_adapter,
+        lighter_adapter,
+        funding_repo=None,
+        overlap_ms: Optional[int] = None,
+        lighter_concurrency: Optional[int] = None,
+    ):
+        self.x10 = x10_adapter
+        self.lighter = lighter_adapter
+        self.funding_repo = funding_repo
+
+        self.overlap_ms = int(
+            overlap_ms if overlap_ms is not None
+            else getattr(config, "FUNDING_LEDGER_OVERLAP_SECONDS", 120) * 1000
+        )
+        self.lighter_concurrency = max(1, int(
+            lighter_concurrency if lighter_concurrency is not None
+            else getattr(config, "FUNDING_LEDGER_LIGHTER_CONCURRENCY", 4)
+        ))
+
+        # exchange -> last seen paid_time (ms) / payment id
+        self._cursors: Dict[str, int] = {}
+        self._cursor_ids: Dict[str, Optional[str]] = {}
+        # exchange -> {payment_id: paid_time} within the overlap window
+        self._seen: Dict[str, Dict[str, int]] = {EXCHANGE_X10: {}, EXCHANGE_LIGHTER: {}}
+        self._loaded = False
+
+        self._stats = {
+            "polls": 0,
+            "payments_fetched": 0,
+            "payments_new": 0,
+            "duplicates_skipped": 0,
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # CURSOR PERSISTENCE
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def load(self) -> None:
+        """Restore cursors and the dedup window from the database."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.funding_repo:
+            return
+
+        for exchange in (EXCHANGE_X10, EXCHANGE_LIGHTER):
+            try:
+                cursor = await self.funding_repo.get_funding_cursor(exchange)
+                if not cursor:
+                    continue
+                self._cursors[exchange] = int(cursor.get("last_paid_time") or 0)
+                self._cursor_ids[exchange] = cursor.get("last_payment_id")
+                self._seen[exchange] = await self.funding_repo.get_payment_ids_since(
+                    exchange, self._cursors[exchange] - self.overlap_ms
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Funding ledger: failed to restore {exchange} cursor: {e}")
+
+        if self._cursors:
+            logger.info(f"📒 Funding ledger cursors restored: {self._cursors}")
+
+    async def _persist_cursor(self, exchange: str) -> None:
+        if not self.funding_repo or exchange not in self._cursors:
+            return
+        try:
+            await self.funding_repo.save_funding_cursor(
+                exchange, self._cursors[exchange], self._cursor_ids.get(exchange)
+            )
+        except Exception as e:
+            logger.debug(f"Funding ledger: cursor persist failed for {exchange}: {e}")
+
+    @property
+    def needs_bootstrap(self) -> bool:
+        return not (EXCHANGE_X10 in self._cursors and EXCHANGE_LIGHTER in self._cursors)
+
+    def get_cursor(self, exchange: str) -> Optional[int]:
+        return self._cursors.get(exchange)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # POLLING
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _since_ms(self, exchange: str, oldest_trade_ms: int, bootstrap: bool) -> int:
+        if bootstrap or exchange not in self._cursors:
+            return oldest_trade_ms
+        # Never look further back than the oldest open trade, and re-read a
+        # small overlap window so late-posted payments are not missed.
+        return max(self._cursors[exchange] - self.overlap_ms, oldest_trade_ms)
+
+    async def poll(self, open_trades: Iterable[Any]) -> Tuple[List[FundingPayment], bool]:
+        """
+        Fetch payments newer than the high-water marks.
+
+        Returns:
+            (payments, bootstrap) - normally only payments not seen before.
+            bootstrap is True when at least one exchange had no cursor; the
+            full history since the oldest open trade is then fetched and
+            returned so the caller can reconcile totals.
+
+        A failed fetch (None) leaves that exchange's cursor untouched, so the
+        next poll re-reads from it. A bootstrap with a failed fetch returns
+        nothing - reconciling against one exchange would drop the other's
+        funding - and is repeated on the next poll.
+        """
+        await self.load()
+
+        trades = list(open_trades)
+        if not trades:
+            return [], False
+
+        self._stats["polls"] += 1
+        bootstrap = self.needs_bootstrap
+
+        created = [int(getattr(t, "created_at", 0) or 0) for t in trades]
+        oldest_trade_ms = min((c for c in created if c > 0), default=int((time.time() - 86400) * 1000))
+        symbols = {t.symbol for t in trades}
+
+        x10_payments, lighter_payments = await asyncio.gather(
+            self._fetch_x10(self._since_ms(EXCHANGE_X10, oldest_trade_ms, bootstrap)),
+            self._fetch_lighter(symbols, self._since_ms(EXCHANGE_LIGHTER, oldest_trade_ms, bootstrap)),
+        )
+
+        new_payments: List[FundingPayment] = []
+        result: List[FundingPayment] = []
+        failed: List[str] = []
+        for exchange, fetched in ((EXCHANGE_X10, x10_payments), (EXCHANGE_LIGHTER, lighter_payments)):
+            if fetched is None:
+                failed.append(exchange)
+                continue
+            new = self._ingest(exchange, fetched)
+            new_payments.extend(new)
+            if bootstrap:
+                result.extend({p.payment_id: p for p in fetched}.values())
+                if exchange not in self._cursors:
+                    # Nothing paid yet: start the cursor at the oldest open trade.
+                    self._cursors[exchange] = oldest_trade_ms
+                    self._cursor_ids[exchange] = None
+            else:
+                result.extend(new)
+
+        if new_payments and self.funding_repo:
+            try:
+                await self.funding_repo.add_funding_payments([p.to_row() for p in new_payments])
+            except Exception as e:
+                logger.warning(f"⚠️ Funding ledger: bulk persist failed: {e}")
+
+        await asyncio.gather(*(self._persist_cursor(ex) for ex in (EXCHANGE_X10, EXCHANGE_LIGHTER)))
+
+        if new_payments:
+            logger.debug(
+                f"📒 Funding ledger: {len(new_payments)} new payments "
+                f"(x10={len(x10_payments or [])}, lighter={len(lighter_payments or [])} fetched, "
+                f"bootstrap={bootstrap})"
+            )
+        if bootstrap and failed:
+            logger.warning(f"⚠️ Funding ledger: bootstrap fetch failed for {failed}, retrying next cycle")
+            return [], False
+        return result, bootstrap
+
+    def _ingest(self, exchange: str, fetched: List[FundingPayment]) -> List[FundingPayment]:
+        """Deduplicate, advance the high-water mark and prune the seen window."""
+        seen = self._seen.setdefault(exchange, {})
+        self._stats["payments_fetched"] += len(fetched)
+
+        new: List[FundingPayment] = []
+        for p in fetched:
+            if p.payment_id in seen:
+                self._stats["duplicates_skipped"] += 1
+                continue
+            seen[p.payment_id] = p.paid_time
+            new.append(p)
+            if p.paid_time >= self._cursors.get(exchange, 0):
+                self._cursors[exchange] = p.paid_time
+                self._cursor_ids[exchange] = p.payment_id
+
+        self._stats["payments_new"] += len(new)
+
+        horizon = self._cursors.get(exchange, 0) - self.overlap_ms
+        if horizon > 0 and len(seen) > len(new):
+            self._seen[exchange] = {pid: ts for pid, ts in seen.items() if ts >= horizon}
+        return new
+
+    async def _fetch_x10(self, since_ms: int) -> Optional[List[FundingPayment]]:
+        """Payments since since_ms, or None if the fetch failed."""
+        if not hasattr(self.x10, "fetch_funding_payments"):
+            return []
+        try:
+            # strict: an outage must raise, not look like "no payments"
+            raw = await self.x10.fetch_funding_payments(symbol=None, from_time=since_ms, strict=True)
+        except Exception as e:
+            logger.debug(f"Funding ledger: X10 fetch failed: {e}")
+            return None
+
+        payments = []
+        for item in raw or []:
+            paid_ms = _to_ms(item.get("paid_time"))
+            symbol = item.get("symbol")
+            if not symbol or paid_ms <= 0:
+                continue
+            pid = item.get("id")
+            payments.append(FundingPayment(
+                exchange=EXCHANGE_X10,
+                payment_id=str(pid) if pid is not None else f"{symbol}:{paid_ms}",
+                symbol=symbol,
+                amount=safe_decimal(item.get("funding_fee", 0)),
+                paid_time=paid_ms,
+                rate=safe_float(item.get("funding_rate"), 0.0),
+            ))
+        return payments
+
+    async def _fetch_lighter(self, symbols: Iterable[str], since_ms: int) -> Optional[List[FundingPayment]]:
+        """Payments since since_ms, or None if any market fetch failed (one cursor for all markets)."""
+        if not hasattr(self.lighter, "fetch_position_funding"):
+            return []
+
+        market_info = getattr(self.lighter, "market_info", {}) or {}
+        semaphore = asyncio.Semaphore(self.lighter_concurrency)
+
+        async def fetch_market(symbol: str) -> Optional[List[FundingPayment]]:
+            market_id = (market_info.get(symbol) or {}).get("i")
+            if market_id is None:
+                return []
+            async with semaphore:
+                try:
+                    raw = await self.lighter.fetch_position_funding(
+                        market_id=market_id,
+                        side="all",
+                        limit=100,
+                        since_timestamp=since_ms,
+                        strict=True,
+                    )
+                except Exception as e:
+                    logger.debug(f"Funding ledger: Lighter fetch failed for {symbol}: {e}")
+                    return None
+
+            payments = []
+            for f in raw or []:
+                paid_ms = _to_ms(f.get("timestamp"))
+                if paid_ms < since_ms:
+                    continue
+                # funding_id identifies the funding round, which is shared across
+                # markets, so the payment id is scoped by market.
+                fid = f.get("funding_id")
+                payments.append(FundingPayment(
+                    exchange=EXCHANGE_LIGHTER,
+                    payment_id=f"{market_id}:{fid if fid is not None else paid_ms}",
+                    symbol=symbol,
+                    amount=safe_decimal(f.get("funding_received", f.get("change", 0))),
+                    paid_time=paid_ms,
+                    rate=safe_float(f.get("rate"), 0.0),
+                ))
+            return payments
+
+        results = await asyncio.gather(*(fetch_market(s) for s in sorted(symbols)))
+        if any(chunk is None for chunk in results):
+            return None
+        return [p for chunk in results for p in chunk]
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # ATTRIBUTION
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def attribute(open_trades: Iterable[Any], payments: Iterable[FundingPayment]) -> Dict[str, Decimal]:
+        """Sum payments per open trade, ignoring payments from before the trade was opened."""
+        created_by_symbol = {t.symbol: int(getattr(t, "created_at", 0) or 0) for t in open_trades}
+        totals: Dict[str, Decimal] = {}
+        for p in payments:
+            created = created_by_symbol.get(p.symbol)
+            if created is None or p.paid_time < created:
+                continue
+            totals[p.symbol] = totals.get(p.symbol, Decimal("0")) + p.amount
+        return totals
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "cursors": dict(self._cursors)}
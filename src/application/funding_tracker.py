@@ -12,6 +12,7 @@ import config
 
 from src.utils.pnl_utils import normalize_funding_sign
 from src.infrastructure.database import get_funding_repository
+from src.application.funding_ledger import FundingLedger
 from src.utils import safe_decimal, quantize_usd
 
 logger = logging.getLogger(__name__)
@@ -44,15 +45,17 @@ class FundingTracker:
             "errors": 0
         }
         self.funding_repo = None
+        self.ledger = FundingLedger(x10_adapter, lighter_adapter)
 
     async def start(self):
         """Start background funding tracking loop"""
         if self._tracking_task is None or self._tracking_task.done():
+            self.funding_repo = await get_funding_repository()
+            self.ledger.funding_repo = self.funding_repo
             self._tracking_task = asyncio.create_task(
                 self._tracking_loop(),
                 name="funding_tracker"
             )
-            self.funding_repo = await get_funding_repository()
             logger.info(f"✅ Funding Tracker started (updates every {self.update_interval}s)")
 
     async def stop(self):
@@ -83,7 +86,13 @@ class FundingTracker:
                 await asyncio.sleep(60)
 
     async def update_all_trades(self):
-        """Update funding collected for all open trades using Decimal"""
+        """
+        Update funding collected for all open trades using Decimal.
+        
+        Only payments newer than the ledger's per-exchange high-water mark are
+        fetched, so the cost per cycle scales with new payments instead of
+        trade age × open trades.
+        """
         start_time = time.time()
         
         try:
@@ -94,31 +103,30 @@ class FundingTracker:
                 await self._save_pnl_snapshot(0, Decimal('0'), Decimal('0'), Decimal('0'))
                 return
 
-            # Batch fetch X10 funding if supported
-            x10_batch_funding: Dict[str, Decimal] = {}
-            try:
-                if hasattr(self.x10, 'fetch_funding_payments_batch'):
-                    symbols = [t.symbol for t in open_trades]
-                    oldest_created_at = min((t.created_at for t in open_trades), default=None)
-                    
-                    from_time_ms = int(oldest_created_at) if oldest_created_at else int((time.time() - 86400) * 1000)
-                    
-                    x10_batch_funding_raw = await self.x10.fetch_funding_payments_batch(
-                        symbols=symbols, 
-                        from_time=from_time_ms
-                    )
-                    x10_batch_funding = {k: safe_decimal(v) for k, v in x10_batch_funding_raw.items()}
-            except Exception: pass
+            if self.ledger.funding_repo is None:
+                self.ledger.funding_repo = self.funding_repo
+
+            payments, bootstrap = await self.ledger.poll(open_trades)
+            per_symbol = self.ledger.attribute(open_trades, payments)
             
             total_collected = Decimal('0')
             updated_count = 0
             
             for trade in open_trades:
                 try:
-                    incremental_funding = await self._fetch_trade_funding(trade, x10_batch_funding=x10_batch_funding)
+                    current_funding = safe_decimal(trade.funding_collected)
+                    if bootstrap:
+                        # First run without a cursor: the ledger returned the full
+                        # history since the oldest trade, so reconcile the total.
+                        total = per_symbol.get(trade.symbol, Decimal('0'))
+                        if total == 0 and current_funding != 0:
+                            # Empty fetch (API error / no data) - keep the stored value
+                            continue
+                        incremental_funding = total - current_funding
+                    else:
+                        incremental_funding = per_symbol.get(trade.symbol, Decimal('0'))
                     
                     if abs(incremental_funding) > Decimal('1e-8'):
-                        current_funding = safe_decimal(trade.funding_collected)
                         new_total = current_funding + incremental_funding
                         
                         await self.state_manager.update_trade(
@@ -141,7 +149,7 @@ class FundingTracker:
                             except Exception: pass
                     
                 except Exception as e:
-                    logger.error(f"❌ Error fetching funding for {trade.symbol}: {e}")
+                    logger.error(f"❌ Error updating funding for {trade.symbol}: {e}")
                     continue
             
             self._stats["total_updates"] += 1
@@ -149,7 +157,11 @@ class FundingTracker:
             self._stats["last_update_time"] = int(time.time())
             
             if updated_count > 0:
-                logger.info(f"✅ Funding update: {updated_count}/{len(open_trades)} trades updated, ${float(total_collected):.4f} collected")
+                logger.info(
+                    f"✅ Funding update: {updated_count}/{len(open_trades)} trades updated, "
+                    f"${float(total_collected):.4f} collected ({len(payments)} payments, "
+                    f"{(time.time() - start_time) * 1000:.0f}ms)"
+                )
             
             # Save PnL snapshot
             await self._save_pnl_snapshot(
@@ -163,49 +175,6 @@ class FundingTracker:
             logger.error(f"❌ Error in update_all_trades: {e}", exc_info=True)
             self._stats["errors"] += 1
 
-    async def _fetch_trade_funding(
-        self, 
-        trade: Any,
-        x10_batch_funding: Optional[Dict[str, Decimal]] = None
-    ) -> Decimal:
-        """
-        Fetch funding payments using Decimal.
-        """
-        symbol = trade.symbol
-        x10_funding = Decimal('0')
-        lighter_funding = Decimal('0')
-
-        created_at = getattr(trade, 'created_at', None)
-        from_time_ms = int(created_at) if created_at else int((time.time() - 86400) * 1000)
-        
-        # X10
-        try:
-            if x10_batch_funding and symbol in x10_batch_funding:
-                x10_funding = x10_batch_funding[symbol]
-            elif hasattr(self.x10, 'fetch_funding_payments'):
-                payments = await self.x10.fetch_funding_payments(symbol=symbol, from_time=from_time_ms)
-                if payments:
-                    x10_funding = sum(safe_decimal(p.get('funding_fee', 0)) for p in payments)
-        except Exception: pass
-        
-        # Lighter
-        try:
-            if hasattr(self.lighter, 'get_funding_for_symbol'):
-                lighter_funding = safe_decimal(await self.lighter.get_funding_for_symbol(symbol, from_time_ms))
-            else:
-                positions = await self.lighter.fetch_open_positions()
-                pos = next((p for p in (positions or []) if p.symbol == symbol), None)
-                if pos:
-                    # Fallback to Unrealized PnL from position if specific funding data not available
-                    lighter_funding = pos.unrealized_pnl
-        except Exception: pass
-        
-        total_current_funding = x10_funding + lighter_funding
-        previous_funding = safe_decimal(trade.funding_collected)
-        incremental_funding = total_current_funding - previous_funding
-        
-        return incremental_funding
-
     async def _save_pnl_snapshot(
         self,
         trade_count: int,
@@ -257,4 +226,5 @@ class FundingTracker:
             **self._stats,
             "is_running": self._tracking_task and not self._tracking_task.done(),
             "update_interval_seconds": self.update_interval,
+            "ledger": self.ledger.get_stats(),
         }
@@ -32,6 +32,7 @@ from src.core.orderbook_validator import (
     get_orderbook_validator,
 )
 from src.infrastructure.orderbook_provider import get_orderbook_provider, init_orderbook_provider
+from src.infrastructure.order_tracker import get_order_tracker
 import math
 
 def _scalar_float(value: Any) -> Optional[float]:
@@ -172,12 +173,10 @@ class ParallelExecutionManager:
         self._compliance_cache_ttl = 5.0  # Cache compliance result for 5 seconds
         
         # ═══════════════════════════════════════════════════════════════
-        # FIX 5: EVENT-BASED FILL DETECTION
+        # EVENT-BASED FILL DETECTION: stream-fed order state tracker
+        # (X10 order/trade/position stream, Lighter account_all + position callbacks)
         # ═══════════════════════════════════════════════════════════════
-        # Events for position updates (filled signals)
-        self._position_fill_events: Dict[str, asyncio.Event] = {}  # symbol -> Event
-        self._position_fill_sizes: Dict[str, float] = {}  # symbol -> target_size_coins
-        self._last_position_check: Dict[str, float] = {}  # symbol -> timestamp
+        self._order_tracker = get_order_tracker()
 
         # Simplified path for unit tests that inject MagicMock adapters
         self._test_mode = any("MagicMock" in str(type(adapter)) for adapter in (x10_adapter, lighter_adapter))
@@ -185,22 +184,11 @@ class ParallelExecutionManager:
         logger.info("✅ ParallelExecutionManager started")
 
     async def start(self):
-        """Start background rollback processor and register position update callbacks"""
+        """Start background rollback processor"""
         if self._test_mode:
             return
         self._rollback_task = asyncio.create_task(self._rollback_processor())
-        
-        # ═══════════════════════════════════════════════════════════════
-        # FIX 5: Register position update callbacks for event-based fill detection
-        # ═══════════════════════════════════════════════════════════════
-        if hasattr(self.x10, 'register_position_callback'):
-            self.x10.register_position_callback(self._on_x10_position_update)
-            logger.debug("✅ Registered X10 position update callback for fill detection")
-        
-        # FIXED: Also register Lighter position callback for Ghost-Fill detection
-        if hasattr(self.lighter, 'register_position_callback'):
-            self.lighter.register_position_callback(self._on_lighter_position_update)
-            logger.debug("✅ Registered Lighter position update callback for fill detection")
+        # Fill detection needs no callbacks here: the adapters feed the order state tracker
 
         logger.info("✅ ParallelExecutionManager: Rollback processor started")
 
@@ -355,90 +343,6 @@ class ParallelExecutionManager:
             except Exception as e:
                 logger.error(f"❌ Rollback error for {symbol}: {e}")
     
-    # ═══════════════════════════════════════════════════════════════
-    # FIX 5: EVENT-BASED FILL DETECTION
-    # ═══════════════════════════════════════════════════════════════
-    
-    async def _on_x10_position_update(self, data: dict):
-        """
-        Handle X10 position update from WebSocket.
-        Checks if this position update indicates a fill for an active execution.
-        """
-        try:
-            symbol = data.get("market") or data.get("symbol") or ""
-            if not symbol:
-                return
-            
-            # Check if we're waiting for a fill for this symbol
-            if symbol not in self._position_fill_events:
-                return
-            
-            status = data.get("status", "").upper()
-            size = safe_float(data.get("size") or data.get("quantity") or data.get("qty") or 0)
-            target_size = self._position_fill_sizes.get(symbol, 0)
-            
-            # Position is OPENED and size matches target (95% threshold for partial fills)
-            if status == "OPENED" and target_size > 0 and abs(size) >= target_size * 0.95:
-                event = self._position_fill_events.get(symbol)
-                if event and not event.is_set():
-                    logger.debug(f"🔔 [WEBSOCKET FILL] {symbol}: Position update detected fill! size={size}, target={target_size}")
-                    event.set()
-        
-        except Exception as e:
-            logger.debug(f"Error processing X10 position update for fill detection: {e}")
-    
-    async def _on_lighter_position_update(self, data: dict):
-        """
-        Handle Lighter position update (from REST polling or WebSocket if available).
-        FIXED: Enables faster Ghost-Fill detection by triggering event when position appears.
-        """
-        try:
-            symbol = data.get("symbol") or data.get("market") or ""
-            if not symbol:
-                return
-            
-            # Check if we're waiting for a fill for this symbol
-            if symbol not in self._position_fill_events:
-                return
-            
-            size = safe_float(data.get("size") or data.get("quantity") or data.get("qty") or 0)
-            target_size = self._position_fill_sizes.get(symbol, 0)
-            is_ghost = data.get("is_ghost", False)
-            
-            # Position exists with at least 50% of target OR is Ghost Guardian position
-            if target_size > 0 and (is_ghost or abs(size) >= target_size * 0.50):
-                event = self._position_fill_events.get(symbol)
-                if event and not event.is_set():
-                    if is_ghost:
-                        logger.debug(f"🔔 [LIGHTER FILL EVENT] {symbol}: Ghost Guardian detected! Marking as filled.")
-                    else:
-                        logger.debug(f"🔔 [LIGHTER FILL EVENT] {symbol}: Position detected! size={size}, target={target_size}")
-                    event.set()
-        
-        except Exception as e:
-            logger.debug(f"Error processing Lighter position update for fill detection: {e}")
-    
-    def _setup_fill_event(self, symbol: str, target_size_coins: float):
-        """
-        Setup event-based fill detection for a symbol.
-        Returns the event that will be set when fill is detected.
-        """
-        # Create or reset event for this symbol
-        if symbol in self._position_fill_events:
-            self._position_fill_events[symbol].clear()
-        else:
-            self._position_fill_events[symbol] = asyncio.Event()
-        
-        self._position_fill_sizes[symbol] = target_size_coins
-        self._last_position_check[symbol] = time.time()
-        return self._position_fill_events[symbol]
-    
-    def _cleanup_fill_event(self, symbol: str):
-        """Cleanup fill event for a symbol after execution completes"""
-        self._position_fill_events.pop(symbol, None)
-        self._position_fill_sizes.pop(symbol, None)
-        self._last_position_check.pop(symbol, None)
-
     async def _emergency_close_position(self, adapter, symbol: str, position: dict) -> bool:
         """Emergency close a position during shutdown."""
         try:
@@ -541,11 +445,15 @@ class ParallelExecutionManager:
         size_lighter: Decimal,
         price_x10: Optional[Decimal] = None,
         price_lighter: Optional[Decimal] = None,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        snapshot=None,
     ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Execute hedged trade on both exchanges in parallel.
         
+        snapshot: MarketSnapshot of the scan cycle - its top-of-book mids are used
+        as entry prices while fresh instead of re-reading both books.
+        
         Returns:
             (success, x10_order_id, lighter_order_id)
         """
@@ -727,7 +635,7 @@ class ParallelExecutionManager:
 
             try:
                 result = await self._execute_parallel_internal(
-                    execution, timeout
+                    execution, timeout, snapshot=snapshot
                 )
                 
                 success = result[0]
@@ -1087,39 +995,31 @@ class ParallelExecutionManager:
                 
                 logger.info(f"✅ [RETRY] {symbol}: Retry order placed: {retry_order_id[:40]}...")
                 
-                # Wait for fill with dynamic timeout
+                # Wait for fill: stream position updates wake the waiter, REST positions
+                # only every ORDER_TRACKER_REST_INTERVAL as safety net
                 wait_start = time.time()
-                filled = False
-                check_count = 0
-                
-                while time.time() - wait_start < dynamic_timeout:
-                    if getattr(config, "IS_SHUTTING_DOWN", False):
-                        logger.warning(f"⚡ [RETRY] {symbol}: SHUTDOWN detected - aborting retry wait!")
-                        break
-                    
-                    check_count += 1
-                    try:
-                        pos = await self.lighter.fetch_open_positions()
-                        p = next((x for x in (pos or []) if x.get("symbol") == symbol), None)
-                        current_size = safe_float(p.get("size", 0)) if p else 0.0
-                        
-                        if execution.quantity_coins > 0 and abs(current_size) >= execution.quantity_coins * 0.95:
-                            filled = True
-                            fill_time = time.time() - wait_start
-                            logger.info(
-                                f"✅ [RETRY] {symbol}: Fill detected after {check_count} checks "
-                                f"(attempt {retry_attempt}/{max_retries}, {fill_time:.2f}s)!"
-                            )
-                            break
-                        
-                        # FIX 7: Reduced from 0.5s to 0.3s for faster fill detection
-                        await asyncio.sleep(0.3)
-                        
-                    except Exception as e:
-                        logger.debug(f"[RETRY] {symbol}: Check #{check_count} error: {e}")
-                        # FIX 7: Reduced from 1.0s to 0.5s for faster recovery
-                        await asyncio.sleep(0.5)
-                
+                target = execution.quantity_coins
+
+                def _retry_filled(state) -> bool:
+                    return target > 0 and (state.position_size or 0.0) >= target * 0.95
+
+                try:
+                    state = await self._order_tracker.wait(
+                        "lighter", retry_order_id, _retry_filled, dynamic_timeout, symbol=symbol,
+                        rest_check=lambda: self._refresh_lighter_position(symbol),
+                    )
+                finally:
+                    self._order_tracker.forget("lighter", retry_order_id)
+
+                filled = state is not None
+                if filled:
+                    logger.info(
+                        f"✅ [RETRY] {symbol}: Fill detected via {state.source or 'event'} "
+                        f"(attempt {retry_attempt}/{max_retries}, {time.time() - wait_start:.2f}s)!"
+                    )
+                elif getattr(config, "IS_SHUTTING_DOWN", False):
+                    logger.warning(f"⚡ [RETRY] {symbol}: SHUTDOWN detected - aborting retry wait!")
+
                 if filled:
                     # Update phase times
                     phase_times["lighter_fill_wait"] = time.time() - wait_start
@@ -1348,57 +1248,48 @@ class ParallelExecutionManager:
                     extended_checks_skipped = True
                 else:
                     # 2. FIX: Aggressiver Ghost-Fill Check (2025-12-13 Audit Fix)
-                    # PROBLEM: Alter Code startete bei 1.0s und wuchs auf 3.0s = 55s bis Attempt 22!
-                    # LÖSUNG: Schnellere Checks mit kürzerem Backoff + tatsächliche Position Size tracken
+                    # Stream position updates (account_all / Ghost Guardian) end the check at once;
+                    # REST positions once per second as safety net, ~15s like the former 20 polls.
                     logger.info(f"🔍 [MAKER STRATEGY] {symbol}: Checking for Ghost Fills (FAST CHECK)...")
-                    
-                    # AUDIT FIX: 20 Versuche mit schnellerem Intervall (~10s total statt ~60s)
-                    # Alt: 30 Versuche, 1.0-3.0s delay = ~60s
-                    # Neu: 20 Versuche, 0.3-1.0s delay = ~10s
-                    max_checks = 20
-                    for i in range(max_checks): 
-                        # FAST SHUTDOWN: Abort immediately if shutdown detected mid-loop
-                        if getattr(config, 'IS_SHUTTING_DOWN', False):
-                            logger.warning(f"⚡ {symbol}: SHUTDOWN detected during ghost check - aborting!")
-                            extended_checks_skipped = True
-                            break
-                            
-                        # AUDIT FIX: Schnellerer Backoff - Start 0.3s, +0.05s pro Versuch, max 1.0s
-                        # Attempt 0: 0.3s, Attempt 5: 0.55s, Attempt 14+: 1.0s
-                        # Total Zeit für 20 checks: ~10-12s (statt ~55s vorher!)
-                        wait_time = min(0.3 + (i * 0.05), 1.0)
-                        await asyncio.sleep(wait_time)
+                    ghost_check_seconds = 15.0
+                    order_key = str(lighter_order_id)
+
+                    async def _ghost_rest_check() -> None:
+                        nonlocal extended_checks_done
                         extended_checks_done += 1
-                        
+                        await self._refresh_lighter_position(symbol)
+
+                    try:
+                        state = await self._order_tracker.wait(
+                            "lighter", order_key,
+                            lambda st: st.is_ghost or (st.position_size or 0.0) > 1e-8,
+                            ghost_check_seconds, symbol=symbol,
+                            rest_check=_ghost_rest_check, rest_interval=1.0,
+                        )
+                    finally:
+                        self._order_tracker.forget("lighter", order_key)
+
+                    if state is not None:
+                        size = state.position_size or 0.0
+                        logger.warning(
+                            f"⚠️ [MAKER STRATEGY] {symbol}: GHOST FILL DETECTED via {state.source or 'event'} "
+                            f"after {extended_checks_done} REST checks! Size={size}. HEDGING NOW!"
+                        )
+                        filled = True
+                        # Ghost Guardian positions may not carry a size yet (None = unknown)
+                        actual_filled_size = size if size > 0 else None
+
+                        # CRITICAL FIX (2025-12-13): If partial fill detected, attempt to cancel remaining order
+                        # The original order might still be open in the orderbook (e.g., 0.2 filled, 51.8 still open)
                         try:
-                            positions = await self.lighter.fetch_open_positions()
-                            
-                            # Suche nach Position in diesem Symbol
-                            pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-                            size = safe_float(pos.get('size', 0)) if pos else 0.0
-                            
-                            if abs(size) > 1e-8:
-                                logger.warning(f"⚠️ [MAKER STRATEGY] {symbol}: GHOST FILL DETECTED on attempt {i+1}! Size={size}. HEDGING NOW!")
-                                filled = True
-                                actual_filled_size = abs(size)  # Store actual position size for accurate hedge
-                                
-                                # CRITICAL FIX (2025-12-13): If partial fill detected, attempt to cancel remaining order
-                                # The original order might still be open in the orderbook (e.g., 0.2 filled, 51.8 still open)
-                                try:
-                                    if hasattr(self.lighter, 'cancel_all_orders'):
-                                        logger.info(f"🧹 [GHOST FILL] {symbol}: Attempting to cancel remaining order parts after partial fill (size={size})")
-                                        await self.lighter.cancel_all_orders(symbol)
-                                except Exception as cancel_e:
-                                    logger.debug(f"🧹 [GHOST FILL] {symbol}: Error cancelling remaining order: {cancel_e}")
-                                
-                                break
-                            
-                            # Logge alle 5 Versuche für besseres Monitoring
-                            if i % 5 == 0:
-                                logger.debug(f"🔍 {symbol} check {i+1}/{max_checks} clean...")
-                                
-                        except Exception as e:
-                            logger.debug(f"Check error: {e}")
+                            if hasattr(self.lighter, 'cancel_all_orders'):
+                                logger.info(f"🧹 [GHOST FILL] {symbol}: Attempting to cancel remaining order parts after partial fill (size={size})")
+                                await self.lighter.cancel_all_orders(symbol)
+                        except Exception as cancel_e:
+                            logger.debug(f"🧹 [GHOST FILL] {symbol}: Error cancelling remaining order: {cancel_e}")
+                    elif getattr(config, 'IS_SHUTTING_DOWN', False):
+                        logger.warning(f"⚡ {symbol}: SHUTDOWN detected during ghost check - aborting!")
+                        extended_checks_skipped = True
         
 
 
@@ -1457,9 +1348,7 @@ class ParallelExecutionManager:
             elif extended_checks_skipped:
                 logger.info(f"✓ [MAKER STRATEGY] {symbol}: Cancel confirmed (Clean Exit - extended checks skipped during shutdown).")
             elif extended_checks_done > 0:
-                # AUDIT FIX: Neue Formel für Backoff: 0.3s + (i * 0.05s), max 1.0s
-                estimated_seconds = sum(min(0.3 + (i * 0.05), 1.0) for i in range(extended_checks_done))
-                logger.info(f"✓ [MAKER STRATEGY] {symbol}: Cancel confirmed (Clean Exit verified after ~{estimated_seconds:.1f}s, {extended_checks_done} checks).")
+                logger.info(f"✓ [MAKER STRATEGY] {symbol}: Cancel confirmed (Clean Exit verified after ~{ghost_check_seconds:.1f}s, {extended_checks_done} REST checks).")
             else:
                 logger.info(f"✓ [MAKER STRATEGY] {symbol}: Cancel confirmed (Clean Exit - no extended verification needed).")
             return False, None, False  # Not filled, no size, wait_more=False
@@ -1653,6 +1542,14 @@ class ParallelExecutionManager:
 
         return x10_mid, lit_mid
 
+    async def _entry_mid(self, adapter, exchange: str, symbol: str, snapshot=None) -> Optional[float]:
+        """Entry mid price: the cycle snapshot's book while fresh, else the adapter's orderbook."""
+        if snapshot is not None and snapshot.book_fresh(exchange, symbol):
+            return snapshot.book(exchange, symbol).mid
+        if hasattr(adapter, 'get_orderbook_mid_price'):
+            return await adapter.get_orderbook_mid_price(symbol)
+        return None
+
     async def _validate_spread_before_hedge(
         self,
         symbol: str,
@@ -1703,7 +1600,8 @@ class ParallelExecutionManager:
     async def _execute_parallel_internal(
         self, 
         execution: TradeExecution,
-        timeout: float
+        timeout: float,
+        snapshot=None,
     ) -> Tuple[bool, Optional[str], Optional[str]]:
         """Internal parallel execution logic with comprehensive logging and timeout handling"""
         symbol = execution.symbol
@@ -1759,11 +1657,11 @@ class ParallelExecutionManager:
                 fresh_lighter_price = None
                 fresh_x10_price = None
 
-                # Get fresh prices from both exchanges
-                if hasattr(self.lighter, 'get_orderbook_mid_price'):
-                    fresh_lighter_price = await self.lighter.get_orderbook_mid_price(symbol)
-                if hasattr(self.x10, 'get_orderbook_mid_price'):
-                    fresh_x10_price = await self.x10.get_orderbook_mid_price(symbol)
+                # Cycle snapshot mids if still fresh, otherwise re-read both books concurrently
+                fresh_lighter_price, fresh_x10_price = await asyncio.gather(
+                    self._entry_mid(self.lighter, "lighter", symbol, snapshot),
+                    self._entry_mid(self.x10, "x10", symbol, snapshot),
+                )
 
                 # Use fresh prices if available, otherwise fall back to cached
                 if fresh_lighter_price and fresh_lighter_price > 0:
@@ -2067,212 +1965,30 @@ class ParallelExecutionManager:
 
         logger.info("═" * 60)
 
+    async def _refresh_lighter_position(self, symbol: str) -> float:
+        """REST position check, feeds the order state tracker (safety net for missed stream updates).
 
-
-
-    async def _wait_for_lighter_fill(
-        self, symbol: str, execution: TradeExecution, lighter_order_id: str, max_wait_seconds: float
-    ) -> bool:
-        """Wait for Lighter order to fill (hybrid: event-based + polling fallback)
-        
-        FIX 7 (2025-12-14): Reduced polling interval from 0.5s to 0.3s for ~40% faster Ghost-Fill detection.
-        Pattern from TS SDK: Faster polling reduces unhedged exposure window significantly.
-        Also uses event-based detection via _position_fill_events when available.
+        fetch_open_positions() already feeds the tracker via the position callbacks
+        (raw dicts incl. Ghost Guardian); Position objects only carry symbol/size.
+        Returns the signed position size (0.0 = no position).
         """
-        wait_start = time.time()
-        check_count = 0
-        # FIX 7: Reduced from 0.5s to 0.3s for faster fill detection (~40% improvement)
-        # TS SDK Pattern: Minimize detection latency to reduce unhedged exposure window
-        polling_interval = 0.3  # Faster polling to reduce Ghost-Fill window
-        # For IOC orders, check order status early to detect cancellations
-        order_status_checked = False
-        
-        # Setup event-based fill detection (if not already setup)
-        fill_event = None
-        if execution.quantity_coins > 0:
-            fill_event = self._setup_fill_event(symbol, execution.quantity_coins)
-
-        try:
-            while time.time() - wait_start < max_wait_seconds:
-                if getattr(config, "IS_SHUTTING_DOWN", False):
-                    logger.warning(f"⚡ [LIGHTER FILL] {symbol}: SHUTDOWN detected - aborting wait!")
-                    return False
-
-                # FIXED: Check event first (fastest path - set by position callbacks)
-                if fill_event and fill_event.is_set():
-                    fill_time = time.time() - wait_start
-                    logger.info(f"🔔 [LIGHTER FILL] {symbol}: Fill detected via EVENT after {fill_time:.2f}s!")
-                    return True
+        positions = await self.lighter.fetch_open_positions()
+        size = 0.0
+        for p in (positions or []):
+            p_symbol = p.get("symbol") if isinstance(p, dict) else getattr(p, "symbol", None)
+            if p_symbol == symbol:
+                size = safe_float(p.get("size", 0) if isinstance(p, dict) else getattr(p, "size", 0))
+                break
+        self._order_tracker.update_position("lighter", symbol, size, source="rest")
+        return size
 
-                check_count += 1
-                try:
-                    # Check position via REST (fallback path)
-                    pos = await self.lighter.fetch_open_positions()
-                    p = next((x for x in (pos or []) if x.get("symbol") == symbol), None)
-                    current_size = safe_float(p.get("size", 0)) if p else 0.0
-                    is_ghost = p.get("is_ghost", False) if p else False
-
-                    # Check if position exists:
-                    # 1. Ghost Guardian position (is_ghost=True) means order is pending and will fill
-                    # 2. Real position with at least 50% of expected size (more lenient for faster detection)
-                    if execution.quantity_coins > 0 and (is_ghost or abs(current_size) >= execution.quantity_coins * 0.50):
-                        fill_time = time.time() - wait_start
-                        if is_ghost:
-                            logger.info(f"✅ [LIGHTER FILL] {symbol}: Fill detected via Ghost Guardian after {check_count} checks ({fill_time:.2f}s)! (Order pending, position will appear in API soon)")
-                        else:
-                            logger.info(f"✅ [LIGHTER FILL] {symbol}: Fill detected after {check_count} checks ({fill_time:.2f}s)! (size={abs(current_size):.6f}, expected={execution.quantity_coins:.6f})")
-                        return True
-
-                    # For IOC orders, check if order still exists after initial delay
-                    # IOC orders that don't fill immediately are cancelled
-                    # BUT: If order is gone, it might be filled (position exists) OR cancelled (no position)
-                    # We need to do a fresh fetch to bypass rate limiter deduplication
-                    # However, positions may take time to appear in API, so we check multiple times
-                    if not order_status_checked and time.time() - wait_start > 1.0:
-                        try:
-                            open_orders = await self.lighter.get_open_orders(symbol)
-                            # Extract order IDs (could be full hash or truncated)
-                            order_id_short = lighter_order_id[:20] if lighter_order_id else ""
-                            order_found = any(
-                                str(o.get("id", "")).startswith(order_id_short) or 
-                                str(o.get("id", "")).endswith(order_id_short[-20:])
-                                for o in open_orders
-                            )
-                            
-                            if not order_found:
-                                # Order is not in open orders - could be filled OR cancelled
-                                # Do multiple fresh position fetches with delays to account for API lag
-                                # Positions may take 1-3 seconds to appear after IOC order fills
-                                # For POST_ONLY orders, positions may take longer (5-10s), so we need more attempts
-                                # Check if this is a POST_ONLY order: if order was placed >5s ago and disappeared, likely POST_ONLY filled
-                                elapsed_so_far = time.time() - wait_start
-                                is_post_only_likely = elapsed_so_far > 5.0
-                                # FIX 7: More aggressive fresh-fetch with shorter delays
-                                max_fresh_fetch_attempts = 12 if is_post_only_likely else 5  # Increased attempts
-                                fresh_fetch_attempts = 0
-                                fresh_fetch_delay = 0.2  # FIX 7: Reduced from 0.5s to 0.2s
-                                
-                                while fresh_fetch_attempts < max_fresh_fetch_attempts:
-                                    cached_positions = None
-                                    if hasattr(self.lighter, '_positions_cache'):
-                                        # Set cache to None temporarily to force fresh API call
-                                        cached_positions = self.lighter._positions_cache
-                                        self.lighter._positions_cache = None
-                                    
-                                    try:
-                                        await asyncio.sleep(fresh_fetch_delay * fresh_fetch_attempts)  # Delay increases with each attempt
-                                        fresh_pos = await self.lighter.fetch_open_positions()
-                                        fresh_p = next((x for x in (fresh_pos or []) if x.get("symbol") == symbol), None)
-                                        fresh_size = safe_float(fresh_p.get("size", 0)) if fresh_p else 0.0
-                                        is_ghost = fresh_p.get("is_ghost", False) if fresh_p else False
-                                        
-                                        # Check if position exists:
-                                        # 1. Ghost Guardian position (is_ghost=True) means order is pending and will fill
-                                        # 2. Real position with at least 50% of expected size
-                                        if is_ghost:
-                                            # Ghost Guardian position = order is pending, consider it filled
-                                            fill_time = time.time() - wait_start
-                                            logger.info(f"✅ [LIGHTER FILL] {symbol}: Fill confirmed via Ghost Guardian (attempt {fresh_fetch_attempts + 1}) after {fill_time:.2f}s (IOC order disappeared, Ghost Guardian detected pending position - will appear in API soon)!")
-                                            # Restore cache with fresh data
-                                            if hasattr(self.lighter, '_positions_cache'):
-                                                self.lighter._positions_cache = fresh_pos if fresh_pos else cached_positions
-                                            return True  # Fill confirmed, exit immediately
-                                        elif abs(fresh_size) >= execution.quantity_coins * 0.50:
-                                            # Position exists with sufficient size! Order was filled
-                                            fill_time = time.time() - wait_start
-                                            logger.info(f"✅ [LIGHTER FILL] {symbol}: Fill confirmed via fresh fetch (attempt {fresh_fetch_attempts + 1}) after {fill_time:.2f}s (IOC order disappeared but position exists)! (size={abs(fresh_size):.6f}, expected={execution.quantity_coins:.6f})")
-                                            # Restore cache with fresh data
-                                            if hasattr(self.lighter, '_positions_cache'):
-                                                self.lighter._positions_cache = fresh_pos if fresh_pos else cached_positions
-                                            return True  # Fill confirmed, exit immediately
-                                        else:
-                                            fresh_fetch_attempts += 1
-                                            # Restore cache before next attempt
-                                            if hasattr(self.lighter, '_positions_cache'):
-                                                self.lighter._positions_cache = cached_positions
-                                            if fresh_fetch_attempts >= max_fresh_fetch_attempts:
-                                                # No position found after all fresh fetch attempts
-                                                # For POST_ONLY orders, continue polling instead of giving up immediately
-                                                # (POST_ONLY orders can take time to fill and appear in API)
-                                                elapsed = time.time() - wait_start
-                                                if is_post_only_likely:
-                                                    # POST_ONLY order: continue polling instead of giving up
-                                                    logger.debug(f"⏳ [LIGHTER FILL] {symbol}: POST_ONLY order not found in open orders and no position after {max_fresh_fetch_attempts} fresh fetch attempts ({elapsed:.2f}s) - continuing to poll (POST_ONLY may fill later)")
-                                                    # Restore cache and continue polling
-                                                    if hasattr(self.lighter, '_positions_cache'):
-                                                        self.lighter._positions_cache = cached_positions
-                                                    order_status_checked = True  # Don't check again, just continue polling
-                                                    break  # Exit fresh fetch loop, continue normal polling
-                                                else:
-                                                    # IOC order: likely cancelled/rejected
-                                                    logger.warning(f"❌ [LIGHTER FILL] {symbol}: IOC order not found in open orders and no position after {max_fresh_fetch_attempts} fresh fetch attempts ({elapsed:.2f}s) - cancelled/rejected")
-                                                    return False
-                                    except Exception as fresh_fetch_error:
-                                        logger.debug(f"[LIGHTER FILL] {symbol}: Fresh fetch attempt {fresh_fetch_attempts + 1} error: {fresh_fetch_error}")
-                                        # Restore cache on error
-                                        if hasattr(self.lighter, '_positions_cache') and cached_positions is not None:
-                                            self.lighter._positions_cache = cached_positions
-                                        fresh_fetch_attempts += 1
-                                        if fresh_fetch_attempts >= max_fresh_fetch_attempts:
-                                            # Continue polling if all fresh fetch attempts fail
-                                            break
-                            else:
-                                # Order still exists, continue normal polling
-                                order_status_checked = True
-                        except Exception as e:
-                            logger.debug(f"[LIGHTER FILL] {symbol}: Order status check error: {e}")
-                            # Continue polling if check fails
-                            order_status_checked = True  # Mark as checked to avoid repeated errors
-
-                    await asyncio.sleep(polling_interval)
-                except Exception as e:
-                    logger.debug(f"[LIGHTER FILL] {symbol}: Check #{check_count} error: {e}")
-                    await asyncio.sleep(polling_interval)
-
-            logger.warning(f"⏰ [LIGHTER FILL] {symbol}: Fill timeout after {max_wait_seconds:.2f}s")
-            return False
-        finally:
-            # FIXED: Cleanup fill event to prevent memory leaks
-            self._cleanup_fill_event(symbol)
-
-    async def _wait_for_x10_fill(
-        self, symbol: str, execution: TradeExecution, x10_order_id: str, max_wait_seconds: float = 60.0
-    ) -> bool:
-        """Wait for X10 limit order to fill (polling-based via WebSocket position updates)"""
-        wait_start = time.time()
-        check_count = 0
-        polling_interval = 0.5  # Check every 0.5s
-        
-        while time.time() - wait_start < max_wait_seconds:
-            if getattr(config, "IS_SHUTTING_DOWN", False):
-                logger.warning(f"⚡ [X10 FILL] {symbol}: SHUTDOWN detected - aborting wait!")
-                return False
-            
-            check_count += 1
-            try:
-                # Check position cache (updated via WebSocket on_position_update)
-                # NOTE: _positions_cache is a LIST of position dicts, not a dict!
-                if hasattr(self.x10, '_positions_cache') and self.x10._positions_cache:
-                    # Search for position in the list
-                    pos = next(
-                        (p for p in self.x10._positions_cache if p.get('symbol') == symbol),
-                        None
-                    )
-                    if pos:
-                        size = safe_float(pos.get('size', 0))
-                        # Check if position matches expected size (at least 95%)
-                        if abs(size) >= execution.quantity_coins * 0.95:
-                            fill_time = time.time() - wait_start
-                            logger.info(f"✅ [X10 FILL] {symbol}: Fill detected after {check_count} checks ({fill_time:.2f}s)!")
-                            return True
-                
-                await asyncio.sleep(polling_interval)
-            except Exception as e:
-                logger.debug(f"[X10 FILL] {symbol}: Check #{check_count} error: {e}")
-                await asyncio.sleep(polling_interval)
-        
-        logger.warning(f"⏰ [X10 FILL] {symbol}: Fill timeout after {max_wait_seconds:.2f}s")
-        return False
+    async def _refresh_x10_position(self, symbol: str) -> float:
+        """REST position check, feeds the order state tracker; returns the absolute X10 size."""
+        positions = await self.x10.fetch_open_positions()
+        pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
+        size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
+        self._order_tracker.update_position("x10", symbol, size, source="rest")
+        return size
 
     async def _execute_lighter_leg(
         self, symbol: str, side: str, notional_usd: float, post_only: bool, amount_coins: Optional[float] = None
@@ -2367,6 +2083,7 @@ class ParallelExecutionManager:
         timeout = timeout_per_cycle or float(getattr(config, 'X10_MAKER_TIMEOUT_SECONDS', 3.0))
         requotes = max_requotes or int(getattr(config, 'X10_MAKER_MAX_REQUOTES', 1))
         chase_pct = price_chase_pct or float(getattr(config, 'X10_MAKER_PRICE_CHASE_PCT', 0.001))
+        # REST safety-net interval for the tracker wait (fills arrive via the account stream)
         check_interval = float(getattr(config, 'X10_MAKER_FILL_CHECK_INTERVAL', 0.3))
         
         # Shutdown mode: faster timeout
@@ -2385,11 +2102,41 @@ class ParallelExecutionManager:
         # Get initial position snapshot for ghost-fill detection
         initial_position_size = 0.0
         try:
-            positions = await self.x10.fetch_open_positions()
-            pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-            initial_position_size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
+            initial_position_size = await self._refresh_x10_position(symbol)
         except Exception as e:
             logger.debug(f"[X10 MAKER] {symbol}: Initial position check error: {e}")
+
+        tracker = self._order_tracker
+        placed_order_ids: List[str] = []
+
+        def _fill_ratio(state) -> float:
+            """Filled share of size_coins: order fills or position delta (stream-fed)."""
+            if state is None or size_coins <= 0:
+                return 0.0
+            if state.is_filled:
+                return 1.0
+            filled_qty = state.filled_qty
+            if state.position_size is not None:
+                filled_qty = max(filled_qty, abs(state.position_size - initial_position_size))
+            return filled_qty / size_coins
+
+        async def _wait_fill(order_id: str, ratio: float, wait_s: float, rest_interval: Optional[float] = None):
+            """Stream events wake the waiter; REST positions only as safety net."""
+            return await tracker.wait(
+                "x10", order_id, lambda st: _fill_ratio(st) >= ratio or st.is_dead, wait_s,
+                symbol=symbol, rest_check=lambda: self._refresh_x10_position(symbol), rest_interval=rest_interval,
+            )
+
+        async def _ghost_fill(order_id: Optional[str]) -> bool:
+            """>= 50% filled? Stream state first, one REST position check only if it shows no fill."""
+            if order_id and _fill_ratio(tracker.get("x10", order_id)) >= 0.50:
+                return True
+            try:
+                current_size = await self._refresh_x10_position(symbol)
+            except Exception as e:
+                logger.debug(f"[X10 MAKER] {symbol}: Ghost check error: {e}")
+                return False
+            return size_coins > 0 and abs(current_size - initial_position_size) >= size_coins * 0.50
         
         logger.info(
             f"🎯 [X10 MAKER] {symbol} {side}: Starting Maker-First strategy | "
@@ -2439,6 +2186,7 @@ class ParallelExecutionManager:
                         break
                 
                 current_order_id = order_id
+                placed_order_ids.append(order_id)
                 logger.debug(f"✓ [X10 MAKER] {symbol}: Order placed: {order_id}")
                 
             except Exception as e:
@@ -2450,60 +2198,34 @@ class ParallelExecutionManager:
                     break
             
             # ═══════════════════════════════════════════════════════════════
-            # WAIT FOR FILL (with position monitoring)
+            # WAIT FOR FILL (order / trade / position stream events)
             # ═══════════════════════════════════════════════════════════════
             wait_start = time.time()
-            while time.time() - wait_start < timeout:
-                if getattr(config, 'IS_SHUTTING_DOWN', False):
-                    logger.warning(f"⚡ [X10 MAKER] {symbol}: SHUTDOWN during wait - breaking!")
-                    break
-                
-                try:
-                    # Check position (faster than checking order status)
-                    positions = await self.x10.fetch_open_positions()
-                    pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-                    current_size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
-                    
-                    # Calculate position delta (detect fill)
-                    size_delta = abs(current_size - initial_position_size)
-                    
-                    # Check if filled (>= 90% of requested size appeared)
-                    if size_delta >= size_coins * 0.90:
-                        filled = True
-                        fill_time = time.time() - wait_start
-                        total_time = time.monotonic() - total_start
-                        logger.info(
-                            f"✅ [X10 MAKER] {symbol}: MAKER FILLED in {fill_time:.2f}s! "
-                            f"(attempt {attempt}, total={total_time:.2f}s, size_delta={size_delta:.6f})"
-                        )
-                        return True, current_order_id, False  # Success, Maker fill
-                    
-                    await asyncio.sleep(check_interval)
-                    
-                except Exception as e:
-                    logger.debug(f"[X10 MAKER] {symbol}: Fill check error: {e}")
-                    await asyncio.sleep(check_interval)
-            
+            state = await _wait_fill(current_order_id, 0.90, timeout, rest_interval=max(check_interval, 1.0))
+            if state is not None and _fill_ratio(state) >= 0.90:
+                filled = True
+                total_time = time.monotonic() - total_start
+                logger.info(
+                    f"✅ [X10 MAKER] {symbol}: MAKER FILLED in {time.time() - wait_start:.2f}s via {state.source or 'event'}! "
+                    f"(attempt {attempt}, total={total_time:.2f}s, filled={_fill_ratio(state) * size_coins:.6f})"
+                )
+                self._forget_x10_orders(placed_order_ids)
+                return True, current_order_id, False  # Success, Maker fill
+            if getattr(config, 'IS_SHUTTING_DOWN', False):
+                logger.warning(f"⚡ [X10 MAKER] {symbol}: SHUTDOWN during wait - breaking!")
+
             # Timeout - check for ghost fill before cancel
             if not filled and attempt < requotes:
-                # Ghost-Fill protection: Check position BEFORE cancel
-                try:
-                    positions = await self.x10.fetch_open_positions()
-                    pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-                    current_size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
-                    size_delta = abs(current_size - initial_position_size)
-                    
-                    if size_delta >= size_coins * 0.50:
-                        # Partial fill large enough - count as success
-                        logger.warning(
-                            f"⚠️ [X10 MAKER] {symbol}: GHOST FILL detected before cancel! "
-                            f"size_delta={size_delta:.6f} >= 50% of {size_coins:.6f}"
-                        )
-                        return True, current_order_id, False  # Partial maker fill
-                        
-                except Exception as e:
-                    logger.debug(f"[X10 MAKER] {symbol}: Ghost check error: {e}")
-                
+                # Ghost-Fill protection: Check fill BEFORE cancel
+                if await _ghost_fill(current_order_id):
+                    # Partial fill large enough - count as success
+                    logger.warning(
+                        f"⚠️ [X10 MAKER] {symbol}: GHOST FILL detected before cancel! "
+                        f">= 50% of {size_coins:.6f}"
+                    )
+                    self._forget_x10_orders(placed_order_ids)
+                    return True, current_order_id, False  # Partial maker fill
+
                 # Cancel and continue to next requote
                 try:
                     logger.debug(f"🗑️ [X10 MAKER] {symbol}: Cancelling order for requote...")
@@ -2513,17 +2235,10 @@ class ParallelExecutionManager:
                     logger.debug(f"[X10 MAKER] {symbol}: Cancel error (may already be filled): {e}")
                     
                     # After cancel error, re-check for ghost fill
-                    try:
-                        positions = await self.x10.fetch_open_positions()
-                        pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-                        current_size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
-                        size_delta = abs(current_size - initial_position_size)
-                        
-                        if size_delta >= size_coins * 0.50:
-                            logger.warning(f"⚠️ [X10 MAKER] {symbol}: Fill detected after cancel error!")
-                            return True, current_order_id, False
-                    except Exception:
-                        pass
+                    if await _ghost_fill(current_order_id):
+                        logger.warning(f"⚠️ [X10 MAKER] {symbol}: Fill detected after cancel error!")
+                        self._forget_x10_orders(placed_order_ids)
+                        return True, current_order_id, False
                 
                 requote_count = attempt + 1
         
@@ -2545,17 +2260,10 @@ class ParallelExecutionManager:
                     pass
             
             # Final ghost-fill check before taker
-            try:
-                positions = await self.x10.fetch_open_positions()
-                pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-                current_size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
-                size_delta = abs(current_size - initial_position_size)
-                
-                if size_delta >= size_coins * 0.50:
-                    logger.warning(f"⚠️ [X10 TAKER] {symbol}: Fill detected before taker! (ghost fill)")
-                    return True, current_order_id, False
-            except Exception:
-                pass
+            if await _ghost_fill(current_order_id):
+                logger.warning(f"⚠️ [X10 TAKER] {symbol}: Fill detected before taker! (ghost fill)")
+                self._forget_x10_orders(placed_order_ids)
+                return True, current_order_id, False
             
             # Place TAKER (IOC) order
             try:
@@ -2570,27 +2278,26 @@ class ParallelExecutionManager:
                 )
                 
                 if success and taker_order_id:
-                    # Wait briefly for fill
-                    await asyncio.sleep(0.5)
-                    
-                    # Verify fill
-                    positions = await self.x10.fetch_open_positions()
-                    pos = next((p for p in (positions or []) if p.get('symbol') == symbol), None)
-                    current_size = abs(safe_float(pos.get('size', 0))) if pos else 0.0
-                    size_delta = abs(current_size - initial_position_size)
+                    placed_order_ids.append(taker_order_id)
+                    # IOC: the stream confirms within ~1s, REST position check after 0.5s as fallback
+                    state = await _wait_fill(taker_order_id, 0.90, 1.0, rest_interval=0.5)
+                    if state is None or _fill_ratio(state) < 0.90:
+                        await _ghost_fill(None)  # one last REST position read feeds the tracker
+                        state = tracker.get("x10", taker_order_id)
                     
-                    if size_delta >= size_coins * 0.90:
+                    if _fill_ratio(state) >= 0.90:
                         taker_time = time.monotonic() - taker_start
                         total_time = time.monotonic() - total_start
                         logger.info(
                             f"✅ [X10 TAKER] {symbol}: TAKER FILLED in {taker_time:.2f}s! "
                             f"(total={total_time:.2f}s, used_taker=True)"
                         )
+                        self._forget_x10_orders(placed_order_ids)
                         return True, taker_order_id, True  # Success, Taker fill
                     else:
                         logger.warning(
                             f"⚠️ [X10 TAKER] {symbol}: Taker order placed but fill not confirmed "
-                            f"(expected={size_coins:.6f}, delta={size_delta:.6f})"
+                            f"(expected={size_coins:.6f}, filled={_fill_ratio(state) * size_coins:.6f})"
                         )
                 else:
                     logger.error(f"❌ [X10 TAKER] {symbol}: Taker order placement failed!")
@@ -2599,6 +2306,7 @@ class ParallelExecutionManager:
                 logger.error(f"❌ [X10 TAKER] {symbol}: Taker exception: {e}", exc_info=True)
         
         # All attempts failed
+        self._forget_x10_orders(placed_order_ids)
         total_time = time.monotonic() - total_start
         logger.error(
             f"❌ [X10 MAKER] {symbol}: All attempts FAILED! "
@@ -2606,6 +2314,10 @@ class ParallelExecutionManager:
         )
         return False, current_order_id, used_taker
 
+    def _forget_x10_orders(self, order_ids: List[str]) -> None:
+        for order_id in order_ids:
+            self._order_tracker.forget("x10", order_id)
+
 
     async def _get_fresh_maker_price(self, symbol: str, side: str) -> Optional[float]:
         """
@@ -2984,7 +2696,7 @@ class ParallelExecutionManager:
             
             if provider:
                 # Check if in post-reconnect cooldown
-                if provider.is_in_cooldown():
+                if provider.is_in_cooldown(symbol):
                     remaining = provider.get_cooldown_remaining()
                     # ═══════════════════════════════════════════════════════════════
                     # IMPROVEMENT: During cooldown, try to fetch fresh REST snapshot
@@ -2994,9 +2706,13 @@ class ParallelExecutionManager:
                     logger.info(f"⏱️ {symbol}: Post-reconnect cooldown ({remaining:.1f}s) - fetching fresh REST snapshot...")
                     
                     try:
-                        fresh_snapshot = await provider.fetch_orderbook_rest_fallback(
-                            symbol, "lighter", retry_on_crossed=True
-                        )
+                        if provider.needs_resync(symbol, "lighter"):
+                            # Per-symbol resync: snapshot + replay of buffered WS deltas
+                            fresh_snapshot = await provider.resync_lighter_symbol(symbol)
+                        else:
+                            fresh_snapshot = await provider.fetch_orderbook_rest_fallback(
+                                symbol, "lighter", retry_on_crossed=True
+                            )
                         if fresh_snapshot and fresh_snapshot.best_ask and fresh_snapshot.best_bid:
                             if fresh_snapshot.best_ask > fresh_snapshot.best_bid:
                                 logger.info(f"✅ {symbol}: Fresh REST snapshot OK during cooldown - proceeding with validation")
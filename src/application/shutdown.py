@@ -327,6 +327,8 @@ class ShutdownOrchestrator:
         
         logger.warning(f"⚠️ Final sweep found {len(positions_to_close)} positions to close!")
         
+        use_flatten = self._use_lighter_flatten(lighter)
+        flatten_batch = []
         for exchange_name, adapter, pos in positions_to_close:
             symbol = pos.get("symbol")
             size = self._safe_float(pos.get("size", 0))
@@ -378,6 +380,10 @@ class ShutdownOrchestrator:
                     data["x10_side"] = pos.get("side", "")
                     self._position_pnl_data[symbol] = data
             
+            if exchange_name == "lighter" and use_flatten:
+                flatten_batch.append(pos)
+                continue
+            
             try:
                 # original_side is the side of the POSITION (BUY for long, SELL for short)
                 original_side = "BUY" if size > 0 else "SELL"
@@ -429,6 +435,11 @@ class ShutdownOrchestrator:
                 errors.append(f"final_close_error:{exchange_name}:{symbol}:{e}")
                 logger.error(f"❌ Final close error {symbol}: {e}")
         
+        if flatten_batch:
+            logger.info(f"🚨 Final close: flattening {len(flatten_batch)} Lighter positions in one batch")
+            if not await self._flatten_lighter_with_tracking(lighter, flatten_batch, errors, record_pnl=False):
+                errors.append("final_close_failed:lighter:flatten")
+        
         # Verify all closed
         await asyncio.sleep(1.0)
         final_check = await self._fetch_positions()
@@ -655,6 +666,8 @@ class ShutdownOrchestrator:
 
             # Close Lighter positions with escalating slippage (price from WS cache first)
             lighter_tasks = []
+            use_flatten = self._use_lighter_flatten(lighter)
+            flatten_batch = []
             for pos in positions["lighter"]:
                 size = self._safe_float(pos.get("size", 0))
                 if size == 0:
@@ -698,6 +711,11 @@ class ShutdownOrchestrator:
                         f"rPnL=${realized_pnl:.4f}, funding=${total_funding:.4f}, entry=${avg_entry:.6f}"
                     )
                 
+                if use_flatten:
+                    # All Lighter positions go out together as one transaction batch
+                    flatten_batch.append(pos)
+                    continue
+
                 close_side = "SELL" if size > 0 else "BUY"
                 price = self._get_cached_price(symbol)
 
@@ -715,6 +733,10 @@ class ShutdownOrchestrator:
                 except Exception as e:  # noqa: BLE001
                     errors.append(f"lighter_close_prepare:{symbol}:{e}")
 
+            if flatten_batch:
+                logger.info(f"🛑 Flattening {len(flatten_batch)} Lighter positions in one batch (IOC reduce_only)")
+                lighter_tasks.append(self._flatten_lighter_with_tracking(lighter, flatten_batch, errors))
+
             close_tasks = []
             if x10_tasks:
                 close_tasks.extend(x10_tasks)
@@ -851,178 +873,7 @@ class ShutdownOrchestrator:
                 await self._mark_closed("lighter", symbol)
                 logger.info(f"✅ Lighter {symbol} closed and tracked")
                 
-                # ═══════════════════════════════════════════════════════════════
-                # PNL FIX: Try Lighter API first (Grok's suggestion), then X10 proxy
-                # Priority:
-                # 1. Lighter AccountApi.get_account_pnl() - direct API (if it works)
-                # 2. X10 fill price as proxy (reliable fallback)
-                # 3. Orderbook mid-price (last resort)
-                # ═══════════════════════════════════════════════════════════════
-                try:
-                    await asyncio.sleep(0.5)  # Wait for fills to settle
-                    
-                    pre_close_data = self._position_pnl_data.get(symbol, {})
-                    entry_price = pre_close_data.get("avg_entry_price", 0.0)
-                    position_size = abs(size)
-                    
-                    closed_pnl = None
-                    pnl_source = "unknown"
-                    close_price = 0.0
-                    
-                    # ═══════════════════════════════════════════════════════════════
-                    # PRIORITY 1: Try Lighter accountInactiveOrders for the REAL close fill price
-                    #
-                    # Uses fetch_my_trades() which calls /api/v1/accountInactiveOrders
-                    # to get filled orders with price data. Retries briefly as trades
-                    # may appear with slight delay after order execution.
-                    # ═══════════════════════════════════════════════════════════════
-                    if hasattr(lighter, "fetch_my_trades"):
-                        try:
-                            desired_side = str(close_side or "").upper()
-                            now_ts = time.time()
-                            entry_time = pre_close_data.get("entry_time") or (now_ts - 600)
-                            try:
-                                entry_time = float(entry_time)
-                            except Exception:
-                                entry_time = now_ts - 600
-
-                            def _ts_to_sec(v) -> Optional[float]:
-                                """Best-effort timestamp normalizer for accountTrades."""
-                                if v is None:
-                                    return None
-                                # Numeric unix timestamps (seconds or ms)
-                                if isinstance(v, (int, float)):
-                                    vv = float(v)
-                                    if vv > 1e12:  # ms
-                                        return vv / 1000.0
-                                    if vv > 1e10:  # ms-ish
-                                        return vv / 1000.0
-                                    return vv
-                                # ISO strings
-                                try:
-                                    s = str(v).strip()
-                                    if not s:
-                                        return None
-                                    # Lighter sometimes returns ms epoch as string
-                                    if s.isdigit():
-                                        vv = float(s)
-                                        return vv / 1000.0 if vv > 1e12 else vv
-                                    if s.endswith("Z"):
-                                        s = s.replace("Z", "+00:00")
-                                    return __import__("datetime").datetime.fromisoformat(s).timestamp()
-                                except Exception:
-                                    return None
-
-                            # Retry: trades may appear a bit after the close completes
-                            for _ in range(10):
-                                trades = await lighter.fetch_my_trades(symbol, limit=50, force=True)
-                                parsed = []
-                                for t in (trades or []):
-                                    try:
-                                        p = float(t.get("price") or 0)
-                                        if p <= 0:
-                                            continue
-                                        ts = _ts_to_sec(t.get("timestamp"))
-                                        if ts is None:
-                                            continue
-                                        s = str(t.get("side") or "").upper()
-                                        parsed.append((ts, s, p))
-                                    except Exception:
-                                        continue
-
-                                # Most recent first
-                                parsed.sort(key=lambda x: x[0], reverse=True)
-
-                                # Prefer a trade on the desired side close to this position lifecycle.
-                                # We allow some slack because we might not have an exact entry_time.
-                                for ts, s, p in parsed:
-                                    if desired_side and s != desired_side:
-                                        continue
-                                    if ts < (entry_time - 60):
-                                        continue
-                                    close_price = p
-                                    pnl_source = "lighter_accountTrades"
-                                    break
-
-                                if close_price > 0:
-                                    logger.info(f"✅ {symbol} Using Lighter accountTrades close price: ${close_price:.6f}")
-                                    break
-
-                                await asyncio.sleep(0.75)
-                        except Exception as api_err:
-                            logger.debug(f"Lighter accountTrades close-price fetch failed: {api_err}")
-                    
-                    # ═══════════════════════════════════════════════════════════════
-                    # PRIORITY 2: X10 fill price as close price proxy (fallback only)
-                    # Only use if we didn't get Lighter close price from PRIORITY 1
-                    # ═══════════════════════════════════════════════════════════════
-                    if close_price == 0.0:
-                        x10 = self._components.get("x10")
-                        if x10 and hasattr(x10, 'get_last_close_price'):
-                            x10_price, x10_qty, x10_fee = x10.get_last_close_price(symbol)
-                            if x10_price > 0:
-                                close_price = x10_price
-                                pnl_source = "x10_fill_proxy"
-                                logger.debug(f"[PNL] {symbol}: Using X10 fill price ${x10_price:.6f} (fallback)")
-                    
-                    # ═══════════════════════════════════════════════════════════════
-                    # PRIORITY 3: Orderbook mid-price (last resort)
-                    # ═══════════════════════════════════════════════════════════════
-                    if closed_pnl is None and close_price == 0.0:
-                        if hasattr(lighter, '_rest_get'):
-                            try:
-                                market = lighter.market_info.get(symbol, {})
-                                market_index = market.get('i') or market.get('market_id')
-                                if market_index:
-                                    resp = await lighter._rest_get(
-                                        "/api/v1/orderBookDetails", 
-                                        params={"market_index": int(market_index)},
-                                        force=True
-                                    )
-                                    if resp:
-                                        best_bid = float(resp.get('best_bid_price', 0) or 0)
-                                        best_ask = float(resp.get('best_ask_price', 0) or 0)
-                                        if best_bid > 0 and best_ask > 0:
-                                            close_price = (best_bid + best_ask) / 2
-                                            pnl_source = "orderbook_mid"
-                            except Exception:
-                                pass
-                        
-                        # Ultimate fallback
-                        if close_price == 0.0:
-                            try:
-                                close_price = float(lighter.get_price(symbol) or price or 0)
-                                pnl_source = "cached_price"
-                            except Exception:
-                                close_price = 0.0
-                    
-                    # Calculate PnL if not from direct API
-                    if closed_pnl is None and entry_price > 0 and close_price > 0 and position_size > 0:
-                        if close_side.upper() == "BUY":  # Closing a SHORT
-                            closed_pnl = (entry_price - close_price) * position_size
-                        else:  # Closing a LONG
-                            closed_pnl = (close_price - entry_price) * position_size
-                    
-                    # Store result
-                    if closed_pnl is not None:
-                        self._position_pnl_data[symbol] = {
-                            **pre_close_data,
-                            "total_pnl": closed_pnl,
-                            "unrealized_pnl": 0.0,
-                            "realized_pnl": closed_pnl,
-                            "closed_size": position_size,
-                            "entry_price": entry_price,
-                            "close_price": close_price,
-                            "source": pnl_source
-                        }
-                        logger.info(
-                            f"💰 {symbol} Lighter Closed PnL: ${closed_pnl:.4f} "
-                            f"(entry=${entry_price:.6f}, close=${close_price:.6f}, "
-                            f"size={position_size:.4f}, source={pnl_source})"
-                        )
-                            
-                except Exception as pnl_err:
-                    logger.debug(f"⚠️ {symbol} Could not calculate post-close PnL: {pnl_err}")
+                await self._record_lighter_close_pnl(lighter, symbol, close_side, size, price)
             
             return success, order_id
             
@@ -1051,6 +902,242 @@ class ShutdownOrchestrator:
             logger.error(f"❌ Lighter close error {symbol}: {e}")
             return False, None
 
+    async def _record_lighter_close_pnl(
+        self,
+        lighter,
+        symbol: str,
+        close_side: str,
+        size: float,
+        price: Optional[float],
+    ) -> None:
+        """Resolve the close price of a just-closed Lighter position and store its PnL."""
+        # ═══════════════════════════════════════════════════════════════
+        # PNL FIX: Try Lighter API first (Grok's suggestion), then X10 proxy
+        # Priority:
+        # 1. Lighter AccountApi.get_account_pnl() - direct API (if it works)
+        # 2. X10 fill price as proxy (reliable fallback)
+        # 3. Orderbook mid-price (last resort)
+        # ═══════════════════════════════════════════════════════════════
+        try:
+            await asyncio.sleep(0.5)  # Wait for fills to settle
+            
+            pre_close_data = self._position_pnl_data.get(symbol, {})
+            entry_price = pre_close_data.get("avg_entry_price", 0.0)
+            position_size = abs(size)
+            
+            closed_pnl = None
+            pnl_source = "unknown"
+            close_price = 0.0
+            
+            # ═══════════════════════════════════════════════════════════════
+            # PRIORITY 1: Try Lighter accountInactiveOrders for the REAL close fill price
+            #
+            # Uses fetch_my_trades() which calls /api/v1/accountInactiveOrders
+            # to get filled orders with price data. Retries briefly as trades
+            # may appear with slight delay after order execution.
+            # ═══════════════════════════════════════════════════════════════
+            if hasattr(lighter, "fetch_my_trades"):
+                try:
+                    desired_side = str(close_side or "").upper()
+                    now_ts = time.time()
+                    entry_time = pre_close_data.get("entry_time") or (now_ts - 600)
+                    try:
+                        entry_time = float(entry_time)
+                    except Exception:
+                        entry_time = now_ts - 600
+
+                    def _ts_to_sec(v) -> Optional[float]:
+                        """Best-effort timestamp normalizer for accountTrades."""
+                        if v is None:
+                            return None
+                        # Numeric unix timestamps (seconds or ms)
+                        if isinstance(v, (int, float)):
+                            vv = float(v)
+                            if vv > 1e12:  # ms
+                                return vv / 1000.0
+                            if vv > 1e10:  # ms-ish
+                                return vv / 1000.0
+                            return vv
+                        # ISO strings
+                        try:
+                            s = str(v).strip()
+                            if not s:
+                                return None
+                            # Lighter sometimes returns ms epoch as string
+                            if s.isdigit():
+                                vv = float(s)
+                                return vv / 1000.0 if vv > 1e12 else vv
+                            if s.endswith("Z"):
+                                s = s.replace("Z", "+00:00")
+                            return __import__("datetime").datetime.fromisoformat(s).timestamp()
+                        except Exception:
+                            return None
+
+                    # Retry: trades may appear a bit after the close completes
+                    for _ in range(10):
+                        trades = await lighter.fetch_my_trades(symbol, limit=50, force=True)
+                        parsed = []
+                        for t in (trades or []):
+                            try:
+                                p = float(t.get("price") or 0)
+                                if p <= 0:
+                                    continue
+                                ts = _ts_to_sec(t.get("timestamp"))
+                                if ts is None:
+                                    continue
+                                s = str(t.get("side") or "").upper()
+                                parsed.append((ts, s, p))
+                            except Exception:
+                                continue
+
+                        # Most recent first
+                        parsed.sort(key=lambda x: x[0], reverse=True)
+
+                        # Prefer a trade on the desired side close to this position lifecycle.
+                        # We allow some slack because we might not have an exact entry_time.
+                        for ts, s, p in parsed:
+                            if desired_side and s != desired_side:
+                                continue
+                            if ts < (entry_time - 60):
+                                continue
+                            close_price = p
+                            pnl_source = "lighter_accountTrades"
+                            break
+
+                        if close_price > 0:
+                            logger.info(f"✅ {symbol} Using Lighter accountTrades close price: ${close_price:.6f}")
+                            break
+
+                        await asyncio.sleep(0.75)
+                except Exception as api_err:
+                    logger.debug(f"Lighter accountTrades close-price fetch failed: {api_err}")
+            
+            # ═══════════════════════════════════════════════════════════════
+            # PRIORITY 2: X10 fill price as close price proxy (fallback only)
+            # Only use if we didn't get Lighter close price from PRIORITY 1
+            # ═══════════════════════════════════════════════════════════════
+            if close_price == 0.0:
+                x10 = self._components.get("x10")
+                if x10 and hasattr(x10, 'get_last_close_price'):
+                    x10_price, x10_qty, x10_fee = x10.get_last_close_price(symbol)
+                    if x10_price > 0:
+                        close_price = x10_price
+                        pnl_source = "x10_fill_proxy"
+                        logger.debug(f"[PNL] {symbol}: Using X10 fill price ${x10_price:.6f} (fallback)")
+            
+            # ═══════════════════════════════════════════════════════════════
+            # PRIORITY 3: Orderbook mid-price (last resort)
+            # ═══════════════════════════════════════════════════════════════
+            if closed_pnl is None and close_price == 0.0:
+                if hasattr(lighter, '_rest_get'):
+                    try:
+                        market = lighter.market_info.get(symbol, {})
+                        market_index = market.get('i') or market.get('market_id')
+                        if market_index:
+                            resp = await lighter._rest_get(
+                                "/api/v1/orderBookDetails", 
+                                params={"market_index": int(market_index)},
+                                force=True
+                            )
+                            if resp:
+                                best_bid = float(resp.get('best_bid_price', 0) or 0)
+                                best_ask = float(resp.get('best_ask_price', 0) or 0)
+                                if best_bid > 0 and best_ask > 0:
+                                    close_price = (best_bid + best_ask) / 2
+                                    pnl_source = "orderbook_mid"
+                    except Exception:
+                        pass
+                
+                # Ultimate fallback
+                if close_price == 0.0:
+                    try:
+                        close_price = float(lighter.get_price(symbol) or price or 0)
+                        pnl_source = "cached_price"
+                    except Exception:
+                        close_price = 0.0
+            
+            # Calculate PnL if not from direct API
+            if closed_pnl is None and entry_price > 0 and close_price > 0 and position_size > 0:
+                if close_side.upper() == "BUY":  # Closing a SHORT
+                    closed_pnl = (entry_price - close_price) * position_size
+                else:  # Closing a LONG
+                    closed_pnl = (close_price - entry_price) * position_size
+            
+            # Store result
+            if closed_pnl is not None:
+                self._position_pnl_data[symbol] = {
+                    **pre_close_data,
+                    "total_pnl": closed_pnl,
+                    "unrealized_pnl": 0.0,
+                    "realized_pnl": closed_pnl,
+                    "closed_size": position_size,
+                    "entry_price": entry_price,
+                    "close_price": close_price,
+                    "source": pnl_source
+                }
+                logger.info(
+                    f"💰 {symbol} Lighter Closed PnL: ${closed_pnl:.4f} "
+                    f"(entry=${entry_price:.6f}, close=${close_price:.6f}, "
+                    f"size={position_size:.4f}, source={pnl_source})"
+                )
+                    
+        except Exception as pnl_err:
+            logger.debug(f"⚠️ {symbol} Could not calculate post-close PnL: {pnl_err}")
+
+    def _use_lighter_flatten(self, lighter) -> bool:
+        return bool(
+            lighter
+            and getattr(config, "LIGHTER_FLATTEN_BATCH_ENABLED", True)
+            and hasattr(lighter, "flatten_positions")
+        )
+
+    async def _flatten_lighter_with_tracking(
+        self,
+        lighter,
+        positions: List[Dict[str, Any]],
+        errors: List[str],
+        record_pnl: bool = True,
+    ) -> bool:
+        """
+        Close all given Lighter positions with ONE batched flatten
+        (reduce-only IOC, sendTxBatch) instead of one close call per symbol.
+        Closed symbols are tracked; residuals are left for the next attempt.
+        """
+        sizes = {p.get("symbol"): self._safe_float(p.get("size", 0)) for p in positions}
+        try:
+            result = await lighter.flatten_positions(positions)
+        except Exception as e:
+            errors.append(f"lighter_flatten_error:{e}")
+            logger.error(f"❌ Lighter batch flatten error: {e}")
+            return False
+
+        for symbol in result.closed:
+            await self._mark_closed("lighter", symbol)
+        for symbol in result.skipped:
+            errors.append(f"lighter_flatten_skipped:{symbol}")
+        if result.residual:
+            logger.warning(f"⚠️ Lighter flatten residuals: {result.residual}")
+        logger.info(
+            f"✅ Lighter flatten: {len(result.closed)}/{len(sizes)} closed and tracked "
+            f"({result.batches} batch(es), {result.elapsed_ms:.0f}ms)"
+        )
+
+        if record_pnl and result.closed:
+            await asyncio.gather(
+                *(
+                    self._record_lighter_close_pnl(
+                        lighter,
+                        symbol,
+                        "SELL" if sizes.get(symbol, 0.0) > 0 else "BUY",
+                        abs(sizes.get(symbol, 0.0)),
+                        self._get_cached_price(symbol),
+                    )
+                    for symbol in result.closed
+                ),
+                return_exceptions=True,
+            )
+        return result.ok
+
     async def _persist_state(self, errors: List[str]) -> None:
         """Persist state and db using compute_hedge_pnl for accurate calculations."""
         state_manager = self._components.get("state_manager")
@@ -1272,7 +1359,9 @@ class ShutdownOrchestrator:
                             f"fees=${float(hedge_result['fee_total']):.4f})"
                         )
                     
-                    await state_manager.close_trade(symbol, pnl=total_pnl, funding=total_funding)
+                    await state_manager.close_trade(
+                        symbol, pnl=total_pnl, funding=total_funding, fees=float(hedge_result["fee_total"])
+                    )
                     logger.info(f"📝 Shutdown: Marked {symbol} as closed in DB (PnL=${total_pnl:.4f}, Funding=${total_funding:.4f})")
                 except Exception as e:
                     logger.warning(f"⚠️ Shutdown: Could not mark {symbol} as closed: {e}")
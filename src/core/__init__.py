@@ -16,6 +16,7 @@ from .state import (
     add_trade_to_state,
     close_trade_in_state,
     archive_trade_to_history,
+    update_trade_history,
     get_cached_positions,
     get_execution_lock,
     get_symbol_lock,
@@ -25,6 +26,7 @@ from .state import (
 
 from .opportunities import (
     find_opportunities,
+    capture_scan_snapshot,
     calculate_expected_profit,
     is_tradfi_or_fx,
 )
@@ -50,6 +52,11 @@ from .trade_management import (
     reconcile_state_with_exchange,
     get_cached_positions,
     manage_open_trades,
+    evaluate_trade_exit,
+    execute_trade_exit,
+    get_exit_pipeline,
+    get_settlement_queue,
+    requeue_provisional_settlements,
 )
 
 from .monitoring import (
@@ -77,7 +84,10 @@ from .circuit_breaker import CircuitBreaker
 from .latency_arb import LatencyArbDetector, get_detector, is_latency_arb_enabled
 from .open_interest_tracker import OpenInterestTracker, get_oi_tracker, init_oi_tracker
 from .event_loop import BotEventLoop, TaskPriority, get_event_loop
+from .task_scheduler import TaskScheduler, get_task_scheduler
 from .interfaces import ExchangeAdapter, Position, OrderResult
+from .market_snapshot import MarketSnapshot, SymbolQuote, BookTop
+from .admission import AdmissionGate, AdmissionDecision, get_admission_gate
 
 __all__ = [
     # Interfaces
@@ -89,6 +99,7 @@ __all__ = [
     'add_trade_to_state',
     'close_trade_in_state',
     'archive_trade_to_history',
+    'update_trade_history',
     'get_cached_positions',
     'get_execution_lock',
     'get_symbol_lock',
@@ -96,10 +107,17 @@ __all__ = [
     'check_total_exposure',
     # Opportunities
     'find_opportunities',
+    'capture_scan_snapshot',
+    'MarketSnapshot',
+    'SymbolQuote',
+    'BookTop',
     'calculate_expected_profit',
     'is_tradfi_or_fx',
     # Trading
     'execute_trade_parallel',
+    'AdmissionGate',
+    'AdmissionDecision',
+    'get_admission_gate',
     'execute_trade_task',
     'launch_trade_task',
     'close_trade',
@@ -114,6 +132,11 @@ __all__ = [
     'should_farm_quick_exit',
     'parse_iso_time',
     'manage_open_trades',
+    'evaluate_trade_exit',
+    'execute_trade_exit',
+    'get_exit_pipeline',
+    'get_settlement_queue',
+    'requeue_provisional_settlements',
     'reconcile_db_with_exchanges',
     'reconcile_state_with_exchange',
     # Monitoring
@@ -144,6 +167,8 @@ __all__ = [
     'BotEventLoop',
     'TaskPriority',
     'get_event_loop',
+    'TaskScheduler',
+    'get_task_scheduler',
 ]
 
 
@@ -0,0 +1,366 @@
+# src/core/admission.py
+"""
+Pre-trade admission gate served from in-memory account state.
+
+execute_trade_parallel used to make a REST round trip to both exchanges for
+every candidate before any order went out (positions, open trades twice,
+balances one after the other in check_total_exposure, min notionals and
+balances again, mark prices). The AdmissionGate keeps everything the entry
+checks need in memory:
+
+- positions per exchange: full REST sync by the background refresher,
+  patched in between by the position stream (OrderStateTracker listener)
+  and by fresh MarketSnapshots
+- open trades (notional per symbol): full sync + add/close hooks in state.py
+- available balances of both exchanges
+- in-flight margin reservations (IN_FLIGHT_MARGIN) per symbol
+- market minimums (max of both exchanges' min_notional_usd)
+
+``admit(symbol, size_usd)`` answers "may this symbol open at this size"
+synchronously and reserves the margin in the same step - there is no await
+between check and reservation, so concurrent entries cannot spend the same
+margin twice. Only when a part of the state is older than
+ADMISSION_MAX_STATE_AGE_SECONDS the caller refreshes it (staleness fallback).
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import config
+from src.utils import safe_decimal, safe_float
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES = ("x10", "lighter")
+_ZERO = Decimal('0')
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    """Result of one admission check (sizes in USD, Decimal)."""
+    ok: bool
+    reason: str = ""
+    size_usd: Decimal = _ZERO
+    margin_usd: Decimal = _ZERO
+    leverage: Decimal = _ZERO
+
+
+class AdmissionGate:
+    """In-memory positions / exposure / margin / minimums with synchronous ``admit()``."""
+
+    def __init__(self, max_age: Optional[float] = None, refresh_interval: Optional[float] = None):
+        self.max_age = float(
+            max_age if max_age is not None else getattr(config, 'ADMISSION_MAX_STATE_AGE_SECONDS', 30.0)
+        )
+        self.refresh_interval = float(
+            refresh_interval if refresh_interval is not None
+            else getattr(config, 'ADMISSION_REFRESH_INTERVAL_SECONDS', 5.0)
+        )
+        self._positions: Dict[str, Dict[str, float]] = {ex: {} for ex in EXCHANGES}
+        self._positions_at: Dict[str, float] = {}
+        self._balances: Dict[str, Decimal] = {}
+        self._balances_at: Optional[float] = None
+        self._open_trades: Dict[str, Decimal] = {}
+        self._trades_at: Optional[float] = None
+        self._min_notional: Dict[str, Decimal] = {}
+        self._reservations: Dict[str, Tuple[Decimal, Decimal]] = {}  # symbol -> (margin, notional)
+        # Legacy view (trading.IN_FLIGHT_MARGIN), kept in sync by reserve/release
+        self.in_flight: Dict[str, Decimal] = {'X10': _ZERO, 'Lighter': _ZERO}
+        self._refresh_lock = asyncio.Lock()
+        self._stats = {"admitted": 0, "rejected": 0, "stale_refreshes": 0, "refreshes": 0, "stream_updates": 0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Feeding
+    # ═══════════════════════════════════════════════════════════════
+
+    def set_positions(self, exchange: str, sizes: Dict[str, float], at: Optional[float] = None) -> None:
+        """Replace the positions of one exchange (full sync). Older data never wins."""
+        at = at if at is not None else time.time()
+        if at < self._positions_at.get(exchange, 0.0):
+            return
+        self._positions[exchange] = {s: safe_float(v) for s, v in sizes.items() if abs(safe_float(v)) > 1e-8}
+        self._positions_at[exchange] = at
+
+    def update_position(self, exchange: str, symbol: str, size: float, **_: Any) -> None:
+        """Patch one position from a stream update (OrderStateTracker listener)."""
+        if exchange not in self._positions or not symbol:
+            return
+        self._stats["stream_updates"] += 1
+        if abs(size) > 1e-8:
+            self._positions[exchange][symbol] = size
+        else:
+            self._positions[exchange].pop(symbol, None)
+
+    def set_balances(self, x10: Any, lighter: Any, at: Optional[float] = None) -> None:
+        at = at if at is not None else time.time()
+        if self._balances_at is not None and at < self._balances_at:
+            return
+        self._balances = {"x10": safe_decimal(x10), "lighter": safe_decimal(lighter)}
+        self._balances_at = at
+
+    def set_open_trades(self, trades: Iterable[Dict[str, Any]], at: Optional[float] = None) -> None:
+        self._open_trades = {
+            t['symbol']: safe_decimal(t.get('size_usd') or t.get('notional_usd') or 0)
+            for t in trades or [] if t.get('symbol')
+        }
+        self._trades_at = at if at is not None else time.time()
+
+    def note_trade_opened(self, symbol: str, size_usd: Any) -> None:
+        """Hook: add_trade_to_state (PENDING / OPEN record)."""
+        self._open_trades[symbol] = safe_decimal(size_usd)
+
+    def note_trade_closed(self, symbol: str) -> None:
+        """Hook: close_trade_in_state / rollback."""
+        self._open_trades.pop(symbol, None)
+
+    def set_min_notional(self, symbol: str, *minimums: Any) -> None:
+        self._min_notional[symbol] = max((safe_decimal(m) for m in minimums), default=_ZERO)
+
+    def ingest_snapshot(self, snapshot) -> None:
+        """Take positions / balances of a MarketSnapshot (only if newer than ours)."""
+        if snapshot is None:
+            return
+        if snapshot.positions_at is not None:
+            for ex in EXCHANGES:
+                if ex in snapshot.positions:
+                    self.set_positions(ex, dict(snapshot.positions[ex]), at=snapshot.positions_at)
+        if snapshot.balances_at is not None and all(ex in snapshot.balances for ex in EXCHANGES):
+            self.set_balances(snapshot.balance("x10"), snapshot.balance("lighter"), at=snapshot.balances_at)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Freshness / REST refresh (off the entry path)
+    # ═══════════════════════════════════════════════════════════════
+
+    def _fresh(self, ts: Optional[float]) -> bool:
+        return ts is not None and time.time() - ts <= self.max_age
+
+    def stale_parts(self) -> List[str]:
+        parts = []
+        if not all(self._fresh(self._positions_at.get(ex)) for ex in EXCHANGES):
+            parts.append("positions")
+        if not self._fresh(self._balances_at):
+            parts.append("balances")
+        if not self._fresh(self._trades_at):
+            parts.append("trades")
+        return parts
+
+    def is_ready(self) -> bool:
+        return not self.stale_parts()
+
+    async def refresh(
+        self,
+        lighter,
+        x10,
+        get_open_trades: Optional[Callable[[], Awaitable[List[Dict[str, Any]]]]] = None,
+        parts: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> None:
+        """REST sync of the given (default: all) parts, fetched concurrently."""
+        if get_open_trades is None:
+            from src.core.state import get_open_trades
+        parts = set(parts if parts is not None else ("positions", "balances", "trades"))
+
+        async with self._refresh_lock:
+            jobs: Dict[str, Callable[[], Awaitable]] = {}
+            if "positions" in parts:
+                jobs["pos_x10"] = x10.fetch_open_positions
+                jobs["pos_lighter"] = lighter.fetch_open_positions
+            if "balances" in parts:
+                jobs["bal_x10"] = x10.get_available_balance
+                jobs["bal_lighter"] = lighter.get_available_balance
+            if "trades" in parts:
+                jobs["trades"] = get_open_trades
+
+            async def _call(fn):
+                return await fn()
+
+            started = time.time()
+            results = dict(zip(jobs, await asyncio.gather(*(_call(fn) for fn in jobs.values()),
+                                                          return_exceptions=True)))
+            self._stats["refreshes"] += 1
+
+            from src.core.market_snapshot import positions_by_symbol
+            for ex in EXCHANGES:
+                res = results.get(f"pos_{ex}")
+                if res is None:
+                    continue
+                if isinstance(res, Exception):
+                    logger.warning(f"[ADMISSION] {ex} positions refresh failed: {res}")
+                else:
+                    self.set_positions(ex, positions_by_symbol(res), at=started)
+            if "bal_x10" in results:
+                bal_x10, bal_lit = results["bal_x10"], results["bal_lighter"]
+                if isinstance(bal_x10, Exception) or isinstance(bal_lit, Exception):
+                    logger.warning(f"[ADMISSION] balance refresh failed: x10={bal_x10!r} lighter={bal_lit!r}")
+                else:
+                    self.set_balances(bal_x10, bal_lit, at=started)
+            if "trades" in results:
+                if isinstance(results["trades"], Exception):
+                    logger.warning(f"[ADMISSION] open trades refresh failed: {results['trades']}")
+                else:
+                    self.set_open_trades(results["trades"], at=started)
+
+            if symbols is None:
+                symbols = set(getattr(x10, 'market_info', {}) or {}) & set(getattr(lighter, 'market_info', {}) or {})
+            for symbol in symbols:
+                await self.refresh_min_notional(symbol, lighter, x10)
+
+    async def ensure_fresh(self, lighter, x10, symbol: str,
+                           get_open_trades: Optional[Callable[[], Awaitable[List[Dict[str, Any]]]]] = None) -> None:
+        """Staleness fallback on the entry path: REST only for the parts that went stale."""
+        stale = self.stale_parts()
+        if stale:
+            self._stats["stale_refreshes"] += 1
+            logger.debug(f"[ADMISSION] {symbol}: refreshing stale {stale}")
+            await self.refresh(lighter, x10, get_open_trades=get_open_trades, parts=stale, symbols=[symbol])
+        elif symbol not in self._min_notional:
+            await self.refresh_min_notional(symbol, lighter, x10)
+
+    async def refresh_min_notional(self, symbol: str, lighter, x10) -> None:
+        minimums = []
+        for adapter in (x10, lighter):
+            try:
+                value = adapter.min_notional_usd(symbol)
+                if inspect.isawaitable(value):
+                    value = await value
+                minimums.append(value)
+            except Exception as e:
+                logger.debug(f"[ADMISSION] min_notional_usd {symbol} failed: {e}")
+        if minimums:
+            self.set_min_notional(symbol, *minimums)
+
+    async def run(self, lighter, x10) -> None:
+        """Background refresher: keeps the state warm so admit() never waits on REST."""
+        while not getattr(config, 'IS_SHUTTING_DOWN', False):
+            try:
+                await self.refresh(lighter, x10)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[ADMISSION] refresh error: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Admission (synchronous, in-memory)
+    # ═══════════════════════════════════════════════════════════════
+
+    def _reject(self, reason: str, **kwargs) -> AdmissionDecision:
+        self._stats["rejected"] += 1
+        return AdmissionDecision(False, reason, **kwargs)
+
+    def position_size(self, exchange: str, symbol: str) -> float:
+        return self._positions.get(exchange, {}).get(symbol, 0.0)
+
+    def admit(
+        self,
+        symbol: str,
+        size_usd: Any = None,
+        busy_symbols: Iterable[str] = (),
+        reserve: bool = True,
+    ) -> AdmissionDecision:
+        """
+        May ``symbol`` open now? Checks max positions, existing positions /
+        trades, total exposure vs LEVERAGE_MULTIPLIER and margin, then sizes
+        the trade and (``reserve=True``) reserves its margin on both exchanges.
+        """
+        stale = self.stale_parts()
+        if stale:
+            return self._reject(f"Admission state stale ({', '.join(stale)})")
+
+        # Max open positions (exchange positions | state | running entries)
+        max_positions = int(getattr(config, 'MAX_OPEN_POSITIONS', getattr(config, 'MAX_OPEN_TRADES', 40)))
+        if max_positions > 0:
+            active = set(self._open_trades) | set(self._reservations) | {s for s in busy_symbols if s}
+            for by_symbol in self._positions.values():
+                active |= set(by_symbol)
+            if len(active) >= max_positions:
+                return self._reject(f"Max open positions reached ({len(active)}/{max_positions})")
+
+        for ex in EXCHANGES:
+            size = self.position_size(ex, symbol)
+            if abs(size) > 1e-8:
+                label = "X10" if ex == "x10" else "Lighter"
+                return self._reject(f"already open on {label} (size={size})")
+        if symbol in self._open_trades:
+            return self._reject("already open in state")
+        if symbol in self._reservations:
+            return self._reject("entry already in flight")
+
+        # Exposure (open trades + in-flight notional + this trade) vs total balance
+        trade_size = safe_decimal(size_usd or getattr(config, 'DESIRED_NOTIONAL_USD', 500))
+        raw_x10 = self._balances.get("x10", _ZERO)
+        raw_lit = self._balances.get("lighter", _ZERO)
+        total_balance = raw_x10 + raw_lit
+        max_leverage = safe_decimal(getattr(config, 'LEVERAGE_MULTIPLIER', 5))
+        if max_leverage <= 0:
+            max_leverage = Decimal('1')
+        if total_balance <= 0:
+            return self._reject("No available balance on either exchange")
+        exposure = sum(self._open_trades.values(), _ZERO)
+        exposure += sum((n for s, (_, n) in self._reservations.items() if s not in self._open_trades), _ZERO)
+        current_leverage = ((exposure + trade_size) / total_balance).quantize(Decimal('0.0001'))
+        if current_leverage > max_leverage:
+            return self._reject(f"Exposure limit ({current_leverage}x > {max_leverage}x)")
+
+        # Sizing against market minimums and free margin (minus in-flight reservations)
+        min_req = self._min_notional.get(symbol, _ZERO)
+        max_trade = safe_decimal(getattr(config, 'MAX_TRADE_SIZE_USD', 600.0))
+        if min_req > max_trade:
+            return self._reject(f"Min notional ${min_req:.2f} > MAX_TRADE_SIZE_USD")
+
+        available = min(
+            max(_ZERO, raw_x10 - self.in_flight['X10']),
+            max(_ZERO, raw_lit - self.in_flight['Lighter']),
+        )
+        desired = safe_decimal(getattr(config, 'DESIRED_NOTIONAL_USD', 80.0))
+        final_usd = max(desired, min_req)
+        leverage = safe_decimal(getattr(config, 'LEVERAGE_MULTIPLIER', 1.0))
+        margin = (final_usd / leverage) * Decimal('1.05')
+        if margin > available:
+            return self._reject(
+                f"Insufficient capital (need ${margin.quantize(Decimal('0.01'))} margin, "
+                f"have ${available.quantize(Decimal('0.01'))})"
+            )
+        final_usd = min(final_usd, max_trade)
+
+        if reserve:
+            self._reservations[symbol] = (margin, final_usd)
+            self.in_flight['X10'] += margin
+            self.in_flight['Lighter'] += margin
+        self._stats["admitted"] += 1
+        return AdmissionDecision(True, "OK", size_usd=final_usd, margin_usd=margin, leverage=leverage)
+
+    def release(self, symbol: str) -> None:
+        """Drop the in-flight reservation of a finished (or aborted) entry."""
+        reservation = self._reservations.pop(symbol, None)
+        if reservation is None:
+            return
+        margin = reservation[0]
+        self.in_flight['X10'] = max(_ZERO, self.in_flight['X10'] - margin)
+        self.in_flight['Lighter'] = max(_ZERO, self.in_flight['Lighter'] - margin)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "open_trades": len(self._open_trades),
+            "in_flight": len(self._reservations),
+            "stale": self.stale_parts(),
+        }
+
+
+_default_gate: Optional[AdmissionGate] = None
+
+
+def get_admission_gate() -> AdmissionGate:
+    """Get singleton admission gate (subscribed to the position stream)"""
+    global _default_gate
+    if _default_gate is None:
+        from src.infrastructure.order_tracker import get_order_tracker
+        _default_gate = AdmissionGate()
+        get_order_tracker().add_position_listener(_default_gate.update_position)
+    return _default_gate
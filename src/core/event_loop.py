@@ -12,6 +12,7 @@ import time
 from src.application.shutdown import get_shutdown_orchestrator
 from src.core.events import NotificationEvent
 from src.core.trading import publish_event
+from src.core.task_scheduler import get_task_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,7 @@ class ManagedTask:
     task: Optional[asyncio.Task] = None
     last_restart: float = 0.0
     enabled: bool = True
+    cpu_budget: Optional[float] = None  # share of the budget window, None = priority default
 
 
 class BotEventLoop:
@@ -69,6 +71,10 @@ class BotEventLoop:
         self.state_manager = None
         self.telegram_bot = None
         
+        # Runtime priority enforcement (CPU accounting, pausing LOW/NORMAL under pressure)
+        self._scheduler = get_task_scheduler()
+        self._lag_monitor: Optional[asyncio.Task] = None
+
         # Callbacks
         self._on_shutdown_callbacks: List[Callable] = []
         self._on_startup_callbacks: List[Callable] = []
@@ -92,7 +98,8 @@ class BotEventLoop:
         priority: TaskPriority = TaskPriority.NORMAL,
         restart_on_failure: bool = True,
         restart_delay: float = 5.0,
-        max_restarts: int = 10
+        max_restarts: int = 10,
+        cpu_budget: Optional[float] = None
     ):
         """Register a managed task"""
         self._tasks[name] = ManagedTask(
@@ -101,7 +108,8 @@ class BotEventLoop:
             priority=priority,
             restart_on_failure=restart_on_failure,
             restart_delay=restart_delay,
-            max_restarts=max_restarts
+            max_restarts=max_restarts,
+            cpu_budget=cpu_budget
         )
         logger.debug(f"Registered task: {name} (priority={priority.name})")
     
@@ -115,22 +123,7 @@ class BotEventLoop:
     
     async def start(self):
         """Start the event loop and all tasks"""
-        # #region agent log
-        import json, time
-        DEBUG_LOG_PATH = r"c:\Users\koopm\funding-bot\.cursor\debug.log"
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H2", "location": "event_loop.py:112", "message": "start() entry", "data": {"_running": self._running, "shutdown_event_set": self._shutdown_event.is_set()}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
-        
         if self._running:
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H2", "location": "event_loop.py:115", "message": "start() early return - already running", "data": {}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
             logger.warning("Event loop already running")
             return
         
@@ -150,13 +143,6 @@ class BotEventLoop:
         except Exception:
             pass
         
-        # #region agent log
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H2", "location": "event_loop.py:127", "message": "About to log BotEventLoop starting", "data": {"_running": self._running, "tasks_count": len(self._tasks)}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
-        
         logger.info("🚀 BotEventLoop starting...")
         
         # Setup signal handlers
@@ -177,23 +163,13 @@ class BotEventLoop:
             key=lambda t: t.priority. value
         )
         
-        # #region agent log
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H3", "location": "event_loop.py:147", "message": "Before starting tasks", "data": {"tasks_count": len(sorted_tasks), "enabled_tasks": sum(1 for t in sorted_tasks if t.enabled)}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
-        
         for managed_task in sorted_tasks:
             if managed_task.enabled:
                 await self._start_task(managed_task)
         
-        # #region agent log
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H3", "location": "event_loop.py:156", "message": "After starting tasks", "data": {"tasks_count": len(self._tasks)}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
+        # Loop lag feeds the scheduler (LOW tasks pause while the loop lags)
+        if self._lag_monitor is None or self._lag_monitor.done():
+            self._lag_monitor = asyncio.create_task(self._scheduler.monitor_lag(), name="loop_lag_monitor")
         
         logger.info(f"✅ Started {len(self._tasks)} tasks")
         
@@ -208,52 +184,16 @@ class BotEventLoop:
         
         # Main supervision loop
         try:
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "A", "location": "event_loop.py:154", "message": "Before _supervision_loop", "data": {"_running": self._running, "shutdown_event_set": self._shutdown_event.is_set(), "tasks_count": len(self._tasks)}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
             await self._supervision_loop()
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "A", "location": "event_loop.py:156", "message": "After _supervision_loop", "data": {"_running": self._running, "shutdown_reason": self._shutdown_reason}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
-        except asyncio.CancelledError as e:
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H5", "location": "event_loop.py:170", "message": "CancelledError in supervision loop", "data": {"error": str(e)}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
+        except asyncio.CancelledError:
             if not self._shutdown_reason:
                 self._shutdown_reason = "cancelled"
             logger.info("Event loop cancelled")
         except Exception as e:
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H5", "location": "event_loop.py:178", "message": "Exception in supervision loop", "data": {"error": str(e), "error_type": type(e).__name__}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
             logger.error(f"❌ Exception in supervision loop: {e}", exc_info=True)
             raise
         finally:
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H6", "location": "event_loop.py:186", "message": "Before _shutdown()", "data": {"_running": self._running, "shutdown_reason": self._shutdown_reason}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
             await self._shutdown()
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H6", "location": "event_loop.py:192", "message": "After _shutdown()", "data": {}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
     
     async def stop(self):
         """Request graceful shutdown"""
@@ -307,6 +247,10 @@ class BotEventLoop:
         """Start a single managed task"""
         try:
             coro = managed_task.coro_factory()
+            if asyncio.iscoroutine(coro):
+                coro = self._scheduler.wrap(
+                    managed_task.name, coro, managed_task.priority.value, managed_task.cpu_budget
+                )
             managed_task.task = asyncio.create_task(
                 coro,
                 name=managed_task.name
@@ -320,15 +264,6 @@ class BotEventLoop:
     
     def _task_done_callback(self, managed_task: ManagedTask, task: asyncio.Task):
         """Handle task completion/failure"""
-        # #region agent log
-        import json, time
-        DEBUG_LOG_PATH = r"c:\Users\koopm\funding-bot\.cursor\debug.log"
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H", "location": "event_loop.py:198", "message": "_task_done_callback", "data": {"task_name": managed_task.name, "_running": self._running, "task_done": task.done()}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
-        
         if not self._running:
             return
         
@@ -339,12 +274,6 @@ class BotEventLoop:
             return
         
         if exc:
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "H", "location": "event_loop.py:209", "message": "Task exception detected", "data": {"task_name": managed_task.name, "error": str(exc), "error_type": type(exc).__name__}, "timestamp": int(time.time() * 1000)}) + "\n")
-            except: pass
-            # #endregion
             logger.error(
                 f"❌ Task {managed_task.name} crashed: {exc}",
                 exc_info=exc
@@ -391,15 +320,6 @@ class BotEventLoop:
         health_interval = 10.0  # Reduced from 30s to 10s for faster error detection
         last_health_check = 0.0
         
-        # #region agent log
-        import json
-        DEBUG_LOG_PATH = r"c:\Users\koopm\funding-bot\.cursor\debug.log"
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "B", "location": "event_loop.py:258", "message": "_supervision_loop entry", "data": {"_running": self._running, "shutdown_event_set": self._shutdown_event.is_set()}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
-        
         # FIX: Ensure shutdown event is cleared at the start of supervision loop
         # This prevents immediate exit if the event was set from a previous run
         if self._shutdown_event.is_set():
@@ -433,13 +353,6 @@ class BotEventLoop:
             try:
                 # Wait for shutdown or health check interval
                 try:
-                    # #region agent log
-                    try:
-                        with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                            f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "C", "location": "event_loop.py:263", "message": "Before wait_for shutdown_event", "data": {"_running": self._running, "shutdown_event_set": self._shutdown_event.is_set(), "timeout": health_interval}, "timestamp": int(time.time() * 1000)}) + "\n")
-                    except: pass
-                    # #endregion
-                    
                     # CRITICAL: Check state BEFORE wait() to prevent immediate return
                     event_before_wait = self._shutdown_event.is_set()
                     running_before_wait = self._running
@@ -529,12 +442,6 @@ class BotEventLoop:
                     logger.debug(f"✅ [Iteration {loop_iterations}] Health check scheduled (non-blocking)")
                 
             except asyncio.CancelledError:
-                # #region agent log
-                try:
-                    with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                        f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "E", "location": "event_loop.py:277", "message": "CancelledError in supervision loop", "data": {"_running": self._running}, "timestamp": int(time.time() * 1000)}) + "\n")
-                except: pass
-                # #endregion
                 # CRITICAL FIX: Only break if we're actually shutting down
                 # If we're cancelled but still supposed to be running, continue the loop
                 if self._running and not self._shutdown_reason:
@@ -558,23 +465,10 @@ class BotEventLoop:
                     logger.warning(f"⚠️ [Iteration {loop_iterations}] CancelledError in supervision loop - breaking (shutdown requested)")
                     break
             except Exception as e:
-                # #region agent log
-                try:
-                    with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                        f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "F", "location": "event_loop.py:279", "message": "Exception in supervision loop", "data": {"error": str(e), "error_type": type(e).__name__}, "timestamp": int(time.time() * 1000)}) + "\n")
-                except: pass
-                # #endregion
                 logger.error(f"❌ [Iteration {loop_iterations}] Supervision loop error: {e}", exc_info=True)
                 # Don't break the loop on exception - continue running
                 await asyncio.sleep(1.0)
         
-        # #region agent log
-        try:
-            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId": "debug-session", "runId": "run1", "hypothesisId": "G", "location": "event_loop.py:281", "message": "_supervision_loop exit", "data": {"_running": self._running, "shutdown_reason": self._shutdown_reason, "loop_iterations": loop_iterations}, "timestamp": int(time.time() * 1000)}) + "\n")
-        except: pass
-        # #endregion
-        
         logger.warning(f"⚠️ Supervision loop exited! _running={self._running}, _shutdown_reason='{self._shutdown_reason}', iterations={loop_iterations}")
     
     async def _health_check(self):
@@ -667,6 +561,9 @@ class BotEventLoop:
             task.cancel()
             logger.debug(f"Cancelled task: {managed_task.name}")
 
+        if self._lag_monitor is not None and not self._lag_monitor.done():
+            self._lag_monitor.cancel()
+
         # Wait for tasks to complete
         tasks = [mt.task for mt in self._tasks.values() if mt.task and mt.task is not current]
         if tasks:
@@ -871,7 +768,8 @@ class BotEventLoop:
                 "status": task_status,
                 "priority": mt.priority. name,
                 "restart_count": mt.restart_count,
-                "enabled": mt.enabled
+                "enabled": mt.enabled,
+                **self._scheduler.task_stats(name)
             }
         return status
     
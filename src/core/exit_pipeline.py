@@ -0,0 +1,124 @@
+# src/core/exit_pipeline.py
+"""
+Exit pipeline - decouples exit EVALUATION from exit EXECUTION.
+
+manage_open_trades scores all open trades concurrently and hands every
+positive decision to the ExitPipeline. The pipeline runs closes (and the
+post-close PnL accounting) on background workers:
+- at most one close in flight per symbol (duplicate decisions are dropped)
+- at most EXIT_MAX_CONCURRENT_CLOSES closes at once (adapter rate limiters
+  still pace the individual requests)
+
+A slow close therefore never delays the exit checks of other trades.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExitDecision:
+    """Result of a positive exit evaluation (estimates used for logging/fallback PnL)."""
+    trade: Dict[str, Any]
+    reason: str
+    gross_pnl: float = 0.0
+    est_fees: float = 0.0
+    total_pnl: float = 0.0
+    funding_pnl: float = 0.0
+    spread_pnl: float = 0.0
+    decided_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def symbol(self) -> str:
+        return self.trade.get('symbol', '')
+
+
+ExitExecutor = Callable[[ExitDecision], Awaitable[bool]]
+
+
+class ExitPipeline:
+    """Per-symbol close workers with bounded parallelism."""
+
+    def __init__(self, executor: ExitExecutor, max_concurrent: Optional[int] = None):
+        self._executor = executor
+        self.max_concurrent = max(1, int(
+            max_concurrent if max_concurrent is not None else getattr(config, 'EXIT_MAX_CONCURRENT_CLOSES', 4)
+        ))
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "submitted": 0,
+            "duplicates": 0,
+            "closed": 0,
+            "failed": 0,
+        }
+        self._latency_ms_max = 0.0
+
+    def in_flight(self, symbol: str) -> bool:
+        task = self._tasks.get(symbol)
+        return task is not None and not task.done()
+
+    @property
+    def active_symbols(self) -> Set[str]:
+        return {s for s in self._tasks if self.in_flight(s)}
+
+    def submit(self, decision: ExitDecision) -> bool:
+        """Queue a close. Returns False if that symbol is already closing."""
+        symbol = decision.symbol
+        if self.in_flight(symbol):
+            self._stats["duplicates"] += 1
+            return False
+        self._stats["submitted"] += 1
+        task = asyncio.create_task(self._run(decision), name=f"exit:{symbol}")
+        self._tasks[symbol] = task
+        task.add_done_callback(functools.partial(self._on_done, symbol))
+        return True
+
+    def _on_done(self, symbol: str, task: asyncio.Task) -> None:
+        if self._tasks.get(symbol) is task:
+            del self._tasks[symbol]
+
+    async def _run(self, decision: ExitDecision) -> bool:
+        async with self._semaphore:
+            try:
+                ok = bool(await self._executor(decision))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [EXIT] {decision.symbol}: close worker error: {e}")
+                ok = False
+        self._stats["closed" if ok else "failed"] += 1
+        latency_ms = (time.monotonic() - decision.decided_at) * 1000.0
+        self._latency_ms_max = max(self._latency_ms_max, latency_ms)
+        logger.debug(f"[EXIT] {decision.symbol}: {'closed' if ok else 'not closed'} {latency_ms:.0f}ms after decision")
+        return ok
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Wait for all in-flight closes (e.g. tests, shutdown)."""
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    async def stop(self) -> None:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "in_flight": len(self.active_symbols),
+            "max_concurrent": self.max_concurrent,
+            "decision_to_close_ms_max": round(self._latency_ms_max, 1),
+        }
@@ -267,7 +267,13 @@ class StateManagerInterface(ABC):
         pass
 
     @abstractmethod
-    async def close_trade(self, symbol: str, pnl: Union[float, Decimal], funding: Union[float, Decimal]) -> bool:
+    async def close_trade(
+        self,
+        symbol: str,
+        pnl: Union[float, Decimal],
+        funding: Union[float, Decimal],
+        fees: Union[float, Decimal] = 0.0,
+    ) -> bool:
         pass
 
 
@@ -0,0 +1,276 @@
+# src/core/market_snapshot.py
+"""
+Per-cycle market data snapshot.
+
+One logic_loop iteration used to read the same data several times
+(rates/marks in find_opportunities, balances twice, positions, mid prices
+and books again in the execution path). The MarketSnapshot is captured once
+per cycle and passed down the pipeline:
+
+    capture_quotes()   -> funding rates + mark prices of all common symbols
+    find_opportunities -> top-of-book / depth summaries of the candidates
+    capture_account()  -> balances + positions (only if there are candidates)
+    execute_trade_parallel(snapshot=...)
+
+The snapshot is immutable (frozen dataclasses, read-only mappings); every
+part carries its capture timestamp. Callers that really need fresh data use
+the explicit freshness checks (quotes_fresh / positions_fresh /
+balances_fresh / book_fresh) and re-read only when the snapshot part is too old.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+import config
+from src.utils import safe_float
+
+logger = logging.getLogger(__name__)
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+def _freeze(mapping: Optional[Mapping]) -> Mapping:
+    return MappingProxyType(dict(mapping or {}))
+
+
+def default_max_age() -> float:
+    return float(getattr(config, 'MARKET_SNAPSHOT_MAX_AGE_SECONDS', 3.0))
+
+
+@dataclass(frozen=True)
+class SymbolQuote:
+    """Funding rates and mark prices of one symbol (adapter caches, Decimal)."""
+    symbol: str
+    rate_lighter: Optional[Decimal]
+    rate_x10: Optional[Decimal]
+    mark_lighter: Optional[Decimal]
+    mark_x10: Optional[Decimal]
+
+
+@dataclass(frozen=True)
+class BookTop:
+    """Top-of-book plus depth summary of one orderbook."""
+    exchange: str
+    symbol: str
+    best_bid: float
+    best_ask: float
+    bid_depth_usd: float
+    ask_depth_usd: float
+    levels: int
+    captured_at: float
+
+    @property
+    def mid(self) -> float:
+        if self.best_bid > 0 and self.best_ask > 0:
+            return (self.best_bid + self.best_ask) / 2
+        return 0.0
+
+    @classmethod
+    def from_orderbook(cls, exchange: str, symbol: str, book: Any,
+                       captured_at: Optional[float] = None) -> Optional["BookTop"]:
+        """Build from an adapter orderbook dict ({'bids': [[p, s], ...], 'asks': ...})."""
+        if not isinstance(book, dict):
+            return None
+
+        def _levels(side):
+            out = []
+            for level in side or []:
+                try:
+                    if isinstance(level, dict):
+                        p, s = level.get("price", level.get("p")), level.get("size", level.get("s"))
+                    else:
+                        p, s = level[0], level[1]
+                    out.append((safe_float(p), safe_float(s)))
+                except (IndexError, TypeError):
+                    continue
+            return out
+
+        bids, asks = _levels(book.get("bids")), _levels(book.get("asks"))
+        if not bids and not asks:
+            return None
+        return cls(
+            exchange=exchange,
+            symbol=symbol,
+            best_bid=bids[0][0] if bids else 0.0,
+            best_ask=asks[0][0] if asks else 0.0,
+            bid_depth_usd=sum(p * s for p, s in bids),
+            ask_depth_usd=sum(p * s for p, s in asks),
+            levels=max(len(bids), len(asks)),
+            captured_at=captured_at if captured_at is not None else time.time(),
+        )
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Immutable view of the market + account for one scan cycle."""
+    captured_at: float
+    quotes: Mapping[str, SymbolQuote] = field(default_factory=lambda: _EMPTY)
+    books: Mapping[Tuple[str, str], BookTop] = field(default_factory=lambda: _EMPTY)  # (exchange, symbol) -> BookTop
+    balances: Mapping[str, float] = field(default_factory=lambda: _EMPTY)  # "x10" / "lighter" -> available balance
+    balances_at: Optional[float] = None
+    positions: Mapping[str, Mapping[str, float]] = field(default_factory=lambda: _EMPTY)  # exchange -> symbol -> signed size
+    positions_at: Optional[float] = None
+    open_trade_symbols: FrozenSet[str] = field(default_factory=frozenset)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Access
+    # ═══════════════════════════════════════════════════════════════
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.captured_at
+
+    def quote(self, symbol: str) -> Optional[SymbolQuote]:
+        return self.quotes.get(symbol)
+
+    def book(self, exchange: str, symbol: str) -> Optional[BookTop]:
+        return self.books.get((exchange.lower(), symbol))
+
+    def balance(self, exchange: str, default: float = 0.0) -> float:
+        return self.balances.get(exchange.lower(), default)
+
+    def position_symbols(self, exchange: Optional[str] = None) -> FrozenSet[str]:
+        """Symbols with a non-zero position (on one or both exchanges)."""
+        return frozenset(
+            sym
+            for ex, by_symbol in self.positions.items() if exchange in (None, ex)
+            for sym, size in by_symbol.items() if abs(size) > 1e-8
+        )
+
+    def position_size(self, exchange: str, symbol: str) -> float:
+        return self.positions.get(exchange.lower(), _EMPTY).get(symbol, 0.0)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Freshness checks
+    # ═══════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _fresh(ts: Optional[float], max_age: Optional[float]) -> bool:
+        if ts is None:
+            return False
+        return time.time() - ts <= (default_max_age() if max_age is None else max_age)
+
+    def positions_fresh(self, max_age: Optional[float] = None) -> bool:
+        return self._fresh(self.positions_at, max_age)
+
+    def balances_fresh(self, max_age: Optional[float] = None) -> bool:
+        return self._fresh(self.balances_at, max_age)
+
+    def quotes_fresh(self, max_age: Optional[float] = None) -> bool:
+        return self._fresh(self.captured_at, max_age)
+
+    def book_fresh(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> bool:
+        top = self.book(exchange, symbol)
+        return top is not None and self._fresh(top.captured_at, max_age)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Derived snapshots (the original stays untouched)
+    # ═══════════════════════════════════════════════════════════════
+
+    def with_books(self, books: Iterable[Optional[BookTop]]) -> "MarketSnapshot":
+        merged = dict(self.books)
+        for top in books:
+            if top is not None:
+                merged[(top.exchange, top.symbol)] = top
+        return dataclasses.replace(self, books=MappingProxyType(merged))
+
+    def with_account(
+        self,
+        balances: Optional[Mapping[str, float]] = None,
+        balances_at: Optional[float] = None,
+        positions: Optional[Mapping[str, Mapping[str, float]]] = None,
+        positions_at: Optional[float] = None,
+    ) -> "MarketSnapshot":
+        changes: Dict[str, Any] = {}
+        if balances is not None:
+            changes["balances"] = _freeze(balances)
+            changes["balances_at"] = balances_at if balances_at is not None else time.time()
+        if positions is not None:
+            changes["positions"] = MappingProxyType({ex: _freeze(p) for ex, p in positions.items()})
+            changes["positions_at"] = positions_at if positions_at is not None else time.time()
+        return dataclasses.replace(self, **changes)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Capture
+# ═══════════════════════════════════════════════════════════════
+
+def positions_by_symbol(positions: Iterable[Any]) -> Dict[str, float]:
+    """Position dicts or Position objects -> {symbol: signed size}."""
+    out: Dict[str, float] = {}
+    for p in positions or []:
+        if isinstance(p, dict):
+            symbol, size = p.get("symbol"), p.get("size", 0)
+        else:
+            symbol, size = getattr(p, "symbol", None), getattr(p, "size", 0)
+        if symbol:
+            out[symbol] = safe_float(size)
+    return out
+
+
+async def capture_quotes(lighter, x10, symbols: Optional[Iterable[str]] = None,
+                         open_trade_symbols: Iterable[str] = ()) -> MarketSnapshot:
+    """Funding rates + mark prices of all common symbols (adapter caches)."""
+    captured_at = time.time()
+    if symbols is None:
+        symbols = set(lighter.market_info.keys()) & set(x10.market_info.keys())
+    semaphore = asyncio.Semaphore(getattr(config, "OPP_SCAN_CONCURRENCY", 20))
+
+    async def fetch_symbol_data(s: str) -> SymbolQuote:
+        async with semaphore:
+            try:
+                # Funding rates + prices from the adapter caches - already Decimal
+                lr = await lighter.fetch_funding_rate(s)
+                xr = await x10.fetch_funding_rate(s)
+                px = await x10.fetch_mark_price(s)
+                pl = await lighter.fetch_mark_price(s)
+                return SymbolQuote(s, lr, xr, pl, px)
+            except Exception as e:
+                logger.debug(f"Error fetching {s}: {e}")
+                return SymbolQuote(s, None, None, None, None)
+
+    results = await asyncio.gather(*(fetch_symbol_data(s) for s in symbols), return_exceptions=True)
+    quotes = {q.symbol: q for q in results if isinstance(q, SymbolQuote)}
+    return MarketSnapshot(
+        captured_at=captured_at,
+        quotes=MappingProxyType(quotes),
+        open_trade_symbols=frozenset(open_trade_symbols),
+    )
+
+
+async def capture_account(snapshot: MarketSnapshot, lighter, x10) -> MarketSnapshot:
+    """Balances of both exchanges + positions, fetched concurrently."""
+    from src.core.trade_management import POSITION_CACHE, get_cached_positions
+
+    bal_x10, bal_lit, positions = await asyncio.gather(
+        x10.get_real_available_balance(),
+        lighter.get_real_available_balance(),
+        get_cached_positions(lighter, x10, force=False),
+        return_exceptions=True,
+    )
+    balances_at = time.time()
+    if isinstance(bal_x10, Exception):
+        logger.error(f"❌ X10 Balance Check FAILED: {bal_x10}")
+        bal_x10 = 0.0
+    if isinstance(bal_lit, Exception):
+        logger.error(f"❌ Lighter Balance Check FAILED: {bal_lit}")
+        bal_lit = 0.0
+
+    if isinstance(positions, Exception):
+        logger.warning(f"Failed to fetch real positions: {positions}")
+        return snapshot.with_account(
+            balances={"x10": safe_float(bal_x10), "lighter": safe_float(bal_lit)}, balances_at=balances_at
+        )
+
+    x10_pos, lighter_pos = positions
+    return snapshot.with_account(
+        balances={"x10": safe_float(bal_x10), "lighter": safe_float(bal_lit)},
+        balances_at=balances_at,
+        positions={"x10": positions_by_symbol(x10_pos), "lighter": positions_by_symbol(lighter_pos)},
+        positions_at=POSITION_CACHE.get('last_update') or time.time(),
+    )
@@ -308,6 +308,12 @@ async def trade_management_loop(lighter, x10, manage_open_trades_fn=None):
             logger.error(f"Trade Management Error: {e}")
             await asyncio.sleep(5)
 
+    # Exit workers belong to this loop - shutdown closes whatever is left
+    from src.core.trade_management import stop_exit_pipeline, stop_settlement_queue
+    await stop_exit_pipeline()
+    # Pending PnL settlements get one last (bounded) attempt before adapters close
+    await stop_settlement_queue()
+
 
 # ============================================================
 # MAINTENANCE LOOP
@@ -400,6 +406,33 @@ async def health_reporter(event_loop, parallel_exec):
                 f"{exec_stats.get('pending_rollbacks', 0)} pending rollbacks"
             )
             
+            # Scheduler: CPU per task, loop lag, pauses of LOW/NORMAL work
+            try:
+                from src.core.task_scheduler import get_task_scheduler
+                sched = get_task_scheduler().get_stats()
+                top = sorted(sched["tasks"].items(), key=lambda kv: kv[1]["cpu_time_ms"], reverse=True)[:3]
+                logger.info(
+                    f"📊 SCHEDULER: lag={sched['loop_lag_ms']}ms (max {sched['max_loop_lag_ms']}ms), "
+                    f"pauses={sched['pauses']}, throttles={sched['throttles']} | CPU: "
+                    + ", ".join(f"{name}={st['cpu_time_ms']:.0f}ms" for name, st in top)
+                )
+            except Exception:
+                pass
+            
+            # Event bus: slowest subscriber (queue depth / handler latency)
+            try:
+                from src.infrastructure.event_bus import get_event_bus
+                subs = get_event_bus().get_stats()["subscribers"]
+                if subs:
+                    slowest = max(subs, key=lambda st: st["latency_p99_ms"])
+                    logger.info(
+                        f"📊 EVENT BUS: {len(subs)} subscribers, slowest {slowest['handler']} "
+                        f"({slowest['event']}) p99={slowest['latency_p99_ms']}ms depth={slowest['depth']} "
+                        f"dropped={sum(st['dropped'] for st in subs)}"
+                    )
+            except Exception:
+                pass
+            
             # Fee Stats
             try:
                 from src.application.fee_manager import get_fee_manager
@@ -447,6 +480,20 @@ IN_FLIGHT_MARGIN = {'X10': 0.0, 'Lighter': 0.0}
 IN_FLIGHT_LOCK = asyncio.Lock()
 
 
+def _update_orderbook_relevance(open_syms, opportunities) -> None:
+    """Tell the orderbook refresher which books matter most (positions, top candidates)."""
+    try:
+        from src.infrastructure.orderbook_provider import get_orderbook_provider
+        refresher = getattr(get_orderbook_provider(), "refresher", None)
+        if refresher is not None:
+            refresher.set_relevance(
+                positions=open_syms,
+                candidates=[o.get('symbol') for o in (opportunities or []) if isinstance(o, dict)],
+            )
+    except Exception as e:
+        logger.debug(f"Orderbook relevance update failed: {e}")
+
+
 # ============================================================
 # MAIN TRADING LOGIC LOOP
 # ============================================================
@@ -464,16 +511,22 @@ async def logic_loop(lighter, x10, price_event, parallel_exec):
     
     # Lazy imports
     from src.core.state import get_open_trades, get_symbol_lock
-    from src.core.opportunities import find_opportunities
+    from src.core.opportunities import find_opportunities, capture_scan_snapshot
+    from src.core.market_snapshot import capture_account
     from src.core.trading import execute_trade_parallel
-    from src.core.trade_management import (
-        get_cached_positions, 
-        reconcile_state_with_exchange
-    )
+    from src.core.trade_management import reconcile_state_with_exchange
     
     REFRESH_DELAY = getattr(config, 'REFRESH_DELAY_SECONDS', 5)
     logger.info(f"Logic Loop gestartet – REFRESH alle {REFRESH_DELAY}s")
 
+    # First scan as soon as the streams cover the universe (PriceBootstrap)
+    from src.infrastructure.price_bootstrap import get_price_bootstrap
+    bootstrap = get_price_bootstrap()
+    if bootstrap is not None:
+        max_wait = float(getattr(config, 'PRICE_BOOTSTRAP_MAX_WAIT_SECONDS', 30.0))
+        if not await bootstrap.wait_ready(timeout=max_wait):
+            logger.warning(f"⚠️ Market data not ready after {max_wait:.0f}s - scanning with partial prices")
+
     while not SHUTDOWN_FLAG:
         try:
             LAST_DATA_UPDATE = time.time()
@@ -501,23 +554,23 @@ async def logic_loop(lighter, x10, price_event, parallel_exec):
                     await asyncio.sleep(REFRESH_DELAY)
                 continue
 
-            opportunities = await find_opportunities(lighter, x10, open_syms, is_farm_mode=None)
+            # One immutable MarketSnapshot per cycle (rates/marks -> books -> account)
+            snapshot = await capture_scan_snapshot(lighter, x10, open_syms)
+            opportunities = []
+            if snapshot is not None:
+                opportunities = await find_opportunities(lighter, x10, open_syms, is_farm_mode=None, snapshot=snapshot)
+            _update_orderbook_relevance(open_syms, opportunities)
             
             if opportunities:
                 logger.info(f"🎯 Found {len(opportunities)} opportunities")
                 
-                # Balance Check
-                try:
-                    bal_x10 = await x10.get_real_available_balance()
-                except Exception as e:
-                    logger.error(f"❌ X10 Balance Check FAILED: {e}")
-                    bal_x10 = 0.0
-                
-                try:
-                    bal_lit = await lighter.get_real_available_balance()
-                except Exception as e:
-                    logger.error(f"❌ Lighter Balance Check FAILED: {e}")
-                    bal_lit = 0.0
+                # Balance + position check (concurrent, captured once for the whole cycle)
+                snapshot = await capture_account(snapshot, lighter, x10)
+                snapshot = snapshot.with_books(
+                    top for opp in opportunities for top in (opp.get('book_x10'), opp.get('book_lighter'))
+                )
+                bal_x10 = snapshot.balance("x10")
+                bal_lit = snapshot.balance("lighter")
 
                 if bal_x10 < 5.0:
                     logger.warning(f"⚠️ X10 Balance too low (${bal_x10:.2f})")
@@ -561,16 +614,7 @@ async def logic_loop(lighter, x10, price_event, parallel_exec):
                             await asyncio.sleep(REFRESH_DELAY)
                         continue
                     
-                    x10_pos, lighter_pos = await get_cached_positions(lighter, x10, force=False)
-                    real_x10_symbols = {
-                        p.get('symbol') for p in (x10_pos or [])
-                        if abs(safe_float(p.get('size', 0))) > 1e-8
-                    }
-                    real_lighter_symbols = {
-                        p.get('symbol') for p in (lighter_pos or [])
-                        if abs(safe_float(p.get('size', 0))) > 1e-8
-                    }
-                    real_exchange_symbols = real_x10_symbols | real_lighter_symbols
+                    real_exchange_symbols = set(snapshot.position_symbols())
                 except Exception as e:
                     logger.warning(f"Failed to fetch real positions: {e}")
                     real_exchange_symbols = set()
@@ -762,11 +806,13 @@ async def logic_loop(lighter, x10, price_event, parallel_exec):
                         logger.info(f"🚀 Launching {symbol} (APY={opp.get('apy', 0):.1f}%)")
                         
                         # Create handler with proper closure
-                        def make_handler(sym, opportunity):
+                        def make_handler(sym, opportunity, cycle_snapshot):
                             async def _handle_with_lock():
                                 async with get_symbol_lock(sym):
                                     try:
-                                        await execute_trade_parallel(opportunity, lighter, x10, parallel_exec)
+                                        await execute_trade_parallel(
+                                            opportunity, lighter, x10, parallel_exec, snapshot=cycle_snapshot
+                                        )
                                     except asyncio.CancelledError:
                                         raise
                                     except Exception as e:
@@ -783,7 +829,7 @@ async def logic_loop(lighter, x10, price_event, parallel_exec):
                                     del ACTIVE_TASKS[symbol]
                             break
                         
-                        handler = make_handler(symbol, opp)
+                        handler = make_handler(symbol, opp, snapshot)
                         task = asyncio.create_task(handler())
                         
                         async with TASKS_LOCK:
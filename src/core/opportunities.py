@@ -23,6 +23,7 @@ from src.utils import safe_decimal, quantize_usd
 from src.core.adaptive_threshold import get_threshold_manager
 from src.core.latency_arb import get_detector, is_latency_arb_enabled
 from src.core.orderbook_validator import simulate_price_impact, PriceImpactResult
+from src.core.market_snapshot import BookTop, MarketSnapshot, capture_quotes
 from src.application.fee_manager import get_fee_manager
 
 logger = logging.getLogger(__name__)
@@ -236,34 +237,8 @@ def _estimate_price_pnl_to_basis_target_usd(
 # ============================================================
 # MAIN OPPORTUNITY FINDER
 # ============================================================
-async def find_opportunities(lighter, x10, open_syms, is_farm_mode: bool = None) -> List[Dict]:
-    """
-    Find trading opportunities across Lighter and X10.
-
-    Args:
-        lighter: Lighter adapter
-        x10: X10 adapter
-        open_syms: Set of already open symbols
-        is_farm_mode: If True, mark all trades as farm trades. If None, auto-detect from config.
-    
-    Returns:
-        List of opportunity dictionaries sorted by APY
-    """
-    # Auto-detect farm mode if not specified
-    if is_farm_mode is None:
-        is_farm_mode = config.VOLUME_FARM_MODE
-
-    opps: List[Dict] = []
-    common = set(lighter.market_info.keys()) & set(x10.market_info.keys())
-    threshold_manager = get_threshold_manager()
-    detector = get_detector()  # ⚡ Latency Detector Instance
-
-    # Verify market data is loaded
-    if not common:
-        logger.warning("⚠️ No common markets found")
-        logger.debug(f"X10 markets: {len(x10.market_info)}, Lighter: {len(lighter.market_info)}")
-        return []
-
+async def warm_price_caches(lighter, x10, common) -> None:
+    """Refresh the adapter price caches if they are (mostly) empty."""
     # Check price cache status - count actual valid prices (> 0) using sync cache access
     x10_prices = len([s for s in common if x10.fetch_mark_price_sync(s) > 0])
     lit_prices = len([s for s in common if lighter.fetch_mark_price_sync(s) > 0])
@@ -285,41 +260,64 @@ async def find_opportunities(lighter, x10, open_syms, is_farm_mode: bool = None)
             return_exceptions=True
         )
 
+
+async def capture_scan_snapshot(lighter, x10, open_syms=()) -> Optional[MarketSnapshot]:
+    """
+    Capture the per-cycle MarketSnapshot (rates + marks of all common markets).
+
+    Returns None if no common markets are loaded.
+    """
+    common = set(lighter.market_info.keys()) & set(x10.market_info.keys())
+
+    # Verify market data is loaded
+    if not common:
+        logger.warning("⚠️ No common markets found")
+        logger.debug(f"X10 markets: {len(x10.market_info)}, Lighter: {len(lighter.market_info)}")
+        return None
+
+    await warm_price_caches(lighter, x10, common)
+
     logger.debug(
         f"🔍 Scanning {len(common)} pairs. "
         f"Lighter markets: {len(lighter.market_info)}, X10 markets: {len(x10.market_info)}"
     )
+    return await capture_quotes(lighter, x10, common, open_trade_symbols=open_syms)
 
-    concurrency_limit = getattr(config, "OPP_SCAN_CONCURRENCY", 20)
-    semaphore = asyncio.Semaphore(concurrency_limit)
 
-    async def fetch_symbol_data(s: str):
-        async with semaphore:
-            try:
-                # Get funding rates (from cache) - already Decimal from adapter
-                lr = await lighter.fetch_funding_rate(s)
-                xr = await x10.fetch_funding_rate(s)
-                
-                # Get prices (from cache) - already Decimal from adapter
-                px = await x10.fetch_mark_price(s)
-                pl = await lighter.fetch_mark_price(s)
-                
-                return (s, lr, xr, px, pl)
-                
-            except Exception as e:
-                logger.debug(f"Error fetching {s}: {e}")
-                return (s, None, None, None, None)
+async def find_opportunities(
+    lighter, x10, open_syms, is_farm_mode: bool = None, snapshot: Optional[MarketSnapshot] = None
+) -> List[Dict]:
+    """
+    Find trading opportunities across Lighter and X10.
 
-    # Launch concurrent fetches
-    tasks = [asyncio.create_task(fetch_symbol_data(s)) for s in common]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    Args:
+        lighter: Lighter adapter
+        x10: X10 adapter
+        open_syms: Set of already open symbols
+        is_farm_mode: If True, mark all trades as farm trades. If None, auto-detect from config.
+        snapshot: Per-cycle MarketSnapshot (rates/marks). Captured here if not given.
+    
+    Returns:
+        List of opportunity dictionaries sorted by APY. Each standard opportunity
+        carries 'book_x10' / 'book_lighter' (BookTop) for the cycle snapshot.
+    """
+    # Auto-detect farm mode if not specified
+    if is_farm_mode is None:
+        is_farm_mode = config.VOLUME_FARM_MODE
 
-    # Filter out exceptions
-    clean_results = []
-    for r in results:
-        if isinstance(r, Exception):
-            continue
-        clean_results.append(r)
+    opps: List[Dict] = []
+    threshold_manager = get_threshold_manager()
+    detector = get_detector()  # ⚡ Latency Detector Instance
+
+    if snapshot is None:
+        snapshot = await capture_scan_snapshot(lighter, x10, open_syms)
+        if snapshot is None:
+            return []
+
+    clean_results = [
+        (q.symbol, q.rate_lighter, q.rate_x10, q.mark_x10, q.mark_lighter)
+        for q in snapshot.quotes.values()
+    ]
 
     # ═══════════════════════════════════════════════════════════════
     # LATENCY ARB: FIRST PRIORITY
@@ -514,14 +512,20 @@ async def find_opportunities(lighter, x10, open_syms, is_farm_mode: bool = None)
         leg1_side = "SELL" if rl > rx else "BUY"
         x10_side, lit_side = _derive_sides(leg1_exchange, leg1_side)
 
+        # One fetch per book: Lighter depth (20 levels) also serves the price impact check below
+        lit_depth = None
+        x10_top = lit_top = None
         try:
             x10_book, lit_book = await asyncio.gather(
                 x10.fetch_orderbook(s, limit=1),
-                lighter.fetch_orderbook(s, limit=1),
+                lighter.fetch_orderbook(s, limit=20),
                 return_exceptions=True,
             )
+            lit_depth = None if isinstance(lit_book, Exception) else lit_book
             x10_book = {"bids": [], "asks": []} if isinstance(x10_book, Exception) else (x10_book or {})
             lit_book = {"bids": [], "asks": []} if isinstance(lit_book, Exception) else (lit_book or {})
+            x10_top = BookTop.from_orderbook("x10", s, x10_book)
+            lit_top = BookTop.from_orderbook("lighter", s, lit_book)
             x10_bid, x10_ask = _best_bid_ask_from_orderbook(x10_book)
             lit_bid, lit_ask = _best_bid_ask_from_orderbook(lit_book)
         except Exception:
@@ -632,23 +636,22 @@ async def find_opportunities(lighter, x10, open_syms, is_farm_mode: bool = None)
         max_slippage_pct = getattr(config, 'MAX_PRICE_IMPACT_PCT', 0.5)
         
         try:
-            if hasattr(lighter, 'fetch_orderbook'):
-                book = await lighter.fetch_orderbook(s, limit=20)
-                if book and 'bids' in book and 'asks' in book:
-                    price_impact_result = simulate_price_impact(
-                        side=leg1_side,
-                        order_size_usd=float(notional),
-                        bids=book['bids'],
-                        asks=book['asks'],
-                        mid_price=float((pl + px) / 2),
-                    )
-                    
-                    if price_impact_result.can_fill:
-                        estimated_slippage_pct = float(price_impact_result.slippage_percent)
-                        if estimated_slippage_pct > max_slippage_pct:
-                            continue
-                    else:
+            book = lit_depth
+            if book and 'bids' in book and 'asks' in book:
+                price_impact_result = simulate_price_impact(
+                    side=leg1_side,
+                    order_size_usd=float(notional),
+                    bids=book['bids'],
+                    asks=book['asks'],
+                    mid_price=float((pl + px) / 2),
+                )
+                
+                if price_impact_result.can_fill:
+                    estimated_slippage_pct = float(price_impact_result.slippage_percent)
+                    if estimated_slippage_pct > max_slippage_pct:
                         continue
+                else:
+                    continue
         except Exception:
             pass
         
@@ -692,6 +695,8 @@ async def find_opportunities(lighter, x10, open_syms, is_farm_mode: bool = None)
             'entry_edge_usd': float(entry_edge_usd),
             'roundtrip_fees_est': float(roundtrip_fees),
             'exit_slippage_cost_est': float(exit_slippage_cost),
+            'book_x10': x10_top,
+            'book_lighter': lit_top,
         })
 
     # Apply farm flag
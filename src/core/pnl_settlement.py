@@ -0,0 +1,344 @@
+# src/core/pnl_settlement.py
+"""
+Deferred post-close PnL settlement.
+
+execute_trade_exit books the exit ESTIMATE right after both legs are closed
+(close_trade_in_state + trade_history row with pnl_status='PROVISIONAL'),
+so the slot is free immediately. The exact numbers - exit fee rates, real
+exit fills and the X10 funding/fee breakdown - show up on the exchanges
+seconds later. This queue resolves them in the background:
+
+- jobs wait PNL_SETTLEMENT_BATCH_WINDOW before the first attempt, so closes
+  of the same cycle are settled together
+- one history read per symbol and exchange per round (Lighter fills,
+  X10 realised-PnL breakdown), fetched concurrently and shared by all jobs
+- incomplete results are retried with exponential backoff; after
+  PNL_SETTLEMENT_MAX_ATTEMPTS the best available numbers are booked
+- the final numbers replace the provisional trade_history row and the
+  closed trades row (pnl_rollups get the difference by trigger) and are
+  written to realized_pnl.csv
+- rows still PROVISIONAL after a restart are re-enqueued at startup
+  (requeue_provisional)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import config
+from src.utils import safe_float
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SettlementJob:
+    """A closed trade whose provisional PnL still has to be settled."""
+    trade: Dict[str, Any]
+    reason: str
+    provisional: Dict[str, float]
+    history_id: Optional[int] = None
+    closed_at: float = field(default_factory=time.time)
+    attempts: int = 0
+    next_attempt: float = 0.0
+    fees_fetched: bool = False
+    last_result: Optional[Dict[str, Any]] = None
+
+    @property
+    def symbol(self) -> str:
+        return self.trade.get('symbol', '')
+
+
+class _HistoryBatch:
+    """
+    Adapter view for one settlement round: the per-symbol history call is
+    fetched once and shared by every job of that round. Everything else is
+    delegated to the real adapter.
+    """
+
+    def __init__(self, adapter, method: str, **kwargs):
+        self._adapter = adapter
+        self._method = method
+        self._kwargs = kwargs
+        self._results: Dict[str, Any] = {}
+
+    def __getattr__(self, name):
+        if name == self._method:
+            return self._cached
+        return getattr(self._adapter, name)
+
+    async def prefetch(self, symbols) -> None:
+        fetch = getattr(self._adapter, self._method, None)
+        if fetch is None:
+            return
+        symbols = [s for s in dict.fromkeys(symbols) if s not in self._results]
+        results = await asyncio.gather(
+            *(fetch(s, **self._kwargs) for s in symbols), return_exceptions=True
+        )
+        for sym, res in zip(symbols, results):
+            if isinstance(res, Exception):
+                logger.debug(f"[SETTLE] {self._method}({sym}) failed: {res}")
+                continue
+            self._results[sym] = res
+
+    async def _cached(self, symbol, *args, **kwargs):
+        if symbol not in self._results:
+            await self.prefetch([symbol])
+        return self._results.get(symbol)
+
+
+SettlementResolver = Callable[[SettlementJob, Any, Any], Awaitable[Dict[str, Any]]]
+
+
+async def resolve_close_pnl(job: SettlementJob, lighter, x10) -> Dict[str, Any]:
+    """Default resolver: exit fee rates (once) + calculate_realized_close_pnl without inline waits."""
+    from src.core.trade_management import calculate_realized_close_pnl
+
+    t = job.trade
+    if not job.fees_fetched:
+        async def _exit_fee(adapter, key: str, order_key: str) -> None:
+            if t.get(order_key) and hasattr(adapter, "get_order_fee"):
+                try:
+                    t[key] = safe_float(await adapter.get_order_fee(str(t[order_key])), 0.0)
+                except Exception:
+                    pass
+
+        await asyncio.gather(
+            _exit_fee(x10, "exit_fee_x10", "x10_exit_order_id"),
+            _exit_fee(lighter, "exit_fee_lighter", "lighter_exit_order_id"),
+        )
+        job.fees_fetched = True
+
+    return await calculate_realized_close_pnl(t, lighter, x10, settle_delay=0.0, fill_wait_s=0.0)
+
+
+class PnLSettlementQueue:
+    """Background worker that turns provisional close PnL into final PnL."""
+
+    def __init__(
+        self,
+        lighter,
+        x10,
+        resolver: Optional[SettlementResolver] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        retry_max: Optional[float] = None,
+        batch_window: Optional[float] = None,
+        trade_repo=None,
+    ):
+        self.lighter = lighter
+        self.x10 = x10
+        self._resolver = resolver or resolve_close_pnl
+        self._trade_repo = trade_repo  # TradeRepository, resolved lazily
+        self.max_attempts = max(1, int(
+            max_attempts if max_attempts is not None else getattr(config, 'PNL_SETTLEMENT_MAX_ATTEMPTS', 6)
+        ))
+        self.retry_base = float(
+            retry_base if retry_base is not None else getattr(config, 'PNL_SETTLEMENT_RETRY_BASE', 2.0)
+        )
+        self.retry_max = float(
+            retry_max if retry_max is not None else getattr(config, 'PNL_SETTLEMENT_RETRY_MAX', 60.0)
+        )
+        self.batch_window = float(
+            batch_window if batch_window is not None else getattr(config, 'PNL_SETTLEMENT_BATCH_WINDOW', 1.0)
+        )
+        self._pending: List[SettlementJob] = []
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._stats = {
+            "enqueued": 0,
+            "settled": 0,
+            "settled_incomplete": 0,
+            "retries": 0,
+            "rounds": 0,
+            "history_reads": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(
+        self,
+        trade: Dict[str, Any],
+        reason: str,
+        provisional: Dict[str, float],
+        history_id: Optional[int] = None,
+        closed_at: Optional[float] = None,
+    ) -> SettlementJob:
+        job = SettlementJob(
+            trade=dict(trade),
+            reason=reason,
+            provisional=dict(provisional),
+            history_id=history_id,
+        )
+        if closed_at is not None:
+            job.closed_at = closed_at
+        job.next_attempt = time.monotonic() + self.batch_window
+        self._pending.append(job)
+        self._stats["enqueued"] += 1
+        self._ensure_worker()
+        self._wakeup.set()
+        return job
+
+    async def requeue_provisional(self) -> int:
+        """Re-enqueue trade_history rows a previous run left PROVISIONAL."""
+        from src.core.state import get_provisional_trade_history
+
+        count = 0
+        for row in await get_provisional_trade_history():
+            if row.get("closed_at") is None:
+                # Without the trades row there is nothing to resolve the fills against
+                logger.warning(
+                    f"[SETTLE] {row['symbol']}: trade_history row {row['history_id']} stays PROVISIONAL "
+                    f"(closed trade not found)"
+                )
+                continue
+            trade = {
+                key: row[key] for key in (
+                    'symbol', 'entry_time', 'account_label', 'side_x10', 'side_lighter', 'size_usd',
+                    'entry_price_x10', 'entry_price_lighter', 'x10_order_id', 'lighter_order_id',
+                )
+            }
+            trade['funding_collected'] = row['funding_pnl_usd']
+            provisional = {
+                'total_net_pnl': safe_float(row['final_pnl_usd'], 0.0),
+                'funding_pnl': safe_float(row['funding_pnl_usd'], 0.0),
+                'spread_pnl': safe_float(row['spread_pnl_usd'], 0.0),
+                'fees': safe_float(row['fees_usd'], 0.0),
+            }
+            self.enqueue(trade, row['close_reason'], provisional, row['history_id'],
+                         closed_at=row['closed_at'] / 1000)
+            count += 1
+        if count:
+            logger.info(f"🧾 [SETTLE] {count} provisional close(s) from the previous run re-enqueued")
+        return count
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name="pnl_settlement")
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            next_due = min(j.next_attempt for j in self._pending)
+            if next_due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Jobs due within the batch window ride along with this round
+            due = [j for j in self._pending if j.next_attempt <= now + self.batch_window]
+            try:
+                await self._settle_round(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Never lose jobs to an unexpected error - back off and retry
+                logger.error(f"[SETTLE] round failed: {e}")
+                for job in due:
+                    job.next_attempt = time.monotonic() + self.retry_base
+
+    async def _settle_round(self, jobs: List[SettlementJob], final: bool = False) -> None:
+        """One batched attempt for all due jobs. final=True books whatever is available."""
+        if not jobs:
+            return
+        self._stats["rounds"] += 1
+        symbols = [j.symbol for j in jobs]
+        lighter_view = _HistoryBatch(self.lighter, "fetch_my_trades", limit=50, force=True)
+        x10_view = _HistoryBatch(self.x10, "get_realised_pnl_breakdown", limit=10)
+        await asyncio.gather(lighter_view.prefetch(symbols), x10_view.prefetch(symbols))
+        self._stats["history_reads"] += 2 * len(set(symbols))
+
+        results = await asyncio.gather(
+            *(self._resolver(job, lighter_view, x10_view) for job in jobs),
+            return_exceptions=True,
+        )
+
+        for job, res in zip(jobs, results):
+            job.attempts += 1
+            if isinstance(res, Exception):
+                logger.debug(f"[SETTLE] {job.symbol}: attempt {job.attempts} failed: {res}")
+            elif res:
+                job.last_result = res
+
+            complete = bool(job.last_result and job.last_result.get("complete"))
+            if complete or final or job.attempts >= self.max_attempts:
+                await self._finalize(job, complete)
+                self._pending.remove(job)
+            else:
+                delay = min(self.retry_max, self.retry_base * (2 ** (job.attempts - 1)))
+                job.next_attempt = time.monotonic() + delay
+                self._stats["retries"] += 1
+
+    async def _finalize(self, job: SettlementJob, complete: bool) -> None:
+        from src.core.state import archive_trade_to_history, update_trade_history
+
+        prov = job.provisional
+        res = job.last_result or {}
+        pnl_data = {
+            'total_net_pnl': safe_float(res.get("total_pnl"), prov['total_net_pnl']),
+            'funding_pnl': safe_float(res.get("funding_total"), prov['funding_pnl']),
+            'spread_pnl': safe_float(res.get("price_pnl_total"), prov['spread_pnl']),
+            'fees': safe_float(res.get("fees_total"), prov['fees']),
+        }
+
+        if job.history_id is not None:
+            await update_trade_history(job.history_id, job.trade, pnl_data)
+        else:
+            await archive_trade_to_history(job.trade, job.reason, pnl_data)
+        await self._settle_trade_row(job, pnl_data)
+
+        self._stats["settled" if complete else "settled_incomplete"] += 1
+        delta = pnl_data['total_net_pnl'] - prov['total_net_pnl']
+        logger.info(
+            f"🧾 [SETTLE] {job.symbol}: PnL ${prov['total_net_pnl']:.4f} -> ${pnl_data['total_net_pnl']:.4f} "
+            f"(Δ${delta:+.4f}, {job.attempts} attempt(s), "
+            f"{time.time() - job.closed_at:.1f}s after close{'' if complete else ', INCOMPLETE fills'})"
+        )
+
+    async def _settle_trade_row(self, job: SettlementJob, pnl_data: Dict[str, float]) -> None:
+        """Book the final numbers on the closed trades row (the rollups follow by trigger)."""
+        try:
+            if self._trade_repo is None:
+                from src.infrastructure.database import get_trade_repository
+                self._trade_repo = await get_trade_repository()
+            # trades.closed_at is set before the job exists; a later close of the symbol is newer
+            updated = await self._trade_repo.settle_closed_trade(
+                job.symbol,
+                pnl_data['total_net_pnl'],
+                pnl_data['funding_pnl'],
+                pnl_data['fees'],
+                closed_before_ms=int(job.closed_at * 1000),
+            )
+            if not updated:
+                logger.warning(f"[SETTLE] {job.symbol}: closed trades row not found, rollups keep the estimate")
+        except Exception as e:
+            logger.error(f"[SETTLE] {job.symbol}: trades row update failed: {e}")
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """Settle everything pending now (one last attempt each, shutdown)."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        jobs = list(self._pending)
+        if not jobs:
+            return
+        try:
+            await asyncio.wait_for(self._settle_round(jobs, final=True), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[SETTLE] flush timed out - {self.pending} trade(s) stay PROVISIONAL in trade_history")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending": self.pending}
@@ -63,7 +63,8 @@ async def migrate_database():
                     funding_pnl_usd REAL,
                     spread_pnl_usd REAL,
                     fees_usd REAL,
-                    account_label TEXT DEFAULT 'Main'
+                    account_label TEXT DEFAULT 'Main',
+                    pnl_status TEXT DEFAULT 'FINAL'
                 )
             """)
             await conn.commit()
@@ -87,6 +88,15 @@ async def migrate_database():
                 logger.info("✅ Database migration complete")
             else:
                 logger.debug("✅ Database schema up to date")
+
+            # pnl_status: PROVISIONAL rows are finalized by the PnL settlement queue
+            if not any(col[1] == 'pnl_status' for col in columns):
+                try:
+                    await conn.execute("ALTER TABLE trade_history ADD COLUMN pnl_status TEXT DEFAULT 'FINAL'")
+                    await conn.commit()
+                    logger.info("✅ trade_history.pnl_status column added")
+                except Exception:
+                    pass
                 
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}")
@@ -135,7 +145,7 @@ async def run_bot_v5(bot_instance=None, event_bus=None):
     """
     Main bot entry point with full task supervision and component wiring.
     """
-    global SHUTDOWN_FLAG, state_manager
+    global SHUTDOWN_FLAG
     
     logger.info("🔍 run_bot_v5() entry point called")
     
@@ -165,18 +175,14 @@ async def run_bot_v5(bot_instance=None, event_bus=None):
         health_reporter
     )
     from src.core.state import get_open_trades, close_trade_in_state
+    from src.core.trade_management import requeue_provisional_settlements
     
     logger.info("🔥 BOT V5 (Architected) STARTING...")
     
     # 1. INIT INFRASTRUCTURE
     from src.core.state import set_state_manager
-    infra_sm = await get_state_manager()
-    set_state_manager(infra_sm)
-    state_manager = infra_sm
-    logger.info("✅ State Manager started")
-        
-    await setup_database()
-    await migrate_database()
+    from src.core.startup_graph import StartupGraph
+    from src.infrastructure.http_transport import warm_up_transports, close_transports
     
     x10 = X10Adapter()
     lighter = LighterAdapter()
@@ -189,100 +195,133 @@ async def run_bot_v5(bot_instance=None, event_bus=None):
     x10.price_update_event = price_event
     lighter.price_update_event = price_event
     
-    # Balance check
-    logger.info("💰 Checking exchange balances at startup...")
+    # ═══════════════════════════════════════════════════════════════
+    # STARTUP GRAPH: independent steps run concurrently, dependents
+    # only wait for what they need. Critical steps abort startup.
+    # ═══════════════════════════════════════════════════════════════
+    graph = StartupGraph("startup")
+    
+    async def _start_state_manager():
+        global state_manager
+        infra_sm = await get_state_manager()
+        set_state_manager(infra_sm)
+        state_manager = infra_sm
+        logger.info("✅ State Manager started")
+        return infra_sm
+    
+    async def _start_funding_tracker():
+        interval = int(getattr(config, "FUNDING_TRACK_INTERVAL_SECONDS", 300))
+        tracker = FundingTracker(x10, lighter, graph.result("state_manager"), update_interval_seconds=interval)
+        await tracker.start()
+        logger.info("✅ FundingTracker started")
+        return tracker
+    
+    async def _start_fee_manager():
+        manager = await init_fee_manager(x10, lighter)
+        logger.info("✅ FeeManager started")
+        return manager
+    
+    async def _warmup_x10_markets():
+        x10_client = graph.result("x10_client") or await x10._get_trading_client()
+        await x10_client.markets_info.get_markets()
+    
+    def _common_symbols() -> List[str]:
+        return list(set(x10.market_info.keys()) & set(lighter.market_info.keys()))
+    
+    async def _start_stream_clients():
+        if not getattr(config, "USE_ADAPTER_STREAM_CLIENTS", False):
+            logger.info("Adapter stream clients disabled (using WebSocketManager)")
+            return
+        logger.info("🌐 Initializing Stream Clients...")
+        symbols = _common_symbols()
+        for name, adapter in (("X10", x10), ("Lighter", lighter)):
+            try:
+                await adapter.initialize_stream_client(symbols=symbols)
+                logger.info(f"{name} stream client initialized")
+            except Exception as e:
+                logger.warning(f"{name} stream client initialization failed: {e}")
+                logger.info("Continuing with polling fallback...")
+    
+    async def _start_oi_tracker():
+        symbols = _common_symbols()
+        logger.info(f"🚀 Starting OI Tracker for {len(symbols)} symbols...")
+        return await init_oi_tracker(x10, lighter, symbols=symbols)
+    
+    async def _start_ws_manager():
+        logger.info("🌐 Starting WebSocket Manager...")
+        manager = await init_websocket_manager(
+            x10, lighter, symbols=_common_symbols(),
+            ping_interval=None, ping_timeout=None
+        )
+        manager.set_oi_tracker(graph.result("oi_tracker"))
+        return manager
+    
+    async def _wait_ws_ready():
+        ws_wait = float(getattr(config, "LIGHTER_WAIT_FOR_WS_MARKET_STATS_SECONDS", 10.0))
+        if hasattr(lighter, "wait_for_ws_market_stats_ready"):
+            return await lighter.wait_for_ws_market_stats_ready(timeout=ws_wait)
+        return False
+    
+    # Infrastructure
+    graph.add("database", setup_database, critical=True)
+    graph.add("migrate_database", migrate_database, deps=["database"])
+    # State manager reads tables the migrations may still be altering
+    graph.add("state_manager", _start_state_manager, deps=["migrate_database"], critical=True)
+    graph.add("funding_tracker", _start_funding_tracker, deps=["state_manager"], critical=True)
+    # Exchange clients (Lighter signer is shared by balance, market and fee calls)
+    graph.add("http_warmup", warm_up_transports)
+    graph.add("x10_client", x10._get_trading_client)
+    graph.add("lighter_signer", lighter._get_signer)
+    graph.add("balance_x10", x10.get_real_available_balance, deps=["x10_client"])
+    graph.add("balance_lighter", lighter.get_real_available_balance, deps=["lighter_signer"])
+    graph.add("fee_manager", _start_fee_manager, deps=["x10_client", "lighter_signer"], critical=True)
+    # Market data
+    graph.add("markets_x10", lambda: x10.load_market_cache(force=True))
+    graph.add("markets_lighter", lambda: lighter.load_market_cache(force=True), deps=["lighter_signer"])
+    graph.add("warmup_x10", _warmup_x10_markets, deps=["x10_client"])
+    graph.add("stream_clients", _start_stream_clients, deps=["markets_x10", "markets_lighter"])
+    graph.add("oi_tracker", _start_oi_tracker, deps=["markets_x10", "markets_lighter"], critical=True)
+    graph.add("ws_manager", _start_ws_manager, deps=["oi_tracker"], critical=True)
+    graph.add("ws_ready", _wait_ws_ready, deps=["ws_manager"])
+    # Closes the previous run left PROVISIONAL (settlement resolves them against exchange history)
+    graph.add(
+        "pnl_settlement_requeue",
+        lambda: requeue_provisional_settlements(lighter, x10),
+        deps=["state_manager", "fee_manager", "markets_x10", "markets_lighter"],
+    )
+    # REST funding must land AFTER the first WS market_stats (WebSocket rates are incorrect)
+    graph.add(
+        "lighter_funding_rest",
+        lambda: lighter.load_funding_rates_and_prices(force=True),
+        deps=["ws_ready"],
+        critical=True,
+    )
+    
+    logger.info(f"🧭 Running startup graph ({len(graph.steps)} steps)...")
     try:
-        await x10._get_trading_client()
-        bal_x10 = await x10.get_real_available_balance()
-        bal_lit = await lighter.get_real_available_balance()
+        await graph.run()
+    finally:
+        logger.info("⏱️ Startup timing:\n" + graph.format_timing_table())
+    
+    bal_x10 = safe_float(graph.result("balance_x10"), 0.0)
+    bal_lit = safe_float(graph.result("balance_lighter"), 0.0)
+    if graph.steps["balance_x10"].status == "ok" and graph.steps["balance_lighter"].status == "ok":
         logger.info(f"💰 STARTUP BALANCE CHECK: X10=${bal_x10:.2f}, Lighter=${bal_lit:.2f}")
-        
         if bal_x10 == 0 and bal_lit == 0:
             logger.critical("🚨 CRITICAL: BOTH exchange balances are $0!")
         else:
             logger.info("✅ Exchange balances OK - Bot can trade!")
-    except Exception as e:
-        logger.error(f"❌ STARTUP BALANCE CHECK FAILED: {e}", exc_info=True)
-    
-    # Init FeeManager
-    fee_manager = await init_fee_manager(x10, lighter)
-    logger.info("✅ FeeManager started")
-    
-    # Init FundingTracker
-    interval = int(getattr(config, "FUNDING_TRACK_INTERVAL_SECONDS", 300))
-    funding_tracker = FundingTracker(x10, lighter, state_manager, update_interval_seconds=interval)
-    await funding_tracker.start()
-    logger.info("✅ FundingTracker started")
-    
-    # Load market data
-    logger.info("📊 Loading Market Data via REST...")
-    try:
-        await asyncio.gather(
-            x10.load_market_cache(force=True),
-            lighter.load_market_cache(force=True),
-            return_exceptions=True
-        )
-        logger.info(f"✅ Markets loaded: X10={len(x10.market_info)}, Lighter={len(lighter.market_info)}")
-    except Exception as e:
-        logger.error(f"⚠️ Market load warning: {e}")
-
-    # Warmup execution clients
-    logger.info("🔥 Warming up execution clients (Network Handshake)...")
-    try:
-        await lighter._get_signer()
-        x10_client = await x10._get_trading_client()
-        await x10_client.markets_info.get_markets()
-        logger.info("✅ Execution clients warmed up & NETWORK READY")
-    except Exception as e:
-        logger.warning(f"⚠️ Warmup warning: {e}")
-
-    # Init OI Tracker
-    common_symbols = list(set(x10.market_info.keys()) & set(lighter.market_info.keys()))
-    
-    # ═══════════════════════════════════════════════════════════════
-    # Initialize Stream Clients for real-time updates
-    # ═══════════════════════════════════════════════════════════════
-    logger.info("🌐 Initializing Stream Clients...")
-
-    if getattr(config, "USE_ADAPTER_STREAM_CLIENTS", False):
-        # Initialize X10 Stream Client
-        try:
-            await x10.initialize_stream_client(symbols=common_symbols)
-            logger.info("X10 stream client initialized")
-        except Exception as e:
-            logger.warning(f"X10 stream client initialization failed: {e}")
-            logger.info("Continuing with polling fallback...")
-
-        # Initialize Lighter Stream Client
-        try:
-            await lighter.initialize_stream_client(symbols=common_symbols)
-            logger.info("Lighter stream client initialized")
-        except Exception as e:
-            logger.warning(f"Lighter stream client initialization failed: {e}")
-            logger.info("Continuing with polling fallback...")
     else:
-        logger.info("Adapter stream clients disabled (using WebSocketManager)")
-
-    # Init OI Tracker
-    logger.info(f"🚀 Starting OI Tracker for {len(common_symbols)} symbols...")
-    oi_tracker = await init_oi_tracker(x10, lighter, symbols=common_symbols)
-    
-    # Init WebSocket Manager
-    logger.info("🌐 Starting WebSocket Manager...")
-    ws_manager = await init_websocket_manager(
-        x10, lighter, symbols=common_symbols,
-        ping_interval=None, ping_timeout=None
-    )
-    ws_manager.set_oi_tracker(oi_tracker)
-    ws_wait = float(getattr(config, "LIGHTER_WAIT_FOR_WS_MARKET_STATS_SECONDS", 10.0))
-    ws_ready = False
-    if hasattr(lighter, "wait_for_ws_market_stats_ready"):
-        ws_ready = await lighter.wait_for_ws_market_stats_ready(timeout=ws_wait)
+        logger.error("❌ STARTUP BALANCE CHECK FAILED (see startup step errors above)")
     
-    # Load Lighter funding rates from REST API (WebSocket rates are incorrect)
-    await lighter.load_funding_rates_and_prices(force=True)
+    logger.info(f"✅ Markets loaded: X10={len(x10.market_info)}, Lighter={len(lighter.market_info)}")
     
-    if ws_ready:
+    fee_manager = graph.result("fee_manager")
+    funding_tracker = graph.result("funding_tracker")
+    oi_tracker = graph.result("oi_tracker")
+    ws_manager = graph.result("ws_manager")
+    
+    if graph.result("ws_ready"):
         logger.info("✅ Lighter WS ready (prices from WS, funding from REST)")
     else:
         logger.info("⚠️ Lighter WS not ready; using REST data")
@@ -361,6 +400,14 @@ async def run_bot_v5(bot_instance=None, event_bus=None):
         restart_on_failure=True
     )
     
+    from src.core.admission import get_admission_gate
+    event_loop.register_task(
+        "admission_refresh",
+        lambda: get_admission_gate().run(lighter, x10),
+        priority=TaskPriority.NORMAL,
+        restart_on_failure=True
+    )
+    
     event_loop.register_task(
         "farm_loop",
         lambda: farm_loop(lighter, x10, parallel_exec),
@@ -375,6 +422,14 @@ async def run_bot_v5(bot_instance=None, event_bus=None):
         restart_on_failure=True
     )
     
+    from src.infrastructure.db_maintenance import db_maintenance_loop
+    event_loop.register_task(
+        "db_maintenance",
+        lambda: db_maintenance_loop(),
+        priority=TaskPriority.LOW,
+        restart_on_failure=True
+    )
+
     event_loop.register_task(
         "cleanup_finished_tasks",
         lambda: cleanup_finished_tasks(),
@@ -503,6 +558,7 @@ async def run_bot_v5(bot_instance=None, event_bus=None):
     
     await x10.aclose()
     await lighter.aclose()
+    await close_transports()
     
     logger.info("✅ Bot V5 shutdown complete")
 
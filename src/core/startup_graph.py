@@ -0,0 +1,167 @@
+# src/core/startup_graph.py
+"""
+Dependency-aware startup graph.
+
+Each step is an async callable with a list of steps it depends on. All steps
+are started at once and each one only waits for its own dependencies, so
+independent bring-up work (DB, balances, market loads, fee schedules) runs
+concurrently. Per-step timings are collected for a summary table.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupError(RuntimeError):
+    """A critical startup step failed."""
+
+    def __init__(self, step: str, error: BaseException):
+        super().__init__(f"Startup step '{step}' failed: {error}")
+        self.step = step
+        self.error = error
+
+
+@dataclass
+class StartupStep:
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    deps: List[str] = field(default_factory=list)
+    critical: bool = False  # abort startup on failure (otherwise: log + continue)
+
+    # Filled in by StartupGraph.run()
+    status: str = "pending"  # pending | ok | failed | skipped
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    waited_s: float = 0.0
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def duration_s(self) -> float:
+        if not self.finished_at:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class StartupGraph:
+    """
+    Runs startup steps concurrently, respecting declared dependencies.
+
+    Non-critical failures are logged and their dependents still run (with the
+    failed step's result = None), matching the old sequential try/except
+    behaviour. A critical failure cancels everything still running and raises
+    StartupError.
+    """
+
+    def __init__(self, name: str = "startup"):
+        self.name = name
+        self.steps: Dict[str, StartupStep] = {}
+        self._t0 = 0.0
+        self._total_s = 0.0
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        deps: Optional[List[str]] = None,
+        critical: bool = False,
+    ) -> "StartupGraph":
+        if name in self.steps:
+            raise ValueError(f"Duplicate startup step: {name}")
+        self.steps[name] = StartupStep(name=name, func=func, deps=list(deps or []), critical=critical)
+        return self
+
+    def result(self, name: str) -> Any:
+        return self.steps[name].result
+
+    def _validate(self) -> None:
+        for step in self.steps.values():
+            for dep in step.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"Startup step '{step.name}' depends on unknown step '{dep}'")
+
+        # Cycle check (DFS)
+        visiting, done = set(), set()
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Startup dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.steps[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all steps; returns {step_name: result}."""
+        self._validate()
+        self._t0 = time.monotonic()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: StartupStep) -> Any:
+            wait_start = time.monotonic()
+            if step.deps:
+                # Dependency tasks never raise for non-critical failures
+                await asyncio.gather(*(tasks[d] for d in step.deps))
+            step.started_at = time.monotonic()
+            step.waited_s = step.started_at - wait_start
+            try:
+                step.result = await step.func()
+                step.status = "ok"
+            except asyncio.CancelledError:
+                step.status = "skipped"
+                raise
+            except Exception as e:
+                step.status = "failed"
+                step.error = e
+                if step.critical:
+                    raise StartupError(step.name, e) from e
+                logger.warning(f"⚠️ Startup step '{step.name}' failed: {e}")
+            finally:
+                step.finished_at = time.monotonic()
+            return step.result
+
+        for step in self.steps.values():
+            tasks[step.name] = asyncio.create_task(run_step(step), name=f"{self.name}:{step.name}")
+
+        try:
+            # FIRST_EXCEPTION: only critical steps raise
+            done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self._total_s = time.monotonic() - self._t0
+
+        return {name: step.result for name, step in self.steps.items()}
+
+    def format_timing_table(self) -> str:
+        """Per-step timings, ordered by start time (offsets relative to graph start)."""
+        rows = sorted(self.steps.values(), key=lambda s: (s.started_at or float("inf"), s.name))
+        width = max([len(s.name) for s in rows] + [4])
+        lines = [
+            f"{'STEP':<{width}}  {'START':>7}  {'WAIT':>7}  {'DURATION':>8}  STATUS",
+        ]
+        for s in rows:
+            start = (s.started_at - self._t0) if s.started_at else 0.0
+            lines.append(
+                f"{s.name:<{width}}  {start:>6.2f}s  {s.waited_s:>6.2f}s  {s.duration_s:>7.2f}s  {s.status}"
+            )
+        serial = sum(s.duration_s for s in rows)
+        lines.append(f"{'TOTAL':<{width}}  wall={self._total_s:.2f}s  serial={serial:.2f}s")
+        return "\n".join(lines)
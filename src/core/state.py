@@ -58,6 +58,11 @@ def get_local_state_manager():
     return state_manager
 
 
+def _admission_gate():
+    from src.core.admission import get_admission_gate
+    return get_admission_gate()
+
+
 async def get_open_trades() -> List[Dict[str, Any]]:
     """Get open trades from state manager."""
     sm = await get_state_manager()
@@ -94,21 +99,40 @@ async def add_trade_to_state(trade_data: Dict[str, Any]) -> str:
         x10_order_id=trade_data.get('x10_order_id'),
         lighter_order_id=trade_data.get('lighter_order_id'),
     )
-    return await sm.add_trade(trade)
+    result = await sm.add_trade(trade)
+    _admission_gate().note_trade_opened(trade.symbol, size_usd)
+    return result
 
 
-async def close_trade_in_state(symbol: str, pnl: Decimal = Decimal('0'), funding: Decimal = Decimal('0')):
+async def close_trade_in_state(
+    symbol: str,
+    pnl: Decimal = Decimal('0'),
+    funding: Decimal = Decimal('0'),
+    fees: Decimal = Decimal('0'),
+):
     """Close trade in state using Decimal."""
     sm = await get_state_manager()
     
     logger.info(f"📝 close_trade_in_state({symbol}): PnL=${float(pnl):.4f}, Funding=${float(funding):.4f}")
     
-    await sm.close_trade(symbol, pnl, funding)
+    await sm.close_trade(symbol, pnl, funding, fees=fees)
+    _admission_gate().note_trade_closed(symbol)
     logger.info(f"✅ Trade {symbol} closed in state")
 
 
-async def archive_trade_to_history(trade_data: Dict, close_reason: str, pnl_data: Dict):
-    """Archive closed trade to trade_history table"""
+async def archive_trade_to_history(
+    trade_data: Dict,
+    close_reason: str,
+    pnl_data: Dict,
+    provisional: bool = False,
+) -> Optional[int]:
+    """
+    Archive closed trade to trade_history table.
+
+    provisional=True books the exit estimate (pnl_status='PROVISIONAL') and
+    skips the CSV; the PnL settlement queue finalizes the row later via
+    update_trade_history(). Returns the trade_history row id.
+    """
     try:
         async with aiosqlite.connect(config.DB_FILE) as conn:
             exit_time = datetime.utcnow()
@@ -126,31 +150,93 @@ async def archive_trade_to_history(trade_data: Dict, close_reason: str, pnl_data
             
             duration = (exit_time - entry_time).total_seconds() / 3600 if entry_time else 0
             
-            await conn.execute("""
+            cursor = await conn.execute("""
                 INSERT INTO trade_history 
                 (symbol, entry_time, exit_time, hold_duration_hours, close_reason, 
-                 final_pnl_usd, funding_pnl_usd, spread_pnl_usd, fees_usd, account_label)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 final_pnl_usd, funding_pnl_usd, spread_pnl_usd, fees_usd, account_label, pnl_status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 trade_data['symbol'], entry_time, exit_time, duration, close_reason,
                 pnl_data['total_net_pnl'], pnl_data['funding_pnl'], pnl_data['spread_pnl'], pnl_data['fees'],
-                trade_data.get('account_label', 'Main')
+                trade_data.get('account_label', 'Main'),
+                'PROVISIONAL' if provisional else 'FINAL',
             ))
             await conn.commit()
-            logger.info(f" 💰 PnL {trade_data['symbol']}: ${pnl_data['total_net_pnl']:.2f} ({close_reason})")
+            row_id = cursor.lastrowid
+            logger.info(
+                f" 💰 PnL {trade_data['symbol']}: ${pnl_data['total_net_pnl']:.2f} ({close_reason})"
+                f"{' [provisional]' if provisional else ''}"
+            )
             
             # ═══════════════════════════════════════════════════════════════
             # CSV LOGGING (Added/Restored)
             # ═══════════════════════════════════════════════════════════════
-            try:
-                await _append_to_realized_pnl_csv(trade_data, pnl_data)
-            except Exception as e:
-                logger.error(f"Failed to write realized_pnl.csv: {e}")
+            if not provisional:
+                try:
+                    await _append_to_realized_pnl_csv(trade_data, pnl_data)
+                except Exception as e:
+                    logger.error(f"Failed to write realized_pnl.csv: {e}")
+            return row_id
 
     except Exception as e:
         logger.error(f"Archive Error: {e}")
+        return None
+
+
+async def update_trade_history(row_id: int, trade_data: Dict, pnl_data: Dict) -> bool:
+    """Replace a provisional trade_history row with the settled PnL and write the CSV row."""
+    try:
+        async with aiosqlite.connect(config.DB_FILE) as conn:
+            cursor = await conn.execute("""
+                UPDATE trade_history
+                SET final_pnl_usd = ?, funding_pnl_usd = ?, spread_pnl_usd = ?, fees_usd = ?,
+                    pnl_status = 'FINAL'
+                WHERE id = ?
+            """, (
+                pnl_data['total_net_pnl'], pnl_data['funding_pnl'], pnl_data['spread_pnl'], pnl_data['fees'],
+                row_id,
+            ))
+            await conn.commit()
+            if cursor.rowcount == 0:
+                logger.warning(f"trade_history row {row_id} ({trade_data.get('symbol')}) not found for settlement")
+                return False
+    except Exception as e:
+        logger.error(f"Settlement update error for {trade_data.get('symbol')}: {e}")
         return False
 
+    try:
+        await _append_to_realized_pnl_csv(trade_data, pnl_data)
+    except Exception as e:
+        logger.error(f"Failed to write realized_pnl.csv: {e}")
+    return True
+
+
+async def get_provisional_trade_history() -> List[Dict[str, Any]]:
+    """
+    trade_history rows still PROVISIONAL (bot stopped before settlement),
+    joined with their closed trades row. closed_at (ms) is None when the
+    trades row is gone (replaced by a newer close of the symbol).
+    """
+    try:
+        async with aiosqlite.connect(config.DB_FILE) as conn:
+            conn.row_factory = aiosqlite.Row
+            # exit_time is written right after the trades row was closed
+            cursor = await conn.execute("""
+                SELECT h.id AS history_id, h.symbol, h.entry_time, h.close_reason,
+                       h.final_pnl_usd, h.funding_pnl_usd, h.spread_pnl_usd, h.fees_usd, h.account_label,
+                       t.side_x10, t.side_lighter, t.size_usd, t.entry_price_x10, t.entry_price_lighter,
+                       t.x10_order_id, t.lighter_order_id, t.closed_at
+                FROM trade_history h
+                LEFT JOIN trades t ON t.symbol = h.symbol AND t.status = 'closed'
+                    AND t.closed_at <= CAST((julianday(h.exit_time) - 2440587.5) * 86400000 AS INTEGER)
+                WHERE h.pnl_status = 'PROVISIONAL'
+                ORDER BY h.id
+            """)
+            return [dict(row) for row in await cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Could not load provisional trade_history rows: {e}")
+        return []
+
 
 async def _append_to_realized_pnl_csv(trade_data: Dict, pnl_data: Dict):
     """
@@ -340,8 +426,11 @@ async def check_total_exposure(
             current_exposure += _safe_to_decimal(size_val)
         
         # Total capital = X10 + Lighter (user goal is portfolio-level ROI).
-        x10_balance = await x10_adapter.get_available_balance()
-        lighter_balance = await lighter_adapter.get_available_balance()
+        # (BalanceService: from memory while the account streams are fresh)
+        x10_balance, lighter_balance = await asyncio.gather(
+            x10_adapter.get_available_balance(),
+            lighter_adapter.get_available_balance(),
+        )
 
         # Safely convert balances
         x10_balance = _safe_to_decimal(x10_balance)
@@ -0,0 +1,309 @@
+"""
+Task Scheduler - runtime priority enforcement for BotEventLoop tasks
+
+TaskPriority used to decide the start order only; afterwards a LOW cleanup
+task competed equally with WebSocket ingest and trade execution. Every
+managed task is now driven through a ``MeteredCoroutine``:
+
+- each step (``send`` / ``throw``) is timed -> per-task CPU time, step
+  count, longest step and CPU share of the current budget window
+- before a LOW / NORMAL step the scheduler decides whether it may run:
+    * CRITICAL / HIGH work is waiting (a resumed CRITICAL/HIGH task that
+      has not run yet, or an ``urgent()`` section such as a trade entry)
+      -> LOW and NORMAL pause
+    * event-loop lag above SCHEDULER_LAG_THRESHOLD_MS -> LOW pauses
+    * CPU share of the window above the task budget
+      (SCHEDULER_CPU_BUDGETS, per task via ``register_task(cpu_budget=)``)
+      -> the task is throttled until the window ends
+  A paused step is parked on a gate future and resumed as soon as the
+  pressure is gone, at the latest after SCHEDULER_MAX_PAUSE_SECONDS (a
+  paused task may hold a lock a HIGH task waits for).
+
+CRITICAL / HIGH tasks are never delayed.
+"""
+
+import asyncio
+import collections.abc
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS = {"NORMAL": 0.25, "LOW": 0.05}
+
+
+@dataclass
+class TaskBudget:
+    """Runtime accounting of one managed task."""
+    name: str
+    priority: int
+    cpu_budget: Optional[float] = None  # share of the window, None = unlimited
+    cpu_time: float = 0.0
+    steps: int = 0
+    max_step: float = 0.0
+    window_start: float = 0.0
+    window_cpu: float = 0.0
+    last_share: float = 0.0
+    pauses: int = 0
+    throttles: int = 0
+    paused_time: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cpu_time_ms": round(self.cpu_time * 1000, 3),
+            "steps": self.steps,
+            "max_step_ms": round(self.max_step * 1000, 3),
+            "cpu_share": round(self.last_share, 4),
+            "cpu_budget": self.cpu_budget,
+            "pauses": self.pauses,
+            "throttles": self.throttles,
+            "paused_ms": round(self.paused_time * 1000, 1),
+        }
+
+
+class MeteredCoroutine(collections.abc.Coroutine):
+    """Coroutine proxy that times every step and lets the scheduler park it between steps."""
+
+    def __init__(self, coro, budget: TaskBudget, scheduler: "TaskScheduler"):
+        self._coro = coro
+        self._budget = budget
+        self._scheduler = scheduler
+        self._parked = False
+        self._parked_value = None
+        self._parked_at = 0.0
+
+    def send(self, value):
+        if self._parked:
+            # Gate released -> resume the inner coroutine with the value it was waiting for
+            self._parked = False
+            self._budget.paused_time += time.perf_counter() - self._parked_at
+            value, self._parked_value = self._parked_value, None
+        else:
+            gate = self._scheduler.gate_for(self._budget)
+            if gate is not None:
+                self._parked, self._parked_value, self._parked_at = True, value, time.perf_counter()
+                return gate
+        return self._step(self._coro.send, value)
+
+    def throw(self, typ, val=None, tb=None):
+        # Cancellation / errors always reach the inner coroutine, parked or not
+        if self._parked:
+            self._parked, self._parked_value = False, None
+            self._budget.paused_time += time.perf_counter() - self._parked_at
+        if val is None and tb is None:
+            return self._step(self._coro.throw, typ)
+        return self._step(self._coro.throw, typ, val, tb)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def _step(self, fn, *args):
+        scheduler = self._scheduler
+        scheduler.on_step_start(self._budget)
+        started = time.perf_counter()
+        try:
+            result = fn(*args)
+        finally:
+            scheduler.on_step_end(self._budget, time.perf_counter() - started)
+        if self._budget.priority <= scheduler.HIGH and isinstance(result, asyncio.Future):
+            # The task waits for ``result``; once it completes the task is runnable = waiting work
+            result.add_done_callback(lambda _f, b=self._budget: scheduler.on_ready(b))
+        return result
+
+
+class TaskScheduler:
+    """Priority enforcement, CPU accounting and loop-lag tracking for managed tasks."""
+
+    CRITICAL, HIGH, NORMAL, LOW = 0, 1, 2, 3
+
+    def __init__(
+        self,
+        lag_threshold_ms: Optional[float] = None,
+        max_pause: Optional[float] = None,
+        window: Optional[float] = None,
+        budgets: Optional[Dict[str, float]] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.enabled = bool(enabled if enabled is not None else getattr(config, 'SCHEDULER_ENABLED', True))
+        self.lag_threshold = float(
+            lag_threshold_ms if lag_threshold_ms is not None else getattr(config, 'SCHEDULER_LAG_THRESHOLD_MS', 50.0)
+        ) / 1000.0
+        self.max_pause = float(
+            max_pause if max_pause is not None else getattr(config, 'SCHEDULER_MAX_PAUSE_SECONDS', 0.5)
+        )
+        self.window = float(
+            window if window is not None else getattr(config, 'SCHEDULER_BUDGET_WINDOW_SECONDS', 1.0)
+        )
+        self.budgets = dict(budgets if budgets is not None else getattr(config, 'SCHEDULER_CPU_BUDGETS', DEFAULT_BUDGETS))
+        self._tasks: Dict[str, TaskBudget] = {}
+        self._ready_high = 0
+        self._urgent: Dict[str, int] = {}
+        self._gates: List[asyncio.Future] = []
+        self._lag = 0.0
+        self._max_lag = 0.0
+        self._stats = {"pauses": 0, "throttles": 0, "forced_resumes": 0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Registration
+    # ═══════════════════════════════════════════════════════════════
+
+    def wrap(self, name: str, coro, priority: int, cpu_budget: Optional[float] = None):
+        """Return ``coro`` metered for task ``name`` (budget accounting survives restarts)."""
+        budget = self._tasks.get(name)
+        if budget is None:
+            level = {0: "CRITICAL", 1: "HIGH", 2: "NORMAL", 3: "LOW"}.get(priority, "NORMAL")
+            budget = TaskBudget(
+                name=name,
+                priority=priority,
+                cpu_budget=cpu_budget if cpu_budget is not None else self.budgets.get(level),
+                window_start=time.perf_counter(),
+            )
+            self._tasks[name] = budget
+        return MeteredCoroutine(coro, budget, self)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Pressure signals
+    # ═══════════════════════════════════════════════════════════════
+
+    @contextmanager
+    def urgent(self, name: str = "urgent"):
+        """Mark latency-critical work outside the managed tasks (e.g. a trade entry)."""
+        self._urgent[name] = self._urgent.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            count = self._urgent.get(name, 1) - 1
+            if count > 0:
+                self._urgent[name] = count
+            else:
+                self._urgent.pop(name, None)
+            self._release_gates()
+
+    def high_priority_waiting(self) -> bool:
+        return self._ready_high > 0 or bool(self._urgent)
+
+    def lagging(self) -> bool:
+        return self._lag > self.lag_threshold
+
+    def on_ready(self, budget: TaskBudget) -> None:
+        self._ready_high += 1
+
+    def on_step_start(self, budget: TaskBudget) -> None:
+        if budget.priority <= self.HIGH and self._ready_high > 0:
+            self._ready_high -= 1  # the waiting CRITICAL/HIGH task runs now
+
+    def on_step_end(self, budget: TaskBudget, elapsed: float) -> None:
+        budget.cpu_time += elapsed
+        budget.steps += 1
+        if elapsed > budget.max_step:
+            budget.max_step = elapsed
+        now = time.perf_counter()
+        if now - budget.window_start >= self.window:
+            budget.last_share = budget.window_cpu / max(now - budget.window_start, 1e-9)
+            budget.window_start, budget.window_cpu = now, 0.0
+        budget.window_cpu += elapsed
+        if budget.priority <= self.HIGH and self._gates and not self.high_priority_waiting():
+            self._release_gates()
+
+    # ═══════════════════════════════════════════════════════════════
+    # Gating
+    # ═══════════════════════════════════════════════════════════════
+
+    def gate_for(self, budget: TaskBudget) -> Optional[asyncio.Future]:
+        """None = step may run now, otherwise a future to park the step on."""
+        if not self.enabled or budget.priority <= self.HIGH:
+            return None
+
+        if self.high_priority_waiting() or (budget.priority == self.LOW and self.lagging()):
+            budget.pauses += 1
+            self._stats["pauses"] += 1
+            return self._new_gate(self.max_pause, pressure=True)
+
+        if budget.cpu_budget is not None:
+            now = time.perf_counter()
+            elapsed = now - budget.window_start
+            if elapsed < self.window and budget.window_cpu > budget.cpu_budget * self.window:
+                budget.throttles += 1
+                self._stats["throttles"] += 1
+                return self._new_gate(self.window - elapsed, pressure=False)
+        return None
+
+    def _new_gate(self, delay: float, pressure: bool) -> asyncio.Future:
+        """Pressure gates open early when the pressure is gone, budget gates at the window end."""
+        loop = asyncio.get_running_loop()
+        gate = loop.create_future()
+        gate._asyncio_future_blocking = True
+        if pressure:
+            self._gates.append(gate)
+        loop.call_later(max(0.0, delay), self._resolve, gate, pressure)
+        return gate
+
+    def _resolve(self, gate: asyncio.Future, pressure: bool) -> None:
+        if not gate.done():
+            if pressure:
+                self._stats["forced_resumes"] += 1
+            gate.set_result(None)
+        if gate in self._gates:
+            self._gates.remove(gate)
+
+    def _release_gates(self) -> None:
+        if self.high_priority_waiting():
+            return
+        gates, self._gates = self._gates, []
+        for gate in gates:
+            if not gate.done():
+                gate.set_result(None)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Event-loop lag
+    # ═══════════════════════════════════════════════════════════════
+
+    async def monitor_lag(self, interval: float = 0.1) -> None:
+        """Measure how late the loop wakes a ``sleep(interval)`` (loop lag)."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self._lag = max(0.0, time.perf_counter() - started - interval)
+            if self._lag > self._max_lag:
+                self._max_lag = self._lag
+            if not self.lagging():
+                self._release_gates()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "loop_lag_ms": round(self._lag * 1000, 2),
+            "max_loop_lag_ms": round(self._max_lag * 1000, 2),
+            "high_priority_waiting": self.high_priority_waiting(),
+            "paused": len(self._gates),
+            "tasks": {name: budget.to_dict() for name, budget in self._tasks.items()},
+        }
+
+    def task_stats(self, name: str) -> Dict[str, Any]:
+        budget = self._tasks.get(name)
+        return budget.to_dict() if budget is not None else {}
+
+
+_default_scheduler: Optional[TaskScheduler] = None
+
+
+def get_task_scheduler() -> TaskScheduler:
+    """Get singleton task scheduler"""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = TaskScheduler()
+    return _default_scheduler
@@ -20,7 +20,10 @@ import config
 from src.utils import safe_float
 from src.application.fee_manager import get_fee_manager
 from src.core.events import NotificationEvent, TradeClosed
+from src.core.exit_pipeline import ExitDecision, ExitPipeline
+from src.core.pnl_settlement import PnLSettlementQueue
 from src.core.trading import publish_event
+from src.infrastructure.orderbook_provider import get_orderbook_provider
 from src.utils.pnl_utils import compute_hedge_pnl, _side_sign
 
 logger = logging.getLogger(__name__)
@@ -228,7 +231,13 @@ async def _lighter_fill_stats_for_order(
     return {"price": 0.0, "qty": 0.0, "fee": 0.0}
 
 
-async def calculate_realized_close_pnl(trade: Dict, lighter, x10) -> Dict[str, float]:
+async def calculate_realized_close_pnl(
+    trade: Dict,
+    lighter,
+    x10,
+    settle_delay: float = 0.5,
+    fill_wait_s: float = 3.0,
+) -> Dict[str, float]:
     """
     Compute realized PnL (for DB/accounting) from best-available entry/exit data.
     Returns a dict with breakdown fields (price_pnl, fees, funding, total).
@@ -236,6 +245,10 @@ async def calculate_realized_close_pnl(trade: Dict, lighter, x10) -> Dict[str, f
     Uses compute_hedge_pnl from pnl_utils for accurate, sign-correct calculations.
     
     H4 Enhancement: Also fetches EXACT PnL breakdown from X10 API for verification.
+
+    settle_delay/fill_wait_s: inline waiting for the exchanges to publish the
+    close. The PnL settlement queue passes 0 and retries instead.
+    The 'complete' flag is True once real exit fills were found on both legs.
     """
     symbol = trade.get("symbol")
     notional = safe_float(trade.get("notional_usd") or trade.get("size_usd") or 0.0, 0.0)
@@ -262,7 +275,8 @@ async def calculate_realized_close_pnl(trade: Dict, lighter, x10) -> Dict[str, f
     if x10 and hasattr(x10, "get_realised_pnl_breakdown"):
         try:
             # Wait a bit for position to be fully closed on X10 side
-            await asyncio.sleep(0.5)
+            if settle_delay > 0:
+                await asyncio.sleep(settle_delay)
             x10_breakdown = await x10.get_realised_pnl_breakdown(symbol, limit=5)
             
             if x10_breakdown:
@@ -298,11 +312,15 @@ async def calculate_realized_close_pnl(trade: Dict, lighter, x10) -> Dict[str, f
     lighter_exit_oid = trade.get("lighter_exit_order_id")
     entry_time_dt = parse_iso_time(trade.get("entry_time"))
     since_ts = entry_time_dt.timestamp() if entry_time_dt else None
-    lit_stats = await _lighter_fill_stats_for_order(lighter, symbol, lighter_exit_oid, fallback_since_ts=since_ts)
+    lit_stats = await _lighter_fill_stats_for_order(
+        lighter, symbol, lighter_exit_oid, fallback_since_ts=since_ts, max_wait_s=fill_wait_s
+    )
     lit_exit_px = safe_float(lit_stats.get("price"), 0.0)
     lit_exit_qty = safe_float(lit_stats.get("qty"), 0.0)
     lit_exit_fee_usd = safe_float(lit_stats.get("fee"), 0.0)
 
+    complete = (x10_exit_px > 0 or bool(x10_breakdown)) and lit_exit_px > 0
+
     # Fallback prices if we couldn't find fills
     if x10_exit_px <= 0:
         try:
@@ -418,6 +436,7 @@ async def calculate_realized_close_pnl(trade: Dict, lighter, x10) -> Dict[str, f
         "exit_fee_x10": x10_exit_fee_usd,
         "exit_fee_lighter": lit_exit_fee_usd,
         "x10_breakdown": x10_breakdown,  # H4: Include exact breakdown for audit
+        "complete": complete,
     }
 
 
@@ -937,6 +956,62 @@ async def reconcile_state_with_exchange(lighter, x10, parallel_exec):
 # ============================================================
 # MAIN TRADE MANAGEMENT FUNCTION
 # ============================================================
+# ============================================================
+# EXIT PIPELINE (evaluation -> per-symbol close workers)
+# ============================================================
+_EXIT_PIPELINE: Optional[ExitPipeline] = None
+
+
+def get_exit_pipeline(lighter=None, x10=None) -> ExitPipeline:
+    """Module-wide exit pipeline (created on first use with the live adapters)."""
+    global _EXIT_PIPELINE
+    if _EXIT_PIPELINE is None:
+        _EXIT_PIPELINE = ExitPipeline(lambda d: execute_trade_exit(d, lighter, x10))
+    return _EXIT_PIPELINE
+
+
+async def stop_exit_pipeline() -> None:
+    """Cancel in-flight exit workers (shutdown takes over closing)."""
+    global _EXIT_PIPELINE
+    if _EXIT_PIPELINE is not None:
+        await _EXIT_PIPELINE.stop()
+        _EXIT_PIPELINE = None
+
+
+# ============================================================
+# PNL SETTLEMENT (provisional close PnL -> exact PnL)
+# ============================================================
+_SETTLEMENT_QUEUE: Optional[PnLSettlementQueue] = None
+
+
+def get_settlement_queue(lighter=None, x10=None) -> Optional[PnLSettlementQueue]:
+    """Module-wide settlement queue, None if PNL_SETTLEMENT_ENABLED is off."""
+    global _SETTLEMENT_QUEUE
+    if not getattr(config, 'PNL_SETTLEMENT_ENABLED', True):
+        return None
+    if _SETTLEMENT_QUEUE is None:
+        _SETTLEMENT_QUEUE = PnLSettlementQueue(lighter, x10)
+    return _SETTLEMENT_QUEUE
+
+
+async def requeue_provisional_settlements(lighter, x10) -> int:
+    """Hand closes the previous run left PROVISIONAL back to the settlement queue."""
+    settlement = get_settlement_queue(lighter, x10)
+    if settlement is None:
+        return 0
+    return await settlement.requeue_provisional()
+
+
+async def stop_settlement_queue(timeout: Optional[float] = None) -> None:
+    """Settle pending closes one last time (best-effort) and drop the queue."""
+    global _SETTLEMENT_QUEUE
+    if _SETTLEMENT_QUEUE is not None:
+        await _SETTLEMENT_QUEUE.flush(
+            timeout=timeout if timeout is not None else getattr(config, 'PNL_SETTLEMENT_FLUSH_TIMEOUT', 10.0)
+        )
+        _SETTLEMENT_QUEUE = None
+
+
 async def manage_open_trades(lighter, x10, state_manager=None):
     """
     Monitors open trades and closes them based on exit conditions.
@@ -946,9 +1021,11 @@ async def manage_open_trades(lighter, x10, state_manager=None):
     - MAX_HOLD_HOURS exceeded (safety override)
     - FARM trades: quick exit on low spread + profit
     - Funding flip detection
+
+    All trades are evaluated concurrently; closes run on the exit
+    pipeline so one slow close never blocks the other exit checks.
     """
-    get_open_trades, close_trade_in_state, archive_trade_to_history, _ = _get_state_functions()
-    close_trade, _ = _get_trading_functions()
+    get_open_trades, _, _, _ = _get_state_functions()
     
     trades = await get_open_trades()
     if not trades:
@@ -959,734 +1036,819 @@ async def manage_open_trades(lighter, x10, state_manager=None):
     except:
         return
 
-    current_time = time.time()
+    pipeline = get_exit_pipeline(lighter, x10)
+    candidates = [t for t in trades if not pipeline.in_flight(t.get('symbol'))]
+    if not candidates:
+        return
 
-    for t in trades:
-        try:
-            sym = t['symbol']
+    if state_manager is None:
+        from src.core.state import get_state_manager
+        state_manager = await get_state_manager()
 
-            # ═══════════════════════════════════════════════════════════════
-            # CRITICAL: Skip trades that are not fully hedged
-            # Prevents BASIS_CLOSING/PRICE_DIVERGENCE triggers on partial/pending trades.
-            # A trade is only considered "open & manageable" if BOTH legs are filled.
-            # ═══════════════════════════════════════════════════════════════
-            x10_order_id = t.get('x10_order_id')
-            lighter_order_id = t.get('lighter_order_id')
+    eval_limit = asyncio.Semaphore(max(1, int(getattr(config, 'EXIT_EVAL_CONCURRENCY', 16))))
 
-            if not x10_order_id or not lighter_order_id:
-                logger.debug(
-                    f"⏭️ Skipping {sym}: Not fully hedged "
-                    f"(x10_id={x10_order_id}, lighter_id={lighter_order_id})"
-                )
-                continue
+    async def _evaluate(t):
+        async with eval_limit:
+            return await evaluate_trade_exit(t, lighter, x10, p_lit, state_manager)
+
+    decisions = await asyncio.gather(*(_evaluate(t) for t in candidates))
+    for decision in decisions:
+        if decision is not None:
+            pipeline.submit(decision)
+
+
+async def _exit_price(adapter, sym: str):
+    """Orderbook mid (WS) with mark price fallback."""
+    raw = None
+    if hasattr(adapter, 'get_orderbook_mid_price'):
+        raw = await adapter.get_orderbook_mid_price(sym)
+    if raw is None or raw <= 0:
+        raw = await adapter.fetch_mark_price(sym)
+    return raw
+
+
+async def _exit_orderbook(adapter, sym: str, exchange: str) -> Optional[Dict]:
+    """5-level book: OrderbookProvider (WS) first, REST only for a stale or missing book."""
+    try:
+        provider = get_orderbook_provider()
+        getter = provider.get_x10_orderbook if exchange == "x10" else provider.get_lighter_orderbook
+        snap = await getter(sym)
+        if snap is not None and snap.is_valid and snap.age_seconds < provider.max_staleness_seconds:
+            return {'bids': snap.bids[:5], 'asks': snap.asks[:5]}
+    except Exception as e:
+        logger.debug(f"{sym} {exchange} provider orderbook unavailable: {e}")
+    if not hasattr(adapter, 'fetch_orderbook'):
+        return None
+    return await adapter.fetch_orderbook(sym, limit=5)
 
-            # ═══════════════════════════════════════════════════════════════
-            # Data sanitizing for all numeric fields
-            # FIX: Accept both 'notional_usd' and 'size_usd' field names
-            # DB uses 'size_usd', but some code paths use 'notional_usd'
-            # ═══════════════════════════════════════════════════════════════
-            notional = t.get('notional_usd') or t.get('size_usd') or t.get('size_usd_decimal')
-            notional = float(notional) if notional is not None else 0.0
 
-            init_funding = t.get('initial_funding_rate_hourly')
-            init_funding = float(init_funding) if init_funding is not None else 0.0
+async def evaluate_trade_exit(t: Dict, lighter, x10, p_lit: List[Dict], state_manager=None) -> Optional[ExitDecision]:
+    """
+    Score one open trade against all exit conditions (no order placement).
+    Returns an ExitDecision when the trade should be closed, else None.
+    """
+    try:
+        sym = t['symbol']
+
+        # ═══════════════════════════════════════════════════════════════
+        # CRITICAL: Skip trades that are not fully hedged
+        # Prevents BASIS_CLOSING/PRICE_DIVERGENCE triggers on partial/pending trades.
+        # A trade is only considered "open & manageable" if BOTH legs are filled.
+        # ═══════════════════════════════════════════════════════════════
+        x10_order_id = t.get('x10_order_id')
+        lighter_order_id = t.get('lighter_order_id')
+
+        if not x10_order_id or not lighter_order_id:
+            logger.debug(
+                f"⏭️ Skipping {sym}: Not fully hedged "
+                f"(x10_id={x10_order_id}, lighter_id={lighter_order_id})"
+            )
+            return None
+        # ═══════════════════════════════════════════════════════════════
+        # Data sanitizing for all numeric fields
+        # FIX: Accept both 'notional_usd' and 'size_usd' field names
+        # DB uses 'size_usd', but some code paths use 'notional_usd'
+        # ═══════════════════════════════════════════════════════════════
+        notional = t.get('notional_usd') or t.get('size_usd') or t.get('size_usd_decimal')
+        notional = float(notional) if notional is not None else 0.0
+
+        init_funding = t.get('initial_funding_rate_hourly')
+        init_funding = float(init_funding) if init_funding is not None else 0.0
+        
+        # ═══════════════════════════════════════════════════════════════
+        # PNL FIX: Extract Lighter position with REAL PnL data
+        # The Lighter API provides accurate unrealized_pnl, realized_pnl,
+        # avg_entry_price, and total_funding_paid values
+        # ═══════════════════════════════════════════════════════════════
+        lighter_position = None
+        for pos in p_lit:
+            if pos.get('symbol') == sym:
+                lighter_position = pos
+                break
+        
+        # Log if we have real Lighter PnL data
+        if lighter_position and lighter_position.get('unrealized_pnl', 0.0) != 0.0:
+            logger.debug(
+                f"📊 {sym} Lighter Position: uPnL=${lighter_position.get('unrealized_pnl', 0):.4f}, "
+                f"funding=${lighter_position.get('total_funding_paid', 0):.4f}, "
+                f"entry=${lighter_position.get('avg_entry_price', 0):.6f}"
+            )
+        
+        # Calculate age
+        age_seconds, hold_hours = calculate_trade_age(t)
+        
+        logger.debug(f"Check {sym}: Age={age_seconds:.1f}s (Limit={getattr(config, 'FARM_HOLD_SECONDS', 3600)}s)")
+        
+        # ═══════════════════════════════════════════════════════════════
+        # Get prices for PnL calculation
+        # ═══════════════════════════════════════════════════════════════
+        # FIX: Use Orderbook Mid-Price instead of Mark Price if available
+        # Mark Price can lag or be manipulated, leading to false PnL.
+        # Mid Price (avg of best bid/ask) reflects real liquidity.
+        # ═══════════════════════════════════════════════════════════════
+        
+        # X10 + Lighter Price (both legs concurrently)
+        raw_px, raw_pl = await asyncio.gather(_exit_price(x10, sym), _exit_price(lighter, sym))
             
-            # ═══════════════════════════════════════════════════════════════
-            # PNL FIX: Extract Lighter position with REAL PnL data
-            # The Lighter API provides accurate unrealized_pnl, realized_pnl,
-            # avg_entry_price, and total_funding_paid values
-            # ═══════════════════════════════════════════════════════════════
-            lighter_position = None
-            for pos in p_lit:
-                if pos.get('symbol') == sym:
-                    lighter_position = pos
-                    break
+        px = safe_float(raw_px) if raw_px is not None else None
+        pl = safe_float(raw_pl) if raw_pl is not None else None
+
+        # FIX (2025-12-19): Track price source for critical calculations
+        # WebSocket prices are real-time and reliable
+        # REST prices are fallback only (may be stale)
+        px_source_ws = raw_px is not None and raw_px > 0
+        pl_source_ws = raw_pl is not None and raw_pl > 0
+        
+        # REST Fallback if WebSocket has no prices
+        if px is None or pl is None or px <= 0 or pl <= 0:
+            logger.debug(f"{sym}: WS prices missing, trying REST fallback...")
+            try:
+                if px is None or px <= 0:
+                    if hasattr(x10, 'get_price_rest'):
+                        px = safe_float(await x10.get_price_rest(sym))
+                        px_source_ws = False  # Mark as REST source
+                    elif hasattr(x10, 'load_market_cache'):
+                        await x10.load_market_cache(force=True)
+                        px = safe_float(await x10.fetch_mark_price(sym))
+                        px_source_ws = False
+                
+                if pl is None or pl <= 0:
+                    if hasattr(lighter, 'get_price_rest'):
+                        pl = safe_float(await lighter.get_price_rest(sym))
+                        pl_source_ws = False  # Mark as REST source
+                    elif hasattr(lighter, 'load_funding_rates_and_prices'):
+                        await lighter.load_funding_rates_and_prices()
+                        pl = safe_float(await lighter.fetch_mark_price(sym))
+                        pl_source_ws = False
+                
+                if px is not None and pl is not None and px > 0 and pl > 0:
+                    source_info = f"X10={'WS' if px_source_ws else 'REST'}, Lit={'WS' if pl_source_ws else 'REST'}"
+                    logger.info(f"✅ {sym}: Price fetch success [{source_info}] (X10=${px:.2f}, Lit=${pl:.2f})")
+            except Exception as e:
+                logger.warning(f"{sym}: REST Fallback failed: {e}")
             
-            # Log if we have real Lighter PnL data
-            if lighter_position and lighter_position.get('unrealized_pnl', 0.0) != 0.0:
-                logger.debug(
-                    f"📊 {sym} Lighter Position: uPnL=${lighter_position.get('unrealized_pnl', 0):.4f}, "
-                    f"funding=${lighter_position.get('total_funding_paid', 0):.4f}, "
-                    f"entry=${lighter_position.get('avg_entry_price', 0):.6f}"
+            if px is None or pl is None or px <= 0 or pl <= 0:
+                logger.debug(f"{sym}: No prices available, skipping")
+                return None
+        rx, rl = await asyncio.gather(x10.fetch_funding_rate(sym), lighter.fetch_funding_rate(sym))
+        rx = rx or 0.0
+        rl = rl or 0.0
+
+        # ═══════════════════════════════════════════════════════════════
+        # Strategy PnL ESTIMATE (for exit decisions only)
+        # - Funding: depends on which side we hold on each exchange (BUY=long, SELL=short)
+        # - Price/Basis: depends on long/short legs (NOT absolute spread!)
+        # ═══════════════════════════════════════════════════════════════
+        sx = _side_sign(t.get("side_x10"))
+        sl = _side_sign(t.get("side_lighter"))
+
+        # Funding per hour (profit-positive):
+        # funding_cashflow = -(sign * rate) * notional
+        if sx != 0 and sl != 0:
+            current_net = -((sx * rx) + (sl * rl))
+        else:
+            # Fallback for older records missing sides
+            base_net = rl - rx
+            current_net = -base_net if t.get('leg1_exchange') == 'X10' else base_net
+        
+        funding_pnl_est = current_net * hold_hours * notional
+        
+        # ═══════════════════════════════════════════════════════════════
+        # FIX: Use ACTUAL collected funding from FundingTracker if available
+        # The estimate (current_net * hours) assumes constant rate, which is often wrong.
+        # FundingTracker provides the sum of actual payments received.
+        # ═══════════════════════════════════════════════════════════════
+        funding_collected = float(t.get('funding_collected') or 0.0)
+        
+        if abs(funding_collected) > 0.0001:
+            funding_pnl = funding_collected
+            # Add accrued estimate for current hour? (Optional, keeping it simple for now)
+        else:
+            funding_pnl = funding_pnl_est
+
+        # Price/Basis PnL estimate (profit-positive)
+        ep_x10 = float(t.get('entry_price_x10') or px)
+        ep_lit = float(t.get('entry_price_lighter') or pl)
+        basis_entry = ep_lit - ep_x10
+        basis_curr = pl - px
+        qty_est = (notional / px) if px > 0 else 0.0
+
+        # Common hedge configurations:
+        # - long X10 / short Lighter => PnL ~= qty * (basis_entry - basis_curr)
+        # - short X10 / long Lighter => PnL ~= qty * (basis_curr - basis_entry)
+        if sx == 1 and sl == -1:
+            spread_pnl = qty_est * (basis_entry - basis_curr)
+        elif sx == -1 and sl == 1:
+            spread_pnl = qty_est * (basis_curr - basis_entry)
+        else:
+            # Best-effort fallback: assume long X10 / short Lighter shape
+            spread_pnl = qty_est * (basis_entry - basis_curr)
+
+        current_spread_pct = abs(basis_curr) / px if px > 0 else 0.0
+
+        # Gross PnL (before fees)
+        gross_pnl = funding_pnl + spread_pnl
+        
+        # ═══════════════════════════════════════════════════════════════
+        # DEBUG LOGGING: Show exactly what the bot sees
+        # ═══════════════════════════════════════════════════════════════
+        if abs(gross_pnl) > 0.1:
+            logger.info(
+                f"🔍 {sym} PnL Check: "
+                f"X10=${px:.5f}, Lit=${pl:.5f} | "
+                f"SpreadPnL=${spread_pnl:.4f}, Funding=${funding_pnl:.4f} | "
+                f"Gross=${gross_pnl:.4f}"
+            )
+        
+        # ═══════════════════════════════════════════════════════════════
+        # ADVANCED EXIT OPTIMIZATION (16.12.2025)
+        # Dynamische Slippage-Berechnung aus echtem Orderbook
+        # ═══════════════════════════════════════════════════════════════
+        use_dynamic_slippage = getattr(config, 'USE_DYNAMIC_SLIPPAGE', True)
+        dynamic_slippage_cost = 0.0
+        actual_spread_pct = 0.0
+        orderbook_depth_ok = True
+        
+        # Init OB Prices dependent on dynamic slippage
+        x10_best_bid = 0.0
+        x10_best_ask = 0.0
+        lit_best_bid = 0.0
+        lit_best_ask = 0.0
+        
+        if use_dynamic_slippage:
+            try:
+                # Hole echte Spreads aus beiden Orderbooks
+                x10_spread_pct = 0.0
+                lighter_spread_pct = 0.0
+                
+                min_depth = getattr(config, 'MIN_ORDERBOOK_DEPTH_USD', 100.0)
+                # Beide Orderbooks parallel holen
+                x10_ob, lit_ob = await asyncio.gather(
+                    _exit_orderbook(x10, sym, "x10"), _exit_orderbook(lighter, sym, "lighter")
                 )
+                
+                # X10 Orderbook Spread
+                if x10_ob:
+                    if x10_ob and x10_ob.get('bids') and x10_ob.get('asks'):
+                        x10_best_bid = float(x10_ob['bids'][0][0])
+                        x10_best_ask = float(x10_ob['asks'][0][0])
+                        if x10_best_bid > 0 and x10_best_ask > 0:
+                            x10_spread_pct = (x10_best_ask - x10_best_bid) / x10_best_bid
+                            # Check Depth für unsere Trade-Größe
+                            x10_depth = sum(float(b[0]) * float(b[1]) for b in x10_ob['bids'][:5])
+                            if x10_depth < min_depth:
+                                orderbook_depth_ok = False
+                                logger.debug(f"⚠️ {sym} X10: Niedrige Liquidität ${x10_depth:.0f} < ${min_depth:.0f}")
+                
+                # Lighter Orderbook Spread
+                if lit_ob:
+                    if lit_ob and lit_ob.get('bids') and lit_ob.get('asks'):
+                        lit_best_bid = float(lit_ob['bids'][0][0])
+                        lit_best_ask = float(lit_ob['asks'][0][0])
+                        if lit_best_bid > 0 and lit_best_ask > 0:
+                            lighter_spread_pct = (lit_best_ask - lit_best_bid) / lit_best_bid
+                            # Check Depth
+                            lit_depth = sum(float(b[0]) * float(b[1]) for b in lit_ob['bids'][:5])
+                            if lit_depth < min_depth:
+                                orderbook_depth_ok = False
+                                logger.debug(f"⚠️ {sym} Lighter: Niedrige Liquidität ${lit_depth:.0f} < ${min_depth:.0f}")
+                
+                # Kombinierter Exit-Spread (beide Seiten müssen gekreuzt werden)
+                actual_spread_pct = (x10_spread_pct + lighter_spread_pct) / 2
+                
+                # Slippage = halber Spread pro Seite (wir kreuzen den Spread beim Exit)
+                dynamic_slippage_cost = notional * actual_spread_pct * 0.5
+                
+                if actual_spread_pct > 0:
+                    logger.debug(
+                        f"📊 {sym} Dynamic Slippage: X10={x10_spread_pct*100:.3f}%, "
+                        f"Lighter={lighter_spread_pct*100:.3f}%, Combined=${dynamic_slippage_cost:.4f}"
+                    )
+                    
+            except Exception as e:
+                logger.debug(f"Dynamic slippage calc error: {e}, using fallback")
+                actual_spread_pct = 0.0
+        
+        # Calculate Net PnL with proper fees
+        # PNL FIX: Pass lighter_position to use REAL Lighter API PnL data
+        try:
+            fee_manager = get_fee_manager()
+            net_pnl_decimal = await calculate_realized_pnl(
+                t, fee_manager, gross_pnl, lighter_position=lighter_position
+            )
+            total_pnl = float(net_pnl_decimal)
             
-            # Calculate age
-            age_seconds, hold_hours = calculate_trade_age(t)
-            
-            logger.debug(f"Check {sym}: Age={age_seconds:.1f}s (Limit={getattr(config, 'FARM_HOLD_SECONDS', 3600)}s)")
+            # Calculate total fees
+            entry_value = float(notional)
+            exit_value = entry_value
             
-            # ═══════════════════════════════════════════════════════════════
-            # Get prices for PnL calculation
-            # ═══════════════════════════════════════════════════════════════
-            # FIX: Use Orderbook Mid-Price instead of Mark Price if available
-            # Mark Price can lag or be manipulated, leading to false PnL.
-            # Mid Price (avg of best bid/ask) reflects real liquidity.
-            # ═══════════════════════════════════════════════════════════════
+            entry_fees = fee_manager.calculate_trade_fees(
+                entry_value, 'LIGHTER', 'X10',
+                is_maker1=True, is_maker2=False,
+                actual_fee1=t.get('entry_fee_lighter'),
+                actual_fee2=t.get('entry_fee_x10')
+            )
             
-            # X10 Price
-            raw_px = None
-            if hasattr(x10, 'get_orderbook_mid_price'):
-                raw_px = await x10.get_orderbook_mid_price(sym)
-            if raw_px is None or raw_px <= 0:
-                raw_px = await x10.fetch_mark_price(sym)
+            exit_fees = fee_manager.calculate_trade_fees(
+                exit_value, 'LIGHTER', 'X10',
+                is_maker1=False, is_maker2=False,
+                actual_fee1=t.get('exit_fee_lighter'),
+                actual_fee2=t.get('exit_fee_x10')
+            )
             
-            # Lighter Price
-            raw_pl = None
-            if hasattr(lighter, 'get_orderbook_mid_price'):
-                raw_pl = await lighter.get_orderbook_mid_price(sym)
-            if raw_pl is None or raw_pl <= 0:
-                raw_pl = await lighter.fetch_mark_price(sym)
-                
-            px = safe_float(raw_px) if raw_px is not None else None
-            pl = safe_float(raw_pl) if raw_pl is not None else None
-
-            # FIX (2025-12-19): Track price source for critical calculations
-            # WebSocket prices are real-time and reliable
-            # REST prices are fallback only (may be stale)
-            px_source_ws = raw_px is not None and raw_px > 0
-            pl_source_ws = raw_pl is not None and raw_pl > 0
+            est_fees = entry_fees + exit_fees
             
-            # REST Fallback if WebSocket has no prices
-            if px is None or pl is None or px <= 0 or pl <= 0:
-                logger.debug(f"{sym}: WS prices missing, trying REST fallback...")
-                try:
-                    if px is None or px <= 0:
-                        if hasattr(x10, 'get_price_rest'):
-                            px = safe_float(await x10.get_price_rest(sym))
-                            px_source_ws = False  # Mark as REST source
-                        elif hasattr(x10, 'load_market_cache'):
-                            await x10.load_market_cache(force=True)
-                            px = safe_float(await x10.fetch_mark_price(sym))
-                            px_source_ws = False
-                    
-                    if pl is None or pl <= 0:
-                        if hasattr(lighter, 'get_price_rest'):
-                            pl = safe_float(await lighter.get_price_rest(sym))
-                            pl_source_ws = False  # Mark as REST source
-                        elif hasattr(lighter, 'load_funding_rates_and_prices'):
-                            await lighter.load_funding_rates_and_prices()
-                            pl = safe_float(await lighter.fetch_mark_price(sym))
-                            pl_source_ws = False
-                    
-                    if px is not None and pl is not None and px > 0 and pl > 0:
-                        source_info = f"X10={'WS' if px_source_ws else 'REST'}, Lit={'WS' if pl_source_ws else 'REST'}"
-                        logger.info(f"✅ {sym}: Price fetch success [{source_info}] (X10=${px:.2f}, Lit=${pl:.2f})")
-                except Exception as e:
-                    logger.warning(f"{sym}: REST Fallback failed: {e}")
-                
-                if px is None or pl is None or px <= 0 or pl <= 0:
-                    logger.debug(f"{sym}: No prices available, skipping")
-                    continue
-
-            rx = await x10.fetch_funding_rate(sym) or 0.0
-            rl = await lighter.fetch_funding_rate(sym) or 0.0
-
             # ═══════════════════════════════════════════════════════════════
-            # Strategy PnL ESTIMATE (for exit decisions only)
-            # - Funding: depends on which side we hold on each exchange (BUY=long, SELL=short)
-            # - Price/Basis: depends on long/short legs (NOT absolute spread!)
+            # SMART SLIPPAGE: Use dynamic if available, else fallback
             # ═══════════════════════════════════════════════════════════════
-            sx = _side_sign(t.get("side_x10"))
-            sl = _side_sign(t.get("side_lighter"))
-
-            # Funding per hour (profit-positive):
-            # funding_cashflow = -(sign * rate) * notional
-            if sx != 0 and sl != 0:
-                current_net = -((sx * rx) + (sl * rl))
+            if dynamic_slippage_cost > 0:
+                slippage_cost = dynamic_slippage_cost
             else:
-                # Fallback for older records missing sides
-                base_net = rl - rx
-                current_net = -base_net if t.get('leg1_exchange') == 'X10' else base_net
+                # Fallback zu statischem Buffer
+                slippage_buffer_pct = getattr(config, 'EXIT_SLIPPAGE_BUFFER_PCT', 0.0015)
+                slippage_cost = notional * slippage_buffer_pct
             
-            funding_pnl_est = current_net * hold_hours * notional
+            # Safety Margin auf Exit-Kosten
+            exit_cost_safety = getattr(config, 'EXIT_COST_SAFETY_MARGIN', 1.1)
+            slippage_cost *= exit_cost_safety
             
-            # ═══════════════════════════════════════════════════════════════
-            # FIX: Use ACTUAL collected funding from FundingTracker if available
-            # The estimate (current_net * hours) assumes constant rate, which is often wrong.
-            # FundingTracker provides the sum of actual payments received.
-            # ═══════════════════════════════════════════════════════════════
-            funding_collected = float(t.get('funding_collected') or 0.0)
-            
-            if abs(funding_collected) > 0.0001:
-                funding_pnl = funding_collected
-                # Add accrued estimate for current hour? (Optional, keeping it simple for now)
-            else:
-                funding_pnl = funding_pnl_est
-
-            # Price/Basis PnL estimate (profit-positive)
-            ep_x10 = float(t.get('entry_price_x10') or px)
-            ep_lit = float(t.get('entry_price_lighter') or pl)
-            basis_entry = ep_lit - ep_x10
-            basis_curr = pl - px
-            qty_est = (notional / px) if px > 0 else 0.0
-
-            # Common hedge configurations:
-            # - long X10 / short Lighter => PnL ~= qty * (basis_entry - basis_curr)
-            # - short X10 / long Lighter => PnL ~= qty * (basis_curr - basis_entry)
-            if sx == 1 and sl == -1:
-                spread_pnl = qty_est * (basis_entry - basis_curr)
-            elif sx == -1 and sl == 1:
-                spread_pnl = qty_est * (basis_curr - basis_entry)
-            else:
-                # Best-effort fallback: assume long X10 / short Lighter shape
-                spread_pnl = qty_est * (basis_entry - basis_curr)
-
-            current_spread_pct = abs(basis_curr) / px if px > 0 else 0.0
-
-            # Gross PnL (before fees)
-            gross_pnl = funding_pnl + spread_pnl
+            total_pnl -= slippage_cost
             
+        except Exception as e:
+            logger.debug(f"FeeManager error, using fallback: {e}")
+            fee_x10 = getattr(config, 'TAKER_FEE_X10', 0.000225)
+            fee_lit_entry = getattr(config, 'MAKER_FEE_LIGHTER', 0.0)
+            fee_lit_exit = getattr(config, 'TAKER_FEE_LIGHTER', 0.0)
+            est_fees = notional * (fee_x10 * 2.0 + fee_lit_entry + fee_lit_exit)
+            total_pnl = gross_pnl - est_fees
+
+        # ═══════════════════════════════════════════════════════════════
+        # PROFITABILITY FIX (16.12.2025): MINIMUM HOLD TIME + FUNDING CHECK
+        # Problem: 89.4% der Trades bekamen NULL Funding (zu schnell geschlossen)
+        # Lösung: Mindestens 2h halten + Mindest-Funding vor Exit
+        # ═══════════════════════════════════════════════════════════════
+        min_profit_exit = getattr(config, 'MIN_PROFIT_EXIT_USD', 0.10)
+        max_hold_hours = getattr(config, 'MAX_HOLD_HOURS', 72.0)
+        min_maintenance_apy = getattr(config, 'MIN_MAINTENANCE_APY', 0.20)
+        minimum_hold_seconds = getattr(config, 'MINIMUM_HOLD_SECONDS', 7200)  # 2h default
+        min_funding_before_exit = getattr(config, 'MIN_FUNDING_BEFORE_EXIT_USD', 0.03)
+        
+        # CROSS-EXCHANGE ARBITRAGE: Preisdifferenz-Profit nutzen!
+        price_divergence_enabled = getattr(config, 'PRICE_DIVERGENCE_EXIT_ENABLED', True)
+        min_divergence_profit = getattr(config, 'MIN_PRICE_DIVERGENCE_PROFIT_USD', 0.50)
+        # Calculate Current APY
+        # current_net is hourly rate. APY = rate * 24 * 365
+        current_apy = current_net * 24 * 365
+        
+        # Initialize exit tracking
+        reason = None
+        force_close = False
+
+        # ═══════════════════════════════════════════════════════════════
+        # BASIS EXIT ENGINE (DegeniusQ): Wait for basis to close
+        # + basis stop-loss to avoid funding trades bleeding on price.
+        # Uses basis_entry/basis_curr computed above (profit-positive spread_pnl).
+        # ═══════════════════════════════════════════════════════════════
+        if not reason:
+            try:
+                basis_exit_enabled = getattr(config, "BASIS_EXIT_ENABLED", True)
+                basis_close_fraction = float(getattr(config, "BASIS_CLOSE_FRACTION", 0.20))
+                basis_target = float(getattr(config, "BASIS_EXIT_TARGET_USD", 0.0))
+                basis_stop_loss_usd = float(getattr(config, "BASIS_STOP_LOSS_USD", 0.50))
+
+                if basis_exit_enabled and basis_close_fraction > 0 and basis_close_fraction < 1:
+                    # Exit when the remaining basis is <= fraction of entry basis (towards target).
+                    if sx == 1 and sl == -1 and (basis_entry - basis_target) > 0:
+                        threshold = basis_target + (basis_entry - basis_target) * basis_close_fraction
+                        if basis_curr <= threshold:
+                            reason = f"BASIS_CLOSING (basis={basis_curr:.6f}<=thr={threshold:.6f})"
+                    elif sx == -1 and sl == 1 and (basis_target - basis_entry) > 0:
+                        threshold = basis_target - (basis_target - basis_entry) * basis_close_fraction
+                        if basis_curr >= threshold:
+                            reason = f"BASIS_CLOSING (basis={basis_curr:.6f}>=thr={threshold:.6f})"
+
+                # BASIS_STOP_LOSS: DISABLED
+                # Reason: Bei gehedgten Trades ist negative SpreadPnL normal (Execution Slippage, Basis Mean-Reversion)
+                # Der Hedge schützt uns vor Preis-Risiko. Wir wollen nur profitieren von:
+                # 1. Funding Collection (Hauptziel)
+                # 2. Positive Preisdifferenz (PRICE_DIVERGENCE_PROFIT)
+                # Stop-Loss würde profitable Trades zu früh schließen.
+            except Exception as basis_err:
+                logger.debug(f"{sym}: Basis exit engine error: {basis_err}")
+
+        # 1. Force close criteria (Time, Safety)
+        if not reason:
+            shutting_down = bool(getattr(config, 'IS_SHUTTING_DOWN', False))
+            divergence_candidate = bool(price_divergence_enabled and spread_pnl >= min_divergence_profit)
+
+            # Du MUSST mindestens 2h halten um Funding zu bekommen!
             # ═══════════════════════════════════════════════════════════════
-            # DEBUG LOGGING: Show exactly what the bot sees
+            hold_blocked = bool(age_seconds < minimum_hold_seconds and not shutting_down)
+            if hold_blocked and not divergence_candidate:
+                remaining_hold = (minimum_hold_seconds - age_seconds) / 60
+                logger.debug(
+                    f"⏰ [HODL] {sym}: Minimum Hold nicht erreicht ({age_seconds/60:.0f}min < {minimum_hold_seconds/60:.0f}min). "
+                    f"Noch {remaining_hold:.0f}min warten für Funding!"
+                )
+                return None
+            elif hold_blocked and divergence_candidate:
+                # IMPORTANT: Do NOT exit just because mid-price spread_pnl looks good.
+                # Only allow the later Realizable PnL (Bid/Ask) divergence check to run.
+                logger.debug(
+                    f"💎🎁 [PRICE DIVERGENCE CANDIDATE] {sym}: SpreadPnL(mid)=${spread_pnl:.2f} >= ${min_divergence_profit:.2f} - "
+                    "checking realizable (Bid/Ask) profit before bypassing MINIMUM_HOLD"
+                )
+        
             # ═══════════════════════════════════════════════════════════════
-            if abs(gross_pnl) > 0.1:
-                logger.info(
-                    f"🔍 {sym} PnL Check: "
-                    f"X10=${px:.5f}, Lit=${pl:.5f} | "
-                    f"SpreadPnL=${spread_pnl:.4f}, Funding=${funding_pnl:.4f} | "
-                    f"Gross=${gross_pnl:.4f}"
+            # NEU: FUNDING CHECK - Mindestens etwas Funding gesammelt?
+            # ═══════════════════════════════════════════════════════════════
+            funding_blocked = bool(funding_collected < min_funding_before_exit and not force_close and not shutting_down)
+            if funding_blocked and not divergence_candidate:
+                logger.debug(
+                    f"💸 [HODL] {sym}: Noch kein Funding (${funding_collected:.4f} < ${min_funding_before_exit:.2f}). "
+                    f"Warte auf nächstes Funding Payment!"
+                )
+                return None
+            elif funding_blocked and divergence_candidate:
+                logger.debug(
+                    f"💎🎁 [PRICE DIVERGENCE CANDIDATE] {sym}: SpreadPnL(mid)=${spread_pnl:.2f} may compensate missing funding - "
+                    "checking realizable (Bid/Ask) profit before bypassing FUNDING gate"
                 )
             
             # ═══════════════════════════════════════════════════════════════
-            # ADVANCED EXIT OPTIMIZATION (16.12.2025)
-            # Dynamische Slippage-Berechnung aus echtem Orderbook
+            # PROFIT PROTECTION: Nur Exit wenn wirklich profitabel!
+            # Verhindert Verluste durch zu frühe Exits
             # ═══════════════════════════════════════════════════════════════
-            use_dynamic_slippage = getattr(config, 'USE_DYNAMIC_SLIPPAGE', True)
-            dynamic_slippage_cost = 0.0
-            actual_spread_pct = 0.0
-            orderbook_depth_ok = True
+            require_positive = getattr(config, 'REQUIRE_POSITIVE_EXPECTED_PNL', True)
+            min_net_profit = getattr(config, 'MIN_NET_PROFIT_EXIT_USD', 0.05)
             
-            # Init OB Prices dependent on dynamic slippage
-            x10_best_bid = 0.0
-            x10_best_ask = 0.0
-            lit_best_bid = 0.0
-            lit_best_ask = 0.0
-            
-            if use_dynamic_slippage:
-                try:
-                    # Hole echte Spreads aus beiden Orderbooks
-                    x10_spread_pct = 0.0
-                    lighter_spread_pct = 0.0
-                    
-                    # X10 Orderbook Spread
-                    if hasattr(x10, 'fetch_orderbook'):
-                        x10_ob = await x10.fetch_orderbook(sym, limit=5)
-                        if x10_ob and x10_ob.get('bids') and x10_ob.get('asks'):
-                            x10_best_bid = float(x10_ob['bids'][0][0])
-                            x10_best_ask = float(x10_ob['asks'][0][0])
-                            if x10_best_bid > 0 and x10_best_ask > 0:
-                                x10_spread_pct = (x10_best_ask - x10_best_bid) / x10_best_bid
-                                # Check Depth für unsere Trade-Größe
-                                x10_depth = sum(float(b[0]) * float(b[1]) for b in x10_ob['bids'][:5])
-                                min_depth = getattr(config, 'MIN_ORDERBOOK_DEPTH_USD', 100.0)
-                                if x10_depth < min_depth:
-                                    orderbook_depth_ok = False
-                                    logger.debug(f"⚠️ {sym} X10: Niedrige Liquidität ${x10_depth:.0f} < ${min_depth:.0f}")
-                    
-                    # Lighter Orderbook Spread
-                    if hasattr(lighter, 'fetch_orderbook'):
-                        lit_ob = await lighter.fetch_orderbook(sym, limit=5)
-                        if lit_ob and lit_ob.get('bids') and lit_ob.get('asks'):
-                            lit_best_bid = float(lit_ob['bids'][0][0])
-                            lit_best_ask = float(lit_ob['asks'][0][0])
-                            if lit_best_bid > 0 and lit_best_ask > 0:
-                                lighter_spread_pct = (lit_best_ask - lit_best_bid) / lit_best_bid
-                                # Check Depth
-                                lit_depth = sum(float(b[0]) * float(b[1]) for b in lit_ob['bids'][:5])
-                                if lit_depth < min_depth:
-                                    orderbook_depth_ok = False
-                                    logger.debug(f"⚠️ {sym} Lighter: Niedrige Liquidität ${lit_depth:.0f} < ${min_depth:.0f}")
-                    
-                    # Kombinierter Exit-Spread (beide Seiten müssen gekreuzt werden)
-                    actual_spread_pct = (x10_spread_pct + lighter_spread_pct) / 2
-                    
-                    # Slippage = halber Spread pro Seite (wir kreuzen den Spread beim Exit)
-                    dynamic_slippage_cost = notional * actual_spread_pct * 0.5
-                    
-                    if actual_spread_pct > 0:
-                        logger.debug(
-                            f"📊 {sym} Dynamic Slippage: X10={x10_spread_pct*100:.3f}%, "
-                            f"Lighter={lighter_spread_pct*100:.3f}%, Combined=${dynamic_slippage_cost:.4f}"
-                        )
-                        
-                except Exception as e:
-                    logger.debug(f"Dynamic slippage calc error: {e}, using fallback")
-                    actual_spread_pct = 0.0
+            # Berechne erwarteten Net-Profit nach allen Kosten
+            # FIX (2025-12-17): Convert Decimal to float to prevent TypeError
+            est_fees_f = float(est_fees) if hasattr(est_fees, '__float__') else est_fees
+            slippage_cost_f = float(slippage_cost) if hasattr(slippage_cost, '__float__') else slippage_cost
+            expected_exit_cost = est_fees_f + slippage_cost_f
+            expected_net_pnl = gross_pnl - expected_exit_cost
             
-            # Calculate Net PnL with proper fees
-            # PNL FIX: Pass lighter_position to use REAL Lighter API PnL data
-            try:
-                fee_manager = get_fee_manager()
-                net_pnl_decimal = await calculate_realized_pnl(
-                    t, fee_manager, gross_pnl, lighter_position=lighter_position
-                )
-                total_pnl = float(net_pnl_decimal)
-                
-                # Calculate total fees
-                entry_value = float(notional)
-                exit_value = entry_value
-                
-                entry_fees = fee_manager.calculate_trade_fees(
-                    entry_value, 'LIGHTER', 'X10',
-                    is_maker1=True, is_maker2=False,
-                    actual_fee1=t.get('entry_fee_lighter'),
-                    actual_fee2=t.get('entry_fee_x10')
-                )
-                
-                exit_fees = fee_manager.calculate_trade_fees(
-                    exit_value, 'LIGHTER', 'X10',
-                    is_maker1=False, is_maker2=False,
-                    actual_fee1=t.get('exit_fee_lighter'),
-                    actual_fee2=t.get('exit_fee_x10')
-                )
-                
-                est_fees = entry_fees + exit_fees
-                
-                # ═══════════════════════════════════════════════════════════════
-                # SMART SLIPPAGE: Use dynamic if available, else fallback
-                # ═══════════════════════════════════════════════════════════════
-                if dynamic_slippage_cost > 0:
-                    slippage_cost = dynamic_slippage_cost
-                else:
-                    # Fallback zu statischem Buffer
-                    slippage_buffer_pct = getattr(config, 'EXIT_SLIPPAGE_BUFFER_PCT', 0.0015)
-                    slippage_cost = notional * slippage_buffer_pct
-                
-                # Safety Margin auf Exit-Kosten
-                exit_cost_safety = getattr(config, 'EXIT_COST_SAFETY_MARGIN', 1.1)
-                slippage_cost *= exit_cost_safety
-                
-                total_pnl -= slippage_cost
-                
-            except Exception as e:
-                logger.debug(f"FeeManager error, using fallback: {e}")
-                fee_x10 = getattr(config, 'TAKER_FEE_X10', 0.000225)
-                fee_lit_entry = getattr(config, 'MAKER_FEE_LIGHTER', 0.0)
-                fee_lit_exit = getattr(config, 'TAKER_FEE_LIGHTER', 0.0)
-                est_fees = notional * (fee_x10 * 2.0 + fee_lit_entry + fee_lit_exit)
-                total_pnl = gross_pnl - est_fees
-
+            if require_positive and not force_close and not shutting_down:
+                # Check: Ist der Trade nach allen Kosten wirklich profitabel?
+                if expected_net_pnl < min_net_profit:
+                    logger.debug(
+                        f"🛡️ [PROFIT PROTECTION] {sym}: Expected Net ${expected_net_pnl:.4f} < ${min_net_profit:.2f}. "
+                        f"Halte Trade bis profitabel! (Gross=${gross_pnl:.4f}, Costs=${expected_exit_cost:.4f})"
+                    )
+                    return None
             # ═══════════════════════════════════════════════════════════════
-            # PROFITABILITY FIX (16.12.2025): MINIMUM HOLD TIME + FUNDING CHECK
-            # Problem: 89.4% der Trades bekamen NULL Funding (zu schnell geschlossen)
-            # Lösung: Mindestens 2h halten + Mindest-Funding vor Exit
+            # LIQUIDITY CHECK: Genug Orderbook-Tiefe für Exit?
             # ═══════════════════════════════════════════════════════════════
-            min_profit_exit = getattr(config, 'MIN_PROFIT_EXIT_USD', 0.10)
-            max_hold_hours = getattr(config, 'MAX_HOLD_HOURS', 72.0)
-            min_maintenance_apy = getattr(config, 'MIN_MAINTENANCE_APY', 0.20)
-            minimum_hold_seconds = getattr(config, 'MINIMUM_HOLD_SECONDS', 7200)  # 2h default
-            min_funding_before_exit = getattr(config, 'MIN_FUNDING_BEFORE_EXIT_USD', 0.03)
-            
-            # CROSS-EXCHANGE ARBITRAGE: Preisdifferenz-Profit nutzen!
-            price_divergence_enabled = getattr(config, 'PRICE_DIVERGENCE_EXIT_ENABLED', True)
-            min_divergence_profit = getattr(config, 'MIN_PRICE_DIVERGENCE_PROFIT_USD', 0.50)
-            # Calculate Current APY
-            # current_net is hourly rate. APY = rate * 24 * 365
-            current_apy = current_net * 24 * 365
+            smart_exit = getattr(config, 'SMART_EXIT_ENABLED', True)
+            if smart_exit and not orderbook_depth_ok and not force_close:
+                logger.warning(
+                    f"⚠️ [LOW LIQUIDITY] {sym}: Orderbook zu dünn für ${notional:.0f} Exit. "
+                    f"Warte auf bessere Liquidität..."
+                )
+                # Trotzdem Exit erlauben wenn Trade sehr profitabel oder sehr alt
+                if total_pnl < notional * 0.02 and hold_hours < max_hold_hours * 0.8:
+                    return None
+        if not reason:
+            # 1. Safety override: MAX_HOLD_HOURS
+            if hold_hours >= max_hold_hours:
+                reason = "MAX_HOLD_EXPIRED"
+                force_close = True
+                logger.warning(
+                    f"⚠️ [FORCE CLOSE] {sym}: Max hold time reached "
+                    f"({hold_hours:.1f}h >= {max_hold_hours}h)"
+                )
             
-            # Initialize exit tracking
-            reason = None
-            force_close = False
-
             # ═══════════════════════════════════════════════════════════════
-            # BASIS EXIT ENGINE (DegeniusQ): Wait for basis to close
-            # + basis stop-loss to avoid funding trades bleeding on price.
-            # Uses basis_entry/basis_curr computed above (profit-positive spread_pnl).
+            # NEU: CROSS-EXCHANGE ARBITRAGE EXIT (Realizable PnL Check)
+            # FIX (2025-12-19): Use ACTUAL REALIZABLE prices (Bid/Ask from OB)
+            # NOT mid-prices! We need to cross the spread to exit.
+            # FIX (2025-12-19): CRITICAL - Only divergence on WEBSOCKET prices!
+            # REST prices can be stale and cause false profit calculations
             # ═══════════════════════════════════════════════════════════════
-            if not reason:
-                try:
-                    basis_exit_enabled = getattr(config, "BASIS_EXIT_ENABLED", True)
-                    basis_close_fraction = float(getattr(config, "BASIS_CLOSE_FRACTION", 0.20))
-                    basis_target = float(getattr(config, "BASIS_EXIT_TARGET_USD", 0.0))
-                    basis_stop_loss_usd = float(getattr(config, "BASIS_STOP_LOSS_USD", 0.50))
-
-                    if basis_exit_enabled and basis_close_fraction > 0 and basis_close_fraction < 1:
-                        # Exit when the remaining basis is <= fraction of entry basis (towards target).
-                        if sx == 1 and sl == -1 and (basis_entry - basis_target) > 0:
-                            threshold = basis_target + (basis_entry - basis_target) * basis_close_fraction
-                            if basis_curr <= threshold:
-                                reason = f"BASIS_CLOSING (basis={basis_curr:.6f}<=thr={threshold:.6f})"
-                        elif sx == -1 and sl == 1 and (basis_target - basis_entry) > 0:
-                            threshold = basis_target - (basis_target - basis_entry) * basis_close_fraction
-                            if basis_curr >= threshold:
-                                reason = f"BASIS_CLOSING (basis={basis_curr:.6f}>=thr={threshold:.6f})"
-
-                    # BASIS_STOP_LOSS: DISABLED
-                    # Reason: Bei gehedgten Trades ist negative SpreadPnL normal (Execution Slippage, Basis Mean-Reversion)
-                    # Der Hedge schützt uns vor Preis-Risiko. Wir wollen nur profitieren von:
-                    # 1. Funding Collection (Hauptziel)
-                    # 2. Positive Preisdifferenz (PRICE_DIVERGENCE_PROFIT)
-                    # Stop-Loss würde profitable Trades zu früh schließen.
-                except Exception as basis_err:
-                    logger.debug(f"{sym}: Basis exit engine error: {basis_err}")
-
-            # 1. Force close criteria (Time, Safety)
-            if not reason:
-                shutting_down = bool(getattr(config, 'IS_SHUTTING_DOWN', False))
-                divergence_candidate = bool(price_divergence_enabled and spread_pnl >= min_divergence_profit)
-
-                # Du MUSST mindestens 2h halten um Funding zu bekommen!
-                # ═══════════════════════════════════════════════════════════════
-                hold_blocked = bool(age_seconds < minimum_hold_seconds and not shutting_down)
-                if hold_blocked and not divergence_candidate:
-                    remaining_hold = (minimum_hold_seconds - age_seconds) / 60
+            if not force_close and price_divergence_enabled:
+                # FIX (2025-12-19): Validate price sources for divergence
+                if not px_source_ws or not pl_source_ws:
+                    source_info = f"X10={'WS' if px_source_ws else 'REST'}, Lit={'WS' if pl_source_ws else 'REST'}"
                     logger.debug(
-                        f"⏰ [HODL] {sym}: Minimum Hold nicht erreicht ({age_seconds/60:.0f}min < {minimum_hold_seconds/60:.0f}min). "
-                        f"Noch {remaining_hold:.0f}min warten für Funding!"
+                        f"⚠️ [DIVERGENCE SKIP] {sym}: Requires WS prices but got [{source_info}]. "
+                        f"Waiting for real-time prices..."
                     )
-                    continue
-                elif hold_blocked and divergence_candidate:
-                    # IMPORTANT: Do NOT exit just because mid-price spread_pnl looks good.
-                    # Only allow the later Realizable PnL (Bid/Ask) divergence check to run.
+                # 1. Calculate Realizable PnL (Crossing the spread) - FIX: Use actual exit prices
+                elif True:  # Only proceed with WS prices
+                    try:
+                        # ENSURE we have actual Bid/Ask prices from orderbooks
+                        # If dynamic slippage is enabled, these are fetched above.
+                        # If NOT, we use mid-prices as fallback (less accurate but safe)
+                        
+                        # Determine REALIZABLE Exit Prices (what we can actually get from orderbook)
+                        # Long X10 (sx=1) -> We SELL, so we get the BID price
+                        # Short X10 (sx=-1) -> We BUY, so we pay the ASK price
+                        
+                        if x10_best_bid > 0 and x10_best_ask > 0:
+                            exit_price_x10 = x10_best_bid if sx == 1 else x10_best_ask
+                        else:
+                            # Fallback: use mid-price if OB data missing
+                            exit_price_x10 = px
+                        
+                        # Long Lighter (sl=1) -> We SELL, so we get the BID price
+                        # Short Lighter (sl=-1) -> We BUY, so we pay the ASK price
+                        if lit_best_bid > 0 and lit_best_ask > 0:
+                            exit_price_lighter = lit_best_bid if sl == 1 else lit_best_ask
+                        else:
+                            # Fallback: use mid-price if OB data missing
+                            exit_price_lighter = pl
+                        
+                        # FIX (2025-12-19): STRICT VALIDATION - only use if prices are real
+                        if exit_price_x10 > 0 and exit_price_lighter > 0:
+                            # Recalculate PnL with ACTUAL exit prices (not mid-prices!)
+                            # Formula: (Exit - Entry) * Size * Sign
+                            pnl_x10_real = (exit_price_x10 - ep_x10) * sx * qty_est
+                            pnl_lit_real = (exit_price_lighter - ep_lit) * sl * qty_est
+                            
+                            # STRICT: Include ACTUAL slippage cost (dynamic or static)
+                            gross_pnl_real = pnl_x10_real + pnl_lit_real + funding_pnl
+                            # FIX (2025-12-19): Use float-converted versions to avoid Decimal TypeError
+                            net_pnl_real = gross_pnl_real - est_fees_f - slippage_cost_f
+                            
+                            logger.info(
+                                f"💎🎁 [PRICE DIVERGENCE CHECK] {sym}: "
+                                f"Entry(X10=${ep_x10:.5f}, Lit=${ep_lit:.5f}) -> "
+                                f"Exit(X10=${exit_price_x10:.5f}, Lit=${exit_price_lighter:.5f}) | "
+                                f"PnL Components: X10=${pnl_x10_real:.4f}, Lit=${pnl_lit_real:.4f}, "
+                                f"Funding=${funding_pnl:.4f}, Fees=${est_fees_f:.4f}, Slippage=${slippage_cost_f:.4f} | "
+                                f"Net=${net_pnl_real:.4f} vs Target=${min_divergence_profit:.4f}"
+                            )
+                            
+                            if net_pnl_real >= min_divergence_profit:
+                                reason = "PRICE_DIVERGENCE_PROFIT"
+                                logger.info(
+                                    f"✅ [PRICE DIVERGENCE] {sym}: Realizable Net Profit ${net_pnl_real:.2f} >= ${min_divergence_profit:.2f}! "
+                                    f"EXECUTING EXIT!"
+                                )
+                            else:
+                                logger.info(
+                                    f"❌ [PRICE DIVERGENCE] {sym}: Net PnL ${net_pnl_real:.2f} < Target ${min_divergence_profit:.2f}. "
+                                    f"Skipping exit."
+                                )
+                        else:
+                            logger.debug(
+                                f"⚠️ [PRICE DIVERGENCE] {sym}: Missing orderbook data. "
+                                f"X10(bid={x10_best_bid}, ask={x10_best_ask}), "
+                                f"Lighter(bid={lit_best_bid}, ask={lit_best_ask}). Using fallback check."
+                            )
+                            # Fallback: Conservative estimate using mid-prices + slippage
+                            fallback_net_pnl = gross_pnl - est_fees - slippage_cost
+                            if fallback_net_pnl >= min_divergence_profit:
+                                reason = "PRICE_DIVERGENCE_PROFIT_FALLBACK"
+                                logger.info(f"✅ [PRICE DIVERGENCE FALLBACK] {sym}: Est. Net Profit ${fallback_net_pnl:.2f} >= ${min_divergence_profit:.2f}")
+                            
+                    except Exception as div_e:
+                        logger.warning(f"{sym}: Divergence Calc Error: {div_e}", exc_info=True)
+                        # On error: don't exit, wait for next cycle
+                        pass
+
+            # If we were blocked by MINIMUM_HOLD or FUNDING, only allow exit
+            # if divergence has been CONFIRMED (reason set). Otherwise continue holding.
+            if not force_close and not reason and (hold_blocked or funding_blocked):
+                if hold_blocked:
+                    remaining_hold = (minimum_hold_seconds - age_seconds) / 60
                     logger.debug(
-                        f"💎🎁 [PRICE DIVERGENCE CANDIDATE] {sym}: SpreadPnL(mid)=${spread_pnl:.2f} >= ${min_divergence_profit:.2f} - "
-                        "checking realizable (Bid/Ask) profit before bypassing MINIMUM_HOLD"
+                        f"⏰ [HODL] {sym}: MINIMUM_HOLD gate active (no confirmed divergence). "
+                        f"Noch {remaining_hold:.0f}min warten für Funding!"
                     )
-            
-                # ═══════════════════════════════════════════════════════════════
-                # NEU: FUNDING CHECK - Mindestens etwas Funding gesammelt?
-                # ═══════════════════════════════════════════════════════════════
-                funding_blocked = bool(funding_collected < min_funding_before_exit and not force_close and not shutting_down)
-                if funding_blocked and not divergence_candidate:
+                elif funding_blocked:
                     logger.debug(
-                        f"💸 [HODL] {sym}: Noch kein Funding (${funding_collected:.4f} < ${min_funding_before_exit:.2f}). "
-                        f"Warte auf nächstes Funding Payment!"
+                        f"💸 [HODL] {sym}: FUNDING gate active (no confirmed divergence). "
+                        f"${funding_collected:.4f} < ${min_funding_before_exit:.2f}"
                     )
-                    continue
-                elif funding_blocked and divergence_candidate:
+                return None
+            # 2. Profit check
+            if not force_close and not reason:
+                if total_pnl < min_profit_exit:
                     logger.debug(
-                        f"💎🎁 [PRICE DIVERGENCE CANDIDATE] {sym}: SpreadPnL(mid)=${spread_pnl:.2f} may compensate missing funding - "
-                        "checking realizable (Bid/Ask) profit before bypassing FUNDING gate"
+                        f"💎 [HODL] {sym}: Net PnL ${total_pnl:.4f} < ${min_profit_exit:.2f}"
                     )
-                
-                # ═══════════════════════════════════════════════════════════════
-                # PROFIT PROTECTION: Nur Exit wenn wirklich profitabel!
-                # Verhindert Verluste durch zu frühe Exits
-                # ═══════════════════════════════════════════════════════════════
-                require_positive = getattr(config, 'REQUIRE_POSITIVE_EXPECTED_PNL', True)
-                min_net_profit = getattr(config, 'MIN_NET_PROFIT_EXIT_USD', 0.05)
-                
-                # Berechne erwarteten Net-Profit nach allen Kosten
-                # FIX (2025-12-17): Convert Decimal to float to prevent TypeError
-                est_fees_f = float(est_fees) if hasattr(est_fees, '__float__') else est_fees
-                slippage_cost_f = float(slippage_cost) if hasattr(slippage_cost, '__float__') else slippage_cost
-                expected_exit_cost = est_fees_f + slippage_cost_f
-                expected_net_pnl = gross_pnl - expected_exit_cost
-                
-                if require_positive and not force_close and not shutting_down:
-                    # Check: Ist der Trade nach allen Kosten wirklich profitabel?
-                    if expected_net_pnl < min_net_profit:
-                        logger.debug(
-                            f"🛡️ [PROFIT PROTECTION] {sym}: Expected Net ${expected_net_pnl:.4f} < ${min_net_profit:.2f}. "
-                            f"Halte Trade bis profitabel! (Gross=${gross_pnl:.4f}, Costs=${expected_exit_cost:.4f})"
-                        )
-                        continue
-                
-                # ═══════════════════════════════════════════════════════════════
-                # LIQUIDITY CHECK: Genug Orderbook-Tiefe für Exit?
-                # ═══════════════════════════════════════════════════════════════
-                smart_exit = getattr(config, 'SMART_EXIT_ENABLED', True)
-                if smart_exit and not orderbook_depth_ok and not force_close:
-                    logger.warning(
-                        f"⚠️ [LOW LIQUIDITY] {sym}: Orderbook zu dünn für ${notional:.0f} Exit. "
-                        f"Warte auf bessere Liquidität..."
-                    )
-                    # Trotzdem Exit erlauben wenn Trade sehr profitabel oder sehr alt
-                    if total_pnl < notional * 0.02 and hold_hours < max_hold_hours * 0.8:
-                        continue
-            
-            if not reason:
-                # 1. Safety override: MAX_HOLD_HOURS
-                if hold_hours >= max_hold_hours:
-                    reason = "MAX_HOLD_EXPIRED"
-                    force_close = True
-                    logger.warning(
-                        f"⚠️ [FORCE CLOSE] {sym}: Max hold time reached "
-                        f"({hold_hours:.1f}h >= {max_hold_hours}h)"
+                    # Skip 'continue' here to allow other reason checks? 
+                    # No, usually if not profitable we wait.
+                else:
+                    logger.info(
+                        f"💰 [PROFIT] {sym}: Net PnL ${total_pnl:.4f} >= ${min_profit_exit:.2f} | "
+                        f"Funding=${funding_collected:.4f}, SpreadPnL=${spread_pnl:.4f}"
                     )
-                
-                # ═══════════════════════════════════════════════════════════════
-                # NEU: CROSS-EXCHANGE ARBITRAGE EXIT (Realizable PnL Check)
-                # FIX (2025-12-19): Use ACTUAL REALIZABLE prices (Bid/Ask from OB)
-                # NOT mid-prices! We need to cross the spread to exit.
-                # FIX (2025-12-19): CRITICAL - Only divergence on WEBSOCKET prices!
-                # REST prices can be stale and cause false profit calculations
-                # ═══════════════════════════════════════════════════════════════
-                if not force_close and price_divergence_enabled:
-                    # FIX (2025-12-19): Validate price sources for divergence
-                    if not px_source_ws or not pl_source_ws:
-                        source_info = f"X10={'WS' if px_source_ws else 'REST'}, Lit={'WS' if pl_source_ws else 'REST'}"
-                        logger.debug(
-                            f"⚠️ [DIVERGENCE SKIP] {sym}: Requires WS prices but got [{source_info}]. "
-                            f"Waiting for real-time prices..."
+
+                    # Smart Rotation: Exit if APY drops below maintenance threshold
+                    if not reason and current_apy < min_maintenance_apy:
+                        reason = f"LOW_APY_EXIT ({current_apy*100:.1f}% < {min_maintenance_apy*100:.1f}%)"
+                        logger.info(f"📉 [SMART ROTATION] {sym}: APY dropped to {current_apy*100:.1f}%. Exiting to free capital.")
+                    
+                    # Farm Mode Quick Exit
+                    if not reason and t.get('is_farm_trade') and getattr(config, 'VOLUME_FARM_MODE', False):
+                        should_exit, exit_reason = should_farm_quick_exit(
+                            symbol=sym,
+                            trade=t,
+                            current_spread=current_spread_pct,
+                            gross_pnl=gross_pnl
                         )
-                    # 1. Calculate Realizable PnL (Crossing the spread) - FIX: Use actual exit prices
-                    elif True:  # Only proceed with WS prices
-                        try:
-                            # ENSURE we have actual Bid/Ask prices from orderbooks
-                            # If dynamic slippage is enabled, these are fetched above.
-                            # If NOT, we use mid-prices as fallback (less accurate but safe)
-                            
-                            # Determine REALIZABLE Exit Prices (what we can actually get from orderbook)
-                            # Long X10 (sx=1) -> We SELL, so we get the BID price
-                            # Short X10 (sx=-1) -> We BUY, so we pay the ASK price
-                            
-                            if x10_best_bid > 0 and x10_best_ask > 0:
-                                exit_price_x10 = x10_best_bid if sx == 1 else x10_best_ask
+                        
+                        if should_exit:
+                            if "FARM_PROFIT" in exit_reason:
+                                reason = "FARM_QUICK_PROFIT"
+                            elif "FARM_AGED_OUT" in exit_reason:
+                                reason = "FARM_AGED_OUT"
                             else:
-                                # Fallback: use mid-price if OB data missing
-                                exit_price_x10 = px
+                                reason = "FARM_EXIT"
+                            logger.info(f"🚜 [FARM] Quick Exit {sym}: {exit_reason}")
+                    
+                    # Take Profit at high profit
+                    if not reason and notional > 0:
+                        if total_pnl > notional * 0.05:
+                            reason = "TAKE_PROFIT"
+                    
+                    # Farm hold complete
+                    if not reason and t.get('is_farm_trade') and getattr(config, 'VOLUME_FARM_MODE', False):
+                        farm_hold_seconds = getattr(config, 'FARM_HOLD_SECONDS', 3600)
+                        if age_seconds > farm_hold_seconds:
+                            reason = "FARM_HOLD_COMPLETE"
+                            logger.info(
+                                f"✅ [FARM COMPLETE] {sym}: Hold time reached AND profitable!"
+                            )
+                    
+                    # Funding flip (only if profitable)
+                    # Funding flip (only if profitable)
+                    # ═══════════════════════════════════════════════════════════════
+                    # FEATURE #2: Funding-Flip Auto-Exit
+                    # ═══════════════════════════════════════════════════════════════
+                    if not reason and not force_close:
+                        # Are we PAYING funding? (current_net < 0 means paying)
+                        if current_net < 0:
+                            # Lazy load state manager
+                            if state_manager is None:
+                                from src.core.state import get_state_manager
+                                state_manager = await get_state_manager()
                             
-                            # Long Lighter (sl=1) -> We SELL, so we get the BID price
-                            # Short Lighter (sl=-1) -> We BUY, so we pay the ASK price
-                            if lit_best_bid > 0 and lit_best_ask > 0:
-                                exit_price_lighter = lit_best_bid if sl == 1 else lit_best_ask
-                            else:
-                                # Fallback: use mid-price if OB data missing
-                                exit_price_lighter = pl
+                            flip_key = f"funding_flip_start_{sym}"
+                            flip_start_ts = await state_manager.get_state(flip_key)
                             
-                            # FIX (2025-12-19): STRICT VALIDATION - only use if prices are real
-                            if exit_price_x10 > 0 and exit_price_lighter > 0:
-                                # Recalculate PnL with ACTUAL exit prices (not mid-prices!)
-                                # Formula: (Exit - Entry) * Size * Sign
-                                pnl_x10_real = (exit_price_x10 - ep_x10) * sx * qty_est
-                                pnl_lit_real = (exit_price_lighter - ep_lit) * sl * qty_est
-                                
-                                # STRICT: Include ACTUAL slippage cost (dynamic or static)
-                                gross_pnl_real = pnl_x10_real + pnl_lit_real + funding_pnl
-                                # FIX (2025-12-19): Use float-converted versions to avoid Decimal TypeError
-                                net_pnl_real = gross_pnl_real - est_fees_f - slippage_cost_f
-                                
+                            now_ts = time.time()
+                            
+                            if flip_start_ts is None:
+                                # Funding just flipped to negative. Start timer.
+                                await state_manager.set_state(flip_key, now_ts)
                                 logger.info(
-                                    f"💎🎁 [PRICE DIVERGENCE CHECK] {sym}: "
-                                    f"Entry(X10=${ep_x10:.5f}, Lit=${ep_lit:.5f}) -> "
-                                    f"Exit(X10=${exit_price_x10:.5f}, Lit=${exit_price_lighter:.5f}) | "
-                                    f"PnL Components: X10=${pnl_x10_real:.4f}, Lit=${pnl_lit_real:.4f}, "
-                                    f"Funding=${funding_pnl:.4f}, Fees=${est_fees_f:.4f}, Slippage=${slippage_cost_f:.4f} | "
-                                    f"Net=${net_pnl_real:.4f} vs Target=${min_divergence_profit:.4f}"
+                                    f"📉 [FUNDING FLIP] {sym}: Rate flipped to NEGATIVE (Paying). "
+                                    f"Net Rate: {current_net*100:.4f}%/hr. Timer started."
                                 )
+                            else:
+                                # Paying funding for some time... check duration.
+                                try:
+                                    elapsed_hours = (now_ts - float(flip_start_ts)) / 3600.0
+                                except (ValueError, TypeError):
+                                    elapsed_hours = 0.0
+                                    await state_manager.set_state(flip_key, now_ts) # Reset if corrupt
+                                    
+                                flip_hours_threshold = getattr(config, 'FUNDING_FLIP_HOURS_THRESHOLD', 4.0)
                                 
-                                if net_pnl_real >= min_divergence_profit:
-                                    reason = "PRICE_DIVERGENCE_PROFIT"
-                                    logger.info(
-                                        f"✅ [PRICE DIVERGENCE] {sym}: Realizable Net Profit ${net_pnl_real:.2f} >= ${min_divergence_profit:.2f}! "
-                                        f"EXECUTING EXIT!"
+                                if elapsed_hours > flip_hours_threshold:
+                                    reason = f"FUNDING_FLIP_PAYING (Duration {elapsed_hours:.1f}h > {flip_hours_threshold}h)"
+                                    force_close = True
+                                    logger.warning(
+                                        f"🚨 [FUNDING FLIP] {sym}: Paying funding for {elapsed_hours:.1f}h! "
+                                        f"Exiting to prevent drain. Net Rate: {current_net*100:.4f}%/hr"
                                     )
                                 else:
-                                    logger.info(
-                                        f"❌ [PRICE DIVERGENCE] {sym}: Net PnL ${net_pnl_real:.2f} < Target ${min_divergence_profit:.2f}. "
-                                        f"Skipping exit."
+                                    logger.debug(
+                                        f"📉 [FUNDING FLIP] {sym}: Paying funding for {elapsed_hours:.1f}h "
+                                        f"(Threshold: {flip_hours_threshold}h)"
                                     )
-                            else:
-                                logger.debug(
-                                    f"⚠️ [PRICE DIVERGENCE] {sym}: Missing orderbook data. "
-                                    f"X10(bid={x10_best_bid}, ask={x10_best_ask}), "
-                                    f"Lighter(bid={lit_best_bid}, ask={lit_best_ask}). Using fallback check."
-                                )
-                                # Fallback: Conservative estimate using mid-prices + slippage
-                                fallback_net_pnl = gross_pnl - est_fees - slippage_cost
-                                if fallback_net_pnl >= min_divergence_profit:
-                                    reason = "PRICE_DIVERGENCE_PROFIT_FALLBACK"
-                                    logger.info(f"✅ [PRICE DIVERGENCE FALLBACK] {sym}: Est. Net Profit ${fallback_net_pnl:.2f} >= ${min_divergence_profit:.2f}")
-                                
-                        except Exception as div_e:
-                            logger.warning(f"{sym}: Divergence Calc Error: {div_e}", exc_info=True)
-                            # On error: don't exit, wait for next cycle
-                            pass
-
-                # If we were blocked by MINIMUM_HOLD or FUNDING, only allow exit
-                # if divergence has been CONFIRMED (reason set). Otherwise continue holding.
-                if not force_close and not reason and (hold_blocked or funding_blocked):
-                    if hold_blocked:
-                        remaining_hold = (minimum_hold_seconds - age_seconds) / 60
-                        logger.debug(
-                            f"⏰ [HODL] {sym}: MINIMUM_HOLD gate active (no confirmed divergence). "
-                            f"Noch {remaining_hold:.0f}min warten für Funding!"
-                        )
-                    elif funding_blocked:
-                        logger.debug(
-                            f"💸 [HODL] {sym}: FUNDING gate active (no confirmed divergence). "
-                            f"${funding_collected:.4f} < ${min_funding_before_exit:.2f}"
-                        )
-                    continue
-                
-                # 2. Profit check
-                if not force_close and not reason:
-                    if total_pnl < min_profit_exit:
-                        logger.debug(
-                            f"💎 [HODL] {sym}: Net PnL ${total_pnl:.4f} < ${min_profit_exit:.2f}"
-                        )
-                        # Skip 'continue' here to allow other reason checks? 
-                        # No, usually if not profitable we wait.
-                    else:
-                        logger.info(
-                            f"💰 [PROFIT] {sym}: Net PnL ${total_pnl:.4f} >= ${min_profit_exit:.2f} | "
-                            f"Funding=${funding_collected:.4f}, SpreadPnL=${spread_pnl:.4f}"
-                        )
-
-                        # Smart Rotation: Exit if APY drops below maintenance threshold
-                        if not reason and current_apy < min_maintenance_apy:
-                            reason = f"LOW_APY_EXIT ({current_apy*100:.1f}% < {min_maintenance_apy*100:.1f}%)"
-                            logger.info(f"📉 [SMART ROTATION] {sym}: APY dropped to {current_apy*100:.1f}%. Exiting to free capital.")
-                        
-                        # Farm Mode Quick Exit
-                        if not reason and t.get('is_farm_trade') and getattr(config, 'VOLUME_FARM_MODE', False):
-                            should_exit, exit_reason = should_farm_quick_exit(
-                                symbol=sym,
-                                trade=t,
-                                current_spread=current_spread_pct,
-                                gross_pnl=gross_pnl
-                            )
-                            
-                            if should_exit:
-                                if "FARM_PROFIT" in exit_reason:
-                                    reason = "FARM_QUICK_PROFIT"
-                                elif "FARM_AGED_OUT" in exit_reason:
-                                    reason = "FARM_AGED_OUT"
-                                else:
-                                    reason = "FARM_EXIT"
-                                logger.info(f"🚜 [FARM] Quick Exit {sym}: {exit_reason}")
-                        
-                        # Take Profit at high profit
-                        if not reason and notional > 0:
-                            if total_pnl > notional * 0.05:
-                                reason = "TAKE_PROFIT"
-                        
-                        # Farm hold complete
-                        if not reason and t.get('is_farm_trade') and getattr(config, 'VOLUME_FARM_MODE', False):
-                            farm_hold_seconds = getattr(config, 'FARM_HOLD_SECONDS', 3600)
-                            if age_seconds > farm_hold_seconds:
-                                reason = "FARM_HOLD_COMPLETE"
-                                logger.info(
-                                    f"✅ [FARM COMPLETE] {sym}: Hold time reached AND profitable!"
-                                )
                         
-                        # Funding flip (only if profitable)
-                        # Funding flip (only if profitable)
-                        # ═══════════════════════════════════════════════════════════════
-                        # FEATURE #2: Funding-Flip Auto-Exit
-                        # ═══════════════════════════════════════════════════════════════
-                        if not reason and not force_close:
-                            # Are we PAYING funding? (current_net < 0 means paying)
-                            if current_net < 0:
-                                # Lazy load state manager
-                                if state_manager is None:
-                                    from src.core.state import get_state_manager
-                                    state_manager = await get_state_manager()
-                                
+                        else:
+                            # We are Receiving (or Neutral) -> Clear timer if it exists
+                            # Optimization: Lazy load state manager only if we suspect we need to clear
+                            if state_manager:
                                 flip_key = f"funding_flip_start_{sym}"
-                                flip_start_ts = await state_manager.get_state(flip_key)
-                                
-                                now_ts = time.time()
-                                
-                                if flip_start_ts is None:
-                                    # Funding just flipped to negative. Start timer.
-                                    await state_manager.set_state(flip_key, now_ts)
-                                    logger.info(
-                                        f"📉 [FUNDING FLIP] {sym}: Rate flipped to NEGATIVE (Paying). "
-                                        f"Net Rate: {current_net*100:.4f}%/hr. Timer started."
-                                    )
-                                else:
-                                    # Paying funding for some time... check duration.
-                                    try:
-                                        elapsed_hours = (now_ts - float(flip_start_ts)) / 3600.0
-                                    except (ValueError, TypeError):
-                                        elapsed_hours = 0.0
-                                        await state_manager.set_state(flip_key, now_ts) # Reset if corrupt
-                                        
-                                    flip_hours_threshold = getattr(config, 'FUNDING_FLIP_HOURS_THRESHOLD', 4.0)
-                                    
-                                    if elapsed_hours > flip_hours_threshold:
-                                        reason = f"FUNDING_FLIP_PAYING (Duration {elapsed_hours:.1f}h > {flip_hours_threshold}h)"
-                                        force_close = True
-                                        logger.warning(
-                                            f"🚨 [FUNDING FLIP] {sym}: Paying funding for {elapsed_hours:.1f}h! "
-                                            f"Exiting to prevent drain. Net Rate: {current_net*100:.4f}%/hr"
-                                        )
-                                    else:
-                                        logger.debug(
-                                            f"📉 [FUNDING FLIP] {sym}: Paying funding for {elapsed_hours:.1f}h "
-                                            f"(Threshold: {flip_hours_threshold}h)"
-                                        )
-                            
-                            else:
-                                # We are Receiving (or Neutral) -> Clear timer if it exists
-                                # Optimization: Lazy load state manager only if we suspect we need to clear
-                                if state_manager:
-                                    flip_key = f"funding_flip_start_{sym}"
-                                    existing = await state_manager.get_state(flip_key)
-                                    if existing is not None:
-                                         await state_manager.set_state(flip_key, None)
-                                         logger.info(f"📈 [FUNDING FLIP] {sym}: Rate recovered to POSITIVE! Timer cleared.")
-                                         
-                                # Also ensure state_manager is loaded for next iteration if not already
-                                if state_manager is None:
-                                    from src.core.state import get_state_manager
-                                    state_manager = await get_state_manager()
-                                    # Check again with loaded manager
-                                    flip_key = f"funding_flip_start_{sym}"
-                                    if await state_manager.get_state(flip_key) is not None:
-                                         await state_manager.set_state(flip_key, None)
-
-            if reason:
-                # Log exit details
-                logger.info(
-                    f"💸 EXIT {sym}: {reason} | "
-                    f"Gross PnL: ${gross_pnl:.2f} | "
-                    f"Fees: ${est_fees:.4f} | "
-                    f"Net PnL: ${total_pnl:.2f}"
-                )
-                
-                if await close_trade(t, lighter, x10):
-                    # After close: compute REAL realized PnL from entry/exit fills.
-                    # This is what gets persisted to DB (accounting truth).
-                    try:
-                        # Best-effort: fetch exit fee rates (if order ids are available)
-                        if t.get("x10_exit_order_id") and hasattr(x10, "get_order_fee"):
-                            try:
-                                t["exit_fee_x10"] = safe_float(await x10.get_order_fee(str(t["x10_exit_order_id"])), 0.0)
-                            except Exception:
-                                pass
-                        if t.get("lighter_exit_order_id") and hasattr(lighter, "get_order_fee"):
+                                existing = await state_manager.get_state(flip_key)
+                                if existing is not None:
+                                     await state_manager.set_state(flip_key, None)
+                                     logger.info(f"📈 [FUNDING FLIP] {sym}: Rate recovered to POSITIVE! Timer cleared.")
+                                     
+                            # Also ensure state_manager is loaded for next iteration if not already
+                            if state_manager is None:
+                                from src.core.state import get_state_manager
+                                state_manager = await get_state_manager()
+                                # Check again with loaded manager
+                                flip_key = f"funding_flip_start_{sym}"
+                                if await state_manager.get_state(flip_key) is not None:
+                                     await state_manager.set_state(flip_key, None)
+
+        if not reason:
+            return None
+        return ExitDecision(
+            trade=t,
+            reason=reason,
+            gross_pnl=gross_pnl,
+            est_fees=est_fees,
+            total_pnl=total_pnl,
+            funding_pnl=funding_pnl,
+            spread_pnl=spread_pnl,
+        )
+
+    except Exception as e:
+        logger.error(f"Exit Evaluation Error for {t.get('symbol', 'UNKNOWN')}: {e}")
+        import traceback
+        logger.debug(traceback.format_exc())
+        return None
+
+
+async def execute_trade_exit(decision: ExitDecision, lighter, x10) -> bool:
+    """
+    Close both legs and book the realized PnL (runs on an exit worker).
+    Returns True if the trade was closed.
+    """
+    _, close_trade_in_state, archive_trade_to_history, _ = _get_state_functions()
+    close_trade, _ = _get_trading_functions()
+
+    t = decision.trade
+    sym = t['symbol']
+    reason = decision.reason
+    gross_pnl = decision.gross_pnl
+    est_fees = decision.est_fees
+    total_pnl = decision.total_pnl
+    funding_pnl = decision.funding_pnl
+    spread_pnl = decision.spread_pnl
+
+    try:
+        # Log exit details
+        logger.info(
+            f"💸 EXIT {sym}: {reason} | "
+            f"Gross PnL: ${gross_pnl:.2f} | "
+            f"Fees: ${est_fees:.4f} | "
+            f"Net PnL: ${total_pnl:.2f}"
+        )
+        
+        if await close_trade(t, lighter, x10):
+            estimate = {
+                "total_pnl": total_pnl,
+                "funding_total": safe_float(t.get("funding_collected") or funding_pnl, 0.0),
+                "price_pnl_total": spread_pnl,
+                "fees_total": est_fees,
+            }
+            settlement = get_settlement_queue(lighter, x10)
+            if settlement is not None:
+                # Book the estimate now (frees the slot), exact fills/fees are
+                # resolved by the settlement queue and replace this row later.
+                realized = estimate
+            else:
+                # After close: compute REAL realized PnL from entry/exit fills.
+                # This is what gets persisted to DB (accounting truth).
+                try:
+                    # Best-effort: fetch exit fee rates (if order ids are available) - both legs parallel
+                    async def _exit_fee(adapter, key: str, order_key: str) -> None:
+                        if t.get(order_key) and hasattr(adapter, "get_order_fee"):
                             try:
-                                t["exit_fee_lighter"] = safe_float(await lighter.get_order_fee(str(t["lighter_exit_order_id"])), 0.0)
+                                t[key] = safe_float(await adapter.get_order_fee(str(t[order_key])), 0.0)
                             except Exception:
                                 pass
 
-                        realized = await calculate_realized_close_pnl(t, lighter, x10)
-                    except Exception as e:
-                        logger.warning(f"{sym}: Realized PnL calc failed, using estimate. err={e}")
-                        realized = {
-                            "total_pnl": total_pnl,
-                            "funding_total": safe_float(t.get("funding_collected") or funding_pnl, 0.0),
-                            "price_pnl_total": spread_pnl,
-                            "fees_total": est_fees,
-                        }
-
-                    realized_total = safe_float(realized.get("total_pnl"), total_pnl)
-                    realized_funding = safe_float(realized.get("funding_total"), safe_float(t.get("funding_collected") or 0.0, 0.0))
-                    realized_price = safe_float(realized.get("price_pnl_total"), spread_pnl)
-                    realized_fees = safe_float(realized.get("fees_total"), est_fees)
-
-                    await close_trade_in_state(sym, pnl=realized_total, funding=realized_funding)
-                    await archive_trade_to_history(t, reason, {
-                        'total_net_pnl': realized_total,
-                        'funding_pnl': realized_funding,
-                        'spread_pnl': realized_price,
-                        'fees': realized_fees
-                    })
-
-                    # FIX: Track recently closed trades to avoid orphan false positives
-                    RECENTLY_CLOSED_TRADES[sym] = time.time()
-
-                    # Telegram notification via EventBus
-                    await publish_event(TradeClosed(
-                        symbol=sym,
-                        pnl_usd=float(realized_total)
-                    ))
+                    await asyncio.gather(
+                        _exit_fee(x10, "exit_fee_x10", "x10_exit_order_id"),
+                        _exit_fee(lighter, "exit_fee_lighter", "lighter_exit_order_id"),
+                    )
 
-        except Exception as e:
-            logger.error(f"Trade Loop Error for {t.get('symbol', 'UNKNOWN')}: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+                    realized = await calculate_realized_close_pnl(t, lighter, x10)
+                except Exception as e:
+                    logger.warning(f"{sym}: Realized PnL calc failed, using estimate. err={e}")
+                    realized = estimate
+
+            realized_total = safe_float(realized.get("total_pnl"), total_pnl)
+            realized_funding = safe_float(realized.get("funding_total"), safe_float(t.get("funding_collected") or 0.0, 0.0))
+            realized_price = safe_float(realized.get("price_pnl_total"), spread_pnl)
+            realized_fees = safe_float(realized.get("fees_total"), est_fees)
+
+            pnl_data = {
+                'total_net_pnl': realized_total,
+                'funding_pnl': realized_funding,
+                'spread_pnl': realized_price,
+                'fees': realized_fees
+            }
+            await close_trade_in_state(sym, pnl=realized_total, funding=realized_funding, fees=realized_fees)
+            history_id = await archive_trade_to_history(t, reason, pnl_data, provisional=settlement is not None)
+            if settlement is not None:
+                settlement.enqueue(t, reason, pnl_data, history_id)
+
+            # FIX: Track recently closed trades to avoid orphan false positives
+            RECENTLY_CLOSED_TRADES[sym] = time.time()
+
+            # Telegram notification via EventBus
+            await publish_event(TradeClosed(
+                symbol=sym,
+                pnl_usd=float(realized_total)
+            ))
+            return True
+        return False
 
+    except Exception as e:
+        logger.error(f"Trade Loop Error for {t.get('symbol', 'UNKNOWN')}: {e}")
+        import traceback
+        logger.debug(traceback.format_exc())
+        return False
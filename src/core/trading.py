@@ -21,6 +21,8 @@ from src.utils import safe_float, safe_decimal, quantize_usd
 from src.application.fee_manager import get_fee_manager
 from src.core.events import CriticalError, NotificationEvent
 from src.core.interfaces import Position
+from src.core.admission import get_admission_gate
+from src.core.task_scheduler import get_task_scheduler
 
 # B5: JSON Logger for structured logging
 try:
@@ -40,12 +42,18 @@ def set_event_handler(handler):
     EVENT_HANDLER = handler
 
 async def publish_event(event):
-    """Publish an event to the handler."""
-    if EVENT_HANDLER:
-        try:
-            await EVENT_HANDLER(event)
-        except Exception as e:
-            logger.error(f"Failed to publish event {type(event).__name__}: {e}")
+    """Publish an event to the handler (default: the shared EventBus).
+
+    Only enqueues per subscriber - slow subscribers (Telegram) don't delay the caller.
+    """
+    handler = EVENT_HANDLER
+    if handler is None:
+        from src.infrastructure.event_bus import get_event_bus
+        handler = get_event_bus().publish
+    try:
+        await handler(event)
+    except Exception as e:
+        logger.error(f"Failed to publish event {type(event).__name__}: {e}")
 
 # ============================================================
 # GLOBALS (shared with main.py)
@@ -53,7 +61,8 @@ async def publish_event(event):
 FAILED_COINS = {}
 ACTIVE_TASKS = {}
 SHUTDOWN_FLAG = False
-IN_FLIGHT_MARGIN = {'X10': Decimal('0'), 'Lighter': Decimal('0')}
+# In-flight margin reservations live in the AdmissionGate (same dict object)
+IN_FLIGHT_MARGIN = get_admission_gate().in_flight
 IN_FLIGHT_LOCK = asyncio.Lock()
 RECENTLY_OPENED_TRADES = {}
 RECENTLY_OPENED_LOCK = asyncio.Lock()
@@ -197,9 +206,14 @@ async def launch_trade_task(opp: Dict, lighter, x10, parallel_exec):
     ACTIVE_TASKS[symbol] = task
 
 
-async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec) -> bool:
-    """Execute a trade on both exchanges in parallel using Decimal"""
-    global SHUTDOWN_FLAG, IN_FLIGHT_MARGIN
+async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec, snapshot=None) -> bool:
+    """Execute a trade on both exchanges in parallel using Decimal
+
+    Admission (positions, exposure, margin, minimums) is answered from memory
+    by the AdmissionGate. snapshot: MarketSnapshot of the current scan cycle;
+    its positions / balances are fed into the gate when newer than the gate's.
+    """
+    global SHUTDOWN_FLAG
     
     if SHUTDOWN_FLAG:
         return False
@@ -218,134 +232,52 @@ async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec) -> bool
             logger.debug(f"🚫 {symbol}: Shutdown detected - aborting trade execution")
             return False
         
-        # Check if position already exists
+        # ═══════════════════════════════════════════════════════════════
+        # Admission: positions, open trades, exposure, margin and minimums
+        # from memory (AdmissionGate); REST only for parts that went stale
+        # ═══════════════════════════════════════════════════════════════
+        gate = get_admission_gate()
+        gate.ingest_snapshot(snapshot)
+        await gate.ensure_fresh(lighter, x10, symbol, get_open_trades=get_open_trades)
+
+        busy_symbols = set()
         try:
-            position_tasks = await asyncio.gather(
-                x10.fetch_open_positions(),
-                lighter.fetch_open_positions(),
-            )
-            x10_positions, lighter_positions = position_tasks
-
-            max_positions = int(getattr(config, 'MAX_OPEN_POSITIONS', getattr(config, 'MAX_OPEN_TRADES', 40)))
-            if max_positions > 0:
-                open_symbols_real = {
-                    p.symbol for p in (x10_positions or [])
-                    if abs(p.size) > Decimal('1e-8')
-                } | {
-                    p.symbol for p in (lighter_positions or [])
-                    if abs(p.size) > Decimal('1e-8')
-                }
-
-                existing = await get_open_trades()
-                open_symbols_db = {t.get('symbol') for t in (existing or []) if t.get('symbol')}
-
-                active_symbols = set()
-                try:
-                    active_symbols |= set(ACTIVE_TASKS.keys())
-                except Exception:
-                    pass
-                try:
-                    if hasattr(parallel_exec, 'active_executions') and isinstance(parallel_exec.active_executions, dict):
-                        active_symbols |= set(parallel_exec.active_executions.keys())
-                except Exception:
-                    pass
-
-                total_active_symbols = {s for s in (open_symbols_real | open_symbols_db | active_symbols) if s}
-                if len(total_active_symbols) >= max_positions:
-                    logger.info(
-                        f"⛔ {symbol}: Max open positions reached "
-                        f"({len(total_active_symbols)}/{max_positions}) - skip new entry"
-                    )
-                    return False
-            
-            for pos in (x10_positions or []):
-                if pos.symbol == symbol and abs(pos.size) > Decimal('1e-8'):
-                    logger.warning(f"⚠️ {symbol} already open on X10 (size={pos.size}) - SKIP")
-                    return False
-            
-            for pos in (lighter_positions or []):
-                if pos.symbol == symbol and abs(pos.size) > Decimal('1e-8'):
-                    logger.warning(f"⚠️ {symbol} already open on Lighter (size={pos.size}) - SKIP")
-                    return False
-            
-        except Exception as e:
-            logger.error(f"Failed to check positions for {symbol}: {e}")
-            return False
-        
-        # Check state
-        existing = await get_open_trades()
-        if any(t['symbol'] == symbol for t in existing):
-            return False
-
+            busy_symbols |= set(ACTIVE_TASKS.keys())
+        except Exception:
+            pass
+        try:
+            if hasattr(parallel_exec, 'active_executions') and isinstance(parallel_exec.active_executions, dict):
+                busy_symbols |= set(parallel_exec.active_executions.keys())
+        except Exception:
+            pass
+        busy_symbols.discard(symbol)
 
-        # Exposure check
         trade_size = safe_decimal(opp.get('size_usd') or getattr(config, 'DESIRED_NOTIONAL_USD', 500))
-        can_trade, exposure_pct, max_pct = await check_total_exposure(x10, lighter, trade_size)
-        if not can_trade:
-            exposure_print = (exposure_pct * Decimal('100')).quantize(Decimal('0.1')) if isinstance(exposure_pct, Decimal) else exposure_pct
-            max_print = (max_pct * Decimal('100')).quantize(Decimal('0.1')) if isinstance(max_pct, Decimal) else max_pct
-            logger.info(f"⛔ {symbol}: Exposure limit ({exposure_print}% > {max_print}%)")
+        decision = gate.admit(symbol, trade_size, busy_symbols=busy_symbols, reserve=True)
+        if not decision.ok:
+            logger.info(f"⛔ {symbol}: {decision.reason} - skip new entry")
             return False
+        final_usd = decision.size_usd
+        reserved_amount = decision.margin_usd
 
-        # Sizing
-        try:
-            min_req_x10_raw, min_req_lit_raw, raw_x10, raw_lit = await asyncio.gather(
-                x10.min_notional_usd(symbol),
-                lighter.min_notional_usd(symbol),
-                x10.get_available_balance(),
-                lighter.get_available_balance(),
-            )
-
-            min_req_x10 = safe_decimal(min_req_x10_raw)
-            min_req_lit = safe_decimal(min_req_lit_raw)
-            min_req = max(min_req_x10, min_req_lit)
-            
-            if min_req > safe_decimal(config.MAX_TRADE_SIZE_USD):
-                return False
-
-            async with IN_FLIGHT_LOCK:
-                bal_x10_real = max(Decimal('0'), raw_x10 - IN_FLIGHT_MARGIN.get('X10', Decimal('0')))
-                bal_lit_real = max(Decimal('0'), raw_lit - IN_FLIGHT_MARGIN.get('Lighter', Decimal('0')))
-
-            available_capital = min(bal_x10_real, bal_lit_real)
-            desired_size = safe_decimal(getattr(config, 'DESIRED_NOTIONAL_USD', 80.0))
-            final_usd = max(desired_size, min_req)
-
-            leverage = safe_decimal(getattr(config, 'LEVERAGE_MULTIPLIER', 1.0))
-            required_margin_check = (final_usd / leverage) * Decimal('1.05')
-
-            if required_margin_check > available_capital:
-                need_str = required_margin_check.quantize(Decimal('0.01'))
-                have_str = available_capital.quantize(Decimal('0.01'))
-                logger.warning(f"🛑 {symbol}: Insufficient capital (need ${need_str} margin, have ${have_str})")
-                return False
-
-            if final_usd > safe_decimal(config.MAX_TRADE_SIZE_USD):
-                final_usd = safe_decimal(config.MAX_TRADE_SIZE_USD)
-
-            logger.info(
-                f"📏 SIZE {symbol}: ${final_usd.quantize(Decimal('0.01'))} "
-                f"(Lev {leverage}x, Margin ${required_margin_check.quantize(Decimal('0.01'))})"
-            )
+        logger.info(
+            f"📏 SIZE {symbol}: ${final_usd.quantize(Decimal('0.01'))} "
+            f"(Lev {decision.leverage}x, Margin ${reserved_amount.quantize(Decimal('0.01'))})"
+        )
 
-            # Liquidity check
+        # Liquidity check
+        try:
             l_ex = opp.get('leg1_exchange', 'X10')
             l_side = opp.get('leg1_side', 'BUY')
             lit_side_check = l_side if l_ex == 'Lighter' else ("SELL" if l_side == "BUY" else "BUY")
 
-            liquidity_usd = final_usd
-            if not await lighter.check_liquidity(symbol, lit_side_check, liquidity_usd, is_maker=True):
+            if not await lighter.check_liquidity(symbol, lit_side_check, final_usd, is_maker=True):
                 logger.warning(f"🛑 {symbol}: Insufficient Lighter liquidity")
+                gate.release(symbol)
                 return False
-
-            # Reserve margin
-            async with IN_FLIGHT_LOCK:
-                IN_FLIGHT_MARGIN['X10'] = IN_FLIGHT_MARGIN.get('X10', Decimal('0')) + required_margin_check
-                IN_FLIGHT_MARGIN['Lighter'] = IN_FLIGHT_MARGIN.get('Lighter', Decimal('0')) + required_margin_check
-                reserved_amount = required_margin_check
-
         except Exception as e:
             logger.error(f"Sizing error {symbol}: {e}")
+            gate.release(symbol)
             return False
 
         # Execute trade
@@ -365,8 +297,12 @@ async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec) -> bool
 
             # PENDING Persistence
             try:
-                px_mark = await x10.fetch_mark_price(symbol)
-                pl_mark = await lighter.fetch_mark_price(symbol)
+                quote = snapshot.quote(symbol) if snapshot is not None else None
+                if quote is not None and snapshot.quotes_fresh():
+                    px_mark, pl_mark = quote.mark_x10, quote.mark_lighter
+                else:
+                    px_mark = await x10.fetch_mark_price(symbol)
+                    pl_mark = await lighter.fetch_mark_price(symbol)
                 entry_price_x10_est = safe_decimal(opp.get("entry_price_x10_est") or px_mark or 0)
                 entry_price_lighter_est = safe_decimal(opp.get("entry_price_lighter_est") or pl_mark or 0)
                 await add_trade_to_state(
@@ -388,14 +324,16 @@ async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec) -> bool
             except Exception as e:
                 logger.warning(f"⚠️ Failed to record PENDING trade for {symbol}: {e}")
 
-            # Execute in parallel
-            success, x10_id, lit_id = await parallel_exec.execute_trade_parallel(
-                symbol=symbol,
-                side_x10=x10_side,
-                side_lighter=lit_side,
-                size_x10=final_usd,
-                size_lighter=final_usd
-            )
+            # Execute in parallel (LOW/NORMAL background tasks pause meanwhile)
+            with get_task_scheduler().urgent(f"entry:{symbol}"):
+                success, x10_id, lit_id = await parallel_exec.execute_trade_parallel(
+                    symbol=symbol,
+                    side_x10=x10_side,
+                    side_lighter=lit_side,
+                    size_x10=final_usd,
+                    size_lighter=final_usd,
+                    snapshot=snapshot,
+                )
 
             if success:
                 # Get actual prices
@@ -504,6 +442,7 @@ async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec) -> bool
                         from src.core.state import get_state_manager
                         sm = await get_state_manager()
                         await sm.update_trade(symbol, {"status": "rollback", "closed_at": int(time.time() * 1000)})
+                        gate.note_trade_closed(symbol)
                     except Exception:
                         pass
                 FAILED_COINS[symbol] = time.time()
@@ -515,9 +454,7 @@ async def execute_trade_parallel(opp: Dict, lighter, x10, parallel_exec) -> bool
             return False
         finally:
             if reserved_amount > 0:
-                async with IN_FLIGHT_LOCK:
-                    IN_FLIGHT_MARGIN['X10'] = max(Decimal('0'), IN_FLIGHT_MARGIN.get('X10', Decimal('0')) - reserved_amount)
-                    IN_FLIGHT_MARGIN['Lighter'] = max(Decimal('0'), IN_FLIGHT_MARGIN.get('Lighter', Decimal('0')) - reserved_amount)
+                gate.release(symbol)
 
                 # Best-effort PnL enrichment
                 try:
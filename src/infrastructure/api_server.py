@@ -9,6 +9,7 @@ from decimal import Decimal
 from datetime import datetime
 
 import config
+from src.infrastructure.http_transport import get_transport_stats
 
 logger = logging.getLogger(__name__)
 
@@ -32,17 +33,21 @@ def json_serializer(obj):
     return str(obj)
 
 class DashboardApi:
-    def __init__(self, state_manager, parallel_exec, start_time):
+    def __init__(self, state_manager, parallel_exec, start_time, rollups=None):
         self.state_manager = state_manager
         self.parallel_exec = parallel_exec
         self.start_time = start_time
         self.app = web.Application()
         self.runner = None
         self.site = None
+        self._rollups = rollups  # RollupRepository (shared DB pool, lazily resolved)
         
         # Routes
         self.app.router.add_get('/status', self.handle_status)
         self.app.router.add_get('/pnl', self.handle_pnl)
+        self.app.router.add_get('/pnl/series', self.handle_pnl_series)
+        self.app.router.add_get('/pnl/symbols', self.handle_pnl_symbols)
+        self.app.router.add_get('/funding/series', self.handle_funding_series)
         self.app.router.add_get('/positions', self.handle_positions)
         self.app.router.add_get('/health', self.handle_health)
 
@@ -275,21 +280,80 @@ class DashboardApi:
             "uptime_human": f"{uptime / 3600:.2f} hours",
             "version": "5.0.0",
             "tasks_active": len(asyncio.all_tasks()),
-            "farm_mode": getattr(config, 'FARM_MODE', False)
+            "farm_mode": getattr(config, 'FARM_MODE', False),
+            "http": get_transport_stats(),
         }
         return web.json_response(data, dumps=lambda x: json.dumps(x, default=json_serializer))
 
+    async def _get_rollups(self):
+        # Reuses the process-wide AsyncDatabase (read pool) - no per-request connections
+        if self._rollups is None:
+            from src.infrastructure.database import get_rollup_repository
+            self._rollups = await get_rollup_repository(
+                db_path=getattr(self.state_manager, 'db_path', None)
+            )
+        return self._rollups
+
+    @staticmethod
+    def _json(data, status=200):
+        return web.json_response(data, status=status, dumps=lambda x: json.dumps(x, default=json_serializer))
+
+    @staticmethod
+    def _page_args(request):
+        """Parse ?bucket=&symbol=&limit=&cursor= (raises ValueError on bad input)"""
+        q = request.query
+        return {
+            "bucket": q.get("bucket", "day"),
+            "symbol": q.get("symbol", "*"),
+            "limit": int(q.get("limit", 100)),
+            "cursor": int(q["cursor"]) if q.get("cursor") else None,
+        }
+
     async def handle_pnl(self, request):
-        # Get stats from StateManager or ParallelExec
         stats = self.parallel_exec.get_execution_stats()
-        # You might want to aggregate DB stats here if available
+        symbol = request.query.get("symbol", "*")
+        
+        try:
+            rollups = await self._get_rollups()
+            summary = await rollups.get_pnl_summary(symbol)
+        except Exception as e:
+            logger.warning(f"⚠️ API /pnl: rollups unavailable: {e}")
+            return self._json({"session_stats": stats, "error": "rollups unavailable"}, status=503)
         
         data = {
             "session_stats": stats,
-            "total_pnl_usd": 0.00, # TODO: Connect to explicit PnL tracker if available
-            "win_rate": 0.0 # Placeholder
+            "total_pnl_usd": summary["realized_pnl"],
+            "win_rate": summary["win_rate"],
+            "summary": summary,
         }
-        return web.json_response(data, dumps=lambda x: json.dumps(x, default=json_serializer))
+        return self._json(data)
+
+    async def handle_pnl_series(self, request):
+        try:
+            args = self._page_args(request)
+            rollups = await self._get_rollups()
+            page = await rollups.get_pnl_series(**args)
+        except ValueError as e:
+            return self._json({"error": str(e)}, status=400)
+        return self._json(page)
+
+    async def handle_funding_series(self, request):
+        try:
+            args = self._page_args(request)
+            rollups = await self._get_rollups()
+            page = await rollups.get_funding_series(**args)
+        except ValueError as e:
+            return self._json({"error": str(e)}, status=400)
+        return self._json(page)
+
+    async def handle_pnl_symbols(self, request):
+        try:
+            limit = int(request.query.get("limit", 100))
+        except ValueError as e:
+            return self._json({"error": str(e)}, status=400)
+        rollups = await self._get_rollups()
+        page = await rollups.get_symbol_totals(limit=limit, cursor=request.query.get("cursor") or None)
+        return self._json(page)
 
     async def handle_positions(self, request):
         # Get active executions from ParallelExecutionManager
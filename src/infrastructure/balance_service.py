@@ -0,0 +1,153 @@
+"""
+Balance Service - stream-fed collateral / buying power / used margin
+
+Balance lookups (monitoring loop, sizing, check_total_exposure, the
+AdmissionGate) used to hit REST through each adapter's 2s cache. The
+BalanceService keeps the latest account figures per exchange, fed by the
+account streams:
+
+- X10: x10_account BALANCE messages (equity, availableForTrade, marginUsed)
+- Lighter: user_stats/{account_index} (collateral, buying_power,
+  available_balance)
+
+``get_available(exchange, rest_fetch)`` answers from memory while the last
+update is younger than BALANCE_MAX_AGE_SECONDS. Only then REST is used -
+one shared request per exchange, no matter how many callers are waiting.
+A reconnect of the account stream invalidates the exchange (updates may have
+been missed).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AccountBalance:
+    """Latest known account figures of one exchange (USD)."""
+    exchange: str
+    available: float = 0.0    # available for trade / buying power
+    collateral: float = 0.0   # equity / collateral
+    used_margin: float = 0.0
+    source: str = ""
+    updated_at: float = 0.0
+
+
+class BalanceService:
+    """Per-exchange balances from the account streams with a REST staleness fallback."""
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = float(
+            max_age if max_age is not None else getattr(config, 'BALANCE_MAX_AGE_SECONDS', 30.0)
+        )
+        self._balances: Dict[str, AccountBalance] = {}
+        self._rest_inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {"stream_updates": 0, "rest_updates": 0, "hits": 0, "rest_fallbacks": 0,
+                       "shared_rest": 0, "invalidations": 0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Feeding (stream handlers / REST fallback)
+    # ═══════════════════════════════════════════════════════════════
+
+    def update(
+        self,
+        exchange: str,
+        available: Optional[float] = None,
+        collateral: Optional[float] = None,
+        used_margin: Optional[float] = None,
+        source: str = "ws",
+    ) -> AccountBalance:
+        """Apply an account update. Fields that are None keep their last value."""
+        state = self._balances.setdefault(exchange, AccountBalance(exchange=exchange))
+        if available is not None:
+            state.available = float(available)
+        if collateral is not None:
+            state.collateral = float(collateral)
+        if used_margin is not None:
+            state.used_margin = float(used_margin)
+        state.source = source
+        state.updated_at = time.time()
+        self._stats["rest_updates" if source == "rest" else "stream_updates"] += 1
+        return state
+
+    def invalidate(self, exchange: Optional[str] = None) -> None:
+        """Force the next lookup through REST (e.g. account stream reconnect)."""
+        for ex, state in self._balances.items():
+            if exchange in (None, ex):
+                state.updated_at = 0.0
+        self._stats["invalidations"] += 1
+
+    # ═══════════════════════════════════════════════════════════════
+    # Lookups
+    # ═══════════════════════════════════════════════════════════════
+
+    def get(self, exchange: str) -> Optional[AccountBalance]:
+        return self._balances.get(exchange)
+
+    def is_fresh(self, exchange: str, max_age: Optional[float] = None) -> bool:
+        state = self._balances.get(exchange)
+        if state is None or state.updated_at <= 0:
+            return False
+        return time.time() - state.updated_at <= (self.max_age if max_age is None else max_age)
+
+    async def get_available(
+        self,
+        exchange: str,
+        rest_fetch: Callable[[], Awaitable[Optional[float]]],
+        max_age: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Available balance from memory while fresh, otherwise via ``rest_fetch``.
+
+        Concurrent stale lookups share one REST request. A positive REST result
+        is recorded; None / 0 (request failed) is returned as-is so the caller
+        decides about its fallback.
+        """
+        if self.is_fresh(exchange, max_age):
+            self._stats["hits"] += 1
+            return self._balances[exchange].available
+
+        pending = self._rest_inflight.get(exchange)
+        if pending is not None:
+            self._stats["shared_rest"] += 1
+            return await asyncio.shield(pending)
+
+        self._stats["rest_fallbacks"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._rest_inflight[exchange] = future
+        try:
+            value = await rest_fetch()
+            if value is not None and value > 0:
+                self.update(exchange, available=value, source="rest")
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Shared waiters get the exception; don't warn about it if nobody waited
+            future.exception()
+            raise
+        finally:
+            self._rest_inflight.pop(exchange, None)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self._stats,
+            "fresh": {ex: self.is_fresh(ex) for ex in self._balances},
+        }
+
+
+_default_service: Optional[BalanceService] = None
+
+
+def get_balance_service() -> BalanceService:
+    """Get singleton balance service"""
+    global _default_service
+    if _default_service is None:
+        _default_service = BalanceService()
+    return _default_service
@@ -0,0 +1,746 @@
+"""
+Benchmark - replays recorded or synthetic market data through the hot paths
+
+Every stage calls the real code path once per operation and reports
+throughput plus p50 / p99 / max latency:
+
+  ws_decode             ManagedWebSocket._process_single_message (JSON decode,
+                        ping/pong checks, dispatch) for every frame
+  lighter_market_stats  WebSocketManager -> LighterAdapter price caches
+  lighter_orderbook     WebSocketManager -> OrderbookProvider sequenced deltas
+  x10_orderbook         WebSocketManager._handle_x10_orderbook -> X10Adapter
+                        (skipped when the X10 SDK is not installed)
+  x10_orderbook_ingest  MarketDataIngestor (ingest process) -> SharedMarketTable
+  price_impact          simulate_price_impact on the workload books
+  find_opportunities    full scan over all common symbols
+  db_flush              AsyncDatabase._flush_batch on a temporary database
+
+Workloads: synthetic_workload() (seeded, reproducible on any machine) or a
+recording of the public streams (record_workload() / load_workload(), one
+``{"source": ..., "raw": ...}`` JSON line per frame). The X10 side of the
+opportunity scan is served from the workload, everything else runs on the
+bot's own objects without network access (REST fallbacks disabled).
+
+Results are compared against a baseline file (BENCHMARK_BASELINE_FILE): a
+stage regresses when p50 / p99 grow or throughput drops by more than
+BENCHMARK_REGRESSION_TOLERANCE.
+
+Entry point: scripts/run_benchmarks.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import config
+from src.utils import safe_decimal
+
+logger = logging.getLogger(__name__)
+
+Frame = Tuple[str, str]  # (stream name as used by ManagedWebSocket, raw text frame)
+
+BASELINE_VERSION = 1
+STAGES = (
+    "ws_decode",
+    "lighter_market_stats",
+    "lighter_orderbook",
+    "x10_orderbook",
+    "x10_orderbook_ingest",
+    "price_impact",
+    "find_opportunities",
+    "db_flush",
+)
+IMPACT_SIZES_USD = (50.0, 150.0, 500.0, 2000.0, 10000.0)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Results
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class StageResult:
+    """Latency distribution of one stage (per operation)."""
+    name: str
+    ops: int = 0
+    items: int = 0            # work units (frames, rows, symbols); one op may cover several
+    seconds: float = 0.0      # sum of the measured operation times
+    p50_us: float = 0.0
+    p99_us: float = 0.0
+    max_us: float = 0.0
+    detail: str = ""
+    skipped: str = ""
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.ops / self.seconds if self.seconds else 0.0
+
+    @property
+    def items_per_sec(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["ops_per_sec"] = self.ops_per_sec
+        data["items_per_sec"] = self.items_per_sec
+        return data
+
+
+def _percentile(sorted_values: Sequence[int], pct: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100.0))]
+
+
+class _Samples:
+    """Per-operation durations of one stage (perf_counter_ns)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ns: List[int] = []
+        self.items = 0
+        self.detail = ""
+
+    def result(self) -> StageResult:
+        ns = sorted(self.ns)
+        return StageResult(
+            name=self.name,
+            ops=len(ns),
+            items=self.items or len(ns),
+            seconds=sum(ns) / 1e9,
+            p50_us=_percentile(ns, 50) / 1e3,
+            p99_us=_percentile(ns, 99) / 1e3,
+            max_us=(ns[-1] / 1e3) if ns else 0.0,
+            detail=self.detail,
+        )
+
+
+# ═══════════════════════════════════════════════════════════════
+# Workloads
+# ═══════════════════════════════════════════════════════════════
+
+def _ladder(mid: float, depth: int, rng: Optional[random.Random] = None) -> Dict[str, List[List[float]]]:
+    """Uncrossed book of ``depth`` levels per side around ``mid``."""
+    tick = mid * 1e-4
+    size = (lambda i: round(rng.uniform(0.5, 20.0), 4)) if rng else (lambda i: 1.0 + i)
+    return {
+        "bids": [[round(mid - tick * (i + 0.5), 6), size(i)] for i in range(depth)],
+        "asks": [[round(mid + tick * (i + 0.5), 6), size(i)] for i in range(depth)],
+    }
+
+
+@dataclass
+class Workload:
+    """Frames in arrival order plus the market state derived from them."""
+    frames: List[Frame]
+    source: str = "recorded"
+    lighter_ids: Dict[str, int] = field(default_factory=dict)            # symbol -> Lighter market id
+    quotes: Dict[str, Dict[str, float]] = field(default_factory=dict)    # symbol -> lighter/x10 price + funding
+    books: Dict[str, Dict[str, List[List[float]]]] = field(default_factory=dict)      # Lighter depth
+    x10_books: Dict[str, Dict[str, List[List[float]]]] = field(default_factory=dict)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols quoted on both exchanges (the scan universe)."""
+        return sorted(s for s, q in self.quotes.items() if s in self.lighter_ids and len(q) == 4)
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[Frame], source: str = "recorded", depth: int = 20) -> "Workload":
+        workload = cls(frames=list(frames), source=source)
+        lighter_books: Dict[int, Dict[str, List[List[float]]]] = {}
+        for name, raw in workload.frames:
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(msg, dict):
+                workload._scan(name, msg, lighter_books)
+
+        by_id = {market_id: symbol for symbol, market_id in workload.lighter_ids.items()}
+        for market_id, book in lighter_books.items():
+            if market_id in by_id and book["bids"] and book["asks"]:
+                workload.books[by_id[market_id]] = book
+        # Books the recording did not contain: ladder around the mark price
+        for symbol in workload.symbols:
+            quote = workload.quotes[symbol]
+            workload.books.setdefault(symbol, _ladder(quote["lighter_price"], depth))
+            workload.x10_books.setdefault(symbol, _ladder(quote["x10_price"], depth))
+        return workload
+
+    def _scan(self, name: str, msg: Dict[str, Any], lighter_books: Dict[int, Dict[str, List[List[float]]]]) -> None:
+        msg_type = str(msg.get("type", ""))
+        if name == "lighter" and "market_stats" in msg_type:
+            stats = msg.get("market_stats") or {}
+            for entry in (stats.values() if isinstance(stats, dict) else stats):
+                if not isinstance(entry, dict) or entry.get("market_id") is None or not entry.get("symbol"):
+                    continue
+                symbol = f"{entry['symbol']}-USD"
+                self.lighter_ids[symbol] = int(entry["market_id"])
+                quote = self.quotes.setdefault(symbol, {})
+                if entry.get("mark_price") is not None:
+                    quote["lighter_price"] = float(entry["mark_price"])
+                rate = entry.get("funding_rate") or entry.get("current_funding_rate")
+                if rate is not None:
+                    quote["lighter_funding"] = float(rate)
+        elif name == "lighter" and msg_type.startswith("subscribed") and "order_book" in msg_type:
+            book = msg.get("order_book") or {}
+            market_id = int(str(msg.get("channel", "")).replace("/", ":").split(":")[-1])
+            lighter_books[market_id] = {
+                side: [[float(r["price"]), float(r["size"])] for r in book.get(side, [])] for side in ("bids", "asks")
+            }
+        elif name in ("x10_markprice", "x10_funding"):
+            data = msg.get("data") if isinstance(msg.get("data"), dict) else msg
+            market = str(data.get("m", "")).replace("/", "-")
+            value = data.get("p") if name == "x10_markprice" else data.get("f")
+            if market and value is not None:
+                self.quotes.setdefault(market, {})["x10_price" if name == "x10_markprice" else "x10_funding"] = float(value)
+        elif name == "x10_orderbooks" and msg_type == "SNAPSHOT":
+            data = msg.get("data") or {}
+            market = str(data.get("m", "")).replace("/", "-")
+            if market:
+                self.x10_books[market] = {
+                    side: [[float(r["p"]), float(r["q"])] for r in data.get(key, [])]
+                    for side, key in (("bids", "b"), ("asks", "a"))
+                }
+
+
+def synthetic_workload(symbols: int = 100, depth: int = 20, updates: int = 5000, seed: int = 7) -> Workload:
+    """
+    Seeded stream mix: initial snapshots / prices / funding for every market, then X10 book
+    deltas 40%, Lighter book deltas 30%, X10 mark prices 15%, public
+    trades 8%, X10 funding 5%, Lighter market_stats/all 2%.
+    """
+    rng = random.Random(seed)
+    names = (["BTC-USD", "ETH-USD"] + [f"SYM{i}-USD" for i in range(2, symbols)])[:symbols]
+    state: Dict[str, Dict[str, Any]] = {}
+    for i, symbol in enumerate(names):
+        price = 100.0 * (1 + 0.05 * i)
+        x10_price = price * (1 + rng.uniform(-2e-4, 2e-4))
+        # Every tenth market pays a high rate, so the scan also runs its accept path
+        lighter_funding = 2.5e-3 if i % 10 == 5 else rng.gauss(1e-4, 4e-4)
+        state[symbol] = {
+            "id": i, "price": price, "x10_price": x10_price, "nonce": 1,
+            "lighter_funding": lighter_funding, "x10_funding": rng.gauss(5e-5, 1e-4),
+            "book": _ladder(price, depth, rng), "x10_book": _ladder(x10_price, depth, rng),
+        }
+
+    def lighter_stats(msg_type: str) -> str:
+        return json.dumps({"type": msg_type, "channel": "market_stats:all", "market_stats": {
+            str(st["id"]): {
+                "market_id": st["id"], "symbol": s.split("-")[0], "mark_price": f"{st['price']:.6f}",
+                "index_price": f"{st['price']:.6f}", "last_trade_price": f"{st['price']:.6f}",
+                "funding_rate": f"{st['lighter_funding']:.8f}", "open_interest": "1000000.00",
+            } for s, st in state.items()}})
+
+    def lighter_book(st: Dict[str, Any], msg_type: str, bids, asks) -> str:
+        return json.dumps({"type": msg_type, "channel": f"order_book:{st['id']}", "order_book": {
+            "bids": [{"price": f"{p}", "size": f"{q}"} for p, q in bids],
+            "asks": [{"price": f"{p}", "size": f"{q}"} for p, q in asks],
+            "nonce": st["nonce"], "begin_nonce": st["nonce"] - 1}})
+
+    def x10_book(symbol: str, msg_type: str, bids, asks) -> str:
+        return json.dumps({"type": msg_type, "ts": int(time.time() * 1000), "data": {
+            "m": symbol, "b": [{"p": f"{p}", "q": f"{q}"} for p, q in bids],
+            "a": [{"p": f"{p}", "q": f"{q}"} for p, q in asks]}})
+
+    def changed_levels(book: Dict[str, List[List[float]]]) -> Tuple[List[List[float]], List[List[float]]]:
+        out: Dict[str, List[List[float]]] = {"bids": [], "asks": []}
+        for _ in range(rng.randint(1, 3)):
+            side = rng.choice(("bids", "asks"))
+            level = rng.choice(book[side])
+            level[1] = round(rng.uniform(0.5, 20.0), 4)
+            out[side].append(list(level))
+        return out["bids"], out["asks"]
+
+    frames: List[Frame] = [("lighter", lighter_stats("subscribed/market_stats"))]
+    for symbol, st in state.items():
+        ts = int(time.time() * 1000)
+        frames.append(("x10_markprice", json.dumps(
+            {"type": "MP", "data": {"m": symbol, "p": f"{st['x10_price']:.6f}", "ts": ts}, "ts": ts})))
+        frames.append(("x10_funding", json.dumps(
+            {"data": {"m": symbol, "f": f"{st['x10_funding']:.8f}", "T": ts}, "ts": ts})))
+        frames.append(("lighter", lighter_book(st, "subscribed/order_book", st["book"]["bids"], st["book"]["asks"])))
+        frames.append(("x10_orderbooks", x10_book(symbol, "SNAPSHOT", st["x10_book"]["bids"], st["x10_book"]["asks"])))
+
+    kinds, weights = zip(("x10_book", 40), ("lighter_book", 30), ("x10_markprice", 15),
+                         ("x10_trades", 8), ("x10_funding", 5), ("lighter_stats", 2))
+    for _ in range(updates):
+        kind = rng.choices(kinds, weights)[0]
+        symbol = rng.choice(names)
+        st = state[symbol]
+        ts = int(time.time() * 1000)
+        if kind == "x10_book":
+            frames.append(("x10_orderbooks", x10_book(symbol, "DELTA", *changed_levels(st["x10_book"]))))
+        elif kind == "lighter_book":
+            st["nonce"] += 1
+            frames.append(("lighter", lighter_book(st, "update/order_book", *changed_levels(st["book"]))))
+        elif kind == "x10_markprice":
+            st["x10_price"] *= 1 + rng.gauss(0.0, 1e-4)
+            frames.append(("x10_markprice", json.dumps(
+                {"type": "MP", "data": {"m": symbol, "p": f"{st['x10_price']:.6f}", "ts": ts}, "ts": ts})))
+        elif kind == "x10_trades":
+            frames.append(("x10_trades", json.dumps({"data": [{
+                "i": ts, "m": symbol, "S": rng.choice(("BUY", "SELL")), "tT": "TRADE", "T": ts,
+                "p": f"{st['x10_price']:.6f}", "q": "0.01"}], "ts": ts})))
+        elif kind == "x10_funding":
+            frames.append(("x10_funding", json.dumps(
+                {"data": {"m": symbol, "f": f"{st['x10_funding']:.8f}", "T": ts}, "ts": ts})))
+        else:
+            frames.append(("lighter", lighter_stats("update/market_stats")))
+
+    source = f"synthetic(symbols={symbols}, depth={depth}, updates={updates}, seed={seed})"
+    return Workload.from_frames(frames, source=source, depth=depth)
+
+
+def load_workload(path: str, depth: int = 20) -> Workload:
+    frames: List[Frame] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                frames.append((entry["source"], entry["raw"]))
+    return Workload.from_frames(frames, source=f"recorded({os.path.basename(path)}, {len(frames)} frames)", depth=depth)
+
+
+async def record_workload(path: str, seconds: float = 60.0, lighter_books: int = 10) -> int:
+    """
+    Record the public streams (Lighter market_stats/all + order_book/0..N-1,
+    X10 orderbooks / mark prices / funding / trades) into a workload file.
+    URLs follow the config (LIGHTER_WS_URL / X10_STREAM_BASE_URL overrides).
+    """
+    from src.infrastructure.websocket_manager import ManagedWebSocket, WebSocketManager, WSConfig
+
+    urls = WebSocketManager()
+    streams = {
+        "lighter": urls.LIGHTER_WS_URL,
+        "x10_orderbooks": urls.X10_ORDERBOOK_WS_URL,
+        "x10_markprice": urls.X10_MARKPRICE_WS_URL,
+        "x10_funding": urls.X10_FUNDING_WS_URL,
+        "x10_trades": urls.X10_TRADES_WS_URL,
+    }
+    headers = {"User-Agent": "X10PythonTradingClient/0.4.5"}
+    frames: List[Frame] = []
+
+    def _recorder(name: str):
+        async def _record(source: str, msg: Any) -> None:
+            frames.append((name, json.dumps(msg)))
+        return _record
+
+    connections = []
+    for name, url in streams.items():
+        lighter = name == "lighter"
+        conn = ManagedWebSocket(WSConfig(
+            url=url, name=name, ping_interval=None if lighter else 15.0, ping_timeout=None,
+            json_pong_timeout=120.0, headers=None if lighter else headers,
+        ), _recorder(name))
+        if lighter:
+            await conn.subscribe("market_stats/all")
+            for market_id in range(lighter_books):
+                await conn.subscribe(f"order_book/{market_id}")
+        connections.append(conn)
+
+    await asyncio.gather(*[conn.start() for conn in connections], return_exceptions=True)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await asyncio.gather(*[conn.stop() for conn in connections], return_exceptions=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for name, raw in frames:
+            f.write(json.dumps({"source": name, "raw": raw}) + "\n")
+    logger.info(f"📼 Recorded {len(frames)} frames in {seconds:.0f}s -> {path}")
+    return len(frames)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Benchmark environment
+# ═══════════════════════════════════════════════════════════════
+
+class _ReplayX10:
+    """X10 side of the opportunity scan, served from the workload quotes and books."""
+
+    name = "X10"
+
+    def __init__(self, workload: Workload):
+        self.market_info = {s: {"symbol": s} for s in workload.symbols}
+        self._quotes = workload.quotes
+        self._books = workload.x10_books
+
+    def fetch_mark_price_sync(self, symbol: str) -> Decimal:
+        return safe_decimal(self._quotes.get(symbol, {}).get("x10_price", 0))
+
+    async def fetch_mark_price(self, symbol: str) -> Decimal:
+        return self.fetch_mark_price_sync(symbol)
+
+    async def fetch_funding_rate(self, symbol: str) -> Decimal:
+        return safe_decimal(self._quotes.get(symbol, {}).get("x10_funding", 0))
+
+    async def fetch_orderbook(self, symbol: str, limit: int = 20) -> Dict[str, Any]:
+        book = self._books.get(symbol) or {"bids": [], "asks": []}
+        return {"bids": book["bids"][:limit], "asks": book["asks"][:limit], "timestamp": int(time.time() * 1000)}
+
+    async def refresh_missing_prices(self) -> None:
+        return None
+
+
+class _BenchEnv:
+    """The bot objects the stages run on: WebSocketManager, LighterAdapter, OrderbookProvider."""
+
+    def __init__(self, workload: Workload):
+        from src.adapters.lighter_adapter import LighterAdapter
+        from src.infrastructure.market_registry import get_market_registry, lighter_market_meta
+        from src.infrastructure.orderbook_provider import OrderbookProvider
+        from src.infrastructure.websocket_manager import WebSocketManager
+
+        self.workload = workload
+        self.lighter = LighterAdapter()
+        for symbol, market_id in workload.lighter_ids.items():
+            self.lighter.market_info[symbol] = {
+                "i": market_id, "symbol": symbol, "sd": 4, "pd": 2, "size_decimals": 4, "price_decimals": 2,
+                "tick_size": 0.01, "lot_size": 0.0001, "min_base_amount": 0.0001,
+            }
+        get_market_registry().apply(
+            "lighter", [lighter_market_meta(s, info) for s, info in self.lighter.market_info.items()]
+        )
+        self.x10 = _ReplayX10(workload)
+        self.manager = WebSocketManager()
+        self.manager.set_adapters(None, self.lighter)
+        # No REST: a sequence gap ends the resync immediately instead of hitting the exchange
+        self.provider = OrderbookProvider(
+            lighter_adapter=self.lighter, ws_manager=self.manager, rest_fallback_enabled=False
+        )
+        self.manager._orderbook_provider = self.provider
+
+    def parsed(self, names: Sequence[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        out = []
+        for name, raw in self.workload.frames:
+            if name in names:
+                try:
+                    msg = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(msg, dict):
+                    out.append((name, msg))
+        return out
+
+
+# ═══════════════════════════════════════════════════════════════
+# Stages
+# ═══════════════════════════════════════════════════════════════
+
+async def _bench_ws_decode(env: _BenchEnv, **_) -> _Samples:
+    from src.infrastructure.websocket_manager import ManagedWebSocket, WSConfig
+
+    async def _sink(source: str, msg: Any) -> None:
+        return None
+
+    samples = _Samples("ws_decode")
+    connections: Dict[str, ManagedWebSocket] = {}
+    clock = time.perf_counter_ns
+    for name, raw in env.workload.frames:
+        conn = connections.get(name)
+        if conn is None:
+            conn = connections[name] = ManagedWebSocket(WSConfig(url="ws://benchmark", name=name), _sink)
+        started = clock()
+        await conn._process_single_message(raw)
+        samples.ns.append(clock() - started)
+    samples.detail = f"{len(connections)} streams"
+    return samples
+
+
+async def _bench_lighter_market_stats(env: _BenchEnv, **_) -> _Samples:
+    samples = _Samples("lighter_market_stats")
+    clock = time.perf_counter_ns
+    for _, msg in env.parsed(("lighter",)):
+        if "market_stats" not in str(msg.get("type", "")):
+            continue
+        started = clock()
+        await env.manager._handle_lighter_message(msg)
+        samples.ns.append(clock() - started)
+        samples.items += len(msg.get("market_stats") or ())
+    samples.detail = f"{len(env.lighter._price_cache)} prices cached"
+    return samples
+
+
+async def _bench_lighter_orderbook(env: _BenchEnv, **_) -> _Samples:
+    samples = _Samples("lighter_orderbook")
+    clock = time.perf_counter_ns
+    for _, msg in env.parsed(("lighter",)):
+        if "order_book" not in str(msg.get("type", "")):
+            continue
+        started = clock()
+        await env.manager._handle_lighter_message(msg)
+        samples.ns.append(clock() - started)
+    await asyncio.sleep(0)  # let resync tasks of gapped books finish
+    stats = env.provider._sync_stats
+    samples.detail = f"deltas={stats['deltas']} gaps={stats['gaps']} resyncs={stats['resyncs']}"
+    return samples
+
+
+async def _bench_x10_orderbook(env: _BenchEnv, **_) -> Union[_Samples, StageResult]:
+    try:
+        from src.adapters.x10_adapter import X10Adapter
+    except ImportError as e:
+        return _skip("x10_orderbook", f"X10 SDK not installed ({e.name})")
+
+    # The book handlers only touch the caches; __init__ would build the SDK trading client
+    adapter = X10Adapter.__new__(X10Adapter)
+    adapter.orderbook_cache, adapter._orderbook_cache, adapter._orderbook_cache_time = {}, {}, {}
+    adapter._price_cache, adapter._price_cache_time = {}, {}
+    env.manager.x10_adapter = adapter
+    samples = _Samples("x10_orderbook")
+    clock = time.perf_counter_ns
+    try:
+        for _, msg in env.parsed(("x10_orderbooks",)):
+            started = clock()
+            await env.manager._handle_x10_orderbook(msg)
+            samples.ns.append(clock() - started)
+    finally:
+        env.manager.x10_adapter = None
+    samples.detail = f"{len(adapter.orderbook_cache)} books"
+    return samples
+
+
+async def _bench_x10_orderbook_ingest(env: _BenchEnv, **_) -> _Samples:
+    from src.infrastructure.md_ingest import MarketDataIngestor
+    from src.infrastructure.shm_market_data import SharedMarketTable
+
+    messages = env.parsed(("x10_orderbooks",))
+    table = SharedMarketTable.create(
+        slots=max(64, 2 * len(env.workload.x10_books)), depth=int(getattr(config, "MD_INGEST_DEPTH_LEVELS", 5))
+    )
+    samples = _Samples("x10_orderbook_ingest")
+    clock = time.perf_counter_ns
+    try:
+        ingestor = MarketDataIngestor(table)
+        for name, msg in messages:
+            started = clock()
+            await ingestor.handle(name, msg)
+            samples.ns.append(clock() - started)
+        samples.detail = f"{table.used} slots"
+    finally:
+        table.close()
+    return samples
+
+
+async def _bench_price_impact(env: _BenchEnv, **_) -> _Samples:
+    from src.core.orderbook_validator import simulate_price_impact
+
+    samples = _Samples("price_impact")
+    clock = time.perf_counter_ns
+    for symbol in env.workload.symbols:
+        book = env.workload.books[symbol]
+        mid = (book["bids"][0][0] + book["asks"][0][0]) / 2
+        for size in IMPACT_SIZES_USD:
+            for side in ("BUY", "SELL"):
+                started = clock()
+                simulate_price_impact(side=side, order_size_usd=size, bids=book["bids"], asks=book["asks"], mid_price=mid)
+                samples.ns.append(clock() - started)
+    return samples
+
+
+async def _bench_find_opportunities(env: _BenchEnv, scans: int = 20, **_) -> _Samples:
+    from src.core.opportunities import find_opportunities
+
+    workload, lighter = env.workload, env.lighter
+    samples = _Samples("find_opportunities")
+    clock = time.perf_counter_ns
+    found = 0
+    for _ in range(scans):
+        # Same caches the WS / REST feeds fill (books stay younger than the 2s cache TTL)
+        for symbol in workload.symbols:
+            quote = workload.quotes[symbol]
+            lighter._funding_cache[symbol] = quote["lighter_funding"]
+            book = workload.books[symbol]
+            await lighter.handle_orderbook_snapshot(symbol, book["bids"], book["asks"])
+            lighter._price_cache[symbol] = quote["lighter_price"]
+        started = clock()
+        opportunities = await find_opportunities(lighter, env.x10, set(), is_farm_mode=False)
+        samples.ns.append(clock() - started)
+        samples.items += len(workload.symbols)
+        found = len(opportunities)
+    samples.detail = f"{len(workload.symbols)} symbols, {found} opportunities"
+    return samples
+
+
+async def _bench_db_flush(env: _BenchEnv, db_batches: int = 50, **_) -> _Samples:
+    from src.infrastructure.database import AsyncDatabase, DBConfig, WriteOperation
+
+    sql = (
+        "INSERT OR REPLACE INTO funding_rate_history "
+        "(symbol, rate_lighter, rate_x10, timestamp, ob_imbalance, oi_velocity) VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    symbols = env.workload.symbols or ["BTC-USD"]
+    samples = _Samples("db_flush")
+    clock = time.perf_counter_ns
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AsyncDatabase(DBConfig(
+            db_path=os.path.join(tmp, "benchmark.db"), pool_size=1, maintenance_enabled=False,
+        ))
+        await db.initialize()
+        try:
+            batch_size = db.config.write_batch_size
+            now_ms = int(time.time() * 1000)
+            for b in range(db_batches):
+                batch = []
+                for k in range(batch_size):
+                    symbol = symbols[(b * batch_size + k) % len(symbols)]
+                    quote = env.workload.quotes.get(symbol, {})
+                    batch.append(WriteOperation(sql, (
+                        symbol, quote.get("lighter_funding", 0.0), quote.get("x10_funding", 0.0),
+                        now_ms + b * batch_size + k, 0.0, 0.0,
+                    )))
+                started = clock()
+                await db._flush_batch(batch)
+                samples.ns.append(clock() - started)
+                samples.items += len(batch)
+            samples.detail = f"{batch_size} rows/batch"
+        finally:
+            await db.close()
+    return samples
+
+
+def _skip(name: str, reason: str) -> StageResult:
+    return StageResult(name=name, skipped=reason)
+
+
+_STAGE_FUNCS = {
+    "ws_decode": _bench_ws_decode,
+    "lighter_market_stats": _bench_lighter_market_stats,
+    "lighter_orderbook": _bench_lighter_orderbook,
+    "x10_orderbook": _bench_x10_orderbook,
+    "x10_orderbook_ingest": _bench_x10_orderbook_ingest,
+    "price_impact": _bench_price_impact,
+    "find_opportunities": _bench_find_opportunities,
+    "db_flush": _bench_db_flush,
+}
+
+
+async def run_benchmarks(
+    workload: Workload,
+    stages: Optional[Sequence[str]] = None,
+    scans: int = 20,
+    db_batches: int = 50,
+) -> List[StageResult]:
+    """Run the selected stages (default: all) in order on one environment."""
+    env = _BenchEnv(workload)
+    results: List[StageResult] = []
+    for name in stages or STAGES:
+        func = _STAGE_FUNCS.get(name)
+        if func is None:
+            raise ValueError(f"Unknown benchmark stage: {name} (known: {', '.join(STAGES)})")
+        try:
+            outcome = await func(env, scans=scans, db_batches=db_batches)
+        except Exception as e:
+            logger.exception(f"Benchmark stage {name} failed")
+            outcome = _skip(name, f"failed: {e}")
+        results.append(outcome.result() if isinstance(outcome, _Samples) else outcome)
+    return results
+
+
+# ═══════════════════════════════════════════════════════════════
+# Baseline
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class Comparison:
+    stage: str
+    metric: str
+    baseline: float
+    current: float
+    change: float       # relative, positive = worse
+    regression: bool
+
+
+_COMPARED = (("p50_us", False), ("p99_us", False), ("items_per_sec", True))  # (metric, higher is better)
+
+
+def baseline_payload(results: Sequence[StageResult], workload: Workload) -> Dict[str, Any]:
+    return {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workload": workload.source,
+        "stages": {r.name: r.to_dict() for r in results if not r.skipped},
+    }
+
+
+def save_baseline(path: str, results: Sequence[StageResult], workload: Workload) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline_payload(results, workload), f, indent=2)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        logger.warning(f"Benchmark baseline {path} has version {data.get('version')}, expected {BASELINE_VERSION}")
+        return None
+    return data
+
+
+def compare_to_baseline(
+    results: Sequence[StageResult],
+    baseline: Dict[str, Any],
+    tolerance: Optional[float] = None,
+) -> List[Comparison]:
+    if tolerance is None:
+        tolerance = float(getattr(config, "BENCHMARK_REGRESSION_TOLERANCE", 0.25))
+    comparisons = []
+    stages = baseline.get("stages", {})
+    for result in results:
+        base = stages.get(result.name)
+        if result.skipped or not base:
+            continue
+        current = result.to_dict()
+        for metric, higher_is_better in _COMPARED:
+            old, new = float(base.get(metric, 0.0)), float(current[metric])
+            if old <= 0:
+                continue
+            change = (1 - new / old) if higher_is_better else (new / old - 1)
+            comparisons.append(Comparison(result.name, metric, old, new, change, change > tolerance))
+    return comparisons
+
+
+def format_report(
+    results: Sequence[StageResult],
+    comparisons: Optional[Sequence[Comparison]] = None,
+    workload: Optional[Workload] = None,
+    baseline: Optional[Dict[str, Any]] = None,
+) -> str:
+    lines = []
+    if workload is not None:
+        lines.append(f"Workload: {workload.source} - {len(workload.frames)} frames, {len(workload.symbols)} symbols")
+    lines.append(f"{'stage':<22}{'ops':>8}{'items/s':>12}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}  detail")
+    for r in results:
+        if r.skipped:
+            lines.append(f"{r.name:<22}{'-':>8}{'':>12}{'':>10}{'':>10}{'':>10}  skipped: {r.skipped}")
+            continue
+        lines.append(
+            f"{r.name:<22}{r.ops:>8}{r.items_per_sec:>12,.0f}{r.p50_us:>10.1f}{r.p99_us:>10.1f}{r.max_us:>10.1f}  {r.detail}"
+        )
+    if comparisons is not None:
+        if baseline is not None:
+            lines.append(f"\nBaseline: {baseline.get('created')} ({baseline.get('workload')})")
+            if workload is not None and baseline.get("workload") != workload.source:
+                lines.append("⚠️ Baseline was recorded with a different workload")
+        for c in comparisons:
+            flag = "REGRESSION" if c.regression else ""
+            lines.append(f"  {c.stage:<22}{c.metric:<15}{c.baseline:>12.1f} -> {c.current:>12.1f}  {c.change * 100:+6.1f}%  {flag}")
+        regressions = [c for c in comparisons if c.regression]
+        lines.append(f"{len(regressions)} regression(s)" if regressions else "No regressions")
+    return "\n".join(lines)
@@ -58,6 +58,91 @@ sqlite3.register_converter("DECIMAL", _convert_decimal)
 logger.debug("✅ Decimal adapter registered for SQLite")
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# ROLLUPS (pre-aggregated PnL / funding per symbol per hour/day/all-time)
+# ═══════════════════════════════════════════════════════════════════════════════
+# Maintained by triggers on trades (close, settled PnL) and funding_payments (insert), so the
+# dashboard reads single rows / index ranges instead of scanning history.
+# Every event updates (hour, day, all) x (symbol, '*').
+
+ROLLUP_ALL_SYMBOLS = '*'
+ROLLUP_BUCKETS = ('hour', 'day', 'all')
+
+
+def _rollup_keys(ts_expr: str, symbol_expr: str) -> List[Tuple[str, str, str]]:
+    """(bucket, bucket_start SQL, symbol SQL) for every rollup row touched by one event"""
+    starts = {
+        'hour': f"(({ts_expr}) / 3600000) * 3600000",
+        'day': f"(({ts_expr}) / 86400000) * 86400000",
+        'all': "0",
+    }
+    return [
+        (bucket, starts[bucket], sym)
+        for bucket in ROLLUP_BUCKETS
+        for sym in (symbol_expr, f"'{ROLLUP_ALL_SYMBOLS}'")
+    ]
+
+
+# Columns derived from one closed trade row (prefix 'NEW.' in triggers, '' in backfill)
+def _pnl_rollup_values(r: str) -> Dict[str, str]:
+    hold = f"MAX(COALESCE({r}closed_at, 0) - COALESCE({r}created_at, 0), 0)"
+    return {
+        'trades': "1",
+        'wins': f"CASE WHEN COALESCE({r}pnl, 0) > 0 THEN 1 ELSE 0 END",
+        'losses': f"CASE WHEN COALESCE({r}pnl, 0) < 0 THEN 1 ELSE 0 END",
+        'realized_pnl': f"COALESCE({r}pnl, 0)",
+        'funding': f"COALESCE({r}funding_collected, 0)",
+        'fees': f"COALESCE({r}fees, 0)",
+        'hold_ms_total': hold,
+        'hold_lt_1h': f"CASE WHEN {hold} < 3600000 THEN 1 ELSE 0 END",
+        'hold_1h_8h': f"CASE WHEN {hold} >= 3600000 AND {hold} < 28800000 THEN 1 ELSE 0 END",
+        'hold_8h_24h': f"CASE WHEN {hold} >= 28800000 AND {hold} < 86400000 THEN 1 ELSE 0 END",
+        'hold_gt_24h': f"CASE WHEN {hold} >= 86400000 THEN 1 ELSE 0 END",
+    }
+
+
+# Correction of an already closed trade (PnL settlement): NEW minus OLD, trade not counted again
+def _pnl_rollup_delta_values() -> Dict[str, str]:
+    values = {col: "0" for col in _pnl_rollup_values("NEW.")}
+    new, old = _pnl_rollup_values("NEW."), _pnl_rollup_values("OLD.")
+    for col in ('wins', 'losses', 'realized_pnl', 'funding', 'fees'):
+        values[col] = f"({new[col]}) - ({old[col]})"
+    return values
+
+
+def _funding_rollup_values(r: str) -> Dict[str, str]:
+    return {
+        'payments': "1",
+        'amount': f"{r}amount",
+        'amount_x10': f"CASE WHEN {r}exchange = 'X10' THEN {r}amount ELSE 0 END",
+        'amount_lighter': f"CASE WHEN {r}exchange = 'LIGHTER' THEN {r}amount ELSE 0 END",
+    }
+
+
+def _rollup_upserts(table: str, ts_expr: str, symbol_expr: str, values: Dict[str, str], source: str = "") -> List[str]:
+    """
+    UPSERT statements for one event (trigger body) or, with a FROM source,
+    aggregated backfill statements (GROUP BY bucket key).
+    """
+    cols = list(values)
+    stmts = []
+    for bucket, start, sym in _rollup_keys(ts_expr, symbol_expr):
+        if source:
+            select_vals = ", ".join(f"SUM({values[c]})" for c in cols)
+            select = (
+                f"SELECT '{bucket}', {start}, {sym}, {select_vals} {source} "
+                f"GROUP BY 1, 2, 3"
+            )
+        else:
+            select = f"SELECT '{bucket}', {start}, {sym}, " + ", ".join(values[c] for c in cols) + " WHERE 1"
+        updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in cols)
+        stmts.append(
+            f"INSERT INTO {table} (bucket, bucket_start, symbol, {', '.join(cols)}) {select} "
+            f"ON CONFLICT(bucket, symbol, bucket_start) DO UPDATE SET {updates}"
+        )
+    return stmts
+
+
 @dataclass
 class DBConfig:
     """Database configuration"""
@@ -68,8 +153,9 @@ class DBConfig:
     write_flush_interval: float = 1.0     # Seconds between flushes
     busy_timeout_ms: int = 30000          # SQLite busy timeout
     wal_mode: bool = True                 # Write-Ahead Logging
-    maintenance_interval_hours: int = 24  # Run VACUUM every 24h
-    history_retention_days: int = 30      # Delete trades > 30 days
+    maintenance_interval_hours: int = 24  # Integrity check every 24h
+    maintenance_enabled: bool = True      # False: no startup maintenance (scratch / benchmark DBs)
+    history_retention_days: int = 30      # Default retention for log/history tables
 
 
 @dataclass 
@@ -79,6 +165,8 @@ class WriteOperation:
     params: Tuple = field(default_factory=tuple)
     callback: Optional[asyncio.Future] = None
     timestamp: float = field(default_factory=time.monotonic)
+    many: bool = False                    # params is a list of tuples (executemany)
+    script: bool = False                  # sql runs via executescript() (stepped to completion)
 
 
 class AsyncDatabase:
@@ -144,6 +232,11 @@ class AsyncDatabase:
         # Create write connection
         self._write_conn = await self._create_connection(readonly=False)
         
+        # Freed pages are returned to the OS in paced steps by the maintenance task
+        # (must be set before journal_mode writes the file header)
+        if getattr(config, "DB_AUTO_VACUUM_INCREMENTAL", True):
+            await self._ensure_incremental_auto_vacuum()
+
         # Enable WAL mode for better concurrency
         if self.config. wal_mode:
             await self._write_conn.execute("PRAGMA journal_mode=WAL")
@@ -166,68 +259,59 @@ class AsyncDatabase:
         # before trading starts (2025-12-17 Audit Fix)
         await self.run_maintenance()
 
+    async def _ensure_incremental_auto_vacuum(self):
+        """Switch the file to auto_vacuum=INCREMENTAL (needs one VACUUM on existing files)"""
+        async with self._write_conn.execute("PRAGMA auto_vacuum") as cursor:
+            row = await cursor.fetchone()
+        if row and row[0] == 2:
+            return
+        await self._write_conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        async with self._write_conn.execute("PRAGMA auto_vacuum") as cursor:
+            row = await cursor.fetchone()
+        if row and row[0] != 2:
+            # Existing file: one-time conversion before the writer starts,
+            # afterwards only incremental_vacuum steps run
+            logger.info("🧹 Converting database to auto_vacuum=INCREMENTAL (one-time VACUUM)...")
+            await self._write_conn.execute("VACUUM")
+        logger.info("✅ auto_vacuum=INCREMENTAL")
+
     async def run_maintenance(self):
-        """Run database maintenance (VACUUM & Cleanup)"""
+        """Startup integrity check (quarantine on corruption); later checks run in db_maintenance_loop()"""
         if not getattr(config, "DB_MAINTENANCE_ENABLED", True):
             logger.debug("Database maintenance disabled by config.DB_MAINTENANCE_ENABLED=False")
             return
+        if not self.config.maintenance_enabled:
+            return
         if not self._write_conn:
             return
 
-        try:
-            # Check last maintenance time
-            async with self._write_conn.execute(
-                "SELECT timestamp FROM maintenance_log WHERE action='VACUUM' ORDER BY id DESC LIMIT 1"
-            ) as cursor:
-                row = await cursor.fetchone()
-                last_run = row['timestamp'] if row else 0
-
-            # Default: 24h interval
-            interval = getattr(self.config, 'maintenance_interval_hours', 24) * 3600
-            now = int(time.time())
-
-            if now - last_run > interval:
-                logger.info("🧹 Running database maintenance...")
-                
-                # 1. Integrity Check
-                async with self._write_conn.execute("PRAGMA integrity_check") as cursor:
-                    check_result = await cursor.fetchone()
-                    if check_result and check_result[0] != "ok":
-                        logger.error(f"🚨 DATABASE CORRUPT: {check_result[0]}")
-                        # Quarantine corrupted DB
-                        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        corrupt_path = f"{self.config.db_path}.corrupt_{ts}"
-                        logger.warning(f"☣️ Quarantining corrupted DB to {corrupt_path}")
-                        
-                        # Close connections (this will be messy since we are in a loop, but necessary)
-                        await self._write_conn.close()
-                        for conn in self._read_pool:
-                            await conn.close()
-                            
-                        shutil.move(self.config.db_path, corrupt_path)
-                        logger.info("♻️ Corrupted DB moved. Bot will recreate DB on next init.")
-                        # Force exit to allow clean restart
-                        os._exit(1)
-                        return
-
-                # 2. VACUUM (Reclaim space)
-                logger.info("🧹 Executing VACUUM (Integrity OK)...")
-                await self._write_conn.execute("VACUUM")
-                
-                # 2. Log action
-                retention_days = getattr(self.config, 'history_retention_days', 30)
-                await self._write_conn.execute(
-                    "INSERT INTO maintenance_log (action, timestamp, details) VALUES (?, ?, ?)",
-                    ("VACUUM", now, f"VACUUM executed. Retention: {retention_days} days")
-                )
-                await self._write_conn.commit()
-                logger.info("✅ Database maintenance complete")
-            else:
-                logger.debug(f"Maintenance not due (Last: {int((now-last_run)/3600)}h ago)")
+        from src.infrastructure.db_maintenance import DatabaseMaintenance
 
+        try:
+            problem = await DatabaseMaintenance(self).check_integrity()
+            if problem:
+                await self.quarantine_corrupt(problem)
         except Exception as e:
             logger.error(f"Database maintenance failed: {e}")
 
+    async def quarantine_corrupt(self, problem: str):
+        """Move a corrupt database file aside and exit (the bot recreates it on restart)"""
+        logger.error(f"🚨 DATABASE CORRUPT: {problem}")
+        # Quarantine corrupted DB
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        corrupt_path = f"{self.config.db_path}.corrupt_{ts}"
+        logger.warning(f"☣️ Quarantining corrupted DB to {corrupt_path}")
+
+        # Close connections (this will be messy since we are in a loop, but necessary)
+        await self._write_conn.close()
+        for conn in self._read_pool:
+            await conn.close()
+
+        shutil.move(self.config.db_path, corrupt_path)
+        logger.info("♻️ Corrupted DB moved. Bot will recreate DB on next init.")
+        # Force exit to allow clean restart
+        os._exit(1)
+
     async def _create_connection(self, readonly: bool = False) -> aiosqlite.Connection:
         """Create a new database connection"""
         # aiosqlite doesn't support readonly directly, but we can use it for pool management
@@ -373,19 +457,115 @@ class AsyncDatabase:
                 details TEXT
             )
             """,
+            
+            # Migration 10: Raw funding payments (deduplicated per exchange payment id)
+            """
+            CREATE TABLE IF NOT EXISTS funding_payments (
+                exchange TEXT NOT NULL,
+                payment_id TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                amount REAL NOT NULL,
+                rate REAL DEFAULT 0,
+                paid_time INTEGER NOT NULL,
+                PRIMARY KEY (exchange, payment_id)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_fp_symbol_ts 
+            ON funding_payments(symbol, paid_time)
+            """,
+            
+            # Migration 10b: Timestamp indexes for chunked retention pruning
+            """
+            CREATE INDEX IF NOT EXISTS idx_exec_ts ON execution_log(timestamp)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_funding_ts ON funding_history(timestamp)
+            """,
+            
+            # Migration 11: Trade fees + PnL/funding rollups (maintained by triggers)
+            """
+            ALTER TABLE trades ADD COLUMN fees REAL DEFAULT 0
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS pnl_rollups (
+                bucket TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                trades INTEGER NOT NULL DEFAULT 0,
+                wins INTEGER NOT NULL DEFAULT 0,
+                losses INTEGER NOT NULL DEFAULT 0,
+                realized_pnl REAL NOT NULL DEFAULT 0,
+                funding REAL NOT NULL DEFAULT 0,
+                fees REAL NOT NULL DEFAULT 0,
+                hold_ms_total INTEGER NOT NULL DEFAULT 0,
+                hold_lt_1h INTEGER NOT NULL DEFAULT 0,
+                hold_1h_8h INTEGER NOT NULL DEFAULT 0,
+                hold_8h_24h INTEGER NOT NULL DEFAULT 0,
+                hold_gt_24h INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket, symbol, bucket_start)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS funding_rollups (
+                bucket TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                payments INTEGER NOT NULL DEFAULT 0,
+                amount REAL NOT NULL DEFAULT 0,
+                amount_x10 REAL NOT NULL DEFAULT 0,
+                amount_lighter REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket, symbol, bucket_start)
+            ) WITHOUT ROWID
+            """,
+            "CREATE TRIGGER IF NOT EXISTS trg_trades_close_rollup "
+            "AFTER UPDATE OF status ON trades "
+            "WHEN NEW.status = 'closed' AND OLD.status != 'closed' BEGIN "
+            + "; ".join(_rollup_upserts("pnl_rollups", "NEW.closed_at", "NEW.symbol", _pnl_rollup_values("NEW.")))
+            + "; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_trades_settle_rollup "
+            "AFTER UPDATE OF pnl, funding_collected, fees ON trades "
+            "WHEN OLD.status = 'closed' AND NEW.status = 'closed' BEGIN "
+            + "; ".join(_rollup_upserts("pnl_rollups", "NEW.closed_at", "NEW.symbol", _pnl_rollup_delta_values()))
+            + "; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_funding_payments_rollup "
+            "AFTER INSERT ON funding_payments BEGIN "
+            + "; ".join(_rollup_upserts("funding_rollups", "NEW.paid_time", "NEW.symbol", _funding_rollup_values("NEW.")))
+            + "; END",
         ]
         
         for i, sql in enumerate(migrations):
             try:
                 await self._write_conn.execute(sql)
             except Exception as e:
-                # Ignore "already exists" errors
-                if "already exists" not in str(e). lower():
+                # Ignore "already exists" / "duplicate column" errors
+                msg = str(e).lower()
+                if "already exists" not in msg and "duplicate column" not in msg:
                     logger.warning(f"Migration {i+1} warning: {e}")
                     
         await self._write_conn.commit()
+        await self._backfill_rollups()
         logger.info(f"✅ Migrations complete ({len(migrations)} statements)")
 
+    async def _backfill_rollups(self):
+        """Seed empty rollup tables from existing history (one-time, on upgrade)"""
+        backfills = (
+            ("pnl_rollups", "closed_at", _pnl_rollup_values(""),
+             "FROM trades WHERE status = 'closed' AND closed_at IS NOT NULL"),
+            ("funding_rollups", "paid_time", _funding_rollup_values(""),
+             "FROM funding_payments WHERE 1"),
+        )
+        for table, ts_col, values, source in backfills:
+            try:
+                async with self._write_conn.execute(f"SELECT 1 FROM {table} LIMIT 1") as cursor:
+                    if await cursor.fetchone():
+                        continue
+                for sql in _rollup_upserts(table, ts_col, "symbol", values, source=source):
+                    await self._write_conn.execute(sql)
+                await self._write_conn.commit()
+            except Exception as e:
+                logger.warning(f"Rollup backfill for {table} failed: {e}")
+
     @asynccontextmanager
     async def read_connection(self):
         """Get a read connection from the pool"""
@@ -490,11 +670,53 @@ class AsyncDatabase:
     async def execute_many(
         self, 
         sql: str, 
-        params_list: List[Tuple]
-    ):
-        """Execute multiple write operations as a batch"""
-        for params in params_list:
-            await self.execute(sql, params, wait=False)
+        params_list: List[Tuple],
+        wait: bool = False
+    ) -> Optional[int]:
+        """
+        Execute one statement for many parameter tuples.
+        
+        Queued as a single write operation and run via executemany() on the
+        write connection, so N rows cost one queue slot and one statement
+        preparation instead of N.
+        
+        Returns:
+            rowcount if wait=True, else None
+        """
+        if not params_list:
+            return 0 if wait else None
+        if self._shutdown:
+            raise RuntimeError("Database is shutting down")
+        
+        future = asyncio.get_running_loop().create_future() if wait else None
+        
+        await self._write_queue.put(WriteOperation(
+            sql=sql,
+            params=list(params_list),
+            callback=future,
+            many=True
+        ))
+
+        if wait and future:
+            return await future
+        return None
+
+    async def execute_script(self, sql: str, wait: bool = False) -> None:
+        """
+        Queue a statement that must be stepped to completion on the write
+        connection (e.g. PRAGMA incremental_vacuum, which execute() would
+        only advance by a single page).
+
+        Note: executescript() commits the transaction of the current batch first.
+        """
+        if self._shutdown:
+            raise RuntimeError("Database is shutting down")
+
+        future = asyncio.get_running_loop().create_future() if wait else None
+        await self._write_queue.put(WriteOperation(sql=sql, callback=future, script=True))
+
+        if wait and future:
+            await future
 
     async def _write_loop(self):
         """Background task that batches and commits writes - OPTIMIZED for non-blocking operation"""
@@ -565,10 +787,18 @@ class AsyncDatabase:
         try:
             for op in batch:
                 try:
-                    cursor = await self._write_conn.execute(op.sql, op.params)
+                    if op.many:
+                        cursor = await self._write_conn.executemany(op.sql, op.params)
+                        result = cursor.rowcount
+                    elif op.script:
+                        await self._write_conn.executescript(op.sql)
+                        result = None
+                    else:
+                        cursor = await self._write_conn.execute(op.sql, op.params)
+                        result = cursor.lastrowid
                     
                     if op. callback and not op.callback.done():
-                        op.callback.set_result(cursor.lastrowid)
+                        op.callback.set_result(result)
                         
                 except Exception as e:
                     logger.error(f"Write error: {e} | SQL: {op.sql[:100]}")
@@ -693,9 +923,10 @@ class TradeRepository:
         self, 
         symbol: str, 
         pnl: float = 0, 
-        funding_collected: float = 0
+        funding_collected: float = 0,
+        fees: float = 0
     ):
-        """Mark a trade as closed with PnL values"""
+        """Mark a trade as closed with PnL values (rollups are updated by trigger)"""
         # ✅ FIX: Enhanced logging to verify PnL values reach the database
         logger.info(f"📝 DB close_trade({symbol}): PnL=${pnl:.4f}, Funding=${funding_collected:.4f}")
         
@@ -704,17 +935,42 @@ class TradeRepository:
             SET status = 'closed', 
                 closed_at = ?, 
                 pnl = ?,
-                funding_collected = ?
+                funding_collected = ?,
+                fees = ?
             WHERE symbol = ? AND status IN ('open','pending')
         """
         result = await self.db.execute(
             sql, 
-            (int(time.time() * 1000), pnl, funding_collected, symbol),
+            (int(time.time() * 1000), pnl, funding_collected, fees or 0, symbol),
             wait=True
         )
         
         logger.debug(f"📝 DB close_trade({symbol}): Execute returned {result}")
 
+    async def settle_closed_trade(
+        self,
+        symbol: str,
+        pnl: float,
+        funding_collected: float,
+        fees: float,
+        closed_before_ms: Optional[int] = None,
+    ) -> bool:
+        """
+        Replace the provisional PnL of a closed trade (rollups get the delta by trigger).
+        closed_before_ms guards against a newer close of the same symbol.
+        """
+        sql = """
+            UPDATE trades
+            SET pnl = ?, funding_collected = ?, fees = ?
+            WHERE symbol = ? AND status = 'closed' AND closed_at <= ?
+        """
+        closed_before = closed_before_ms if closed_before_ms is not None else int(time.time() * 1000)
+        # execute_many() returns the rowcount
+        count = await self.db.execute_many(
+            sql, [(pnl, funding_collected, fees or 0, symbol, closed_before)], wait=True
+        )
+        return bool(count)
+
     async def update_trade_funding(self, symbol: str, funding_amount: float):
         """Update funding collected for a trade"""
         sql = """
@@ -743,6 +999,7 @@ class TradeRepository:
             "closed_at",
             "pnl",
             "funding_collected",
+            "fees",
         }
 
         set_cols = []
@@ -892,6 +1149,178 @@ class FundingRepository:
         """
         return await self.db.fetch_all(sql, (symbol, cutoff))
 
+    async def add_funding_payments(self, payments: List[Dict[str, Any]]) -> None:
+        """
+        Bulk-insert raw funding payments.
+        
+        Rows are keyed by (exchange, payment_id); payments that were already
+        stored are ignored, so overlapping fetch windows are harmless.
+        """
+        if not payments:
+            return
+        sql = """
+            INSERT OR IGNORE INTO funding_payments
+            (exchange, payment_id, symbol, amount, rate, paid_time)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+        await self.db.execute_many(sql, [
+            (
+                p['exchange'], str(p['payment_id']), p['symbol'],
+                float(p['amount']), float(p.get('rate', 0) or 0), int(p['paid_time'])
+            )
+            for p in payments
+        ])
+
+    async def get_payment_ids_since(self, exchange: str, since_ms: int) -> Dict[str, int]:
+        """Get {payment_id: paid_time} for an exchange since a timestamp (ms)"""
+        rows = await self.db.fetch_all(
+            "SELECT payment_id, paid_time FROM funding_payments WHERE exchange = ? AND paid_time >= ?",
+            (exchange, since_ms)
+        )
+        return {r['payment_id']: r['paid_time'] for r in rows}
+
+    async def get_funding_cursor(self, exchange: str) -> Optional[Dict[str, Any]]:
+        """Get the persisted funding high-water mark for an exchange"""
+        row = await self.db.fetch_one(
+            "SELECT value FROM bot_state WHERE key = ?",
+            (f"funding_cursor:{exchange}",)
+        )
+        if not row:
+            return None
+        try:
+            return json.loads(row['value'])
+        except (TypeError, ValueError):
+            return None
+
+    async def save_funding_cursor(
+        self,
+        exchange: str,
+        last_paid_time: int,
+        last_payment_id: Optional[str] = None
+    ) -> None:
+        """Persist the funding high-water mark for an exchange"""
+        value = json.dumps({"last_paid_time": int(last_paid_time), "last_payment_id": last_payment_id})
+        await self.db.execute(
+            "INSERT OR REPLACE INTO bot_state (key, value, updated_at) VALUES (?, ?, ?)",
+            (f"funding_cursor:{exchange}", value, int(time.time() * 1000))
+        )
+
+
+class RollupRepository:
+    """
+    Read side of the PnL / funding rollups.
+    
+    All queries hit the (bucket, symbol, bucket_start) primary key, so cost
+    depends on the page size, not on the amount of history. Pagination is
+    keyset-based: pass the returned next_cursor to get the following page.
+    """
+    
+    MAX_PAGE_SIZE = 500
+    
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+
+    @classmethod
+    def _page_size(cls, limit: int) -> int:
+        return max(1, min(int(limit or 100), cls.MAX_PAGE_SIZE))
+
+    @staticmethod
+    def _with_derived(row: Dict[str, Any]) -> Dict[str, Any]:
+        trades = row.get('trades') or 0
+        row['win_rate'] = (row['wins'] / trades) if trades else 0.0
+        row['avg_hold_hours'] = (row['hold_ms_total'] / trades / 3_600_000) if trades else 0.0
+        return row
+
+    async def get_pnl_summary(self, symbol: str = ROLLUP_ALL_SYMBOLS) -> Dict[str, Any]:
+        """All-time totals (single row) incl. win rate and hold time distribution"""
+        row = await self.db.fetch_one(
+            "SELECT * FROM pnl_rollups WHERE bucket = 'all' AND symbol = ? AND bucket_start = 0",
+            (symbol,)
+        )
+        funding = await self.db.fetch_one(
+            "SELECT payments, amount, amount_x10, amount_lighter FROM funding_rollups "
+            "WHERE bucket = 'all' AND symbol = ? AND bucket_start = 0",
+            (symbol,)
+        )
+        summary = self._with_derived(row) if row else {
+            'symbol': symbol, 'trades': 0, 'wins': 0, 'losses': 0,
+            'realized_pnl': 0.0, 'funding': 0.0, 'fees': 0.0, 'hold_ms_total': 0,
+            'hold_lt_1h': 0, 'hold_1h_8h': 0, 'hold_8h_24h': 0, 'hold_gt_24h': 0,
+            'win_rate': 0.0, 'avg_hold_hours': 0.0,
+        }
+        summary['funding_payments'] = dict(funding) if funding else {
+            'payments': 0, 'amount': 0.0, 'amount_x10': 0.0, 'amount_lighter': 0.0,
+        }
+        return summary
+
+    async def _get_series(
+        self,
+        table: str,
+        bucket: str,
+        symbol: str,
+        limit: int,
+        cursor: Optional[int],
+    ) -> Dict[str, Any]:
+        if bucket not in ('hour', 'day'):
+            raise ValueError(f"Unknown rollup bucket: {bucket}")
+        size = self._page_size(limit)
+        params: Tuple = (bucket, symbol)
+        where = "bucket = ? AND symbol = ?"
+        if cursor is not None:
+            where += " AND bucket_start < ?"
+            params += (int(cursor),)
+        rows = await self.db.fetch_all(
+            f"SELECT * FROM {table} WHERE {where} ORDER BY bucket_start DESC LIMIT ?",
+            params + (size + 1,)
+        )
+        more = len(rows) > size
+        rows = rows[:size]
+        return {
+            'items': rows,
+            'next_cursor': rows[-1]['bucket_start'] if more else None,
+        }
+
+    async def get_pnl_series(
+        self,
+        bucket: str = 'day',
+        symbol: str = ROLLUP_ALL_SYMBOLS,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """PnL rollups per hour/day, newest first"""
+        page = await self._get_series("pnl_rollups", bucket, symbol, limit, cursor)
+        page['items'] = [self._with_derived(r) for r in page['items']]
+        return page
+
+    async def get_funding_series(
+        self,
+        bucket: str = 'day',
+        symbol: str = ROLLUP_ALL_SYMBOLS,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Funding payment rollups per hour/day, newest first"""
+        return await self._get_series("funding_rollups", bucket, symbol, limit, cursor)
+
+    async def get_symbol_totals(self, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """All-time PnL totals per symbol, ordered by symbol"""
+        size = self._page_size(limit)
+        params: Tuple = (ROLLUP_ALL_SYMBOLS,)
+        where = "bucket = 'all' AND symbol != ?"
+        if cursor:
+            where += " AND symbol > ?"
+            params += (cursor,)
+        rows = await self.db.fetch_all(
+            f"SELECT * FROM pnl_rollups WHERE {where} ORDER BY symbol LIMIT ?",
+            params + (size + 1,)
+        )
+        more = len(rows) > size
+        rows = [self._with_derived(r) for r in rows[:size]]
+        return {
+            'items': rows,
+            'next_cursor': rows[-1]['symbol'] if more else None,
+        }
+
 
 class ExecutionLogRepository:
     """Repository for execution logging"""
@@ -945,6 +1374,7 @@ _db_by_path: Dict[str, AsyncDatabase] = {}
 _trade_repo_by_path: Dict[str, TradeRepository] = {}
 _funding_repo_by_path: Dict[str, FundingRepository] = {}
 _execution_repo_by_path: Dict[str, ExecutionLogRepository] = {}
+_rollup_repo_by_path: Dict[str, RollupRepository] = {}
 _is_shutdown: bool = False  # FIX (2025-12-22): Prevent DB re-init during shutdown
 
 
@@ -1009,6 +1439,17 @@ async def get_execution_repository(db_path: Optional[str] = None) -> ExecutionLo
     return repo
 
 
+async def get_rollup_repository(db_path: Optional[str] = None) -> RollupRepository:
+    """Get or create the rollup repository for a given db_path."""
+    key = _normalize_db_path(db_path)
+    repo = _rollup_repo_by_path.get(key)
+    if repo is None:
+        db = await get_database(db_path=key)
+        repo = RollupRepository(db)
+        _rollup_repo_by_path[key] = repo
+    return repo
+
+
 async def close_database(db_path: Optional[str] = None):
     """Close global database instance(s). If db_path is None, closes all."""
     global _db_by_path, _trade_repo_by_path, _funding_repo_by_path, _execution_repo_by_path, _is_shutdown
@@ -1026,6 +1467,7 @@ async def close_database(db_path: Optional[str] = None):
         _trade_repo_by_path.clear()
         _funding_repo_by_path.clear()
         _execution_repo_by_path.clear()
+        _rollup_repo_by_path.clear()
         return
 
     key = _normalize_db_path(db_path)
@@ -1035,3 +1477,4 @@ async def close_database(db_path: Optional[str] = None):
     _trade_repo_by_path.pop(key, None)
     _funding_repo_by_path.pop(key, None)
     _execution_repo_by_path.pop(key, None)
+    _rollup_repo_by_path.pop(key, None)
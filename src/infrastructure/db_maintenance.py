@@ -0,0 +1,301 @@
+"""
+Database Maintenance - retention, incremental vacuum and online backups
+
+``AsyncDatabase.run_maintenance`` used to run a full ``PRAGMA
+integrity_check`` and a blocking ``VACUUM`` on the single write
+connection, stalling every queued write, and the configured retention was
+never applied. Maintenance now never holds the writer for long:
+
+- integrity: ``PRAGMA quick_check`` on a read connection (WAL readers do
+  not block the writer), every ``maintenance_interval_hours``; a corrupt
+  file is quarantined (``AsyncDatabase.quarantine_corrupt``)
+- retention: rows older than ``DB_RETENTION_DAYS[table]`` are deleted in
+  chunks of ``DB_PRUNE_CHUNK_ROWS`` queued through the write-behind queue,
+  so regular writes interleave between chunks; a chunk slower than
+  ``DB_PRUNE_CHUNK_MAX_MS`` halves the chunk size, and a run stops after
+  ``DB_PRUNE_MAX_SECONDS`` (the backlog continues on the next run)
+- space: the file uses ``auto_vacuum=INCREMENTAL``; freed pages are
+  returned in ``PRAGMA incremental_vacuum(N)`` steps with a pause between
+  steps instead of one full VACUUM
+- backups: ``online_backup()`` copies the live database with the SQLite
+  backup API on its own connection into ``DB_BACKUP_DIR``, verifies the
+  copy with quick_check and keeps the newest ``DB_BACKUP_KEEP`` files
+
+``AsyncDatabase.initialize()`` only runs the integrity check (a corrupt
+file is quarantined before trading starts). ``db_maintenance_loop()`` runs
+all of it, the integrity check included whenever it is due, at startup
+and then every ``DB_MAINTENANCE_INTERVAL_SECONDS`` as a LOW priority
+BotEventLoop task - scratch databases (tests, benchmark) never prune,
+vacuum or write backups.
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import aiosqlite
+
+import config
+from src.infrastructure.database import AsyncDatabase, get_database
+
+logger = logging.getLogger(__name__)
+
+# Tables with an integer millisecond ``timestamp`` column (and an index on it).
+# Only these are pruned; table names are interpolated into SQL.
+PRUNABLE_TABLES = ("execution_log", "funding_history", "pnl_snapshots", "funding_rate_history")
+
+MIN_PRUNE_CHUNK_ROWS = 50
+DAY_MS = 86_400_000
+
+
+async def online_backup(db_path: str, dest_path: str) -> Dict[str, Any]:
+    """
+    Copy a live database with the SQLite backup API and verify the copy.
+
+    The copy runs in a single step on a dedicated connection: one read
+    transaction, so in WAL mode the bot keeps writing. (A stepped copy
+    restarts whenever another connection writes and may never finish.)
+    The file appears at ``dest_path`` only after quick_check passed.
+    """
+    directory = os.path.dirname(dest_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{dest_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    started = time.monotonic()
+    source = await aiosqlite.connect(db_path)
+    # The backup runs on the source connection's thread
+    target = await aiosqlite.connect(tmp_path, check_same_thread=False)
+    try:
+        await source.backup(target)
+        async with target.execute("PRAGMA quick_check") as cursor:
+            row = await cursor.fetchone()
+    finally:
+        await target.close()
+        await source.close()
+
+    check = row[0] if row else "no result"
+    if check != "ok":
+        os.remove(tmp_path)
+        raise RuntimeError(f"Backup verification failed: {check}")
+    os.replace(tmp_path, dest_path)
+    return {
+        "path": dest_path,
+        "bytes": os.path.getsize(dest_path),
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+class DatabaseMaintenance:
+    """Retention, incremental vacuum and backups for one AsyncDatabase."""
+
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+        self.last_run: Dict[str, Any] = {}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Integrity
+    # ═══════════════════════════════════════════════════════════════
+
+    async def check_integrity(self, force: bool = False) -> Optional[str]:
+        """quick_check on a read connection; returns the problem or None if ok / not due."""
+        now = int(time.time())
+        interval = getattr(self.db.config, "maintenance_interval_hours", 24) * 3600
+        # 'VACUUM' rows were written by the previous full-VACUUM maintenance
+        last_run = await self._last_action("INTEGRITY_CHECK", "VACUUM")
+        if not force and now - last_run <= interval:
+            logger.debug(f"Integrity check not due (Last: {int((now - last_run) / 3600)}h ago)")
+            return None
+
+        logger.info("🧹 Running database integrity check (quick_check)...")
+        async with self.db.read_connection() as conn:
+            async with conn.execute("PRAGMA quick_check") as cursor:
+                row = await cursor.fetchone()
+        result = row[0] if row else "ok"
+        if result != "ok":
+            return result
+        await self._log("INTEGRITY_CHECK", "quick_check ok", now)
+        return None
+
+    # ═══════════════════════════════════════════════════════════════
+    # Retention
+    # ═══════════════════════════════════════════════════════════════
+
+    def retention_days(self) -> Dict[str, int]:
+        retention = getattr(config, "DB_RETENTION_DAYS", None)
+        if retention is None:
+            default = getattr(self.db.config, "history_retention_days", 30)
+            retention = {table: default for table in PRUNABLE_TABLES}
+        return {
+            table: int(days) for table, days in retention.items()
+            if table in PRUNABLE_TABLES and days and days > 0
+        }
+
+    async def prune_expired(self, now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Delete expired rows chunk by chunk through the write queue."""
+        now_ms = now_ms or int(time.time() * 1000)
+        chunk = max(MIN_PRUNE_CHUNK_ROWS, int(getattr(config, "DB_PRUNE_CHUNK_ROWS", 500)))
+        max_chunk_ms = float(getattr(config, "DB_PRUNE_CHUNK_MAX_MS", 50.0))
+        pause = float(getattr(config, "DB_PRUNE_PAUSE_SECONDS", 0.05))
+        deadline = time.monotonic() + float(getattr(config, "DB_PRUNE_MAX_SECONDS", 30.0))
+
+        deleted: Dict[str, int] = {}
+        complete = True
+        for table, days in self.retention_days().items():
+            cutoff = now_ms - days * DAY_MS
+            sql = (
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} WHERE timestamp < ? LIMIT ?)"
+            )
+            deleted[table] = 0
+            while True:
+                if time.monotonic() >= deadline:
+                    complete = False
+                    break
+                started = time.monotonic()
+                # execute_many() returns the rowcount (execute() the lastrowid)
+                count = await self.db.execute_many(sql, [(cutoff, chunk)], wait=True) or 0
+                elapsed_ms = (time.monotonic() - started) * 1000
+                deleted[table] += count
+                if count < chunk:
+                    break
+                if elapsed_ms > max_chunk_ms and chunk > MIN_PRUNE_CHUNK_ROWS:
+                    chunk = max(MIN_PRUNE_CHUNK_ROWS, chunk // 2)
+                await asyncio.sleep(pause)
+            if not complete:
+                break
+
+        total = sum(deleted.values())
+        if total:
+            logger.info(f"🧹 Retention: deleted {total} rows {deleted}")
+        if not complete:
+            logger.info("🧹 Retention budget used up - remaining rows follow on the next run")
+        return {"deleted": deleted, "complete": complete}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Incremental vacuum
+    # ═══════════════════════════════════════════════════════════════
+
+    async def incremental_vacuum(self) -> int:
+        """Return free pages to the OS in paced steps; returns pages freed."""
+        if (await self._pragma("auto_vacuum")) != 2:
+            return 0
+        pages = max(1, int(getattr(config, "DB_VACUUM_PAGES_PER_STEP", 256)))
+        min_free = int(getattr(config, "DB_VACUUM_MIN_FREE_PAGES", 1024))
+        pause = float(getattr(config, "DB_PRUNE_PAUSE_SECONDS", 0.05))
+        deadline = time.monotonic() + float(getattr(config, "DB_PRUNE_MAX_SECONDS", 30.0))
+
+        start_free = free = await self._pragma("freelist_count")
+        while free > min_free and time.monotonic() < deadline:
+            await self.db.execute_script(f"PRAGMA incremental_vacuum({pages})", wait=True)
+            remaining = await self._pragma("freelist_count")
+            if remaining >= free:
+                break
+            free = remaining
+            await asyncio.sleep(pause)
+
+        freed = start_free - free
+        if freed > 0:
+            # The file shrinks once the truncation is checkpointed out of the WAL
+            await self.db.execute_script("PRAGMA wal_checkpoint(PASSIVE)", wait=True)
+            logger.info(f"🧹 Incremental vacuum: {freed} pages freed ({free} free pages left)")
+        return freed
+
+    # ═══════════════════════════════════════════════════════════════
+    # Backups
+    # ═══════════════════════════════════════════════════════════════
+
+    def _backup_pattern(self) -> str:
+        stem = os.path.splitext(os.path.basename(self.db.config.db_path))[0]
+        return os.path.join(getattr(config, "DB_BACKUP_DIR", "backups/db"), f"{stem}_*.db")
+
+    async def backup(self, dest_path: Optional[str] = None) -> Dict[str, Any]:
+        """Online backup into DB_BACKUP_DIR (or dest_path), old backups rotated."""
+        if dest_path is None:
+            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+            dest_path = self._backup_pattern().replace("*", ts)
+        result = await online_backup(self.db.config.db_path, dest_path)
+        logger.info(f"💾 Database backup: {result['path']} ({result['bytes'] / 1024 / 1024:.2f} MB in {result['seconds']}s)")
+        await self._log("BACKUP", result["path"])
+
+        keep = int(getattr(config, "DB_BACKUP_KEEP", 7))
+        if keep > 0:
+            for old in sorted(glob.glob(self._backup_pattern()), reverse=True)[keep:]:
+                try:
+                    os.remove(old)
+                except OSError as e:
+                    logger.warning(f"Could not remove old backup {old}: {e}")
+        return result
+
+    async def backup_due(self) -> bool:
+        interval_hours = float(getattr(config, "DB_BACKUP_INTERVAL_HOURS", 24))
+        if interval_hours <= 0:
+            return False
+        return time.time() - await self._last_action("BACKUP") > interval_hours * 3600
+
+    # ═══════════════════════════════════════════════════════════════
+    # Run
+    # ═══════════════════════════════════════════════════════════════
+
+    async def run_once(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        problem = await self.check_integrity()
+        if problem:
+            await self.db.quarantine_corrupt(problem)
+            return {"timestamp": int(time.time()), "integrity": problem}
+        prune = await self.prune_expired()
+        freed = await self.incremental_vacuum()
+        backup = await self.backup() if await self.backup_due() else None
+
+        total = sum(prune["deleted"].values())
+        if total or freed:
+            await self._log("PRUNE", f"deleted={prune['deleted']} pages_freed={freed} complete={prune['complete']}")
+        self.last_run = {
+            "timestamp": int(time.time()),
+            "deleted": prune["deleted"],
+            "prune_complete": prune["complete"],
+            "pages_freed": freed,
+            "backup": backup,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        return self.last_run
+
+    async def _pragma(self, name: str) -> int:
+        row = await self.db.fetch_one(f"PRAGMA {name}")
+        return int(next(iter(row.values()))) if row else 0
+
+    async def _last_action(self, *actions: str) -> int:
+        placeholders = ",".join("?" * len(actions))
+        row = await self.db.fetch_one(
+            f"SELECT MAX(timestamp) AS ts FROM maintenance_log WHERE action IN ({placeholders})",
+            actions,
+        )
+        return int(row["ts"]) if row and row["ts"] else 0
+
+    async def _log(self, action: str, details: str, timestamp: Optional[int] = None) -> None:
+        await self.db.execute(
+            "INSERT INTO maintenance_log (action, timestamp, details) VALUES (?, ?, ?)",
+            (action, timestamp or int(time.time()), details),
+        )
+
+
+async def db_maintenance_loop(db: Optional[AsyncDatabase] = None) -> None:
+    """Maintenance run at startup, then every DB_MAINTENANCE_INTERVAL_SECONDS."""
+    if db is None:
+        db = await get_database()
+    maintenance = DatabaseMaintenance(db)
+    while True:
+        if getattr(config, "DB_MAINTENANCE_ENABLED", True) and db.config.maintenance_enabled:
+            try:
+                await maintenance.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}")
+        await asyncio.sleep(float(getattr(config, "DB_MAINTENANCE_INTERVAL_SECONDS", 3600)))
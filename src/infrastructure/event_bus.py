@@ -1,50 +1,293 @@
+"""
+Event Bus - per-subscriber bounded queues with backpressure policies
+
+The old bus pushed every event into one unbounded queue and a single
+consumer awaited all handlers of an event together, so one slow subscriber
+(Telegram, persistence) delayed every other subscriber and every later event.
+
+Each subscription now owns a bounded queue and a worker task. ``publish``
+only enqueues; what happens when a subscriber's queue is full depends on the
+policy of the event type (EVENT_BUS_POLICIES, ``set_policy``):
+
+- ``block``:    the publisher waits for room (backpressure), at most
+                EVENT_BUS_BLOCK_TIMEOUT_SECONDS, then the event is dropped
+- ``drop``:     the new event is dropped for that subscriber
+- ``coalesce``: a queued event with the same key (default: the event type,
+                ``key=`` e.g. per symbol) is replaced by the newer one;
+                when full without a match, the oldest queued event goes
+
+``subscribe(..., batch_size=N)`` delivers lists of up to N queued events.
+Handler errors are logged per subscriber and never stop delivery.
+"""
+
 from __future__ import annotations
 
 import asyncio
 import contextlib
-from typing import Any, Awaitable, Callable, Dict, List, Type, TypeVar
-from src.core.events import Event, TradeOpened, TradeClosed
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Type, TypeVar
+
+import config
+from src.core.events import Event
 from src.core.interfaces import EventBusInterface
 
+logger = logging.getLogger(__name__)
+
 TEvent = TypeVar("TEvent", bound="Event")
 
 
 Handler = Callable[[Event], Awaitable[Any]]
+KeyFn = Callable[[Any], Any]
+
+POLICIES = ("block", "drop", "coalesce")
+DEFAULT_POLICIES = {"NotificationEvent": "drop"}
+
+
+class _Subscription:
+    """One handler with its own bounded queue, worker and stats."""
+
+    def __init__(self, event_type: Type, handler: Handler, maxsize: int, batch_size: int):
+        self.event_type = event_type
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", None) or repr(handler)
+        self.maxsize = max(1, int(maxsize))
+        self.batch_size = max(1, int(batch_size))
+        self.pending: Deque[list] = deque()  # [key, event]
+        self.by_key: Dict[Any, list] = {}
+        self.has_items = asyncio.Event()
+        self.has_space = asyncio.Event()
+        self.has_space.set()
+        self.idle = asyncio.Event()  # nothing queued, nothing in delivery
+        self.idle.set()
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"delivered": 0, "dropped": 0, "coalesced": 0, "errors": 0, "max_depth": 0, "batches": 0}
+        self.latencies: Deque[float] = deque(maxlen=256)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Queue
+    # ═══════════════════════════════════════════════════════════════
+
+    def full(self) -> bool:
+        return len(self.pending) >= self.maxsize
+
+    def offer(self, event: Any, policy: str, key: Any) -> bool:
+        """Enqueue without waiting. False = queue full (caller applies the policy)."""
+        if policy == "coalesce":
+            entry = self.by_key.get(key)
+            if entry is not None:
+                entry[1] = event
+                self.stats["coalesced"] += 1
+                return True
+            if self.full():
+                old_key, _ = self.pending.popleft()
+                self.by_key.pop(old_key, None)
+                self.stats["dropped"] += 1
+        elif self.full():
+            return False
+
+        entry = [key, event]
+        self.pending.append(entry)
+        if policy == "coalesce":
+            self.by_key[key] = entry
+        if len(self.pending) > self.stats["max_depth"]:
+            self.stats["max_depth"] = len(self.pending)
+        if self.full():
+            self.has_space.clear()
+        self.idle.clear()
+        self.has_items.set()
+        return True
+
+    def _take(self) -> List[Any]:
+        batch = []
+        while self.pending and len(batch) < self.batch_size:
+            entry = self.pending.popleft()
+            if self.by_key.get(entry[0]) is entry:
+                del self.by_key[entry[0]]
+            batch.append(entry[1])
+        if not self.pending:
+            self.has_items.clear()
+        self.has_space.set()
+        return batch
+
+    # ═══════════════════════════════════════════════════════════════
+    # Worker
+    # ═══════════════════════════════════════════════════════════════
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"event_bus:{self.event_type.__name__}:{self.name}")
+
+    async def _run(self) -> None:
+        while True:
+            await self.has_items.wait()
+            batch = self._take()
+            if batch:
+                await self._deliver(batch)
+            if not self.pending:
+                self.idle.set()
+
+    async def _deliver(self, batch: List[Any]) -> None:
+        started = time.perf_counter()
+        try:
+            await self.handler(batch if self.batch_size > 1 else batch[0])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"EventBus handler {self.name} failed on {self.event_type.__name__}: {e}")
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+            self.stats["delivered"] += len(batch)
+            self.stats["batches"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+        return {
+            **self.stats,
+            "event": self.event_type.__name__,
+            "handler": self.name,
+            "depth": len(self.pending),
+            "maxsize": self.maxsize,
+            "latency_avg_ms": round(sum(lat) / len(lat) * 1000, 3) if lat else 0.0,
+            "latency_p99_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000, 3) if lat else 0.0,
+            "latency_max_ms": round(lat[-1] * 1000, 3) if lat else 0.0,
+        }
 
 
 class EventBus(EventBusInterface):
-    """In-memory async event bus (pub/sub)."""
+    """In-memory async event bus (pub/sub), one bounded queue + worker per subscriber."""
 
-    def __init__(self) -> None:
-        self._handlers: Dict[Type[Event], List[Handler]] = {}
-        self._queue: asyncio.Queue[Event] = asyncio.Queue()
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        block_timeout: Optional[float] = None,
+        policies: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._subs: Dict[Type, List[_Subscription]] = {}
+        self._policies: Dict[str, str] = dict(
+            policies if policies is not None else getattr(config, 'EVENT_BUS_POLICIES', DEFAULT_POLICIES)
+        )
+        self._keys: Dict[str, KeyFn] = {}
+        self._maxsize = int(maxsize if maxsize is not None else getattr(config, 'EVENT_BUS_QUEUE_SIZE', 1000))
+        self._block_timeout = float(
+            block_timeout if block_timeout is not None else getattr(config, 'EVENT_BUS_BLOCK_TIMEOUT_SECONDS', 1.0)
+        )
         self._running = False
-        self._loop_task: asyncio.Task | None = None
+        self._stats = {"published": 0, "no_subscribers": 0, "blocked": 0, "block_timeouts": 0}
+
+    def subscribe(
+        self,
+        event_type: Type[TEvent],
+        handler: Handler,
+        maxsize: Optional[int] = None,
+        batch_size: int = 1,
+    ) -> None:
+        """Subscribe ``handler``; with ``batch_size`` > 1 it receives lists of events."""
+        sub = _Subscription(event_type, handler, maxsize or self._maxsize, batch_size)
+        self._subs.setdefault(event_type, []).append(sub)
+        if self._running:
+            sub.start()
+
+    def set_policy(self, event_type: Type, policy: str, key: Optional[KeyFn] = None) -> None:
+        """Full-queue policy for ``event_type``: block / drop / coalesce (``key``: coalesce key)."""
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown event bus policy: {policy}")
+        self._policies[event_type.__name__] = policy
+        if key is not None:
+            self._keys[event_type.__name__] = key
 
-    def subscribe(self, event_type: Type[TEvent], handler: Handler) -> None:
-        self._handlers.setdefault(event_type, []).append(handler)
+    def _policy(self, event: Any):
+        name = type(event).__name__
+        policy = self._policies.get(name, "block")
+        key = self._keys.get(name)
+        return policy, (key(event) if key is not None else name)
 
     async def publish(self, event: Event) -> None:
-        await self._queue.put(event)
+        subs = self._subs.get(type(event))
+        self._stats["published"] += 1
+        if not subs:
+            self._stats["no_subscribers"] += 1
+            return
+        policy, key = self._policy(event)
+        for sub in subs:
+            if sub.offer(event, policy, key):
+                continue
+            if policy == "block":
+                await self._publish_blocking(sub, event, key)
+            else:
+                sub.stats["dropped"] += 1
+
+    def publish_nowait(self, event: Event) -> None:
+        """Publish from sync code; ``block`` events are dropped for full subscribers."""
+        subs = self._subs.get(type(event))
+        self._stats["published"] += 1
+        if not subs:
+            self._stats["no_subscribers"] += 1
+            return
+        policy, key = self._policy(event)
+        for sub in subs:
+            if not sub.offer(event, policy, key):
+                sub.stats["dropped"] += 1
+
+    async def _publish_blocking(self, sub: _Subscription, event: Any, key: Any) -> None:
+        self._stats["blocked"] += 1
+        deadline = time.monotonic() + self._block_timeout
+        while not sub.offer(event, "block", key):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stats["block_timeouts"] += 1
+                sub.stats["dropped"] += 1
+                logger.warning(
+                    f"EventBus: {sub.name} queue full ({sub.maxsize}) for {self._block_timeout}s - "
+                    f"dropping {type(event).__name__}"
+                )
+                return
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(sub.has_space.wait(), timeout=remaining)
 
     async def start(self) -> None:
         if self._running:
             return
         self._running = True
-        self._loop_task = asyncio.create_task(self._run())
+        for subs in self._subs.values():
+            for sub in subs:
+                sub.start()
 
-    async def stop(self) -> None:
+    async def stop(self, drain_timeout: Optional[float] = None) -> None:
+        """Stop the workers; queued events get ``drain_timeout`` seconds to be delivered."""
         self._running = False
-        if self._loop_task:
-            self._loop_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._loop_task
+        subs = [sub for subs in self._subs.values() for sub in subs]
+        timeout = float(
+            drain_timeout if drain_timeout is not None else getattr(config, 'EVENT_BUS_DRAIN_TIMEOUT_SECONDS', 2.0)
+        )
+        busy = [sub.idle.wait() for sub in subs if sub.task and not sub.task.done() and not sub.idle.is_set()]
+        if busy and timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.gather(*busy), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"EventBus: undelivered events dropped after {timeout}s drain")
+        for sub in subs:
+            if sub.task:
+                sub.task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await sub.task
+                sub.task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "subscribers": [sub.get_stats() for subs in self._subs.values() for sub in subs],
+        }
+
+
+_default_bus: Optional[EventBus] = None
 
-    async def _run(self) -> None:
-        while self._running:
-            event = await self._queue.get()
-            await self._dispatch(event)
 
-    async def _dispatch(self, event: Event) -> None:
-        handlers = self._handlers.get(type(event), [])
-        await asyncio.gather(*(handler(event) for handler in handlers))
+def get_event_bus() -> EventBus:
+    """Get singleton event bus"""
+    global _default_bus
+    if _default_bus is None:
+        _default_bus = EventBus()
+    return _default_bus
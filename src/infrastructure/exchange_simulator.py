@@ -0,0 +1,773 @@
+"""
+Exchange Simulator - local Lighter + X10 endpoints for load and latency tests
+
+One aiohttp server on localhost that speaks the REST and WebSocket formats
+the bot consumes, so WebSocketManager, the adapters' REST paths, the
+fast-REST reader, the WS order clients and the ingest process can run at
+production message rates without a live venue:
+
+  Lighter  REST  {base}/lighter/api/v1/...   (orderBookDetails, orderBooks,
+                 funding-rates, orderBookOrders, account, nextNonce, orders,
+                 sendTx, sendTxBatch)
+           WS    {ws}/lighter/stream         (market_stats/all, order_book/{id},
+                 account_all/{idx}, user_stats/{idx}, jsonapi/sendtx[batch])
+  X10      REST  {base}/x10/api/v1/...       (info/markets, orderbook, stats,
+                 user/balance, user/positions, user/orders, user/order)
+           WS    {ws}/x10/stream.extended.exchange/v1/
+                 prices/mark | funding | publicTrades | orderbooks | account
+
+``apply_to(config)`` points LIGHTER_BASE_URL / LIGHTER_WS_URL /
+X10_API_BASE_URL / X10_STREAM_BASE_URL / X10_WS_ORDER_URL at the simulator.
+
+SimulatorConfig controls the load: symbol count, update rate per symbol,
+book depth, REST latency (lognormal from median + p99), 429 injection,
+order rejects, partial fills and forced WebSocket disconnects. Every pushed
+message carries ``sim_ts`` (server send time) for end-to-end latency.
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+LIGHTER_TX_CREATE_ORDER = 14
+LIGHTER_TX_CANCEL_ORDER = 15
+_Z99 = 2.326  # z-score of the 99th percentile
+
+
+@dataclass
+class SimulatorConfig:
+    """Load profile and fault injection of the simulator."""
+    symbols: int = 20
+    base_price: float = 100.0
+    volatility: float = 0.0005            # relative random walk per update
+    update_hz: float = 10.0               # market data updates per symbol and second
+    depth: int = 10                       # book levels per side
+    funding_rate: float = 0.0001          # hourly, +/- small noise per market
+    latency_median_ms: float = 2.0        # REST latency distribution (lognormal)
+    latency_p99_ms: float = 20.0
+    rate_limit_rate: float = 0.0          # share of REST requests answered with 429
+    retry_after_seconds: float = 1.0
+    reject_rate: float = 0.0              # share of orders rejected
+    partial_fill_rate: float = 0.0        # share of taker orders filled only partially
+    partial_fill_ratio: float = 0.5
+    disconnect_interval: float = 0.0      # mean seconds between forced WS drops per connection (0 = off)
+    collateral: float = 10_000.0
+    lighter_account_index: int = 60113
+    size_decimals: int = 4
+    price_decimals: int = 2
+    seed: Optional[int] = None
+
+
+def simulator_endpoints(base_url: str) -> Dict[str, str]:
+    """Config overrides for a simulator listening on ``base_url`` (http://host:port)."""
+    base_url = base_url.rstrip("/")
+    ws_url = "ws" + base_url[4:] if base_url.startswith("http") else base_url
+    return {
+        "LIGHTER_BASE_URL": f"{base_url}/lighter",
+        "LIGHTER_WS_URL": f"{ws_url}/lighter/stream",
+        "X10_API_BASE_URL": f"{base_url}/x10",
+        "X10_STREAM_BASE_URL": f"{ws_url}/x10/stream.extended.exchange/v1",
+        "X10_WS_ORDER_URL": f"{ws_url}/x10/stream.extended.exchange/v1/account",
+    }
+
+
+def apply_endpoints(config_module, overrides: Dict[str, str]) -> Dict[str, Any]:
+    previous = {}
+    for key, value in overrides.items():
+        previous[key] = getattr(config_module, key, None)
+        setattr(config_module, key, value)
+    return previous
+
+
+def _book_delta(old: List[List[float]], new: List[List[float]]) -> List[List[float]]:
+    """Levels that changed between two book sides; removed prices get size 0."""
+    before = {p: q for p, q in old}
+    after = {p: q for p, q in new}
+    return [[p, q] for p, q in new if before.get(p) != q] + [[p, 0.0] for p in before if p not in after]
+
+
+@dataclass
+class SimMarket:
+    symbol: str
+    market_id: int
+    price: float
+    funding: float
+    open_interest: float = 1_000_000.0
+    nonce: int = 0
+    bids: List[List[float]] = field(default_factory=list)
+    asks: List[List[float]] = field(default_factory=list)
+    bid_delta: List[List[float]] = field(default_factory=list)  # changes of the last update, size 0 = removed
+    ask_delta: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class SimOrder:
+    exchange: str
+    order_id: int
+    client_id: str
+    symbol: str
+    is_buy: bool
+    size: float
+    price: float
+    ioc: bool
+    filled: float = 0.0
+    status: str = "NEW"
+    fills: List[Tuple[int, float, float, bool]] = field(default_factory=list)  # unpushed (trade id, qty, price, taker)
+
+
+@dataclass(eq=False)
+class _Client:
+    ws: web.WebSocketResponse
+    request: web.Request
+    kind: str
+    channels: Set[str] = field(default_factory=set)
+
+
+class ExchangeSimulator:
+    """Lighter- and X10-compatible endpoints backed by simulated markets."""
+
+    def __init__(self, cfg: Optional[SimulatorConfig] = None):
+        self.cfg = cfg or SimulatorConfig()
+        self._rng = random.Random(self.cfg.seed)
+        self.markets: Dict[str, SimMarket] = {}
+        self._by_id: Dict[int, SimMarket] = {}
+        for i in range(self.cfg.symbols):
+            symbol = "BTC-USD" if i == 0 else "ETH-USD" if i == 1 else f"SIM{i}-USD"
+            market = SimMarket(
+                symbol=symbol,
+                market_id=i,
+                price=self.cfg.base_price * (1 + 0.1 * i),
+                funding=self.cfg.funding_rate * (1 + self._rng.uniform(-0.5, 0.5)),
+            )
+            self._rebuild_book(market)
+            self.markets[symbol] = market
+            self._by_id[i] = market
+
+        self.positions: Dict[str, Dict[str, List[float]]] = {"lighter": {}, "x10": {}}  # symbol -> [size, entry]
+        self.orders: Dict[int, SimOrder] = {}
+        self._order_seq = 0
+        self._trade_seq = 0
+        self._nonce = 0
+        self._clients: Set[_Client] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+        self.ws_url = ""
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=4096))
+        self.stats = defaultdict(int)
+        sigma = math.log(max(self.cfg.latency_p99_ms, self.cfg.latency_median_ms) / max(self.cfg.latency_median_ms, 1e-6)) / _Z99
+        self._latency_mu, self._latency_sigma = math.log(max(self.cfg.latency_median_ms, 1e-6) / 1000.0), sigma
+
+    # ═══════════════════════════════════════════════════════════════
+    # Lifecycle
+    # ═══════════════════════════════════════════════════════════════
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "ExchangeSimulator":
+        app = web.Application(middlewares=[self._rest_middleware])
+        app.add_routes([
+            web.get("/lighter/api/v1/orderBookDetails", self._lighter_order_book_details),
+            web.get("/lighter/api/v1/orderBooks", self._lighter_order_books),
+            web.get("/lighter/api/v1/funding-rates", self._lighter_funding_rates),
+            web.get("/lighter/api/v1/orderBookOrders", self._lighter_book_orders),
+            web.get("/lighter/api/v1/account", self._lighter_account),
+            web.get("/lighter/api/v1/nextNonce", self._lighter_next_nonce),
+            web.get("/lighter/api/v1/orders", self._lighter_orders),
+            web.post("/lighter/api/v1/sendTx", self._lighter_send_tx),
+            web.post("/lighter/api/v1/sendTxBatch", self._lighter_send_tx_batch),
+            web.get("/lighter/stream", self._lighter_ws),
+            web.get("/x10/api/v1/info/markets", self._x10_markets),
+            web.get("/x10/api/v1/info/markets/{market}/orderbook", self._x10_orderbook),
+            web.get("/x10/api/v1/info/markets/{market}/stats", self._x10_stats),
+            web.get("/x10/api/v1/user/balance", self._x10_balance),
+            web.get("/x10/api/v1/user/positions", self._x10_positions),
+            web.get("/x10/api/v1/user/orders", self._x10_open_orders),
+            web.post("/x10/api/v1/user/order", self._x10_place_order),
+            web.delete("/x10/api/v1/user/order/{order_id}", self._x10_cancel_order),
+            web.get("/x10/stream.extended.exchange/v1/{stream:.+}", self._x10_ws),
+        ])
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound}"
+        self.ws_url = f"ws://{host}:{bound}"
+        self._tasks.append(asyncio.create_task(self._market_loop(), name="simulator_market"))
+        return self
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        for client in list(self._clients):
+            with contextlib.suppress(Exception):
+                await client.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def config_overrides(self) -> Dict[str, str]:
+        return simulator_endpoints(self.base_url)
+
+    def apply_to(self, config_module) -> Dict[str, Any]:
+        """Point the bot config at the simulator; returns the previous values."""
+        return apply_endpoints(config_module, self.config_overrides())
+
+    # ═══════════════════════════════════════════════════════════════
+    # Market simulation
+    # ═══════════════════════════════════════════════════════════════
+
+    def _rebuild_book(self, market: SimMarket) -> None:
+        tick = 10 ** -self.cfg.price_decimals
+        spread = max(tick, round(market.price * 0.0002, self.cfg.price_decimals))
+        bid0 = round(market.price - spread / 2, self.cfg.price_decimals)
+        ask0 = round(bid0 + spread, self.cfg.price_decimals)
+        bids = [[round(bid0 - i * spread, self.cfg.price_decimals), round(self._rng.uniform(0.5, 5.0), 4)]
+                for i in range(self.cfg.depth)]
+        asks = [[round(ask0 + i * spread, self.cfg.price_decimals), round(self._rng.uniform(0.5, 5.0), 4)]
+                for i in range(self.cfg.depth)]
+        market.bid_delta, market.ask_delta = _book_delta(market.bids, bids), _book_delta(market.asks, asks)
+        market.bids, market.asks = bids, asks
+        market.nonce += 1
+
+    def _tick(self) -> None:
+        for market in self.markets.values():
+            market.price *= 1 + self._rng.gauss(0.0, self.cfg.volatility)
+            market.funding += self._rng.gauss(0.0, self.cfg.funding_rate * 0.01)
+            market.open_interest *= 1 + self._rng.gauss(0.0, 0.0001)
+            self._rebuild_book(market)
+
+    async def _market_loop(self) -> None:
+        interval = 1.0 / max(self.cfg.update_hz, 0.001)
+        next_at = time.perf_counter()
+        while True:
+            next_at += interval
+            self._tick()
+            await self._fill_resting_orders()
+            await self._broadcast_market_data()
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    async def _broadcast_market_data(self) -> None:
+        """Encode each update once, only for channels somebody subscribed to."""
+        subscribed = set().union(*(c.channels for c in self._clients)) if self._clients else set()
+        if not subscribed:
+            return
+        now = time.time()
+        ts = int(now * 1000)
+        frames: Dict[str, List[str]] = defaultdict(list)
+        if "market_stats/all" in subscribed:
+            stats = {str(m.market_id): self._lighter_stats(m) for m in self.markets.values()}
+            frames["market_stats/all"].append(json.dumps(
+                {"type": "update/market_stats", "channel": "market_stats:all", "market_stats": stats, "sim_ts": now}))
+        for m in self.markets.values():
+            if "x10:prices/mark" in subscribed:
+                frames["x10:prices/mark"].append(json.dumps(
+                    {"type": "MP", "data": {"m": m.symbol, "p": f"{m.price:.6f}", "ts": ts}, "ts": ts, "sim_ts": now}))
+            if "x10:funding" in subscribed:
+                frames["x10:funding"].append(json.dumps(
+                    {"data": {"m": m.symbol, "f": f"{m.funding:.8f}", "T": ts}, "ts": ts, "sim_ts": now}))
+            if "x10:publicTrades" in subscribed:
+                frames["x10:publicTrades"].append(json.dumps({"data": [{
+                    "i": ts, "m": m.symbol, "S": self._rng.choice(("BUY", "SELL")), "tT": "TRADE", "T": ts,
+                    "p": f"{m.price:.6f}", "q": "0.01"}], "ts": ts, "sim_ts": now}))
+            if "x10:orderbooks" in subscribed:
+                frames["x10:orderbooks"].append(json.dumps(
+                    self._x10_book_message(m, "DELTA", now, m.bid_delta, m.ask_delta)))
+            channel = f"order_book/{m.market_id}"
+            if channel in subscribed:
+                frames[channel].append(json.dumps(
+                    self._lighter_book_message(m, "update/order_book", now, m.bid_delta, m.ask_delta)))
+
+        for client in list(self._clients):
+            out = [f for channel in client.channels for f in frames.get(channel, ())]
+            if out:
+                await self._send_frames(client, out)
+
+    async def _send_frames(self, client: _Client, frames: List[str]) -> None:
+        try:
+            for frame in frames:
+                await client.ws.send_str(frame)
+            self.stats["ws_messages"] += len(frames)
+        except (ConnectionResetError, RuntimeError):
+            self._clients.discard(client)
+
+    def _lighter_stats(self, m: SimMarket) -> Dict[str, Any]:
+        return {
+            "market_id": m.market_id, "symbol": m.symbol.split("-")[0],
+            "mark_price": f"{m.price:.6f}", "index_price": f"{m.price:.6f}", "last_trade_price": f"{m.price:.6f}",
+            "funding_rate": f"{m.funding:.8f}", "current_funding_rate": f"{m.funding:.8f}",
+            "open_interest": f"{m.open_interest:.2f}",
+        }
+
+    @staticmethod
+    def _lighter_book_message(m: SimMarket, msg_type: str, now: float, bids, asks) -> Dict[str, Any]:
+        return {
+            "type": msg_type, "channel": f"order_book:{m.market_id}",
+            "order_book": {
+                "bids": [{"price": f"{p}", "size": f"{q}"} for p, q in bids],
+                "asks": [{"price": f"{p}", "size": f"{q}"} for p, q in asks],
+                "nonce": m.nonce, "begin_nonce": m.nonce - 1,
+            },
+            "sim_ts": now,
+        }
+
+    @staticmethod
+    def _x10_book_message(m: SimMarket, msg_type: str, now: float, bids, asks) -> Dict[str, Any]:
+        ts = int(now * 1000)
+        return {
+            "type": msg_type, "ts": ts, "seq": m.nonce, "sim_ts": now,
+            "data": {"m": m.symbol, "b": [{"p": f"{p}", "q": f"{q}"} for p, q in bids],
+                     "a": [{"p": f"{p}", "q": f"{q}"} for p, q in asks]},
+        }
+
+    # ═══════════════════════════════════════════════════════════════
+    # Orders, fills, accounts
+    # ═══════════════════════════════════════════════════════════════
+
+    def _submit(self, exchange: str, client_id: str, symbol: str, is_buy: bool,
+                size: float, price: float, ioc: bool) -> SimOrder:
+        self._order_seq += 1
+        order = SimOrder(exchange, self._order_seq, str(client_id), symbol, is_buy, size, price, ioc)
+        self.orders[order.order_id] = order
+        self.stats["orders"] += 1
+        market = self.markets.get(symbol)
+        if market is None or size <= 0 or self._rng.random() < self.cfg.reject_rate:
+            order.status = "REJECTED"
+            self.stats["rejects"] += 1
+            return order
+        self._try_fill(order, market, taker=True)
+        if order.status == "NEW" and ioc:
+            order.status = "CANCELLED"
+        return order
+
+    def _try_fill(self, order: SimOrder, market: SimMarket, taker: bool) -> None:
+        best = market.asks[0][0] if order.is_buy else market.bids[0][0]
+        crosses = order.price >= best if order.is_buy else order.price <= best
+        if not crosses:
+            return
+        remaining = order.size - order.filled
+        qty = remaining
+        if taker and self._rng.random() < self.cfg.partial_fill_rate:
+            qty = round(remaining * self.cfg.partial_fill_ratio, self.cfg.size_decimals) or remaining
+            self.stats["partial_fills"] += 1
+        order.filled += qty
+        order.status = "FILLED" if order.filled >= order.size - 1e-12 else "PARTIALLY_FILLED"
+        if order.status == "PARTIALLY_FILLED" and order.ioc:
+            order.status = "CANCELLED"  # IOC remainder
+        self.stats["fills"] += 1
+        self._trade_seq += 1
+        if order.exchange == "x10":  # Lighter pushes positions only, no trade messages
+            order.fills.append((self._trade_seq, qty, best, taker))
+        self._apply_fill(order.exchange, market.symbol, qty if order.is_buy else -qty, best)
+
+    def _apply_fill(self, exchange: str, symbol: str, signed_qty: float, price: float) -> None:
+        pos = self.positions[exchange].setdefault(symbol, [0.0, 0.0])
+        size, entry = pos
+        new_size = size + signed_qty
+        if size == 0 or (size > 0) == (signed_qty > 0):
+            pos[1] = (abs(size) * entry + abs(signed_qty) * price) / abs(new_size) if new_size else 0.0
+        elif abs(new_size) > 0 and (new_size > 0) != (size > 0):
+            pos[1] = price
+        pos[0] = round(new_size, 10)
+        if pos[0] == 0:
+            pos[1] = 0.0
+
+    async def _fill_resting_orders(self) -> None:
+        for order in [o for o in self.orders.values() if o.status in ("NEW", "PARTIALLY_FILLED")]:
+            market = self.markets.get(order.symbol)
+            if market is None:
+                continue
+            before = order.filled
+            self._try_fill(order, market, taker=False)
+            if order.filled != before:
+                await self._push_account(order.exchange, order)
+
+    async def _push_account(self, exchange: str, order: Optional[SimOrder] = None) -> None:
+        now = time.time()
+        if exchange == "lighter":
+            idx = self.cfg.lighter_account_index
+            frames = {
+                f"account_all/{idx}": json.dumps({
+                    "type": "update/account_all", "channel": f"account_all:{idx}",
+                    "positions": self._lighter_positions(), "sim_ts": now}),
+                f"user_stats/{idx}": json.dumps({
+                    "type": "update/user_stats", "channel": f"user_stats:{idx}",
+                    "stats": self._lighter_user_stats(), "sim_ts": now}),
+            }
+            for client in list(self._clients):
+                out = [frame for channel, frame in frames.items() if channel in client.channels]
+                if out:
+                    await self._send_frames(client, out)
+            return
+
+        ts = int(now * 1000)
+        messages = []
+        if order is not None:
+            messages.append({"type": "ORDER", "data": {"orders": [self._x10_order(order)]}, "ts": ts, "sim_ts": now})
+            # One TRADE per fill: its own id, the fill increment and the price it executed at
+            if order.fills:
+                messages.append({"type": "TRADE", "data": {"trades": [{
+                    "id": trade_id, "orderId": order.order_id, "market": order.symbol,
+                    "side": "BUY" if order.is_buy else "SELL", "price": f"{price:.6f}",
+                    "qty": f"{qty}", "isTaker": taker, "createdTime": ts}
+                    for trade_id, qty, price, taker in order.fills]}, "ts": ts, "sim_ts": now})
+                order.fills.clear()
+        messages.append({"type": "POSITION", "data": {"positions": self._x10_positions_data()}, "ts": ts, "sim_ts": now})
+        messages.append({"type": "BALANCE", "data": {"balance": self._x10_balance_data()}, "ts": ts, "sim_ts": now})
+        frames = [json.dumps(m) for m in messages]
+        for client in list(self._clients):
+            if client.kind == "x10:account":
+                await self._send_frames(client, frames)
+
+    def _lighter_positions(self) -> Dict[str, Any]:
+        out = {}
+        for symbol, (size, entry) in self.positions["lighter"].items():
+            m = self.markets[symbol]
+            out[str(m.market_id)] = {
+                "market_id": m.market_id, "symbol": symbol.split("-")[0], "sign": 1 if size >= 0 else -1,
+                "position": f"{abs(size)}", "avg_entry_price": f"{entry}",
+                "position_value": f"{abs(size) * m.price:.6f}",
+                "unrealized_pnl": f"{size * (m.price - entry):.6f}", "realized_pnl": "0",
+                "liquidation_price": "0", "total_funding_paid_out": "0", "allocated_margin": "0",
+            }
+        return out
+
+    def _lighter_user_stats(self) -> Dict[str, Any]:
+        used = sum(abs(s) * self.markets[sym].price for sym, (s, _) in self.positions["lighter"].items()) / 10
+        return {"collateral": f"{self.cfg.collateral}", "available_balance": f"{self.cfg.collateral - used:.6f}",
+                "buying_power": f"{(self.cfg.collateral - used) * 10:.6f}", "portfolio_value": f"{self.cfg.collateral}"}
+
+    def _x10_order(self, order: SimOrder) -> Dict[str, Any]:
+        return {"id": order.order_id, "externalId": order.client_id, "market": order.symbol,
+                "status": order.status, "side": "BUY" if order.is_buy else "SELL",
+                "price": f"{order.price}", "qty": f"{order.size}", "filledQty": f"{order.filled}",
+                "type": "LIMIT", "timeInForce": "IOC" if order.ioc else "GTT"}
+
+    def _x10_positions_data(self) -> List[Dict[str, Any]]:
+        return [{"market": symbol, "side": "LONG" if size > 0 else "SHORT", "size": f"{abs(size)}",
+                 "openPrice": f"{entry}", "markPrice": f"{self.markets[symbol].price:.6f}",
+                 "unrealisedPnl": f"{size * (self.markets[symbol].price - entry):.6f}", "leverage": "5"}
+                for symbol, (size, entry) in self.positions["x10"].items() if size]
+
+    def _x10_balance_data(self) -> Dict[str, Any]:
+        used = sum(abs(s) * self.markets[sym].price for sym, (s, _) in self.positions["x10"].items()) / 5
+        return {"balance": f"{self.cfg.collateral}", "equity": f"{self.cfg.collateral}",
+                "availableForTrade": f"{self.cfg.collateral - used:.6f}", "initialMargin": f"{used:.6f}",
+                "unrealisedPnl": "0"}
+
+    # ═══════════════════════════════════════════════════════════════
+    # REST: latency / 429 injection, stats
+    # ═══════════════════════════════════════════════════════════════
+
+    @web.middleware
+    async def _rest_middleware(self, request: web.Request, handler):
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await handler(request)
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        self.stats["rest_requests"] += 1
+        delay = math.exp(self._rng.gauss(self._latency_mu, self._latency_sigma)) if self._latency_sigma else \
+            self.cfg.latency_median_ms / 1000.0
+        await asyncio.sleep(delay)
+        self._latencies[route].append(delay)
+        if self._rng.random() < self.cfg.rate_limit_rate:
+            self.stats["rest_429"] += 1
+            return web.json_response(
+                {"code": 429, "message": "Too Many Requests"}, status=429,
+                headers={"Retry-After": str(self.cfg.retry_after_seconds)},
+            )
+        return await handler(request)
+
+    # ═══════════════════════════════════════════════════════════════
+    # Lighter REST
+    # ═══════════════════════════════════════════════════════════════
+
+    async def _lighter_order_book_details(self, request: web.Request) -> web.Response:
+        market_id = request.query.get("market_id")
+        markets = [self._by_id[int(market_id)]] if market_id is not None and int(market_id) in self._by_id \
+            else list(self.markets.values())
+        return web.json_response({"code": 200, "order_book_details": [{
+            "market_id": m.market_id, "symbol": m.symbol.split("-")[0], "status": "active",
+            "last_trade_price": m.price, "mark_price": f"{m.price:.6f}", "open_interest": m.open_interest,
+            "size_decimals": self.cfg.size_decimals, "price_decimals": self.cfg.price_decimals,
+            "supported_size_decimals": self.cfg.size_decimals, "supported_price_decimals": self.cfg.price_decimals,
+            "min_base_amount": f"{10 ** -self.cfg.size_decimals}", "min_quote_amount": "10",
+            "taker_fee": "0", "maker_fee": "0",
+        } for m in markets]})
+
+    async def _lighter_order_books(self, request: web.Request) -> web.Response:
+        return web.json_response({"code": 200, "order_books": [{
+            "symbol": m.symbol.split("-")[0], "market_id": m.market_id, "status": "active",
+            "taker_fee": "0", "maker_fee": "0", "min_base_amount": f"{10 ** -self.cfg.size_decimals}",
+            "min_quote_amount": "10", "supported_size_decimals": self.cfg.size_decimals,
+            "supported_price_decimals": self.cfg.price_decimals,
+        } for m in self.markets.values()]})
+
+    async def _lighter_funding_rates(self, request: web.Request) -> web.Response:
+        return web.json_response({"code": 200, "funding_rates": [
+            {"market_id": m.market_id, "exchange": "lighter", "symbol": m.symbol.split("-")[0], "rate": m.funding}
+            for m in self.markets.values()
+        ]})
+
+    async def _lighter_book_orders(self, request: web.Request) -> web.Response:
+        market = self._by_id.get(int(request.query.get("market_id", -1)))
+        if market is None:
+            return web.json_response({"code": 21100, "message": "market not found"}, status=400)
+        limit = int(request.query.get("limit", self.cfg.depth))
+        side = lambda levels: [{"price": f"{p}", "remaining_base_amount": f"{s}"} for p, s in levels[:limit]]  # noqa: E731
+        return web.json_response({"code": 200, "total_bids": len(market.bids), "total_asks": len(market.asks),
+                                  "bids": side(market.bids), "asks": side(market.asks)})
+
+    async def _lighter_account(self, request: web.Request) -> web.Response:
+        stats = self._lighter_user_stats()
+        return web.json_response({"code": 200, "accounts": [{
+            "index": self.cfg.lighter_account_index, "collateral": stats["collateral"],
+            "available_balance": stats["available_balance"], "total_asset_value": stats["portfolio_value"],
+            "buying_power": stats["buying_power"], "positions": list(self._lighter_positions().values()),
+        }]})
+
+    async def _lighter_next_nonce(self, request: web.Request) -> web.Response:
+        self._nonce += 1
+        return web.json_response({"code": 200, "nonce": self._nonce})
+
+    async def _lighter_orders(self, request: web.Request) -> web.Response:
+        market_id = request.query.get("market_id", request.query.get("market_index"))
+        orders = [o for o in self.orders.values()
+                  if o.exchange == "lighter" and o.status in ("NEW", "PARTIALLY_FILLED")
+                  and (market_id is None or self.markets[o.symbol].market_id == int(market_id))]
+        return web.json_response({"code": 200, "orders": [{
+            "order_index": o.order_id, "client_order_index": o.client_id,
+            "market_index": self.markets[o.symbol].market_id, "is_ask": not o.is_buy, "price": f"{o.price}",
+            "initial_base_amount": f"{o.size}", "remaining_base_amount": f"{o.size - o.filled}",
+            "status": "open",
+        } for o in orders]})
+
+    async def _lighter_tx(self, tx_type: int, tx_info: Any) -> Dict[str, Any]:
+        info = json.loads(tx_info) if isinstance(tx_info, str) else dict(tx_info or {})
+        self._nonce += 1
+        result = {"code": 200, "hash": f"0x{self._nonce:064x}", "type": tx_type, "status": 1,
+                  "nonce": info.get("Nonce", self._nonce), "account_index": self.cfg.lighter_account_index}
+        if tx_type == LIGHTER_TX_CREATE_ORDER:
+            market = self._by_id.get(int(info.get("MarketIndex", -1)))
+            order = self._submit(
+                "lighter", str(info.get("ClientOrderIndex", self._nonce)),
+                market.symbol if market else "", not info.get("IsAsk", 0),
+                int(info.get("BaseAmount", 0)) / 10 ** self.cfg.size_decimals,
+                int(info.get("Price", 0)) / 10 ** self.cfg.price_decimals,
+                ioc=int(info.get("TimeInForce", 0)) == 0,
+            )
+            if order.status == "REJECTED":
+                return {"code": 21700, "message": "order rejected (simulated)"}
+            await self._push_account("lighter")
+        elif tx_type == LIGHTER_TX_CANCEL_ORDER:
+            order = next((o for o in self.orders.values() if str(o.order_id) == str(info.get("Index"))), None)
+            if order is not None and order.status in ("NEW", "PARTIALLY_FILLED"):
+                order.status = "CANCELLED"
+        return result
+
+    async def _lighter_send_tx(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        result = await self._lighter_tx(int(form.get("tx_type", 0)), form.get("tx_info", "{}"))
+        return web.json_response(result, status=200 if result["code"] == 200 else 400)
+
+    async def _lighter_send_tx_batch(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        types = json.loads(form.get("tx_types", "[]"))
+        infos = json.loads(form.get("tx_infos", "[]"))
+        results = [await self._lighter_tx(int(t), i) for t, i in zip(types, infos)]
+        return web.json_response({"code": 200, "tx_hash": [r.get("hash") for r in results], "results": results})
+
+    # ═══════════════════════════════════════════════════════════════
+    # X10 REST
+    # ═══════════════════════════════════════════════════════════════
+
+    def _x10_market_json(self, m: SimMarket) -> Dict[str, Any]:
+        tick = 10 ** -self.cfg.price_decimals
+        step = 10 ** -self.cfg.size_decimals
+        return {
+            "name": m.symbol, "assetName": m.symbol.split("-")[0], "active": True, "status": "ACTIVE",
+            "marketStats": {
+                "markPrice": f"{m.price:.6f}", "indexPrice": f"{m.price:.6f}", "lastPrice": f"{m.price:.6f}",
+                "bidPrice": f"{m.bids[0][0]}", "askPrice": f"{m.asks[0][0]}", "fundingRate": f"{m.funding:.8f}",
+                "openInterest": f"{m.open_interest:.2f}",
+            },
+            "tradingConfig": {"minOrderSize": f"{step}", "minOrderSizeChange": f"{step}",
+                              "minPriceChange": f"{tick}", "maxLeverage": "20"},
+        }
+
+    async def _x10_markets(self, request: web.Request) -> web.Response:
+        wanted = set(request.query.getall("market", []))
+        return web.json_response({"status": "OK", "data": [
+            self._x10_market_json(m) for m in self.markets.values() if not wanted or m.symbol in wanted
+        ]})
+
+    async def _x10_orderbook(self, request: web.Request) -> web.Response:
+        market = self.markets.get(request.match_info["market"])
+        if market is None:
+            return web.json_response({"status": "OK"})
+        return web.json_response({"status": "OK", "data": {
+            "market": market.symbol,
+            "bid": [{"qty": f"{s}", "price": f"{p}"} for p, s in market.bids],
+            "ask": [{"qty": f"{s}", "price": f"{p}"} for p, s in market.asks],
+        }})
+
+    async def _x10_stats(self, request: web.Request) -> web.Response:
+        market = self.markets.get(request.match_info["market"])
+        if market is None:
+            return web.json_response({"status": "ERROR", "error": {"message": "not found"}}, status=404)
+        return web.json_response({"status": "OK", "data": self._x10_market_json(market)["marketStats"]})
+
+    async def _x10_balance(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "OK", "data": self._x10_balance_data()})
+
+    async def _x10_positions(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "OK", "data": self._x10_positions_data()})
+
+    async def _x10_open_orders(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "OK", "data": [
+            self._x10_order(o) for o in self.orders.values()
+            if o.exchange == "x10" and o.status in ("NEW", "PARTIALLY_FILLED")
+        ]})
+
+    async def _x10_place_order(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        order = self._submit(
+            "x10", str(body.get("id", "")), body.get("market", ""), str(body.get("side", "")).upper() == "BUY",
+            float(body.get("qty", 0)), float(body.get("price", 0)),
+            ioc=str(body.get("timeInForce", "GTT")).upper() in ("IOC", "FOK") or body.get("type") == "MARKET",
+        )
+        if order.status == "REJECTED":
+            return web.json_response({"status": "ERROR", "error": {"code": 1140, "message": "rejected (simulated)"}},
+                                     status=400)
+        await self._push_account("x10", order)
+        return web.json_response({"status": "OK", "data": {"id": order.order_id, "externalId": order.client_id}})
+
+    async def _x10_cancel_order(self, request: web.Request) -> web.Response:
+        order = self.orders.get(int(request.match_info["order_id"]))
+        if order is not None and order.status in ("NEW", "PARTIALLY_FILLED"):
+            order.status = "CANCELLED"
+            await self._push_account("x10", order)
+        return web.json_response({"status": "OK"})
+
+    # ═══════════════════════════════════════════════════════════════
+    # WebSockets
+    # ═══════════════════════════════════════════════════════════════
+
+    async def _open_ws(self, request: web.Request, kind: str) -> _Client:
+        ws = web.WebSocketResponse(heartbeat=None)
+        await ws.prepare(request)
+        client = _Client(ws, request, kind)
+        self._clients.add(client)
+        self.stats["ws_connections"] += 1
+        if self.cfg.disconnect_interval > 0:
+            self._tasks.append(asyncio.create_task(self._disconnect_later(client)))
+        return client
+
+    async def _disconnect_later(self, client: _Client) -> None:
+        await asyncio.sleep(self._rng.expovariate(1.0 / self.cfg.disconnect_interval))
+        if client in self._clients and client.request.transport is not None:
+            self.stats["ws_disconnects"] += 1
+            self._clients.discard(client)
+            client.request.transport.abort()  # abrupt drop: the client sees 1006
+
+    async def _lighter_ws(self, request: web.Request) -> web.WebSocketResponse:
+        client = await self._open_ws(request, "lighter")
+        await client.ws.send_str(json.dumps({"type": "connected", "session_id": str(id(client))}))
+        try:
+            async for msg in client.ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                msg_type = data.get("type")
+                if msg_type == "ping":
+                    await client.ws.send_str('{"type":"pong"}')
+                elif msg_type == "subscribe":
+                    await self._lighter_subscribe(client, str(data.get("channel", "")))
+                elif msg_type == "unsubscribe":
+                    client.channels.discard(str(data.get("channel", "")))
+                elif msg_type == "jsonapi/sendtx":
+                    payload = data.get("data", {})
+                    result = await self._lighter_tx(int(payload.get("tx_type", 0)), payload.get("tx_info"))
+                    await client.ws.send_str(json.dumps(self._ws_tx_reply(payload.get("id"), result)))
+                elif msg_type == "jsonapi/sendtxbatch":
+                    payload = data.get("data", {})
+                    types, infos = payload.get("tx_types", []), payload.get("tx_infos", [])
+                    types = json.loads(types) if isinstance(types, str) else types
+                    infos = json.loads(infos) if isinstance(infos, str) else infos
+                    results = [await self._lighter_tx(int(t), i) for t, i in zip(types, infos)]
+                    await client.ws.send_str(json.dumps({"id": payload.get("id"), "data": results}))
+        finally:
+            self._clients.discard(client)
+        return client.ws
+
+    @staticmethod
+    def _ws_tx_reply(req_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.get("code") != 200:
+            return {"id": req_id, "error": {"code": result.get("code"), "message": result.get("message")}}
+        return {"id": req_id, **result}
+
+    async def _lighter_subscribe(self, client: _Client, channel: str) -> None:
+        client.channels.add(channel)
+        now = time.time()
+        if channel == "market_stats/all":
+            stats = {str(m.market_id): self._lighter_stats(m) for m in self.markets.values()}
+            frame = {"type": "subscribed/market_stats", "channel": "market_stats:all", "market_stats": stats}
+        elif channel.startswith("order_book/"):
+            market = self._by_id.get(int(channel.split("/")[-1]))
+            if market is None:
+                return
+            frame = self._lighter_book_message(market, "subscribed/order_book", now, market.bids, market.asks)
+        elif channel.startswith("account_all/"):
+            frame = {"type": "subscribed/account_all", "channel": channel.replace("/", ":"),
+                     "positions": self._lighter_positions()}
+        elif channel.startswith("user_stats/"):
+            frame = {"type": "subscribed/user_stats", "channel": channel.replace("/", ":"),
+                     "stats": self._lighter_user_stats()}
+        else:
+            return
+        frame["sim_ts"] = now
+        await self._send_frames(client, [json.dumps(frame)])
+
+    async def _x10_ws(self, request: web.Request) -> web.WebSocketResponse:
+        stream = request.match_info["stream"].split("/")
+        name = "/".join(stream[:2]) if stream[0] == "prices" else stream[0]
+        client = await self._open_ws(request, f"x10:{name}")
+        if name == "account":
+            await self._push_account("x10")
+        elif name == "orderbooks":
+            now = time.time()
+            await self._send_frames(client, [json.dumps(self._x10_book_message(m, "SNAPSHOT", now, m.bids, m.asks))
+                                             for m in self.markets.values()])
+        client.channels.add(client.kind)
+        try:
+            async for msg in client.ws:
+                if msg.type == WSMsgType.TEXT and '"ping"' in msg.data:
+                    await client.ws.send_str(json.dumps({"type": "pong", "ts": int(time.time() * 1000)}))
+        finally:
+            self._clients.discard(client)
+        return client.ws
+
+    # ═══════════════════════════════════════════════════════════════
+    # Stats
+    # ═══════════════════════════════════════════════════════════════
+
+    def get_stats(self) -> Dict[str, Any]:
+        routes = {}
+        for route, values in self._latencies.items():
+            lat = sorted(values)
+            routes[route] = {
+                "count": len(lat),
+                "p50_ms": round(lat[len(lat) // 2] * 1000, 3),
+                "p99_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000, 3),
+            }
+        return {**self.stats, "ws_clients": len(self._clients), "markets": len(self.markets), "routes": routes}
@@ -0,0 +1,260 @@
+# src/infrastructure/http_transport.py
+"""
+One tuned aiohttp transport per exchange host.
+
+All REST traffic to a host (adapter helpers, fast-path reads and the
+exchange SDKs, which get the session injected) goes through a single
+ClientSession with:
+- keep-alive pool sized per host (no cold TLS handshake on the order path)
+- DNS cache
+- TCP_NODELAY + SO_KEEPALIVE on every socket
+- connection warm-up at startup
+- request-level stats (latency percentiles, bytes, new vs reused connections)
+
+Sessions are owned here; adapters must not close them. close_transports()
+is called once at shutdown.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import aiohttp
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_WINDOW = 1024
+
+
+def _tcp_socket_factory(addr_info) -> socket.socket:
+    family, type_, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class HostTransport:
+    """Shared, tuned ClientSession for one exchange host."""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        dns_cache_ttl: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.limit = int(limit if limit is not None else getattr(config, "HTTP_POOL_LIMIT", 100))
+        self.limit_per_host = int(
+            limit_per_host if limit_per_host is not None else getattr(config, "HTTP_POOL_LIMIT_PER_HOST", 32)
+        )
+        self.keepalive_timeout = float(
+            keepalive_timeout if keepalive_timeout is not None else getattr(config, "HTTP_KEEPALIVE_TIMEOUT", 60.0)
+        )
+        self.dns_cache_ttl = int(
+            dns_cache_ttl if dns_cache_ttl is not None else getattr(config, "HTTP_DNS_CACHE_TTL", 300)
+        )
+        self.connect_timeout = float(
+            connect_timeout if connect_timeout is not None else getattr(config, "HTTP_CONNECT_TIMEOUT", 5.0)
+        )
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._latencies_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._stats = {
+            "requests": 0,
+            "errors": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "connections_new": 0,
+            "connections_reused": 0,
+            "warm_connections": 0,
+        }
+
+    # ═══════════════════════════════════════════════════════════════
+    # SESSION
+    # ═══════════════════════════════════════════════════════════════
+    def _build_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+            socket_factory=_tcp_socket_factory,
+        )
+        timeout = aiohttp.ClientTimeout(total=30, sock_connect=self.connect_timeout)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._trace_config()],
+        )
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Shared session (recreated if closed or bound to another loop)."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = self._build_session()
+            self._loop = loop
+        return self._session
+
+    def owns(self, session: Any) -> bool:
+        return session is not None and session is self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            try:
+                await self._session.close()
+            except Exception as e:
+                logger.debug(f"[HTTP:{self.name}] close error: {e}")
+        self._session = None
+        self._loop = None
+
+    # ═══════════════════════════════════════════════════════════════
+    # WARM-UP
+    # ═══════════════════════════════════════════════════════════════
+    async def warm_up(self, path: str = "/", connections: Optional[int] = None) -> int:
+        """
+        Open `connections` keep-alive connections by firing that many
+        concurrent GETs. Any HTTP status counts - only the TLS connection
+        matters. Returns the number of connections that were established.
+        """
+        n = int(connections if connections is not None else getattr(config, "HTTP_WARMUP_CONNECTIONS", 2))
+        if n <= 0:
+            return 0
+        session = await self.session()
+        url = f"{self.base_url}{path}"
+
+        async def _one() -> bool:
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                    await resp.read()  # release connection back to the pool
+                return True
+            except Exception as e:
+                logger.debug(f"[HTTP:{self.name}] warm-up {url} failed: {e}")
+                return False
+
+        results = await asyncio.gather(*(_one() for _ in range(n)))
+        warm = sum(1 for r in results if r)
+        self._stats["warm_connections"] = warm
+        logger.info(f"🔥 [HTTP:{self.name}] {warm}/{n} connections warmed ({self.base_url})")
+        return warm
+
+    # ═══════════════════════════════════════════════════════════════
+    # STATS (aiohttp tracing - also covers SDK traffic on this session)
+    # ═══════════════════════════════════════════════════════════════
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        stats = self._stats
+
+        async def on_request_start(session, ctx, params):
+            ctx.t0 = time.monotonic()
+            stats["requests"] += 1
+
+        async def on_request_end(session, ctx, params):
+            self._latencies_ms.append((time.monotonic() - ctx.t0) * 1000.0)
+
+        async def on_request_exception(session, ctx, params):
+            stats["errors"] += 1
+
+        async def on_request_chunk_sent(session, ctx, params):
+            stats["bytes_out"] += len(params.chunk)
+
+        async def on_response_chunk_received(session, ctx, params):
+            stats["bytes_in"] += len(params.chunk)
+
+        async def on_connection_create_end(session, ctx, params):
+            stats["connections_new"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats["connections_reused"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_request_chunk_sent.append(on_request_chunk_sent)
+        trace.on_response_chunk_received.append(on_response_chunk_received)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    def get_stats(self) -> Dict[str, Any]:
+        lat = sorted(self._latencies_ms)
+        stats: Dict[str, Any] = dict(self._stats)
+        stats.update({
+            "host": self.base_url,
+            "latency_ms_avg": round(sum(lat) / len(lat), 2) if lat else 0.0,
+            "latency_ms_p50": round(_percentile(lat, 50), 2),
+            "latency_ms_p99": round(_percentile(lat, 99), 2),
+        })
+        return stats
+
+
+# ═══════════════════════════════════════════════════════════════
+# GLOBAL REGISTRY (one transport per exchange host)
+# ═══════════════════════════════════════════════════════════════
+_transports: Dict[str, HostTransport] = {}
+
+
+def _default_base_url(name: str) -> str:
+    if name == "lighter":
+        return getattr(config, "LIGHTER_BASE_URL", "https://mainnet.zklighter.elliot.ai")
+    if name == "x10":
+        return getattr(config, "X10_API_BASE_URL", "https://api.starknet.extended.exchange")
+    raise ValueError(f"Unknown HTTP transport: {name}")
+
+
+def get_transport(name: str, base_url: Optional[str] = None) -> HostTransport:
+    """Get (or create) the shared transport for an exchange host."""
+    transport = _transports.get(name)
+    if transport is None:
+        transport = HostTransport(name, base_url or _default_base_url(name))
+        _transports[name] = transport
+    return transport
+
+
+async def warm_up_transports() -> Dict[str, int]:
+    """Warm all exchange transports concurrently (startup)."""
+    paths = {
+        "lighter": getattr(config, "LIGHTER_WARMUP_PATH", "/"),
+        "x10": getattr(config, "X10_WARMUP_PATH", "/api/v1/info/markets/BTC-USD/stats"),
+    }
+    names = list(paths)
+    results = await asyncio.gather(
+        *(get_transport(n).warm_up(paths[n]) for n in names), return_exceptions=True
+    )
+    return {n: (r if isinstance(r, int) else 0) for n, r in zip(names, results)}
+
+
+def get_transport_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: t.get_stats() for name, t in _transports.items()}
+
+
+async def close_transports() -> None:
+    for name, transport in list(_transports.items()):
+        stats = transport.get_stats()
+        logger.info(
+            f"[HTTP:{name}] requests={stats['requests']} errors={stats['errors']} "
+            f"new_conns={stats['connections_new']} reused={stats['connections_reused']} "
+            f"p50={stats['latency_ms_p50']}ms p99={stats['latency_ms_p99']}ms"
+        )
+        await transport.close()
+    _transports.clear()
@@ -0,0 +1,226 @@
+"""
+Market Registry - versioned, immutable market metadata for both venues
+
+The adapters used to rebuild ``market_info`` in place on every forced
+refresh (X10 with a fresh SDK client per call, Lighter with nested scans),
+and every id -> symbol lookup walked all markets again. The MarketRegistry
+keeps one immutable version per exchange:
+
+- ``MarketMeta``: tick / step size, min notional / min size, ids and the
+  precomputed integer scales (10**decimals) used for order encoding
+- ``MarketRegistryVersion``: read-only views by symbol and by market id
+
+``apply(exchange, metas)`` diffs the new metadata against the current
+version. Unchanged entries are reused, only added / changed / removed
+symbols are touched, and the new version is swapped in with a single
+reference assignment - readers always see either the old or the new
+version, never a half-built dict. A refresh without changes keeps the
+current version (no version bump).
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from src.utils import safe_decimal, safe_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MarketMeta:
+    """Static trading metadata of one market."""
+    exchange: str
+    symbol: str
+    market_id: Optional[int] = None
+    market_index: Optional[int] = None
+    tick_size: Decimal = Decimal("0")
+    step_size: Decimal = Decimal("0")
+    min_size: Decimal = Decimal("0")
+    min_notional: Decimal = Decimal("0")
+    price_decimals: int = 0
+    size_decimals: int = 0
+    price_scale: int = field(init=False)
+    size_scale: int = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "price_scale", 10 ** max(0, int(self.price_decimals)))
+        object.__setattr__(self, "size_scale", 10 ** max(0, int(self.size_decimals)))
+
+    def to_price_int(self, price) -> int:
+        return int(round(safe_decimal(price) * self.price_scale))
+
+    def to_size_int(self, size) -> int:
+        return int(round(safe_decimal(size) * self.size_scale))
+
+
+@dataclass(frozen=True)
+class MarketRegistryVersion:
+    """One immutable registry version of an exchange."""
+    exchange: str
+    version: int = 0
+    by_symbol: Mapping[str, MarketMeta] = field(default_factory=lambda: MappingProxyType({}))
+    by_id: Mapping[int, MarketMeta] = field(default_factory=lambda: MappingProxyType({}))
+    created_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.by_symbol)
+
+
+@dataclass(frozen=True)
+class MarketDiff:
+    """Result of ``MarketRegistry.apply``."""
+    exchange: str
+    version: int
+    added: Tuple[str, ...] = ()
+    changed: Tuple[str, ...] = ()
+    removed: Tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class MarketRegistry:
+    """Per-exchange market metadata, refreshed by diff and swapped atomically."""
+
+    def __init__(self):
+        self._versions: Dict[str, MarketRegistryVersion] = {}
+        self._stats = {"applies": 0, "unchanged": 0, "added": 0, "changed": 0, "removed": 0}
+
+    def current(self, exchange: str) -> MarketRegistryVersion:
+        version = self._versions.get(exchange)
+        if version is None:
+            version = MarketRegistryVersion(exchange=exchange)
+        return version
+
+    def get(self, exchange: str, symbol: str) -> Optional[MarketMeta]:
+        return self.current(exchange).by_symbol.get(symbol)
+
+    def by_id(self, exchange: str, market_id) -> Optional[MarketMeta]:
+        try:
+            return self.current(exchange).by_id.get(int(market_id))
+        except (TypeError, ValueError):
+            return None
+
+    def symbol_for_id(self, exchange: str, market_id) -> Optional[str]:
+        meta = self.by_id(exchange, market_id)
+        return meta.symbol if meta is not None else None
+
+    def apply(self, exchange: str, metas: Iterable[MarketMeta], partial: bool = False) -> MarketDiff:
+        """
+        Diff ``metas`` against the current version and swap in the result.
+
+        ``partial=True`` updates / adds the given markets only (single-market
+        refresh); otherwise markets missing from ``metas`` are removed.
+        """
+        self._stats["applies"] += 1
+        current = self.current(exchange)
+        old = current.by_symbol
+        incoming = {meta.symbol: meta for meta in metas}
+
+        added = tuple(s for s in incoming if s not in old)
+        changed = tuple(s for s, meta in incoming.items() if s in old and old[s] != meta)
+        removed = () if partial else tuple(s for s in old if s not in incoming)
+
+        if not (added or changed or removed):
+            self._stats["unchanged"] += 1
+            return MarketDiff(exchange, current.version)
+
+        by_symbol = dict(old)
+        by_id = dict(current.by_id)
+        for symbol in removed + changed:
+            meta = by_symbol.pop(symbol)
+            for key in {meta.market_id, meta.market_index}:
+                if key is not None and by_id.get(key) is meta:
+                    del by_id[key]
+        for symbol in added + changed:
+            meta = incoming[symbol]
+            by_symbol[symbol] = meta
+            # market_index first: market_id wins if the two collide between markets
+            for key in (meta.market_index, meta.market_id):
+                if key is not None:
+                    by_id[key] = meta
+
+        new_version = MarketRegistryVersion(
+            exchange=exchange,
+            version=current.version + 1,
+            by_symbol=MappingProxyType(by_symbol),
+            by_id=MappingProxyType(by_id),
+            created_at=time.time(),
+        )
+        self._versions[exchange] = new_version  # atomic swap
+
+        self._stats["added"] += len(added)
+        self._stats["changed"] += len(changed)
+        self._stats["removed"] += len(removed)
+        if current.version and (changed or removed):
+            logger.info(
+                f"📐 {exchange} market registry v{new_version.version}: "
+                f"+{len(added)} ~{len(changed)} -{len(removed)}"
+                f"{' changed: ' + ', '.join(changed[:10]) if changed else ''}"
+            )
+        return MarketDiff(exchange, new_version.version, added, changed, removed)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self._stats,
+            "versions": {ex: v.version for ex, v in self._versions.items()},
+            "markets": {ex: len(v) for ex, v in self._versions.items()},
+        }
+
+
+# ═══════════════════════════════════════════════════════════════
+# Adapter payload -> MarketMeta
+# ═══════════════════════════════════════════════════════════════
+
+def _decimals_of(step: Decimal) -> int:
+    return max(0, -step.normalize().as_tuple().exponent) if step > 0 else 0
+
+
+def x10_market_meta(symbol: str, market: Any) -> MarketMeta:
+    """MarketMeta from an X10 SDK market model (``trading_config``)."""
+    cfg = getattr(market, "trading_config", None)
+    tick = safe_decimal(getattr(cfg, "min_price_change", "0.01"), Decimal("0.01"))
+    step = safe_decimal(getattr(cfg, "min_order_size_change", "0"))
+    min_size = safe_decimal(getattr(cfg, "min_order_size", "0"))
+    return MarketMeta(
+        exchange="x10",
+        symbol=symbol,
+        market_id=safe_int(getattr(market, "id", None), None),
+        tick_size=tick,
+        step_size=step,
+        min_size=min_size,
+        min_notional=Decimal("0"),  # X10: min_order_size * mark price (price dependent)
+        price_decimals=_decimals_of(tick),
+        size_decimals=_decimals_of(step if step > 0 else min_size),
+    )
+
+
+def lighter_market_meta(symbol: str, info: Mapping[str, Any]) -> MarketMeta:
+    """MarketMeta from a Lighter ``market_info`` entry."""
+    return MarketMeta(
+        exchange="lighter",
+        symbol=symbol,
+        market_id=safe_int(info.get("i"), None),
+        market_index=safe_int(info.get("market_index"), None),
+        tick_size=safe_decimal(info.get("tick_size", 0)),
+        step_size=safe_decimal(info.get("lot_size", 0)),
+        min_size=safe_decimal(info.get("min_base_amount", info.get("min_quantity", 0))),
+        min_notional=safe_decimal(info.get("min_notional", 0)),
+        price_decimals=safe_int(info.get("pd", info.get("price_decimals", 6)), 6),
+        size_decimals=safe_int(info.get("sd", info.get("size_decimals", 8)), 8),
+    )
+
+
+_default_registry: Optional[MarketRegistry] = None
+
+
+def get_market_registry() -> MarketRegistry:
+    """Get singleton market registry"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MarketRegistry()
+    return _default_registry
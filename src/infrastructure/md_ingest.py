@@ -0,0 +1,423 @@
+"""
+Market Data Ingest Process - public market streams outside the strategy process
+
+With MD_INGEST_PROCESS_ENABLED the public streams (Lighter market_stats/all,
+X10 trades / funding / orderbooks / mark prices) are received and parsed in a
+separate process with its own event loop and GIL. The process writes prices,
+funding, open interest and the top MD_INGEST_DEPTH_LEVELS levels of the X10
+books into a SharedMarketTable (seqlock, shared memory).
+
+The strategy process keeps only the account streams. A pump task polls the
+table every MD_INGEST_PUMP_INTERVAL_MS, reads the changed slots and copies
+them into the adapter caches the rest of the bot already uses (_price_cache,
+_funding_cache, OI tracker, price bootstrap), so no consumer has to change.
+``MarketDataIngestProcess.reader`` gives direct reads of the latest values
+including depth. A dead ingest process is restarted after
+MD_INGEST_RESTART_DELAY_SECONDS.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+from src.infrastructure.shm_market_data import MarketDataReader, MarketSnapshot, SharedMarketTable
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_X10_STREAMS = ("x10_trades", "x10_funding", "x10_orderbooks", "x10_markprice")
+STALE_PRICE_SECONDS = 60.0  # orderbook mid only replaces prices older than this
+
+
+def _valid(value: float) -> bool:
+    return not math.isnan(value)
+
+
+def _parse_levels(levels) -> Dict[float, float]:
+    parsed = {}
+    for level in levels or []:
+        try:
+            if isinstance(level, dict):
+                price, size = float(level.get("p", 0)), float(level.get("q", 0))
+            else:
+                price, size = float(level[0]), float(level[1])
+        except (ValueError, IndexError, TypeError):
+            continue
+        if price > 0:
+            parsed[price] = size
+    return parsed
+
+
+# ═══════════════════════════════════════════════════════════════
+# Ingest process side
+# ═══════════════════════════════════════════════════════════════
+
+class MarketDataIngestor:
+    """Parses the public stream messages into a SharedMarketTable."""
+
+    def __init__(self, table: SharedMarketTable):
+        self.table = table
+        self._books: Dict[str, List[Dict[float, float]]] = {}  # X10 symbol -> [bids, asks]
+        self.stats = {"messages": 0, "updates": 0, "errors": 0, "table_full": 0}
+
+    async def handle(self, source: str, msg: Any) -> None:
+        """ManagedWebSocket message handler."""
+        self.stats["messages"] += 1
+        try:
+            if source == "lighter":
+                self._lighter_market_stats(msg)
+            elif source == "x10_markprice":
+                self._x10_mark_price(msg)
+            elif source == "x10_funding":
+                self._x10_funding(msg)
+            elif source == "x10_trades":
+                self._x10_trades(msg)
+            elif source == "x10_orderbooks":
+                self._x10_orderbook(msg)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"[md_ingest] {source} parse error: {e}")
+
+    def _write(self, exchange: str, key: str, **fields) -> None:
+        if self.table.update(exchange, key, **fields):
+            self.stats["updates"] += 1
+        else:
+            self.stats["table_full"] += 1
+
+    def _x10_mark_price(self, msg: dict) -> None:
+        data = msg.get("data", msg)
+        market, price = data.get("m", ""), data.get("p")
+        if market and price:
+            self._write("x10", market.replace("/", "-"), price=float(price))
+
+    def _x10_funding(self, msg: dict) -> None:
+        market = msg.get("m") or msg.get("market", "")
+        rate = msg.get("f") or msg.get("funding_rate") or msg.get("rate")
+        if not market or rate is None:
+            data = msg.get("data", {})
+            market = market or data.get("m", "") or data.get("market", "")
+            rate = rate if rate is not None else data.get("f") or data.get("funding_rate")
+        if market and rate is not None:
+            self._write("x10", market.replace("/", "-"), funding=float(rate))
+
+    def _x10_trades(self, msg: Any) -> None:
+        if isinstance(msg, list):
+            trades = msg
+        elif "data" in msg:
+            data = msg.get("data", [])
+            trades = data if isinstance(data, list) else [data]
+        else:
+            trades = [msg]
+        for trade in trades:
+            market = trade.get("m") or trade.get("market", "")
+            price = trade.get("p") or trade.get("price")
+            if market and price:
+                self._write("x10", market.replace("/", "-"), price=float(price))
+
+    def _x10_orderbook(self, msg: dict) -> None:
+        data = msg.get("data", {})
+        market = (data.get("m") or data.get("market") or msg.get("market")) if data else None
+        if not market:
+            return
+        symbol = market.replace("/", "-")
+        bids = _parse_levels(data.get("b") or data.get("bids"))
+        asks = _parse_levels(data.get("a") or data.get("asks"))
+
+        book = self._books.get(symbol)
+        if msg.get("type", "SNAPSHOT") == "SNAPSHOT":
+            book = self._books[symbol] = [
+                {p: s for p, s in bids.items() if s > 0},
+                {p: s for p, s in asks.items() if s > 0},
+            ]
+        elif book is None:
+            return  # delta before the first snapshot
+        else:
+            for side, updates in ((book[0], bids), (book[1], asks)):
+                for price, size in updates.items():
+                    if size <= 0:
+                        side.pop(price, None)
+                    else:
+                        side[price] = size
+
+        depth = self.table.depth
+        top_bids = sorted(book[0].items(), reverse=True)[:depth]
+        top_asks = sorted(book[1].items())[:depth]
+        self._write("x10", symbol, bids=top_bids, asks=top_asks)
+
+    def _lighter_market_stats(self, msg: dict) -> None:
+        if "market_stats" not in str(msg.get("type", "")) and "market_stats" not in str(msg.get("channel", "")):
+            return
+        stats = msg.get("market_stats")
+        if isinstance(stats, dict):
+            first = next(iter(stats), None)
+            entries = list(stats.values()) if isinstance(first, str) and first.isdigit() else [stats]
+        elif isinstance(stats, list):
+            entries = stats
+        else:
+            return
+
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            market_id = next(
+                (entry[k] for k in ("market_id", "marketId", "market_index", "marketIndex") if entry.get(k) is not None),
+                None,
+            )
+            if market_id is None:
+                continue
+            price = entry.get("mark_price") or entry.get("last_trade_price") or entry.get("index_price")
+            open_interest = entry.get("open_interest") or entry.get("openInterest")
+            if price is None and not open_interest:
+                continue
+            self._write(
+                "lighter",
+                str(market_id),
+                price=float(price) if price is not None else None,
+                open_interest=float(open_interest) if open_interest else None,
+            )
+
+
+def run_ingest_process(shm_name: str, streams: Dict[str, str], headers: Dict[str, str]) -> None:
+    """Entry point of the ingest process (spawn target)."""
+    logging.basicConfig(
+        level=getattr(config, "LOG_LEVEL", logging.INFO),
+        format="%(asctime)s [md_ingest] %(levelname)s %(message)s",
+    )
+    try:
+        asyncio.run(_ingest_main(shm_name, streams, headers))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _ingest_main(shm_name: str, streams: Dict[str, str], headers: Dict[str, str]) -> None:
+    from src.infrastructure.websocket_manager import ManagedWebSocket, WSConfig
+
+    table = SharedMarketTable.attach(shm_name)
+    ingestor = MarketDataIngestor(table)
+    parent = os.getppid()
+    connections = []
+    for name, url in streams.items():
+        lighter = name == "lighter"
+        ws_config = WSConfig(
+            url=url,
+            name=name,
+            ping_interval=None if lighter else 15.0,  # Lighter /stream: the server pings us
+            ping_timeout=None,
+            json_pong_timeout=120.0,
+            headers=None if lighter else headers,
+        )
+        conn = ManagedWebSocket(ws_config, ingestor.handle)
+        if lighter:
+            await conn.subscribe("market_stats/all")
+        connections.append(conn)
+
+    await asyncio.gather(*[conn.start() for conn in connections], return_exceptions=True)
+    logger.info(f"📡 Market data ingest running: {', '.join(streams)} -> {shm_name}")
+    try:
+        while os.getppid() == parent:  # exit together with the strategy process
+            table.heartbeat()
+            await asyncio.sleep(1.0)
+    finally:
+        await asyncio.gather(*[conn.stop() for conn in connections], return_exceptions=True)
+        logger.info(f"📡 Market data ingest stopped: {ingestor.stats}")
+        table.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Strategy process side
+# ═══════════════════════════════════════════════════════════════
+
+class MarketDataIngestProcess:
+    """Owns the shared table, the ingest process and the pump into the adapter caches."""
+
+    def __init__(
+        self,
+        x10_adapter=None,
+        lighter_adapter=None,
+        streams: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        lighter_symbol: Optional[Callable[[int], Optional[str]]] = None,
+        oi_tracker=None,
+        on_update: Optional[Callable[[], None]] = None,
+        slots: Optional[int] = None,
+        depth: Optional[int] = None,
+        interval_ms: Optional[float] = None,
+        restart_delay: Optional[float] = None,
+    ):
+        self.x10_adapter = x10_adapter
+        self.lighter_adapter = lighter_adapter
+        self.streams = dict(streams or {})
+        self.headers = dict(headers or {})
+        self.lighter_symbol = lighter_symbol or getattr(lighter_adapter, "_symbol_for_market_id", None)
+        self.oi_tracker = oi_tracker
+        self.on_update = on_update
+        self.slots = int(slots if slots is not None else getattr(config, 'MD_INGEST_SLOTS', 1024))
+        self.depth = int(depth if depth is not None else getattr(config, 'MD_INGEST_DEPTH_LEVELS', 5))
+        self.interval = float(
+            interval_ms if interval_ms is not None else getattr(config, 'MD_INGEST_PUMP_INTERVAL_MS', 5.0)
+        ) / 1000.0
+        self.restart_delay = float(
+            restart_delay if restart_delay is not None else getattr(config, 'MD_INGEST_RESTART_DELAY_SECONDS', 5.0)
+        )
+        self.table: Optional[SharedMarketTable] = None
+        self.reader: Optional[MarketDataReader] = None
+        self._process = None
+        self._pump_task: Optional[asyncio.Task] = None
+        self._restart_at = 0.0
+        self._oi_ts: Dict[str, float] = {}
+        self._lag_sum = 0.0
+        self._stats = {"pumps": 0, "applied": 0, "restarts": 0, "unknown_markets": 0, "max_lag_ms": 0.0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Lifecycle
+    # ═══════════════════════════════════════════════════════════════
+
+    def open_table(self) -> SharedMarketTable:
+        if self.table is None:
+            self.table = SharedMarketTable.create(self.slots, self.depth)
+            self.reader = MarketDataReader(self.table)
+        return self.table
+
+    async def start(self) -> None:
+        self.open_table()
+        self._spawn()
+        self._pump_task = asyncio.create_task(self._pump_loop(), name="md_ingest_pump")
+        logger.info(
+            f"📡 Market data ingest process started (pid={self._process.pid}, "
+            f"{self.slots} slots, depth {self.depth}, pump {self.interval * 1000:.1f}ms)"
+        )
+
+    def _spawn(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._process = ctx.Process(
+            target=run_ingest_process,
+            args=(self.table.name, self.streams, self.headers),
+            name="md_ingest",
+            daemon=True,
+        )
+        self._process.start()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    async def stop(self) -> None:
+        if self._pump_task and not self._pump_task.done():
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+            await asyncio.to_thread(self._process.join, 5.0)
+            self._process = None
+        if self.table is not None:
+            self.table.close()
+            self.table = self.reader = None
+
+    # ═══════════════════════════════════════════════════════════════
+    # Pump: shared table -> adapter caches
+    # ═══════════════════════════════════════════════════════════════
+
+    async def _pump_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if not self.is_alive():
+                    self._check_restart()
+                self.pump()
+            except Exception as e:
+                logger.error(f"Market data pump error: {e}")
+
+    def _check_restart(self) -> None:
+        now = time.time()
+        if not self._restart_at:
+            code = self._process.exitcode if self._process is not None else None
+            logger.warning(f"⚠️ Market data ingest process exited (code={code}) - restart in {self.restart_delay}s")
+            self._restart_at = now + self.restart_delay
+        elif now >= self._restart_at:
+            self._restart_at = 0.0
+            self._stats["restarts"] += 1
+            self._spawn()
+
+    def pump(self) -> int:
+        """Copy all slots changed since the last pump into the adapter caches."""
+        self._stats["pumps"] += 1
+        snapshots = self.reader.poll()
+        if not snapshots:
+            return 0
+        now = time.time()
+        lighter_seen = False
+        for snap in snapshots:
+            if snap.exchange == "x10":
+                self._apply_x10(snap, now)
+            elif snap.exchange == "lighter":
+                lighter_seen = True
+                self._apply_lighter(snap)
+            lag = now - max(snap.price_ts if _valid(snap.price_ts) else 0.0,
+                            snap.funding_ts if _valid(snap.funding_ts) else 0.0,
+                            snap.book_ts if _valid(snap.book_ts) else 0.0)
+            if lag < 60.0:
+                self._lag_sum += lag
+                self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], round(lag * 1000, 3))
+
+        if lighter_seen and self.lighter_adapter is not None and hasattr(self.lighter_adapter, "mark_ws_market_stats"):
+            self.lighter_adapter.mark_ws_market_stats()
+        self._stats["applied"] += len(snapshots)
+        if self.on_update is not None:
+            self.on_update()
+        return len(snapshots)
+
+    def _apply_x10(self, snap: MarketSnapshot, now: float) -> None:
+        adapter = self.x10_adapter
+        if adapter is None:
+            return
+        symbol = snap.key
+        cache_time = adapter._price_cache_time.get(symbol, 0)
+        if _valid(snap.price) and snap.price_ts > cache_time:
+            adapter._price_cache[symbol] = snap.price
+            if isinstance(getattr(adapter, "price_cache", None), dict):
+                adapter.price_cache[symbol] = snap.price
+            adapter._price_cache_time[symbol] = snap.price_ts
+        elif (
+            _valid(snap.bid) and _valid(snap.ask) and 0 < snap.bid < snap.ask
+            and (symbol not in adapter._price_cache or now - cache_time > STALE_PRICE_SECONDS)
+        ):
+            # Illiquid markets: orderbook mid when there is no (fresh) trade / mark price
+            adapter._price_cache[symbol] = (snap.bid + snap.ask) / 2.0
+            adapter._price_cache_time[symbol] = now
+
+        if _valid(snap.funding) and snap.funding_ts > adapter._funding_cache_time.get(symbol, 0):
+            adapter._funding_cache[symbol] = snap.funding
+            adapter._funding_cache_time[symbol] = snap.funding_ts
+
+    def _apply_lighter(self, snap: MarketSnapshot) -> None:
+        symbol = self.lighter_symbol(int(snap.key)) if self.lighter_symbol is not None else None
+        if not symbol:
+            self._stats["unknown_markets"] += 1
+            return
+        adapter = self.lighter_adapter
+        if adapter is not None and _valid(snap.price) and snap.price_ts > adapter._price_cache_time.get(symbol, 0):
+            adapter._price_cache[symbol] = snap.price
+            adapter._price_cache_time[symbol] = snap.price_ts
+        if self.oi_tracker is not None and _valid(snap.open_interest) and snap.oi_ts > self._oi_ts.get(symbol, 0):
+            self._oi_ts[symbol] = snap.oi_ts
+            self.oi_tracker.update_from_websocket(symbol, "lighter", snap.open_interest)
+
+    def get_stats(self) -> Dict[str, Any]:
+        applied = self._stats["applied"]
+        heartbeat = self.table.writer_heartbeat() if self.table is not None else 0.0
+        return {
+            **self._stats,
+            "alive": self.is_alive(),
+            "pid": self._process.pid if self._process is not None else None,
+            "markets": self.table.used if self.table is not None else 0,
+            "avg_lag_ms": round(self._lag_sum / applied * 1000, 3) if applied else 0.0,
+            "heartbeat_age_s": round(time.time() - heartbeat, 1) if heartbeat else None,
+            "reader": dict(self.reader.stats) if self.reader is not None else {},
+        }
@@ -0,0 +1,318 @@
+"""
+Order State Tracker - event-driven fill / cancel detection
+
+One place that knows the latest state of every order we are waiting on,
+fed by the exchange streams instead of REST polling:
+
+- X10: account stream order updates (status, filledQty, averagePrice),
+  trade notifications (individual fills) and position updates
+- Lighter: account_all stream position updates and the REST/Ghost-Guardian
+  position callbacks. Lighter order ids returned by the adapter are tx
+  hashes, so Lighter fills are attributed via the position of the symbol
+  the order was placed on.
+
+Callers ``await tracker.wait(exchange, order_id, predicate, timeout)``; the
+waiter wakes up on the update that satisfies the predicate. REST is only a
+slow safety net (``rest_check`` every ``ORDER_TRACKER_REST_INTERVAL`` seconds)
+for missed stream messages.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+FILLED_STATUSES = {"FILLED"}
+DEAD_STATUSES = {"CANCELLED", "CANCELED", "REJECTED", "EXPIRED"}
+TERMINAL_STATUSES = FILLED_STATUSES | DEAD_STATUSES
+
+
+@dataclass
+class OrderState:
+    """Latest known state of one order (plus the position on its symbol)."""
+    exchange: str
+    order_id: str
+    symbol: str = ""
+    status: str = "UNKNOWN"
+    filled_qty: float = 0.0
+    avg_price: float = 0.0
+    fee: float = 0.0
+    position_size: Optional[float] = None  # abs size, None = no position update seen yet
+    is_ghost: bool = False
+    source: str = ""
+    updated_at: float = 0.0
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_filled(self) -> bool:
+        return self.status in FILLED_STATUSES
+
+    @property
+    def is_dead(self) -> bool:
+        return self.status in DEAD_STATUSES
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+Predicate = Callable[[OrderState], bool]
+
+
+class OrderStateTracker:
+    """Stream-fed order states with ``wait(order_id, predicate)``."""
+
+    MAX_ORDERS = 2000
+
+    def __init__(self, rest_interval: Optional[float] = None):
+        self.rest_interval = float(
+            rest_interval if rest_interval is not None else getattr(config, 'ORDER_TRACKER_REST_INTERVAL', 5.0)
+        )
+        self._orders: "OrderedDict[Tuple[str, str], OrderState]" = OrderedDict()
+        self._by_symbol: Dict[Tuple[str, str], Set[str]] = {}
+        self._seen_fills: Set[Tuple[str, str]] = set()
+        self._waiters: Dict[Tuple[str, str], List[Tuple[Predicate, asyncio.Future]]] = {}
+        self._position_listeners: List[Callable[..., None]] = []
+        self._stats = {"updates": 0, "fills": 0, "positions": 0, "woken_by_stream": 0, "woken_by_rest": 0,
+                       "rest_checks": 0, "timeouts": 0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Feeding (stream handlers / REST safety net)
+    # ═══════════════════════════════════════════════════════════════
+
+    def track(self, exchange: str, order_id: str, symbol: str = "") -> OrderState:
+        """Get or create the state for an order and link it to its symbol."""
+        key = (exchange, str(order_id))
+        state = self._orders.get(key)
+        if state is None:
+            state = OrderState(exchange=exchange, order_id=str(order_id), updated_at=time.time())
+            self._orders[key] = state
+            self._prune()
+        if symbol and not state.symbol:
+            state.symbol = symbol
+            self._by_symbol.setdefault((exchange, symbol), set()).add(state.order_id)
+        return state
+
+    def update_order(
+        self,
+        exchange: str,
+        order_id: str,
+        status: Optional[str] = None,
+        symbol: str = "",
+        filled_qty: Optional[float] = None,
+        avg_price: Optional[float] = None,
+        data: Optional[dict] = None,
+        source: str = "ws",
+    ) -> Optional[OrderState]:
+        """Apply an order status update. Terminal states never regress."""
+        if not order_id:
+            return None
+        state = self.track(exchange, order_id, symbol)
+        status = (status or "").upper()
+        if status and not state.is_terminal:
+            state.status = status
+        if filled_qty is not None and filled_qty > state.filled_qty:
+            state.filled_qty = filled_qty
+        if avg_price:
+            state.avg_price = avg_price
+        if data:
+            state.data = data
+        self._touch(state, source)
+        self._stats["updates"] += 1
+        self._notify(state)
+        return state
+
+    def record_fill(
+        self,
+        exchange: str,
+        order_id: str,
+        qty: float,
+        price: float,
+        symbol: str = "",
+        fee: float = 0.0,
+        trade_id: Optional[str] = None,
+        source: str = "ws",
+    ) -> Optional[OrderState]:
+        """Apply one individual fill (volume-weighted average price)."""
+        if not order_id or qty <= 0:
+            return None
+        if trade_id:
+            fill_key = (exchange, str(trade_id))
+            if fill_key in self._seen_fills:
+                return self._orders.get((exchange, str(order_id)))
+            self._seen_fills.add(fill_key)
+            if len(self._seen_fills) > self.MAX_ORDERS * 4:
+                self._seen_fills.clear()
+        state = self.track(exchange, order_id, symbol)
+        total = state.filled_qty + qty
+        if price > 0:
+            state.avg_price = (state.avg_price * state.filled_qty + price * qty) / total
+        state.filled_qty = total
+        state.fee += fee
+        if not state.is_terminal:
+            state.status = "PARTIALLY_FILLED"
+        self._touch(state, source)
+        self._stats["fills"] += 1
+        self._notify(state)
+        return state
+
+    def update_position(self, exchange: str, symbol: str, size: float, is_ghost: bool = False,
+                        source: str = "ws") -> None:
+        """Fan a position update out to all tracked, non-terminal orders on that symbol."""
+        order_ids = self._by_symbol.get((exchange, symbol))
+        self._stats["positions"] += 1
+        for listener in self._position_listeners:
+            try:
+                listener(exchange, symbol, size, is_ghost=is_ghost)
+            except Exception as e:
+                logger.debug(f"[ORDER-TRACKER] position listener error {exchange}:{symbol}: {e}")
+        if not order_ids:
+            return
+        for order_id in list(order_ids):
+            state = self._orders.get((exchange, order_id))
+            if state is None or state.is_terminal:
+                continue
+            state.position_size = abs(size)
+            state.is_ghost = is_ghost
+            self._touch(state, source)
+            self._notify(state)
+
+    def add_position_listener(self, listener: Callable[..., None]) -> None:
+        """Also hand every position update to ``listener(exchange, symbol, size, is_ghost=...)``."""
+        if listener not in self._position_listeners:
+            self._position_listeners.append(listener)
+
+    def get(self, exchange: str, order_id: str) -> Optional[OrderState]:
+        return self._orders.get((exchange, str(order_id)))
+
+    def forget(self, exchange: str, order_id: str) -> None:
+        key = (exchange, str(order_id))
+        if self._waiters.get(key):
+            return
+        state = self._orders.pop(key, None)
+        if state is not None and state.symbol:
+            ids = self._by_symbol.get((exchange, state.symbol))
+            if ids is not None:
+                ids.discard(state.order_id)
+                if not ids:
+                    del self._by_symbol[(exchange, state.symbol)]
+
+    def _touch(self, state: OrderState, source: str) -> None:
+        state.updated_at = time.time()
+        state.source = source
+        self._orders.move_to_end((state.exchange, state.order_id))
+
+    def _prune(self) -> None:
+        while len(self._orders) > self.MAX_ORDERS:
+            oldest = next(iter(self._orders))
+            if self._waiters.get(oldest):
+                self._orders.move_to_end(oldest)
+                return
+            self.forget(*oldest)
+
+    def _notify(self, state: OrderState) -> None:
+        waiters = self._waiters.get((state.exchange, state.order_id))
+        if not waiters:
+            return
+        for predicate, future in waiters:
+            if future.done():
+                continue
+            try:
+                if predicate(state):
+                    future.set_result(state)
+            except Exception as e:
+                logger.debug(f"[ORDER-TRACKER] predicate error {state.exchange}:{state.order_id}: {e}")
+
+    # ═══════════════════════════════════════════════════════════════
+    # Waiting
+    # ═══════════════════════════════════════════════════════════════
+
+    async def wait(
+        self,
+        exchange: str,
+        order_id: str,
+        predicate: Predicate,
+        timeout: float,
+        symbol: str = "",
+        rest_check: Optional[Callable[[], Awaitable[None]]] = None,
+        rest_interval: Optional[float] = None,
+    ) -> Optional[OrderState]:
+        """
+        Wait until ``predicate(state)`` holds for the order.
+
+        Returns the matching state, or None on timeout / shutdown.
+        ``rest_check`` is awaited every ``rest_interval`` seconds and is
+        expected to feed the tracker (update_order / update_position).
+        """
+        state = self.track(exchange, order_id, symbol)
+        key = (exchange, state.order_id)
+        if predicate(state):
+            return state
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        entry = (predicate, future)
+        self._waiters.setdefault(key, []).append(entry)
+
+        interval = self.rest_interval if rest_interval is None else rest_interval
+        deadline = time.monotonic() + timeout
+        next_rest = time.monotonic() + interval
+        try:
+            while not future.done():
+                now = time.monotonic()
+                if now >= deadline:
+                    self._stats["timeouts"] += 1
+                    return None
+                if getattr(config, "IS_SHUTTING_DOWN", False):
+                    return None
+                # Wake up at the latest every 0.5s for the shutdown flag (no I/O)
+                slice_s = min(deadline - now, 0.5)
+                if rest_check is not None and interval > 0:
+                    slice_s = min(slice_s, max(0.0, next_rest - now))
+                await asyncio.wait({future}, timeout=slice_s)
+                if future.done():
+                    break
+                if rest_check is not None and interval > 0 and time.monotonic() >= next_rest:
+                    self._stats["rest_checks"] += 1
+                    try:
+                        await rest_check()
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.debug(f"[ORDER-TRACKER] REST check {exchange}:{order_id} failed: {e}")
+                    next_rest = time.monotonic() + interval
+                    if future.done():
+                        self._stats["woken_by_rest"] += 1
+                        return future.result()
+            self._stats["woken_by_stream"] += 1
+            return future.result()
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters is not None:
+                if entry in waiters:
+                    waiters.remove(entry)
+                if not waiters:
+                    del self._waiters[key]
+            if not future.done():
+                future.cancel()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "tracked": len(self._orders),
+                "waiting": sum(len(w) for w in self._waiters.values())}
+
+
+_default_tracker: Optional[OrderStateTracker] = None
+
+
+def get_order_tracker() -> OrderStateTracker:
+    """Get singleton order state tracker"""
+    global _default_tracker
+    if _default_tracker is None:
+        _default_tracker = OrderStateTracker()
+    return _default_tracker
@@ -5,6 +5,8 @@ This module provides a unified interface for orderbook data, handling:
 - WebSocket orderbook updates (real-time)
 - REST API fallback when WebSocket data is stale
 - Staleness tracking and caching
+- Per-symbol sequence tracking: gaps / reconnects resync only the affected
+  symbol (REST snapshot + replay of the deltas buffered during the fetch)
 
 References:
 - Lighter WebSocket: https://apidocs.lighter.xyz/docs/websocket-reference
@@ -13,12 +15,17 @@ References:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Set
 from decimal import Decimal
 import time
 import asyncio
 import logging
 
+try:
+    import config
+except ImportError:  # pragma: no cover - provider is usable standalone
+    config = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +72,29 @@ class OrderbookSnapshot:
         return sum(p * s for p, s in self.asks)
 
 
+@dataclass
+class _BookDelta:
+    """WS orderbook delta (absolute level sizes, size 0 = remove level)"""
+    bids: List[Tuple[Decimal, Decimal]]
+    asks: List[Tuple[Decimal, Decimal]]
+    sequence: Optional[int] = None
+    prev_sequence: Optional[int] = None
+
+
+def _levels(rows) -> List[Tuple[Decimal, Decimal]]:
+    out = []
+    for row in rows or []:
+        try:
+            if isinstance(row, dict):
+                price, size = row.get("price"), row.get("size", row.get("amount"))
+            else:
+                price, size = row[0], row[1]
+            out.append((Decimal(str(price)), Decimal(str(size))))
+        except (ArithmeticError, IndexError, KeyError, TypeError, ValueError):
+            continue
+    return out
+
+
 class OrderbookProvider:
     """
     Provides orderbook data with staleness tracking and validation.
@@ -90,6 +120,11 @@ class OrderbookProvider:
     MAX_CROSSED_BOOK_RETRIES = 3  # Max REST retries when crossed book detected
     CROSSED_BOOK_RETRY_DELAY = 0.5  # Delay between retries
     
+    # ═══════════════════════════════════════════════════════════════
+    # Gap-aware resync (per symbol instead of blanket cooldown)
+    # ═══════════════════════════════════════════════════════════════
+    MAX_RESYNC_BUFFER = 500  # Deltas buffered per symbol while the REST snapshot is in flight
+    
     def __init__(
         self,
         lighter_adapter=None,
@@ -123,6 +158,23 @@ class OrderbookProvider:
         # Last REST fetch timestamps (rate limiting)
         self._last_rest_fetch: Dict[str, float] = {}
         self._rest_cooldown = 1.0  # Minimum 1s between REST calls per symbol
+        
+        # ═══════════════════════════════════════════════════════════════
+        # Sequence tracking - keys are "exchange:symbol"
+        # ═══════════════════════════════════════════════════════════════
+        self.gap_aware_resync = bool(getattr(config, 'OB_GAP_AWARE_RESYNC', True))
+        self._sequences: Dict[str, int] = {}  # Last applied sequence per book
+        self._levels: Dict[str, Tuple[Dict[Decimal, Decimal], Dict[Decimal, Decimal]]] = {}
+        self._unverified: Set[str] = set()  # Reconnected, continuity not proven yet
+        self._resync_buffers: Dict[str, List[_BookDelta]] = {}  # Snapshot fetch in flight
+        self._resync_tasks: Dict[str, asyncio.Task] = {}
+        self._resync_overflow: Set[str] = set()
+        self._sync_stats = {"deltas": 0, "gaps": 0, "resyncs": 0, "replayed": 0, "stale_dropped": 0}
+        
+        # Shared in-flight REST fetches (one request per symbol) + background refresher
+        self._rest_inflight: Dict[str, asyncio.Future] = {}
+        self._rest_shared = 0
+        self.refresher = None  # OrderbookRefresher, attached by init_orderbook_provider
     
     # ═══════════════════════════════════════════════════════════════
     # Reconnect Cooldown and Invalidation Methods
@@ -146,7 +198,12 @@ class OrderbookProvider:
             reason: Reason for invalidation (for logging)
             exchange: Optional - only invalidate "lighter" or "x10" orderbooks
         """
+        if self.gap_aware_resync:
+            self._mark_unverified(reason, exchange)
+            return
+
         logger.warning(f"🔄 Invalidating orderbooks: {reason}")
+        self._request_refresh_all(exchange)
         
         if exchange is None or exchange == "lighter":
             # Clear the actual cached data (not just validity flags)
@@ -155,6 +212,9 @@ class OrderbookProvider:
             for key in list(self._is_valid.keys()):
                 if key.startswith("lighter:"):
                     del self._is_valid[key]
+            for key in [k for k in self._levels if k.startswith("lighter:")]:
+                del self._levels[key]
+                self._sequences.pop(key, None)
             # Also clear crossed book tracking
             for key in list(self._crossed_book_counts.keys()):
                 if key.startswith("lighter:"):
@@ -179,14 +239,56 @@ class OrderbookProvider:
             f"WebSocket deltas will be IGNORED until REST snapshots are fetched"
         )
     
-    def is_in_cooldown(self) -> bool:
+    def _mark_unverified(self, reason: str, exchange: Optional[str] = None):
+        """
+        Gap-aware reconnect handling: keep the books, but block trading per
+        symbol until each one is proven consistent - either the first delta
+        after the reconnect continues the last sequence, or a REST snapshot
+        (+ replay of buffered deltas) has been applied.
+        """
+        affected = 0
+        for ex, books in (("lighter", self._lighter_orderbooks), ("x10", self._x10_orderbooks)):
+            if exchange is not None and exchange != ex:
+                continue
+            for symbol in books:
+                key = f"{ex}:{symbol}"
+                self._unverified.add(key)
+                self._is_valid[key] = False
+                affected += 1
+        logger.warning(
+            f"🔄 Orderbooks pending resync ({reason}): {affected} {exchange or 'all'} symbol(s) - "
+            f"trading resumes per symbol once its book is consistent"
+        )
+        self._request_refresh_all(exchange)
+
+    def _request_refresh_all(self, exchange: Optional[str] = None):
+        """Hand every known book of the exchange(s) to the background refresher."""
+        if self.refresher is None:
+            return
+        for ex, books in (("lighter", self._lighter_orderbooks), ("x10", self._x10_orderbooks)):
+            if exchange is None or exchange == ex:
+                self.refresher.request_many(ex, list(books))
+
+    def is_in_cooldown(self, symbol: Optional[str] = None, exchange: str = "lighter") -> bool:
         """
         Check if we're in post-reconnect cooldown.
         
+        With a symbol, also True while that book awaits its resync
+        (gap-aware mode has no blanket cooldown).
+        
         Returns:
             True if still in cooldown period, False otherwise
         """
-        return time.time() < self._reconnect_cooldown_until
+        if time.time() < self._reconnect_cooldown_until:
+            return True
+        if symbol is None:
+            return False
+        return self.needs_resync(symbol, exchange)
+
+    def needs_resync(self, symbol: str, exchange: str = "lighter") -> bool:
+        """True while the symbol's book is unverified after a reconnect/gap or resyncing."""
+        key = f"{exchange}:{symbol}"
+        return key in self._unverified or key in self._resync_buffers
     
     def get_cooldown_remaining(self) -> float:
         """Get remaining cooldown time in seconds"""
@@ -215,6 +317,8 @@ class OrderbookProvider:
         if self.is_in_cooldown():
             remaining = self.get_cooldown_remaining()
             return False, f"Post-reconnect cooldown ({remaining:.1f}s remaining)"
+        if self.needs_resync(symbol, exchange):
+            return False, "Orderbook resync pending (reconnect/sequence gap)"
         
         # Get orderbook cache based on exchange
         if exchange == "lighter":
@@ -252,17 +356,202 @@ class OrderbookProvider:
         timestamp: Optional[float] = None,
         sequence: Optional[int] = None,
     ):
-        """Update Lighter orderbook from WebSocket message"""
-        self._lighter_orderbooks[symbol] = OrderbookSnapshot(
+        """Update Lighter orderbook from WebSocket message (full snapshot)"""
+        self._install_lighter_snapshot(symbol, _levels(bids), _levels(asks), timestamp, sequence)
+        # Mark as valid after update
+        self._is_valid[f"lighter:{symbol}"] = True
+        self._unverified.discard(f"lighter:{symbol}")
+
+    # ═══════════════════════════════════════════════════════════════
+    # Sequenced delta merge (WS) + per-symbol REST resync
+    # ═══════════════════════════════════════════════════════════════
+
+    def _install_lighter_snapshot(
+        self,
+        symbol: str,
+        bids: List[Tuple[Decimal, Decimal]],
+        asks: List[Tuple[Decimal, Decimal]],
+        timestamp: Optional[float] = None,
+        sequence: Optional[int] = None,
+    ) -> OrderbookSnapshot:
+        key = f"lighter:{symbol}"
+        self._levels[key] = (
+            {p: q for p, q in bids if q > 0},
+            {p: q for p, q in asks if q > 0},
+        )
+        if sequence is None:
+            self._sequences.pop(key, None)
+        else:
+            self._sequences[key] = int(sequence)
+        return self._publish_levels(symbol, timestamp)
+
+    def _publish_levels(self, symbol: str, timestamp: Optional[float] = None) -> OrderbookSnapshot:
+        key = f"lighter:{symbol}"
+        bid_dict, ask_dict = self._levels[key]
+        snapshot = OrderbookSnapshot(
             symbol=symbol,
             exchange="lighter",
-            bids=[(Decimal(str(p)), Decimal(str(s))) for p, s in bids],
-            asks=[(Decimal(str(p)), Decimal(str(s))) for p, s in asks],
+            bids=sorted(bid_dict.items(), key=lambda x: x[0], reverse=True),
+            asks=sorted(ask_dict.items(), key=lambda x: x[0]),
             timestamp=timestamp or time.time(),
-            sequence=sequence,
+            sequence=self._sequences.get(key),
         )
-        # Mark as valid after update
-        self._is_valid[f"lighter:{symbol}"] = True
+        self._lighter_orderbooks[symbol] = snapshot
+        return snapshot
+
+    def _apply_levels(self, key: str, delta: _BookDelta) -> None:
+        bid_dict, ask_dict = self._levels[key]
+        for side, rows in ((bid_dict, delta.bids), (ask_dict, delta.asks)):
+            for price, size in rows:
+                if size > 0:
+                    side[price] = size
+                else:
+                    side.pop(price, None)
+        if delta.sequence is not None:
+            self._sequences[key] = int(delta.sequence)
+
+    def apply_lighter_delta(
+        self,
+        symbol: str,
+        bids,
+        asks,
+        sequence: Optional[int] = None,
+        prev_sequence: Optional[int] = None,
+    ) -> bool:
+        """
+        Apply a WS delta on top of the current book.
+        
+        Continuity: prev_sequence (if the feed provides it) must equal the
+        last applied sequence, otherwise sequence must be last + 1. A gap,
+        a missing base book or an unprovable post-reconnect delta triggers a
+        resync of THIS symbol only; deltas arriving meanwhile are buffered
+        and replayed on top of the REST snapshot.
+        
+        Returns:
+            True if the delta was applied to a consistent book
+        """
+        key = f"lighter:{symbol}"
+        delta = _BookDelta(_levels(bids), _levels(asks), sequence, prev_sequence)
+        self._sync_stats["deltas"] += 1
+
+        if key in self._resync_buffers:
+            self._buffer_delta(key, delta)
+            return False
+
+        if key not in self._levels:
+            self._start_resync(symbol, delta, reason="no base snapshot")
+            return False
+
+        last = self._sequences.get(key)
+        if last is not None and sequence is not None and int(sequence) <= last:
+            self._sync_stats["stale_dropped"] += 1
+            return False
+
+        expected_prev = prev_sequence if prev_sequence is not None else (
+            int(sequence) - 1 if sequence is not None else None
+        )
+        continuous = last is not None and expected_prev is not None and int(expected_prev) == last
+        if last is not None and expected_prev is not None and not continuous:
+            self._sync_stats["gaps"] += 1
+            self._start_resync(symbol, delta, reason=f"sequence gap ({last} -> {expected_prev})")
+            return False
+        if key in self._unverified and not continuous:
+            self._start_resync(symbol, delta, reason="continuity after reconnect not provable")
+            return False
+
+        self._apply_levels(key, delta)
+        snapshot = self._publish_levels(symbol)
+        if snapshot.best_bid and snapshot.best_ask and snapshot.best_ask <= snapshot.best_bid:
+            self._start_resync(symbol, None, reason="crossed after delta")
+            return False
+        self._unverified.discard(key)
+        self._is_valid[key] = True
+        return True
+
+    def _buffer_delta(self, key: str, delta: _BookDelta) -> None:
+        buf = self._resync_buffers[key]
+        if len(buf) >= self.MAX_RESYNC_BUFFER:
+            # Snapshot too slow for this feed rate - run another resync afterwards
+            buf.clear()
+            self._resync_overflow.add(key)
+        buf.append(delta)
+
+    def _start_resync(self, symbol: str, first_delta: Optional[_BookDelta], reason: str) -> None:
+        key = f"lighter:{symbol}"
+        self._is_valid[key] = False
+        if key in self._resync_buffers:
+            if first_delta is not None:
+                self._buffer_delta(key, first_delta)
+            return
+        self._resync_buffers[key] = [first_delta] if first_delta is not None else []
+        logger.info(f"🔁 [{symbol}] Orderbook resync: {reason}")
+        try:
+            self._resync_tasks[key] = asyncio.get_running_loop().create_task(
+                self._resync_lighter(symbol), name=f"ob_resync:{symbol}"
+            )
+        except RuntimeError:
+            # No running loop (sync caller) - next get_lighter_orderbook() resyncs
+            self._resync_buffers.pop(key, None)
+            self._unverified.add(key)
+
+    async def resync_lighter_symbol(self, symbol: str) -> Optional[OrderbookSnapshot]:
+        """Resync one symbol (REST snapshot + buffered delta replay) and wait for it."""
+        key = f"lighter:{symbol}"
+        if key not in self._resync_buffers:
+            self._start_resync(symbol, None, reason="requested")
+        task = self._resync_tasks.get(key)
+        if task is not None:
+            await asyncio.shield(task)
+        return self._lighter_orderbooks.get(symbol) if self._is_valid.get(key) else None
+
+    async def _resync_lighter(self, symbol: str) -> None:
+        key = f"lighter:{symbol}"
+        try:
+            while True:
+                self._sync_stats["resyncs"] += 1
+                self._resync_overflow.discard(key)
+                snapshot = await self.fetch_orderbook_rest_fallback(symbol, "lighter", retry_on_crossed=True)
+                if snapshot is None:
+                    self._unverified.add(key)
+                    self._is_valid[key] = False
+                    return
+
+                # No await between here and the end of the replay: atomic w.r.t. WS deltas
+                self._install_lighter_snapshot(
+                    symbol, snapshot.bids, snapshot.asks, snapshot.timestamp, snapshot.sequence
+                )
+                buffered = self._resync_buffers.get(key, [])
+                for delta in buffered:
+                    if snapshot.sequence is not None and delta.sequence is not None \
+                            and int(delta.sequence) <= snapshot.sequence:
+                        continue
+                    self._apply_levels(key, delta)
+                    self._sync_stats["replayed"] += 1
+                buffered.clear()
+                if key in self._resync_overflow:
+                    continue
+
+                book = self._publish_levels(symbol, snapshot.timestamp)
+                if book.best_bid and book.best_ask and book.best_ask <= book.best_bid:
+                    logger.warning(f"⚠️ [{symbol}] Crossed after delta replay - book stays invalid")
+                    self._unverified.add(key)
+                    self._is_valid[key] = False
+                    return
+                self._unverified.discard(key)
+                self._is_valid[key] = True
+                logger.debug(f"✅ [{symbol}] Orderbook resynced (seq={self._sequences.get(key)})")
+                return
+        finally:
+            self._resync_buffers.pop(key, None)
+            self._resync_tasks.pop(key, None)
+
+    def get_sync_stats(self) -> Dict:
+        return {
+            **self._sync_stats,
+            "unverified": len(self._unverified),
+            "resyncing": len(self._resync_buffers),
+            "rest_shared": self._rest_shared,
+        }
         
     def update_x10_orderbook(
         self,
@@ -287,6 +576,28 @@ class OrderbookProvider:
         symbol: str,
         exchange: str,
         retry_on_crossed: bool = True,
+    ) -> Optional[OrderbookSnapshot]:
+        """
+        Fetch fresh orderbook via REST - concurrent callers for the same
+        symbol share one in-flight request (see _fetch_orderbook_rest_fallback).
+        """
+        key = f"{exchange}:{symbol}"
+        fut = self._rest_inflight.get(key)
+        if fut is None or fut.done():
+            fut = asyncio.ensure_future(self._fetch_orderbook_rest_fallback(symbol, exchange, retry_on_crossed))
+            self._rest_inflight[key] = fut
+            fut.add_done_callback(
+                lambda f, k=key: self._rest_inflight.pop(k, None) if self._rest_inflight.get(k) is f else None
+            )
+        else:
+            self._rest_shared += 1
+        return await asyncio.shield(fut)
+
+    async def _fetch_orderbook_rest_fallback(
+        self,
+        symbol: str,
+        exchange: str,
+        retry_on_crossed: bool = True,
     ) -> Optional[OrderbookSnapshot]:
         """
         Fetch fresh orderbook via REST when WebSocket data is invalid.
@@ -377,6 +688,12 @@ class OrderbookProvider:
                             )
                             self._lighter_orderbooks[symbol] = snapshot
                             self._is_valid[f"lighter:{symbol}"] = True
+                            if f"lighter:{symbol}" not in self._resync_buffers:
+                                # Direct fetch (no deltas buffered): the snapshot is the new base
+                                snapshot = self._install_lighter_snapshot(
+                                    symbol, snapshot.bids, snapshot.asks, snapshot.timestamp
+                                )
+                                self._unverified.discard(f"lighter:{symbol}")
                             logger.info(f"✅ {symbol} REST fallback successful - orderbook restored")
                             return snapshot
                             
@@ -410,6 +727,7 @@ class OrderbookProvider:
                             )
                             self._x10_orderbooks[symbol] = snapshot
                             self._is_valid[f"x10:{symbol}"] = True
+                            self._unverified.discard(f"x10:{symbol}")
                             logger.info(f"✅ {symbol} REST fallback successful")
                             return snapshot
                         
@@ -449,6 +767,9 @@ class OrderbookProvider:
             # During cooldown, we MUST fetch from REST to get a valid base snapshot
             logger.debug(f"⏸️ [{symbol}] In post-reconnect cooldown ({remaining:.1f}s) - forcing REST fetch")
             force_refresh = True
+        elif self.needs_resync(symbol, "lighter"):
+            # Gap-aware mode: only this symbol waits for its snapshot (+ delta replay)
+            return await self.resync_lighter_symbol(symbol)
         
         # Check WebSocket cache first (if not in cooldown)
         cached = self._lighter_orderbooks.get(symbol)
@@ -556,6 +877,10 @@ class OrderbookProvider:
                         )
                         self._lighter_orderbooks[symbol] = snapshot
                         self._is_valid[f"lighter:{symbol}"] = True
+                        if f"lighter:{symbol}" not in self._resync_buffers:
+                            snapshot = self._install_lighter_snapshot(
+                                symbol, snapshot.bids, snapshot.asks, snapshot.timestamp
+                            )
                         logger.debug(f"📚 {symbol} Lighter orderbook refreshed via REST")
                         return snapshot
                     
@@ -573,6 +898,9 @@ class OrderbookProvider:
         force_refresh: bool = False,
     ) -> Optional[OrderbookSnapshot]:
         """Get X10 orderbook with REST fallback"""
+        if self.needs_resync(symbol, "x10"):
+            # Reconnected - cached/adapter data is unverified until a fresh snapshot arrives
+            force_refresh = True
         cached = self._x10_orderbooks.get(symbol)
         
         if cached and not force_refresh:
@@ -580,7 +908,7 @@ class OrderbookProvider:
                 return cached
                 
         # Try to get from adapter's cache
-        if self.x10_adapter and hasattr(self.x10_adapter, '_orderbook_cache'):
+        if self.x10_adapter and hasattr(self.x10_adapter, '_orderbook_cache') and not force_refresh:
             adapter_cache = self.x10_adapter._orderbook_cache.get(symbol)
             if adapter_cache:
                 cache_time = self.x10_adapter._orderbook_cache_time.get(symbol, 0)
@@ -621,6 +949,8 @@ class OrderbookProvider:
                             timestamp=time.time(),
                         )
                         self._x10_orderbooks[symbol] = snapshot
+                        self._unverified.discard(f"x10:{symbol}")
+                        self._is_valid[f"x10:{symbol}"] = True
                         return snapshot
                     
             except Exception as e:
@@ -648,6 +978,9 @@ class OrderbookProvider:
         """Clear orderbook cache"""
         if exchange is None or exchange == "lighter":
             self._lighter_orderbooks.clear()
+            for key in [k for k in self._levels if k.startswith("lighter:")]:
+                del self._levels[key]
+                self._sequences.pop(key, None)
         if exchange is None or exchange == "x10":
             self._x10_orderbooks.clear()
 
@@ -672,7 +1005,7 @@ def get_orderbook_provider() -> OrderbookProvider:
 
 
 def init_orderbook_provider(lighter_adapter, x10_adapter, ws_manager=None) -> OrderbookProvider:
-    """Initialize orderbook provider with adapters"""
+    """Initialize orderbook provider with adapters (+ background refresher)"""
     global _default_provider
     try:
         import config
@@ -683,6 +1016,9 @@ def init_orderbook_provider(lighter_adapter, x10_adapter, ws_manager=None) -> Or
             max_staleness_seconds=getattr(config, 'OB_MAX_STALENESS_SECONDS', 5.0),
             rest_fallback_enabled=getattr(config, 'OB_REST_FALLBACK_ENABLED', True),
         )
+        if getattr(config, 'OB_REFRESH_ENABLED', True):
+            from src.infrastructure.orderbook_refresher import OrderbookRefresher
+            _default_provider.refresher = OrderbookRefresher(_default_provider)
     except ImportError:
         _default_provider = OrderbookProvider(
             lighter_adapter=lighter_adapter,
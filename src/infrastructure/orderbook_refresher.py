@@ -0,0 +1,300 @@
+"""
+Orderbook Refresher - background REST refresh for stale / unverified books
+
+When a reconnect invalidates many books, callers used to fetch them one at a
+time on demand. The refresher fetches them in the background instead:
+
+- Priority by trading relevance: open positions first, then the top-ranked
+  candidates of the last opportunity scan, then everything else
+- Explicit per-exchange request budget: a fixed worker pool (concurrency)
+  plus a token bucket (requests/second) per exchange
+- One request per symbol: queued duplicates are merged, in-flight fetches
+  are shared via OrderbookProvider.fetch_orderbook_rest_fallback
+- Failed/crossed books are re-queued with a short delay instead of sleeping
+  inside a budget slot
+- A periodic sweep keeps books of relevant symbols fresh
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import config
+from src.infrastructure.rate_limiter import RateLimiterConfig, TokenBucketRateLimiter
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES = ("lighter", "x10")
+
+PRIO_POSITION = 0
+PRIO_CANDIDATE = 1
+PRIO_OTHER = 2
+
+
+class OrderbookRefresher:
+    """Budgeted, prioritized, deduplicating background refresher for one OrderbookProvider."""
+
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY = 1.0
+
+    def __init__(
+        self,
+        provider,
+        concurrency: Optional[Dict[str, int]] = None,
+        rps: Optional[Dict[str, float]] = None,
+        top_candidates: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        self.provider = provider
+        self.concurrency = concurrency or {
+            "lighter": int(getattr(config, 'OB_REFRESH_LIGHTER_CONCURRENCY', 6)),
+            "x10": int(getattr(config, 'OB_REFRESH_X10_CONCURRENCY', 8)),
+        }
+        rps = rps or {
+            "lighter": float(getattr(config, 'OB_REFRESH_LIGHTER_RPS', 10.0)),
+            "x10": float(getattr(config, 'OB_REFRESH_X10_RPS', 15.0)),
+        }
+        self._budgets = {
+            ex: TokenBucketRateLimiter(
+                RateLimiterConfig(tokens_per_second=rps[ex], max_tokens=max(1.0, rps[ex]), min_request_interval=0.0),
+                name=f"ob_refresh_{ex}",
+            )
+            for ex in EXCHANGES
+        }
+        self.top_candidates = int(
+            top_candidates if top_candidates is not None else getattr(config, 'OB_REFRESH_TOP_CANDIDATES', 20)
+        )
+        self.sweep_interval = float(
+            sweep_interval if sweep_interval is not None else getattr(config, 'OB_REFRESH_SWEEP_INTERVAL', 2.0)
+        )
+
+        # Relevance (set by the logic loop)
+        self._positions: Set[str] = set()
+        self._candidate_rank: Dict[str, int] = {}
+
+        # Per-exchange priority queue with lazy deletion: (prio, rank, seq, symbol)
+        self._heaps: Dict[str, List[Tuple[int, int, int, str]]] = {ex: [] for ex in EXCHANGES}
+        self._queued: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._not_before: Dict[Tuple[str, str], float] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._in_progress: Set[Tuple[str, str]] = set()
+        self._seq = itertools.count()
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+        self._stats = {"requested": 0, "merged": 0, "fetched": 0, "skipped_fresh": 0, "failed": 0, "requeued": 0}
+        self._burst_started: Optional[float] = None
+        self.last_burst_seconds: Optional[float] = None
+
+    # ═══════════════════════════════════════════════════════════════
+    # Relevance
+    # ═══════════════════════════════════════════════════════════════
+
+    def set_relevance(self, positions: Iterable[str] = (), candidates: Iterable[str] = ()) -> None:
+        """Open-position symbols and ranked candidate symbols (best first)."""
+        self._positions = set(positions)
+        ranked = [s for s in candidates if s not in self._positions][: self.top_candidates]
+        self._candidate_rank = {s: i for i, s in enumerate(ranked)}
+
+    def priority(self, symbol: str) -> Tuple[int, int]:
+        if symbol in self._positions:
+            return PRIO_POSITION, 0
+        rank = self._candidate_rank.get(symbol)
+        if rank is not None:
+            return PRIO_CANDIDATE, rank
+        return PRIO_OTHER, 0
+
+    # ═══════════════════════════════════════════════════════════════
+    # Queue
+    # ═══════════════════════════════════════════════════════════════
+
+    def request(self, exchange: str, symbol: str) -> bool:
+        """Queue a refresh. Returns False if it was merged into a queued/in-flight one."""
+        if exchange not in self._heaps:
+            return False
+        key = (exchange, symbol)
+        prio = self.priority(symbol)
+        self._stats["requested"] += 1
+        if key in self._in_progress:
+            self._stats["merged"] += 1
+            return False
+        queued = self._queued.get(key)
+        if queued is not None and queued <= prio:
+            self._stats["merged"] += 1
+            return False
+        # New entry (or priority upgrade - the old heap entry becomes stale)
+        self._queued[key] = prio
+        heapq.heappush(self._heaps[exchange], (prio[0], prio[1], next(self._seq), symbol))
+        if self._burst_started is None:
+            self._burst_started = time.monotonic()
+        self._ensure_started()
+        wakeup = self._wakeups.get(exchange)
+        if wakeup is not None:
+            wakeup.set()
+        return True
+
+    def request_many(self, exchange: str, symbols: Iterable[str]) -> int:
+        return sum(1 for s in symbols if self.request(exchange, s))
+
+    def pending(self, exchange: Optional[str] = None) -> int:
+        keys = self._queued.keys() | self._in_progress
+        return sum(1 for ex, _ in keys if exchange in (None, ex))
+
+    def _pop(self, exchange: str) -> Optional[str]:
+        heap = self._heaps[exchange]
+        deferred = []
+        now = time.monotonic()
+        symbol = None
+        while heap:
+            prio, rank, seq, sym = heapq.heappop(heap)
+            key = (exchange, sym)
+            if self._queued.get(key) != (prio, rank):
+                continue  # stale entry (merged / upgraded)
+            if self._not_before.get(key, 0.0) > now:
+                deferred.append((prio, rank, seq, sym))
+                continue
+            del self._queued[key]
+            symbol = sym
+            break
+        for item in deferred:
+            heapq.heappush(heap, item)
+        return symbol
+
+    def _next_retry_in(self, exchange: str) -> Optional[float]:
+        times = [t for key, t in self._not_before.items() if key[0] == exchange and key in self._queued]
+        if not times:
+            return None
+        return max(0.0, min(times) - time.monotonic())
+
+    # ═══════════════════════════════════════════════════════════════
+    # Workers
+    # ═══════════════════════════════════════════════════════════════
+
+    def _ensure_started(self) -> None:
+        if self._running:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._running = True
+        for ex in EXCHANGES:
+            self._wakeups[ex] = asyncio.Event()
+            for i in range(max(1, self.concurrency.get(ex, 1))):
+                self._tasks.append(loop.create_task(self._worker(ex), name=f"ob_refresh:{ex}:{i}"))
+        if self.sweep_interval > 0:
+            self._tasks.append(loop.create_task(self._sweep_loop(), name="ob_refresh:sweep"))
+
+    async def _worker(self, exchange: str) -> None:
+        wakeup = self._wakeups[exchange]
+        while self._running:
+            symbol = self._pop(exchange)
+            if symbol is None:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self._next_retry_in(exchange))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            key = (exchange, symbol)
+            self._in_progress.add(key)
+            try:
+                await self._refresh(exchange, symbol)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"[OB-REFRESH] {exchange}:{symbol} failed: {e}")
+                self._requeue(exchange, symbol)
+            finally:
+                self._in_progress.discard(key)
+                self._check_burst_done()
+
+    async def _refresh(self, exchange: str, symbol: str) -> None:
+        key = (exchange, symbol)
+        if self._is_fresh(exchange, symbol):
+            self._stats["skipped_fresh"] += 1
+            self._forget(key)
+            return
+
+        if await self._budgets[exchange].acquire() < 0:
+            return  # budget shut down
+
+        if exchange == "lighter" and self.provider.needs_resync(symbol, "lighter"):
+            snapshot = await self.provider.resync_lighter_symbol(symbol)
+        else:
+            snapshot = await self.provider.fetch_orderbook_rest_fallback(symbol, exchange, retry_on_crossed=False)
+
+        if snapshot is None:
+            self._requeue(exchange, symbol)
+        else:
+            self._stats["fetched"] += 1
+            self._forget(key)
+
+    def _is_fresh(self, exchange: str, symbol: str) -> bool:
+        if self.provider.needs_resync(symbol, exchange):
+            return False
+        books = self.provider._lighter_orderbooks if exchange == "lighter" else self.provider._x10_orderbooks
+        ob = books.get(symbol)
+        return ob is not None and ob.age_seconds < self.provider.max_staleness_seconds
+
+    def _requeue(self, exchange: str, symbol: str) -> None:
+        key = (exchange, symbol)
+        attempts = self._attempts.get(key, 0) + 1
+        if attempts >= self.MAX_ATTEMPTS:
+            self._stats["failed"] += 1
+            self._forget(key)
+            return
+        self._attempts[key] = attempts
+        self._not_before[key] = time.monotonic() + self.RETRY_DELAY * attempts
+        self._stats["requeued"] += 1
+        prio = self.priority(symbol)
+        self._queued[key] = prio
+        heapq.heappush(self._heaps[exchange], (prio[0], prio[1], next(self._seq), symbol))
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        self._attempts.pop(key, None)
+        self._not_before.pop(key, None)
+
+    def _check_burst_done(self) -> None:
+        if self._burst_started is not None and self.pending() == 0:
+            self.last_burst_seconds = time.monotonic() - self._burst_started
+            self._burst_started = None
+            logger.debug(f"[OB-REFRESH] queue drained in {self.last_burst_seconds:.2f}s")
+
+    async def _sweep_loop(self) -> None:
+        """Keep books of relevant symbols (positions + top candidates) fresh."""
+        while self._running:
+            await asyncio.sleep(self.sweep_interval)
+            for symbol in list(self._positions) + list(self._candidate_rank):
+                for ex in EXCHANGES:
+                    if not self._is_fresh(ex, symbol):
+                        self.request(ex, symbol)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queue is empty (tests / startup)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            "pending": self.pending(),
+            "last_burst_seconds": None if self.last_burst_seconds is None else round(self.last_burst_seconds, 3),
+        }
@@ -0,0 +1,252 @@
+"""
+Price Bootstrap - readiness-driven market data warm-up
+
+The WebSocketManager used to sleep a fixed 15s after connecting, then walk
+every symbol still missing a price one at a time via REST. The
+PriceBootstrap tracks per-symbol readiness instead:
+
+- price:   mark price > 0 in the adapter cache (X10 + Lighter)
+- funding: funding rate present in the adapter cache (X10 + Lighter)
+- book:    orderbook cached (informational, books are fetched on demand)
+
+Stream handlers call ``notify()``; coverage is re-evaluated on every wake-up.
+The universe is declared tradeable (``ready`` event) as soon as the share of
+common symbols with price + funding on both exchanges reaches
+PRICE_BOOTSTRAP_COVERAGE. Symbols still missing after the grace period
+(PRICE_BOOTSTRAP_GRACE_SECONDS, about one WebSocket round trip) are filled:
+one bulk market/funding load per exchange with gaps, then concurrent
+orderbook mid-price fetches for the rest (PRICE_BOOTSTRAP_CONCURRENCY;
+the adapter rate limiters budget the requests).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import config
+from src.utils import safe_float
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES = ("x10", "lighter")
+
+
+class PriceBootstrap:
+    """Per-symbol price / funding / book readiness with gap-only REST fill."""
+
+    def __init__(
+        self,
+        x10_adapter=None,
+        lighter_adapter=None,
+        coverage: Optional[float] = None,
+        grace_seconds: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.adapters = {"x10": x10_adapter, "lighter": lighter_adapter}
+        self.coverage_target = float(
+            coverage if coverage is not None else getattr(config, 'PRICE_BOOTSTRAP_COVERAGE', 0.95)
+        )
+        self.grace_seconds = float(
+            grace_seconds if grace_seconds is not None else getattr(config, 'PRICE_BOOTSTRAP_GRACE_SECONDS', 1.5)
+        )
+        self.concurrency = int(
+            concurrency if concurrency is not None else getattr(config, 'PRICE_BOOTSTRAP_CONCURRENCY', 8)
+        )
+        self.ready = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._started_at: Optional[float] = None
+        self._ready_at: Optional[float] = None
+        self._stats = {"notifications": 0, "bulk_loads": 0, "book_fetches": 0, "filled": 0, "failed": 0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Readiness
+    # ═══════════════════════════════════════════════════════════════
+
+    def universe(self) -> Set[str]:
+        x10, lighter = self.adapters["x10"], self.adapters["lighter"]
+        if x10 is None or lighter is None:
+            return set()
+        return set(getattr(x10, 'market_info', {}) or {}) & set(getattr(lighter, 'market_info', {}) or {})
+
+    def has_price(self, exchange: str, symbol: str) -> bool:
+        adapter = self.adapters.get(exchange)
+        try:
+            return safe_float(adapter.fetch_mark_price_sync(symbol), 0.0) > 0
+        except Exception:
+            return False
+
+    def has_funding(self, exchange: str, symbol: str) -> bool:
+        adapter = self.adapters.get(exchange)
+        return any(symbol in (getattr(adapter, attr, None) or {}) for attr in ("_funding_cache", "funding_cache"))
+
+    def has_book(self, exchange: str, symbol: str) -> bool:
+        adapter = self.adapters.get(exchange)
+        return bool((getattr(adapter, 'orderbook_cache', None) or {}).get(symbol))
+
+    def missing(self, kind: str, exchange: str, symbols: Optional[Iterable[str]] = None) -> List[str]:
+        check = self.has_price if kind == "price" else self.has_funding
+        return sorted(s for s in (symbols if symbols is not None else self.universe()) if not check(exchange, s))
+
+    def coverage(self) -> float:
+        universe = self.universe()
+        if not universe:
+            return 0.0
+        ok = sum(
+            1 for s in universe
+            if all(self.has_price(ex, s) and self.has_funding(ex, s) for ex in EXCHANGES)
+        )
+        return ok / len(universe)
+
+    def notify(self) -> None:
+        """Stream data arrived (called by the WebSocket message router)."""
+        if self.ready.is_set():
+            return
+        self._stats["notifications"] += 1
+        self._changed.set()
+
+    def _check_ready(self) -> bool:
+        if self.ready.is_set():
+            return True
+        coverage = self.coverage()
+        if coverage >= self.coverage_target:
+            self._mark_ready(coverage)
+            return True
+        return False
+
+    def _mark_ready(self, coverage: float) -> None:
+        self._ready_at = time.time()
+        elapsed = self._ready_at - (self._started_at or self._ready_at)
+        logger.info(
+            f"✅ Market data ready: {coverage:.0%} of {len(self.universe())} symbols priced + funded "
+            f"after {elapsed:.2f}s"
+        )
+        self.ready.set()
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the universe is tradeable (True) or the timeout hits (False)."""
+        if self.ready.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # ═══════════════════════════════════════════════════════════════
+    # Bootstrap
+    # ═══════════════════════════════════════════════════════════════
+
+    async def run(self) -> None:
+        """Wait for stream coverage (grace period), then fill only the remaining gaps.
+
+        ``ready`` is set at the coverage threshold; symbols still missing are
+        filled afterwards in the background.
+        """
+        self._started_at = time.time()
+        deadline = time.monotonic() + self.grace_seconds
+        while not self._check_ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=min(remaining, 0.25))
+            except asyncio.TimeoutError:
+                pass
+
+        await self.fill_gaps()
+        if not self._check_ready():
+            coverage = self.coverage()
+            logger.warning(
+                f"⚠️ Market data coverage {coverage:.0%} < {self.coverage_target:.0%} after gap fill - "
+                f"trading anyway, remaining prices come from the streams"
+            )
+            self._mark_ready(coverage)
+
+    async def fill_gaps(self) -> None:
+        universe = self.universe()
+        if not universe:
+            return
+
+        # 1) One bulk load per exchange that has price / funding gaps
+        bulk = []
+        for ex in EXCHANGES:
+            if self.missing("price", ex, universe) or self.missing("funding", ex, universe):
+                bulk.append(self._bulk_load(ex))
+        if bulk:
+            await asyncio.gather(*bulk, return_exceptions=True)
+            self._check_ready()
+
+        # 2) Concurrent orderbook mid-prices for the symbols still without a price
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        jobs = [
+            self._fill_from_book(ex, symbol, semaphore)
+            for ex in EXCHANGES for symbol in self.missing("price", ex, universe)
+        ]
+        if jobs:
+            logger.info(f"📊 Filling {len(jobs)} missing prices from orderbooks (concurrency {self.concurrency})")
+            await asyncio.gather(*jobs, return_exceptions=True)
+
+    async def _bulk_load(self, exchange: str) -> None:
+        adapter = self.adapters[exchange]
+        self._stats["bulk_loads"] += 1
+        try:
+            if exchange == "x10":
+                await adapter.load_market_cache(force=True)
+                # load_market_cache writes price_cache, readiness reads _price_cache
+                now = time.time()
+                for symbol, price in list((getattr(adapter, 'price_cache', None) or {}).items()):
+                    if safe_float(price, 0.0) > 0 and symbol not in adapter._price_cache:
+                        adapter._price_cache[symbol] = price
+                        adapter._price_cache_time[symbol] = now
+            else:
+                await adapter.load_funding_rates_and_prices()
+        except Exception as e:
+            logger.debug(f"[BOOTSTRAP] {exchange} bulk load failed: {e}")
+
+    async def _fill_from_book(self, exchange: str, symbol: str, semaphore: asyncio.Semaphore) -> None:
+        adapter = self.adapters[exchange]
+        async with semaphore:
+            if self.has_price(exchange, symbol) or getattr(config, 'IS_SHUTTING_DOWN', False):
+                return
+            self._stats["book_fetches"] += 1
+            try:
+                book = await adapter.fetch_orderbook(symbol, limit=20)
+                bids, asks = (book or {}).get('bids') or [], (book or {}).get('asks') or []
+                best_bid = safe_float(bids[0][0], 0.0) if bids else 0.0
+                best_ask = safe_float(asks[0][0], 0.0) if asks else 0.0
+                if best_bid > 0 and best_ask > best_bid:
+                    adapter._price_cache[symbol] = (best_bid + best_ask) / 2.0
+                    adapter._price_cache_time[symbol] = time.time()
+                    self._stats["filled"] += 1
+                    return
+            except Exception as e:
+                logger.debug(f"[BOOTSTRAP] {exchange} {symbol} orderbook fetch failed: {e}")
+            self._stats["failed"] += 1
+
+    def get_stats(self) -> Dict[str, object]:
+        universe = self.universe()
+        return {
+            **self._stats,
+            "symbols": len(universe),
+            "coverage": round(self.coverage(), 4),
+            "books": {ex: sum(1 for s in universe if self.has_book(ex, s)) for ex in EXCHANGES},
+            "ready": self.ready.is_set(),
+            "time_to_ready": (self._ready_at - self._started_at) if self._ready_at and self._started_at else None,
+        }
+
+
+_default_bootstrap: Optional[PriceBootstrap] = None
+
+
+def get_price_bootstrap() -> Optional[PriceBootstrap]:
+    """Get the bootstrap of the running WebSocketManager (None before start)"""
+    return _default_bootstrap
+
+
+def init_price_bootstrap(x10_adapter, lighter_adapter) -> PriceBootstrap:
+    """Create the singleton price bootstrap for the given adapters"""
+    global _default_bootstrap
+    _default_bootstrap = PriceBootstrap(x10_adapter, lighter_adapter)
+    return _default_bootstrap
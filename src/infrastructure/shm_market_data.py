@@ -0,0 +1,279 @@
+"""
+Shared Market Data - seqlock-protected shared-memory table for market data
+
+Layout of one ``multiprocessing.shared_memory`` block (single writer = the
+ingest process, any number of readers):
+
+- header:    magic, layout version, slot count, depth levels, used slots,
+             writer pid, writer heartbeat
+- seq array: one uint64 sequence number per slot (the seqlock)
+- key array: exchange + key (X10 symbol / Lighter market id) per slot,
+             written before ``used`` is raised, never changed afterwards
+- records:   price / funding / open interest with their receive timestamps,
+             best bid / ask and ``depth`` price levels per side (float64,
+             NaN = never received)
+
+Writer: seq -> odd, write the record, seq -> even. Reader: read seq (retry
+while odd), unpack the record straight from the shared buffer, re-read seq
+and retry if it moved. No pickling, no pipe, no lock - the strategy process
+reads the latest value of every market without waiting on the writer.
+"""
+
+import math
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MAGIC = 0x4D445348  # "MDSH"
+LAYOUT_VERSION = 1
+
+_HEADER = struct.Struct("<IIIIIId")  # magic, version, slots, depth, used, pid, heartbeat
+_HEADER_SIZE = 64
+_SEQ = struct.Struct("<Q")
+_KEY = struct.Struct("<8s40s")
+_FIELDS = 9  # price_ts, price, funding_ts, funding, oi_ts, open_interest, book_ts, bid, ask
+
+NAN = float("nan")
+
+Level = Tuple[float, float]
+
+
+class MarketSnapshot(NamedTuple):
+    """Consistent copy of one slot."""
+    exchange: str
+    key: str
+    seq: int
+    price_ts: float
+    price: float
+    funding_ts: float
+    funding: float
+    oi_ts: float
+    open_interest: float
+    book_ts: float
+    bid: float
+    ask: float
+    bids: Tuple[Level, ...]
+    asks: Tuple[Level, ...]
+
+
+def _valid(value: float) -> bool:
+    return value is not None and not math.isnan(value)
+
+
+class SharedMarketTable:
+    """Fixed-size slot table in shared memory (see module docstring for the layout)."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        magic, version, slots, depth, _, _, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            raise ValueError(f"{shm.name} is not a market data table (layout v{LAYOUT_VERSION})")
+        self.slots = slots
+        self.depth = depth
+        self._record = struct.Struct(f"<{_FIELDS + 4 * depth}d")
+        self._seq_off = _HEADER_SIZE
+        self._key_off = self._seq_off + _SEQ.size * slots
+        self._data_off = self._key_off + _KEY.size * slots
+        self._seq_view = self._buf[self._seq_off:self._key_off]
+        self._seqs = self._seq_view.cast("Q")
+        self._empty = (NAN,) * (_FIELDS + 4 * depth)
+        # Writer slot index; rebuilt from the key array when a restarted writer attaches
+        self._index: Dict[Tuple[str, str], int] = {self.key_of(slot): slot for slot in range(self.used)}
+
+    # ═══════════════════════════════════════════════════════════════
+    # Lifecycle
+    # ═══════════════════════════════════════════════════════════════
+
+    @classmethod
+    def create(cls, slots: int = 1024, depth: int = 5, name: Optional[str] = None) -> "SharedMarketTable":
+        record_size = 8 * (_FIELDS + 4 * depth)
+        size = _HEADER_SIZE + slots * (_SEQ.size + _KEY.size + record_size)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        _HEADER.pack_into(shm.buf, 0, MAGIC, LAYOUT_VERSION, slots, depth, 0, 0, 0.0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMarketTable":
+        # Child processes share the owner's resource tracker: only the owner unlinks
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        self._seqs.release()
+        self._seq_view.release()
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ═══════════════════════════════════════════════════════════════
+    # Header
+    # ═══════════════════════════════════════════════════════════════
+
+    def _header(self):
+        return _HEADER.unpack_from(self._buf, 0)
+
+    @property
+    def used(self) -> int:
+        return self._header()[4]
+
+    def heartbeat(self) -> None:
+        magic, version, slots, depth, used, _, _ = self._header()
+        _HEADER.pack_into(self._buf, 0, magic, version, slots, depth, used, os.getpid(), time.time())
+
+    def writer_heartbeat(self) -> float:
+        return self._header()[6]
+
+    def key_of(self, slot: int) -> Tuple[str, str]:
+        exchange, key = _KEY.unpack_from(self._buf, self._key_off + slot * _KEY.size)
+        return exchange.rstrip(b"\0").decode(), key.rstrip(b"\0").decode()
+
+    # ═══════════════════════════════════════════════════════════════
+    # Writer (single process)
+    # ═══════════════════════════════════════════════════════════════
+
+    def slot_for(self, exchange: str, key: str) -> Optional[int]:
+        """Slot of (exchange, key); the writer allocates a new one on first sight."""
+        slot = self._index.get((exchange, key))
+        if slot is not None:
+            return slot
+        used = self.used
+        if used >= self.slots:
+            return None
+        _KEY.pack_into(self._buf, self._key_off + used * _KEY.size, exchange.encode()[:8], key.encode()[:40])
+        self._record.pack_into(self._buf, self._data_off + used * self._record.size, *self._empty)
+        magic, version, slots, depth, _, pid, beat = self._header()
+        _HEADER.pack_into(self._buf, 0, magic, version, slots, depth, used + 1, pid, beat)  # publish the key
+        self._index[(exchange, key)] = used
+        return used
+
+    def update(
+        self,
+        exchange: str,
+        key: str,
+        price: Optional[float] = None,
+        funding: Optional[float] = None,
+        open_interest: Optional[float] = None,
+        bids: Optional[Sequence[Level]] = None,
+        asks: Optional[Sequence[Level]] = None,
+        ts: Optional[float] = None,
+    ) -> bool:
+        """Merge the given fields into the slot of (exchange, key). False = table full."""
+        slot = self.slot_for(exchange, key)
+        if slot is None:
+            return False
+        ts = ts if ts is not None else time.time()
+        offset = self._data_off + slot * self._record.size
+        values = list(self._record.unpack_from(self._buf, offset))  # own data, no seqlock needed
+        if price is not None:
+            values[0], values[1] = ts, float(price)
+        if funding is not None:
+            values[2], values[3] = ts, float(funding)
+        if open_interest is not None:
+            values[4], values[5] = ts, float(open_interest)
+        if bids is not None or asks is not None:
+            depth = self.depth
+            values[6] = ts
+            for side, levels, best in ((0, bids, 7), (1, asks, 8)):
+                if levels is None:
+                    continue
+                base = _FIELDS + side * 2 * depth
+                for i in range(depth):
+                    px, sz = (float(levels[i][0]), float(levels[i][1])) if i < len(levels) else (NAN, NAN)
+                    values[base + i], values[base + depth + i] = px, sz
+                values[best] = float(levels[0][0]) if levels else NAN
+
+        seqs = self._seqs
+        # "| 1": a writer that died mid-write leaves the seq odd - never flip the parity
+        seq = seqs[slot] | 1
+        seqs[slot] = seq  # odd: write in progress
+        self._record.pack_into(self._buf, offset, *values)
+        seqs[slot] = seq + 1
+        return True
+
+    # ═══════════════════════════════════════════════════════════════
+    # Reader (any process)
+    # ═══════════════════════════════════════════════════════════════
+
+    def seq(self, slot: int) -> int:
+        return self._seqs[slot]
+
+    def read(self, slot: int, retries: int = 100) -> Optional[MarketSnapshot]:
+        """Consistent snapshot of ``slot`` or None if the writer kept it busy for ``retries`` attempts."""
+        if slot >= self.used:
+            return None
+        seqs = self._seqs
+        offset = self._data_off + slot * self._record.size
+        for _ in range(retries):
+            before = seqs[slot]
+            if before & 1:
+                continue
+            values = self._record.unpack_from(self._buf, offset)
+            if seqs[slot] == before:
+                break
+        else:
+            return None
+
+        exchange, key = self.key_of(slot)
+        depth = self.depth
+        levels = []
+        for side in (0, 1):
+            base = _FIELDS + side * 2 * depth
+            levels.append(tuple(
+                (values[base + i], values[base + depth + i])
+                for i in range(depth) if _valid(values[base + i])
+            ))
+        return MarketSnapshot(exchange, key, before, *values[:_FIELDS], levels[0], levels[1])
+
+
+class MarketDataReader:
+    """Change tracking on top of a SharedMarketTable (one per consuming process / task)."""
+
+    def __init__(self, table: SharedMarketTable):
+        self.table = table
+        self._seen: List[int] = []
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self.stats = {"polls": 0, "updates": 0, "torn_reads": 0}
+
+    def _refresh_keys(self) -> int:
+        used = self.table.used
+        for slot in range(len(self._seen), used):
+            self._slots[self.table.key_of(slot)] = slot
+            self._seen.append(0)
+        return used
+
+    def poll(self) -> List[MarketSnapshot]:
+        """Snapshots of all slots written since the previous poll."""
+        self.stats["polls"] += 1
+        used = self._refresh_keys()
+        table, seen, changed = self.table, self._seen, []
+        for slot in range(used):
+            if table.seq(slot) == seen[slot]:
+                continue
+            snap = table.read(slot)
+            if snap is None:
+                self.stats["torn_reads"] += 1
+                continue
+            seen[slot] = snap.seq
+            changed.append(snap)
+        self.stats["updates"] += len(changed)
+        return changed
+
+    def get(self, exchange: str, key: str) -> Optional[MarketSnapshot]:
+        """Latest snapshot of one market (direct read, no change tracking)."""
+        slot = self._slots.get((exchange, key))
+        if slot is None:
+            self._refresh_keys()
+            slot = self._slots.get((exchange, key))
+        return self.table.read(slot) if slot is not None else None
@@ -10,7 +10,7 @@
 # ✓ Periodic Sync mit Database
 # ✓ Thread-safe mit asyncio Locks
 # ✓ Atomic Updates
-# ✓ Snapshot/Restore für Recovery
+# ✓ Snapshot/Restore für Recovery (Checkpoint + inkrementelle Deltas, off-loop)
 # ═══════════════════════════════════════════════════════════════════════════════
 
 import asyncio
@@ -102,6 +102,7 @@ class InMemoryStateManager:
     WRITE_FLUSH_INTERVAL = 1.0  # seconds
     SYNC_INTERVAL = 60.0  # Full sync every 60s
     SNAPSHOT_INTERVAL = 300.0  # Snapshot every 5 min
+    SNAPSHOT_CHECKPOINT_EVERY = 12  # Full checkpoint every 12 snapshots (1h), deltas in between
     
     def __init__(self, db_path: str = None):
         import config
@@ -131,6 +132,11 @@ class InMemoryStateManager:
         self._sync_task: Optional[asyncio.Task] = None
         self._snapshot_task: Optional[asyncio. Task] = None
         
+        # Snapshot state (checkpoint + delta log)
+        self._snapshot_lock = asyncio.Lock()
+        self._snapshot_seq = 0
+        self._deltas_since_checkpoint: Optional[int] = None  # None = no checkpoint yet
+        
         # Database reference
         self._db = None
         
@@ -294,12 +300,13 @@ class InMemoryStateManager:
         self,
         symbol: str,
         pnl: Union[float, Decimal] = 0.0,
-        funding: Union[float, Decimal] = 0.0
+        funding: Union[float, Decimal] = 0.0,
+        fees: Union[float, Decimal] = 0.0
     ) -> bool:
         """
-        Close a trade with PnL and funding values.
+        Close a trade with PnL, funding and (optional) fee values.
         
-        Accepts both float and Decimal for pnl/funding.
+        Accepts both float and Decimal for pnl/funding/fees.
         Internally converts to float for storage, using Decimal for precision.
         
         FIXED (2025-12-17): Wait for DB write to complete before removing from memory.
@@ -309,6 +316,7 @@ class InMemoryStateManager:
         # REMOVED quantize_usd to preserve precision for small PnL (e.g. < $0.01)
         pnl_value = float(safe_decimal(pnl))
         funding_value = float(safe_decimal(funding))
+        fees_value = float(safe_decimal(fees))
         
         # ✅ FIX: Enhanced logging to verify PnL values are being queued correctly
         logger.info(f"📝 StateManager.close_trade({symbol}): PnL=${pnl_value:.4f}, Funding=${funding_value:.4f}")
@@ -339,6 +347,7 @@ class InMemoryStateManager:
                 'closed_at': int(time.time() * 1000),
                 'pnl': pnl_value,
                 'funding_collected': funding_value,
+                'fees': fees_value,
             },
             wait=True  # CRITICAL: Wait for DB ack before memory removal
         )
@@ -349,7 +358,7 @@ class InMemoryStateManager:
         async with self._trade_lock:
             if symbol in self._trades:
                 del self._trades[symbol]
-                self._dirty_trades.discard(symbol)
+                self._dirty_trades.add(symbol)  # Snapshot delta records the removal
                 logger.debug(f"🧹 Removed closed trade {symbol} from memory (after DB ack)")
         
         return True
@@ -406,7 +415,7 @@ class InMemoryStateManager:
                 return False
             
             del self._trades[symbol]
-            self._dirty_trades.discard(symbol)
+            self._dirty_trades.add(symbol)  # Snapshot delta records the removal
         
         await self._queue_write(
             WriteOperation.DELETE,
@@ -765,6 +774,7 @@ class InMemoryStateManager:
                                 write.key,
                                 write.data.get("pnl", 0),
                                 write.data.get("funding_collected", 0),
+                                write.data.get("fees", 0),
                             )
                         else:
                             # Persist generic updates (order ids, entry prices, status transitions, funding totals, etc.)
@@ -917,55 +927,199 @@ class InMemoryStateManager:
             except Exception as e:
                 logger. error(f"Snapshot error: {e}")
 
-    async def _save_snapshot(self):
-        """Save state snapshot to disk"""
-        snapshot_path = Path(self. db_path). parent / "state_snapshot.json"
+    def _snapshot_paths(self) -> tuple:
+        base = Path(self.db_path).parent
+        return base / "state_snapshot.ckpt.jsonl", base / "state_snapshot.delta.jsonl"
+
+    async def _save_snapshot(self, force_checkpoint: bool = False):
+        """
+        Save state snapshot to disk.
         
-        try:
-            snapshot = {
-                "timestamp": int(time.time() * 1000),
-                "trades": {k: v.to_dict() for k, v in self._trades.items()},
-                "balances": {k: asdict(v) for k, v in self._balances.items()},
-                "bot_state": self._bot_state,
-            }
+        Only entries in the _dirty_* sets are captured (on the loop, cheap);
+        JSON encoding and file I/O run in the default executor. Every
+        SNAPSHOT_CHECKPOINT_EVERY snapshots (and on the first one after start)
+        a full checkpoint replaces the delta log.
+        """
+        async with self._snapshot_lock:
+            checkpoint = (
+                force_checkpoint
+                or self._deltas_since_checkpoint is None
+                or self._deltas_since_checkpoint >= self.SNAPSHOT_CHECKPOINT_EVERY
+            )
             
-            # Write atomically
-            temp_path = snapshot_path.with_suffix('.tmp')
-            with open(temp_path, 'w') as f:
-                json.dump(snapshot, f, indent=2)
-            temp_path.replace(snapshot_path)
+            # Capture + reset dirty sets atomically w.r.t. writers
+            async with self._trade_lock, self._balance_lock, self._state_lock:
+                dirty_trades, self._dirty_trades = self._dirty_trades, set()
+                dirty_balances, self._dirty_balances = self._dirty_balances, set()
+                dirty_state, self._dirty_bot_state = self._dirty_bot_state, set()
+                
+                if checkpoint:
+                    trades = {k: v.to_dict() for k, v in self._trades.items()}
+                    balances = {k: asdict(v) for k, v in self._balances.items()}
+                    bot_state = dict(self._bot_state)
+                else:
+                    trades = {
+                        k: (self._trades[k].to_dict() if k in self._trades else None)
+                        for k in dirty_trades
+                    }
+                    balances = {k: asdict(self._balances[k]) for k in dirty_balances if k in self._balances}
+                    bot_state = {k: self._bot_state.get(k) for k in dirty_state}
             
-            logger.debug(f"📸 State snapshot saved ({len(self._trades)} trades)")
+            if not checkpoint and not (trades or balances or bot_state):
+                return
             
-        except Exception as e:
-            logger.error(f"Snapshot save failed: {e}")
+            self._snapshot_seq += 1
+            record = {
+                "seq": self._snapshot_seq,
+                "timestamp": int(time.time() * 1000),
+                "trades": trades,
+                "balances": balances,
+                "bot_state": bot_state,
+            }
+            ckpt_path, delta_path = self._snapshot_paths()
+            
+            try:
+                loop = asyncio.get_running_loop()
+                if checkpoint:
+                    await loop.run_in_executor(None, self._write_checkpoint, ckpt_path, delta_path, record)
+                    self._deltas_since_checkpoint = 0
+                else:
+                    await loop.run_in_executor(None, self._append_delta, delta_path, record)
+                    self._deltas_since_checkpoint += 1
+                
+                logger.debug(
+                    f"📸 State snapshot saved ({'checkpoint' if checkpoint else 'delta'}, "
+                    f"{len(trades)} trades, seq={self._snapshot_seq})"
+                )
+                
+            except Exception as e:
+                logger.error(f"Snapshot save failed: {e}")
+                # Re-mark captured keys so the next snapshot retries them
+                self._dirty_trades |= dirty_trades
+                self._dirty_balances |= dirty_balances
+                self._dirty_bot_state |= dirty_state
+
+    @staticmethod
+    def _encode_snapshot_line(record: Dict[str, Any]) -> str:
+        return json.dumps(record, separators=(',', ':'), default=str) + "\n"
+
+    @classmethod
+    def _write_checkpoint(cls, ckpt_path: Path, delta_path: Path, record: Dict[str, Any]) -> None:
+        """Write a line-delimited checkpoint atomically, then reset the delta log (executor)."""
+        lines = [cls._encode_snapshot_line({
+            "kind": "checkpoint",
+            "seq": record["seq"],
+            "timestamp": record["timestamp"],
+        })]
+        for key, value in record["trades"].items():
+            lines.append(cls._encode_snapshot_line({"t": "trade", "k": key, "v": value}))
+        for key, value in record["balances"].items():
+            lines.append(cls._encode_snapshot_line({"t": "balance", "k": key, "v": value}))
+        for key, value in record["bot_state"].items():
+            lines.append(cls._encode_snapshot_line({"t": "state", "k": key, "v": value}))
+        
+        ckpt_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = ckpt_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        temp_path.replace(ckpt_path)
+        # Deltas up to this seq are now folded into the checkpoint
+        with open(delta_path, 'w', encoding='utf-8'):
+            pass
+
+    @classmethod
+    def _append_delta(cls, delta_path: Path, record: Dict[str, Any]) -> None:
+        """Append one delta record (executor)."""
+        delta_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(delta_path, 'a', encoding='utf-8') as f:
+            f.write(cls._encode_snapshot_line({"kind": "delta", **record}))
+
+    @classmethod
+    def _read_snapshot(cls, ckpt_path: Path, delta_path: Path, legacy_path: Path) -> Optional[Dict[str, Any]]:
+        """Rebuild state dicts from checkpoint + deltas (executor)."""
+        state = {"seq": 0, "trades": {}, "balances": {}, "bot_state": {}}
+        found = False
+        
+        if ckpt_path.exists():
+            with open(ckpt_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    if item.get("kind") == "checkpoint":
+                        state["seq"] = item.get("seq", 0)
+                        found = True
+                    elif item.get("t") == "trade":
+                        state["trades"][item["k"]] = item["v"]
+                    elif item.get("t") == "balance":
+                        state["balances"][item["k"]] = item["v"]
+                    elif item.get("t") == "state":
+                        state["bot_state"][item["k"]] = item["v"]
+        elif legacy_path.exists():
+            # Pre-checkpoint format: single pretty-printed JSON document
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            state["trades"] = legacy.get("trades", {})
+            state["balances"] = legacy.get("balances", {})
+            state["bot_state"] = legacy.get("bot_state", {})
+            found = True
+        
+        if delta_path.exists():
+            with open(delta_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash mid-append
+                        break
+                    if delta.get("seq", 0) <= state["seq"]:
+                        continue
+                    for key, value in delta.get("trades", {}).items():
+                        if value is None:
+                            state["trades"].pop(key, None)
+                        else:
+                            state["trades"][key] = value
+                    state["balances"].update(delta.get("balances", {}))
+                    for key, value in delta.get("bot_state", {}).items():
+                        if value is None:
+                            state["bot_state"].pop(key, None)
+                        else:
+                            state["bot_state"][key] = value
+                    state["seq"] = delta["seq"]
+                    found = True
+        
+        return state if found else None
 
     async def load_snapshot(self) -> bool:
-        """Load state from snapshot (for recovery)"""
-        snapshot_path = Path(self.db_path).parent / "state_snapshot.json"
-        
-        if not snapshot_path.exists():
-            return False
+        """Load state from snapshot (for recovery): checkpoint + replayed deltas"""
+        ckpt_path, delta_path = self._snapshot_paths()
+        legacy_path = Path(self.db_path).parent / "state_snapshot.json"
         
         try:
-            with open(snapshot_path, 'r') as f:
-                snapshot = json. load(f)
+            snapshot = await asyncio.get_running_loop().run_in_executor(
+                None, self._read_snapshot, ckpt_path, delta_path, legacy_path
+            )
+            if snapshot is None:
+                return False
             
             async with self._trade_lock:
                 self._trades = {
                     k: TradeState.from_dict(v)
-                    for k, v in snapshot. get("trades", {}).items()
+                    for k, v in snapshot["trades"].items()
                 }
             
             async with self._balance_lock:
                 self._balances = {
                     k: BalanceState(**v)
-                    for k, v in snapshot.get("balances", {}).items()
+                    for k, v in snapshot["balances"].items()
                 }
             
-            self._bot_state = snapshot.get("bot_state", {})
+            self._bot_state = snapshot["bot_state"]
+            self._snapshot_seq = max(self._snapshot_seq, snapshot["seq"])
             
-            logger.info(f"📸 Loaded snapshot ({len(self._trades)} trades)")
+            logger.info(f"📸 Loaded snapshot ({len(self._trades)} trades, seq={snapshot['seq']})")
             return True
             
         except Exception as e:
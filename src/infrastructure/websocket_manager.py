@@ -25,6 +25,10 @@ import config
 
 
 from src.utils.helpers import safe_float, mask_sensitive_data
+from src.infrastructure.order_tracker import get_order_tracker
+from src.infrastructure.balance_service import get_balance_service
+from src.infrastructure.price_bootstrap import init_price_bootstrap
+from src.infrastructure.md_ingest import MarketDataIngestProcess, PUBLIC_X10_STREAMS
 
 
 @dataclass
@@ -1145,6 +1149,7 @@ class WebSocketManager:
     X10_TRADES_WS_URL = "wss://api.starknet.extended.exchange/stream.extended.exchange/v1/publicTrades"  # Public: Trades (Firehose - all markets)
     X10_FUNDING_WS_URL = "wss://api.starknet.extended.exchange/stream.extended.exchange/v1/funding"  # Public: Funding Rates (Firehose - all markets)
     X10_MARKPRICE_WS_URL = "wss://api.starknet.extended.exchange/stream.extended.exchange/v1/prices/mark"  # Public: Mark Prices (All markets)
+    X10_ORDERBOOK_WS_URL = "wss://api.starknet.extended.exchange/stream.extended.exchange/v1/orderbooks"  # Public: Orderbooks (Delta Updates)
 
 
     
@@ -1152,6 +1157,18 @@ class WebSocketManager:
         self._connections: Dict[str, ManagedWebSocket] = {}
         self._message_handlers: Dict[str, List[Callable]] = {}
         self._running = False
+
+        # Endpoint overrides (e.g. the local exchange simulator)
+        if getattr(config, 'LIGHTER_WS_URL', None):
+            self.LIGHTER_WS_URL = config.LIGHTER_WS_URL
+        x10_stream = getattr(config, 'X10_STREAM_BASE_URL', None)
+        if x10_stream:
+            x10_stream = x10_stream.rstrip("/")
+            self.X10_ACCOUNT_WS_URL = f"{x10_stream}/account"
+            self.X10_TRADES_WS_URL = f"{x10_stream}/publicTrades"
+            self.X10_FUNDING_WS_URL = f"{x10_stream}/funding"
+            self.X10_MARKPRICE_WS_URL = f"{x10_stream}/prices/mark"
+            self.X10_ORDERBOOK_WS_URL = f"{x10_stream}/orderbooks"
         
         # Adapters for price/funding updates
         self. x10_adapter = None
@@ -1167,6 +1184,8 @@ class WebSocketManager:
         # Orderbook Provider for invalidation on reconnect
         # ═══════════════════════════════════════════════════════════════
         self._orderbook_provider = None
+        self.price_bootstrap = None  # PriceBootstrap, created in start()
+        self.md_ingest = None  # MarketDataIngestProcess (MD_INGEST_PROCESS_ENABLED)
         
         # ═══════════════════════════════════════════════════════════════
         # X10 Account WebSocket Health Tracking
@@ -1220,24 +1239,36 @@ class WebSocketManager:
         Args:
             ws_name: Name of the WebSocket that reconnected
         """
+        # Gap-aware provider resyncs per symbol - adapter caches stay, only
+        # the affected books are blocked until they are consistent again
+        gap_aware = bool(getattr(self._orderbook_provider, "gap_aware_resync", False))
+
         # Map WebSocket name to exchange
         if ws_name.startswith("lighter"):
             exchange = "lighter"
             # ═══════════════════════════════════════════════════════════════
             # CRITICAL: Clear Lighter orderbook caches immediately
             # ═══════════════════════════════════════════════════════════════
-            self._invalidate_all_lighter_orderbooks()
+            if not gap_aware:
+                self._invalidate_all_lighter_orderbooks()
         elif ws_name.startswith("x10"):
             exchange = "x10"
         else:
             exchange = None  # Invalidate all
-            self._invalidate_all_lighter_orderbooks()
+            if not gap_aware:
+                self._invalidate_all_lighter_orderbooks()
         
-        logger.warning(
-            f"🔄 [{ws_name}] Reconnected - cleared {exchange or 'all'} orderbook caches. "
-            f"Fresh REST snapshots required before trading!"
-        )
+        if gap_aware:
+            logger.warning(f"🔄 [{ws_name}] Reconnected - {exchange or 'all'} orderbooks resync per symbol")
+        else:
+            logger.warning(
+                f"🔄 [{ws_name}] Reconnected - cleared {exchange or 'all'} orderbook caches. "
+                f"Fresh REST snapshots required before trading!"
+            )
         
+        # Account updates may have been missed while disconnected
+        get_balance_service().invalidate(exchange)
+
         # Invalidate orderbook provider caches and set cooldown
         if self._orderbook_provider:
             self._orderbook_provider.invalidate_all(
@@ -1638,7 +1669,7 @@ class WebSocketManager:
 
         # 5. X10 ORDERBOOK Connection (Public, Delta Updates)
         x10_orderbook_config = WSConfig(
-            url="wss://api.starknet.extended.exchange/stream.extended.exchange/v1/orderbooks",
+            url=self.X10_ORDERBOOK_WS_URL,
             name="x10_orderbooks", 
             ping_interval=15.0,
             ping_timeout=None,
@@ -1674,7 +1705,30 @@ class WebSocketManager:
             on_health_change=self._on_health_change
         )
 
-        
+        # 7. Optional: public market streams in a separate ingest process
+        # (own event loop + GIL, shared-memory table, pump into the adapter caches).
+        # The "lighter" connection stays here for account_all / user_stats.
+        if getattr(config, 'MD_INGEST_PROCESS_ENABLED', False):
+            for name in PUBLIC_X10_STREAMS:
+                self._connections.pop(name, None)
+            streams = {
+                "lighter": self.LIGHTER_WS_URL,
+                "x10_trades": self.X10_TRADES_WS_URL,
+                "x10_funding": self.X10_FUNDING_WS_URL,
+                "x10_orderbooks": self.X10_ORDERBOOK_WS_URL,
+                "x10_markprice": self.X10_MARKPRICE_WS_URL,
+            }
+            self.md_ingest = MarketDataIngestProcess(
+                self.x10_adapter,
+                self.lighter_adapter,
+                streams=streams,
+                headers=x10_headers,
+                lighter_symbol=self._lighter_market_id_to_symbol,
+                oi_tracker=self.oi_tracker,
+                on_update=self._on_ingest_update,
+            )
+            await self.md_ingest.start()
+
         # Start all connections (use return_exceptions to prevent "exception was never retrieved")
         await asyncio.gather(*[
             conn.start() for conn in self._connections.values()
@@ -1687,10 +1741,11 @@ class WebSocketManager:
                 name="x10_account_keepalive"
             )
         
-        # Start one-time price initialization task (after WebSocket connections are established)
-        # This fills missing prices for illiquid markets via REST, then continues with WebSocket-only
+        # Readiness-driven price bootstrap: tradeable as soon as the streams cover
+        # PRICE_BOOTSTRAP_COVERAGE of the universe, REST only for the remaining gaps
+        self.price_bootstrap = init_price_bootstrap(self.x10_adapter, self.lighter_adapter)
         self._price_init_task = asyncio.create_task(
-            self._initialize_missing_prices(),
+            self.price_bootstrap.run(),
             name="price_initialization"
         )
         
@@ -1706,6 +1761,10 @@ class WebSocketManager:
         self._stopped = True
         
         self._running = False
+
+        refresher = getattr(self._orderbook_provider, "refresher", None)
+        if refresher is not None:
+            await refresher.stop()
         
         # Stop X10 account keepalive task first
         if self._x10_account_keepalive_task and not self._x10_account_keepalive_task.done():
@@ -1726,6 +1785,9 @@ class WebSocketManager:
         await asyncio.gather(*[
             conn.stop() for conn in self._connections.values()
         ], return_exceptions=True)
+
+        if self.md_ingest is not None:
+            await self.md_ingest.stop()
         
         self._connections.clear()
         logger.info("✅ WebSocketManager stopped")
@@ -1778,13 +1840,27 @@ class WebSocketManager:
         """
         lighter_conn = self._connections.get("lighter")
         if lighter_conn:
+            total_subs = 0
             # Subscribe to market_stats/all FIRST (1 subscription)
             # This provides: last_trade_price, funding_rate, mark_price, index_price,
             # open_interest for ALL markets in a single feed
-            await lighter_conn.subscribe("market_stats/all")
-            logger.info("📊 [lighter] Subscribed to market_stats/all (prices, funding, OI for all markets)")
+            # (with the ingest process its own Lighter connection carries it)
+            if self.md_ingest is None:
+                await lighter_conn.subscribe("market_stats/all")
+                total_subs += 1
+                logger.info("📊 [lighter] Subscribed to market_stats/all (prices, funding, OI for all markets)")
+
+            # Account stream (public, no auth): positions for event-driven fill detection
+            account_index = getattr(self.lighter_adapter, "_resolved_account_index", None)
+            if getattr(config, "LIGHTER_WS_ACCOUNT_ENABLED", True) and account_index is not None:
+                await lighter_conn.subscribe(f"account_all/{account_index}")
+                await lighter_conn.subscribe(f"user_stats/{account_index}")
+                total_subs += 2
+                logger.info(
+                    f"👤 [lighter] Subscribed to account_all/{account_index} + user_stats/{account_index} "
+                    f"(positions, collateral / buying power)"
+                )
 
-            total_subs = 1
             # Only subscribe to order_book channels if explicitly enabled
             if getattr(config, "LIGHTER_WS_ORDERBOOKS_ENABLED", False):
                 # Subscribe to orderbooks for ALL symbols (no limit needed with Option 3)
@@ -1810,10 +1886,12 @@ class WebSocketManager:
                         f"⚠️ [lighter] Approaching subscription limit: {total_subs}/100"
                     )
 
-                # NOTE: Lighter WS orderbook processing is DISABLED
-                # We rely on REST polling for orderbooks to avoid crossed books
-                # WS is still used for: prices, funding rates, market stats
-                logger.info(f"ℹ️ [lighter] Orderbook data: REST polling only (WS deltas disabled)")
+                # NOTE: Lighter WS deltas are only merged by a gap-aware OrderbookProvider
+                # (sequence-checked). Otherwise we rely on REST polling for orderbooks.
+                if getattr(self._orderbook_provider, "gap_aware_resync", False):
+                    logger.info("ℹ️ [lighter] Orderbook data: sequenced WS deltas (per-symbol REST resync)")
+                else:
+                    logger.info(f"ℹ️ [lighter] Orderbook data: REST polling only (WS deltas disabled)")
             else:
                 logger.info(
                     "ℹ️ [lighter] Skipping order_book WS subscriptions (REST polling only)"
@@ -1845,6 +1923,10 @@ class WebSocketManager:
     async def _handle_message(self, source: str, msg: dict):
         """Route message to appropriate handler"""
         try:
+            bootstrap = getattr(self, "price_bootstrap", None)
+            if bootstrap is not None:
+                bootstrap.notify()
+
             if source == "lighter":
                 await self._handle_lighter_message(msg)
             
@@ -1922,8 +2004,16 @@ class WebSocketManager:
         msg_type = msg. get("type", "")
         channel = msg.get("channel", "")
         
+        # Account update (positions -> order state tracker)
+        if "account_all" in msg_type or "account_all" in channel:
+            await self._handle_lighter_account(msg)
+
+        # Account stats (collateral / buying power -> balance service)
+        elif "user_stats" in msg_type or "user_stats" in channel:
+            await self._handle_lighter_user_stats(msg)
+
         # Market stats update
-        if "market_stats" in msg_type or "market_stats" in channel:
+        elif "market_stats" in msg_type or "market_stats" in channel:
             await self._handle_lighter_market_stats(msg)
         
         # Order book update
@@ -2062,23 +2152,47 @@ class WebSocketManager:
                 self.oi_tracker.update_from_websocket(symbol, "lighter", float(open_interest))
     
     async def _handle_lighter_orderbook(self, msg: dict):
-        """Process Lighter orderbook update - DISABLED
+        """Process Lighter orderbook update
         
         ═══════════════════════════════════════════════════════════════════════
-        WebSocket orderbook processing is DISABLED to prevent crossed books.
-        
-        The WS delta approach caused consistent crossed orderbook issues due to:
+        The old WS delta merge was DISABLED because it produced crossed books:
         1. Race conditions between WS deltas and REST snapshots
         2. Deltas arriving faster than processing speed
-        3. No sequence guarantee in WS messages
+        3. No sequence check on WS messages
         
-        We now rely EXCLUSIVELY on REST polling via fetch_orderbook().
-        WS is still used for: prices, funding rates, market stats.
+        With a gap-aware OrderbookProvider the deltas go through its sequence
+        tracking instead (nonce/begin_nonce continuity, per-symbol REST
+        resync with buffered delta replay). Without it we stay on REST
+        polling via fetch_orderbook().
+        WS is always used for: prices, funding rates, market stats.
         ═══════════════════════════════════════════════════════════════════════
         """
-        # DISABLED - REST polling only for orderbooks
-        # Simply return without processing to avoid any orderbook corruption
-        return
+        provider = self._orderbook_provider
+        if provider is None or not getattr(provider, "gap_aware_resync", False):
+            return
+
+        book = msg.get("order_book")
+        if not isinstance(book, dict):
+            return
+        channel = str(msg.get("channel", ""))
+        try:
+            market_id = int(channel.replace("/", ":").split(":")[-1])
+        except ValueError:
+            return
+        symbol = self._lighter_market_id_to_symbol(market_id)
+        if not symbol:
+            return
+
+        bids = book.get("bids", [])
+        asks = book.get("asks", [])
+        sequence = book.get("nonce")
+        if str(msg.get("type", "")).startswith("subscribed"):
+            # Initial message of a subscription is the full book
+            provider.update_lighter_orderbook(symbol, bids, asks, sequence=sequence)
+        else:
+            provider.apply_lighter_delta(
+                symbol, bids, asks, sequence=sequence, prev_sequence=book.get("begin_nonce")
+            )
     
     def _invalidate_lighter_orderbook(self, symbol: str):
         """
@@ -2179,6 +2293,41 @@ class WebSocketManager:
             '_ask_dict': ask_dict,
         }
     
+    async def _handle_lighter_account(self, msg: dict):
+        """Process Lighter account_all update: feed positions into the order state tracker"""
+        positions = msg.get("positions")
+        if not isinstance(positions, dict):
+            return
+        tracker = get_order_tracker()
+        for market_id, pos in positions.items():
+            if not isinstance(pos, dict):
+                continue
+            try:
+                symbol = self._lighter_market_id_to_symbol(int(pos.get("market_id", market_id)))
+            except (TypeError, ValueError):
+                continue
+            if not symbol:
+                continue
+            sign = -1.0 if safe_float(pos.get("sign"), 1.0) < 0 else 1.0
+            tracker.update_position("lighter", symbol, sign * safe_float(pos.get("position"), 0.0))
+
+    async def _handle_lighter_user_stats(self, msg: dict):
+        """Process Lighter user_stats update: collateral / buying power into the balance service"""
+        stats = msg.get("stats")
+        if not isinstance(stats, dict):
+            return
+        buying_power = stats.get("buying_power")
+        if buying_power is None:
+            return
+        collateral = safe_float(stats.get("collateral"), 0.0)
+        available = safe_float(stats.get("available_balance"), 0.0)
+        get_balance_service().update(
+            "lighter",
+            available=safe_float(buying_power, 0.0),
+            collateral=collateral,
+            used_margin=max(0.0, collateral - available) if stats.get("available_balance") is not None else None,
+        )
+
     async def _handle_lighter_trade(self, msg: dict):
         """Process Lighter trade"""
         trades = msg.get("trades", [])
@@ -2682,6 +2831,13 @@ class WebSocketManager:
                 
                 # Cache balance for health monitoring
                 self._x10_balance_cache = balance
+                if safe_float(available, 0.0) > 0:
+                    get_balance_service().update(
+                        "x10",
+                        available=safe_float(available, 0.0),
+                        collateral=safe_float(equity, 0.0),
+                        used_margin=safe_float(margin_used, 0.0),
+                    )
                 
         except Exception as e:
             logger.error(f"[x10_account] Balance update error: {e}", exc_info=True)
@@ -2925,227 +3081,15 @@ class WebSocketManager:
         except Exception as e:
             logger.debug(f"[X10] Error updating price from orderbook for {symbol}: {e}")
     
-    async def _initialize_missing_prices(self):
-        """
-        One-time initialization of missing prices via REST API.
-        
-        After WebSocket connections are established, this method:
-        1. Waits 15 seconds for initial WebSocket updates to arrive
-        2. Identifies markets missing prices
-        3. Fetches orderbook data via REST API for those markets
-        4. Calculates mid-price from orderbook and caches it
-        5. After this one-time initialization, only WebSocket updates are used
-        
-        This ensures fast WebSocket-based operation while handling illiquid markets
-        that may not receive frequent trade/orderbook updates.
-        """
-        # Wait for initial WebSocket updates to arrive (15 seconds)
-        await asyncio.sleep(15.0)
-        
-        if not self._running:
-            return
-        
-        logger.info("🔍 Initializing missing prices for illiquid markets (one-time REST fallback)...")
-        
-        # Initialize X10 missing prices
-        if self.x10_adapter and hasattr(self.x10_adapter, 'market_info'):
-            x10_missing = []
-            for symbol in self.x10_adapter.market_info.keys():
-                if symbol not in self.x10_adapter._price_cache:
-                    x10_missing.append(symbol)
-            
-            if x10_missing:
-                logger.info(f"📊 Found {len(x10_missing)} X10 markets without prices, initializing via REST...")
-                
-                # Strategy 0: First, try to refresh market cache (bulk load all market stats)
-                # This is more efficient than individual calls and loads mark_price/index_price for all markets
-                try:
-                    if self.x10_adapter and hasattr(self.x10_adapter, 'load_market_cache'):
-                        logger.debug("🔄 Refreshing X10 market cache to get mark prices for all markets...")
-                        await self.x10_adapter.load_market_cache(force=True)
-                        
-                        # Copy prices from price_cache to _price_cache if not already there
-                        # (load_market_cache writes to price_cache, but we check _price_cache)
-                        for sym in x10_missing:
-                            if sym in self.x10_adapter.price_cache and sym not in self.x10_adapter._price_cache:
-                                price = self.x10_adapter.price_cache[sym]
-                                if price and price > 0:
-                                    self.x10_adapter._price_cache[sym] = price
-                                    self.x10_adapter._price_cache_time[sym] = time.time()
-                        
-                        # After refresh, re-check which markets still need prices
-                        still_missing = [s for s in x10_missing if s not in self.x10_adapter._price_cache]
-                        if len(still_missing) < len(x10_missing):
-                            logger.info(f"✅ Market cache refresh initialized {len(x10_missing) - len(still_missing)} prices")
-                            x10_missing = still_missing
-                except Exception as e:
-                    logger.debug(f"Market cache refresh failed: {e}")
-                
-                initialized = 0
-                failed = 0
-                
-                for symbol in x10_missing:
-                    if not self._running:
-                        break
-                    try:
-                        mid_price = None
-                        
-                        # Strategy 1: Try OrderbookProvider first (uses REST API)
-                        if hasattr(self, 'orderbook_provider') and self.orderbook_provider:
-                            try:
-                                orderbook_snapshot = await self.orderbook_provider.get_x10_orderbook(symbol, force_refresh=True)
-                                if orderbook_snapshot and orderbook_snapshot.best_bid and orderbook_snapshot.best_ask:
-                                    mid_price = float((orderbook_snapshot.best_bid + orderbook_snapshot.best_ask) / 2.0)
-                            except Exception as e:
-                                logger.debug(f"OrderbookProvider failed for {symbol}: {e}")
-                        
-                        # Strategy 2: Fallback to direct adapter fetch_orderbook if provider failed
-                        if mid_price is None and self.x10_adapter and hasattr(self.x10_adapter, 'fetch_orderbook'):
-                            try:
-                                orderbook_data = await self.x10_adapter.fetch_orderbook(symbol)
-                                if orderbook_data:
-                                    bids = orderbook_data.get('bids', [])
-                                    asks = orderbook_data.get('asks', [])
-                                    if bids and asks and len(bids) > 0 and len(asks) > 0:
-                                        best_bid = float(bids[0][0]) if len(bids[0]) >= 2 else None
-                                        best_ask = float(asks[0][0]) if len(asks[0]) >= 2 else None
-                                        if best_bid and best_ask and best_bid > 0 and best_ask > 0 and best_ask > best_bid:
-                                            mid_price = (best_bid + best_ask) / 2.0
-                            except Exception as e:
-                                logger.debug(f"Direct adapter fetch_orderbook failed for {symbol}: {e}")
-                        
-                        # Strategy 3: Fallback to market_stats API (mark_price, index_price, last_price)
-                        # fetch_mark_price checks market_info.market_stats for various price fields
-                        if mid_price is None and self.x10_adapter and hasattr(self.x10_adapter, 'fetch_mark_price'):
-                            try:
-                                # fetch_mark_price is async; use sync accessor here to avoid creating an un-awaited coroutine
-                                if hasattr(self.x10_adapter, "fetch_mark_price_sync"):
-                                    mark_price = self.x10_adapter.fetch_mark_price_sync(symbol)
-                                else:
-                                    mark_price = 0
-                                if mark_price and mark_price > 0:
-                                    mid_price = float(mark_price)
-                                    # fetch_mark_price already updates _price_cache, but ensure it's set
-                                    if symbol not in self.x10_adapter._price_cache:
-                                        self.x10_adapter._price_cache[symbol] = mid_price
-                                        self.x10_adapter._price_cache_time[symbol] = time.time()
-                            except Exception as e:
-                                logger.debug(f"fetch_mark_price failed for {symbol}: {e}")
-                        
-                        # Cache the price if we got one
-                        if mid_price:
-                            self.x10_adapter._price_cache[symbol] = mid_price
-                            self.x10_adapter._price_cache_time[symbol] = time.time()
-                            initialized += 1
-                            logger.info(f"✅ Initialized X10 {symbol} price: ${mid_price:.4f} (from orderbook)")
-                        else:
-                            failed += 1
-                            logger.debug(f"⚠️ No orderbook data available for {symbol}")
-                        
-                        # Small delay to avoid rate limiting
-                        await asyncio.sleep(0.1)
-                    except Exception as e:
-                        failed += 1
-                        logger.warning(f"❌ Failed to initialize X10 price for {symbol}: {e}")
-                
-                # Calculate how many were actually initialized (including from market cache refresh)
-                total_initialized = len([s for s in x10_missing if s in self.x10_adapter._price_cache])
-                total_failed = len(x10_missing) - total_initialized
-                
-                if total_initialized > 0:
-                    logger.info(f"✅ Initialized {total_initialized}/{len(x10_missing)} missing X10 prices (failed: {total_failed}, now using WebSocket-only)")
-                    if total_failed > 0:
-                        # Log which markets failed (for debugging)
-                        failed_symbols = [s for s in x10_missing if s not in self.x10_adapter._price_cache]
-                        logger.warning(f"⚠️ X10 markets that failed price initialization ({total_failed} total): {failed_symbols}")
-                else:
-                    logger.warning(f"⚠️ Could not initialize any X10 prices via REST ({total_failed} failed, {len(x10_missing)} total). Prices will come from WebSocket updates.")
-        
-        # Initialize Lighter missing prices (via orderbook REST as fallback)
-        # Note: Lighter prices should come from market_stats WebSocket, but for illiquid markets
-        # we can use orderbook mid-price as fallback
-        if self.lighter_adapter and hasattr(self.lighter_adapter, 'market_info'):
-            lighter_missing = []
-            for symbol in self.lighter_adapter.market_info.keys():
-                if symbol not in self.lighter_adapter._price_cache:
-                    lighter_missing.append(symbol)
-            
-            if lighter_missing:
-                logger.info(f"📊 Found {len(lighter_missing)} Lighter markets without prices, trying orderbook fallback...")
-                lighter_initialized = 0
-                lighter_failed = 0
-                
-                for symbol in lighter_missing:
-                    if not self._running:
-                        break
-                    try:
-                        mid_price = None
-                        
-                        # Try OrderbookProvider first
-                        if hasattr(self, 'orderbook_provider') and self.orderbook_provider:
-                            try:
-                                orderbook_snapshot = await self.orderbook_provider.get_lighter_orderbook(symbol, force_refresh=True)
-                                if orderbook_snapshot and orderbook_snapshot.best_bid and orderbook_snapshot.best_ask:
-                                    mid_price = float((orderbook_snapshot.best_bid + orderbook_snapshot.best_ask) / 2.0)
-                            except Exception as e:
-                                logger.debug(f"OrderbookProvider failed for Lighter {symbol}: {e}")
-                        
-                        # Fallback to direct adapter fetch_orderbook
-                        if mid_price is None and self.lighter_adapter and hasattr(self.lighter_adapter, 'fetch_orderbook'):
-                            try:
-                                orderbook_data = await self.lighter_adapter.fetch_orderbook(symbol, limit=20)
-                                if orderbook_data:
-                                    bids = orderbook_data.get('bids', [])
-                                    asks = orderbook_data.get('asks', [])
-                                    if bids and asks and len(bids) > 0 and len(asks) > 0:
-                                        best_bid = float(bids[0][0]) if len(bids[0]) >= 2 else None
-                                        best_ask = float(asks[0][0]) if len(asks[0]) >= 2 else None
-                                        if best_bid and best_ask and best_bid > 0 and best_ask > 0 and best_ask > best_bid:
-                                            mid_price = (best_bid + best_ask) / 2.0
-                            except Exception as e:
-                                logger.debug(f"Direct adapter fetch_orderbook failed for Lighter {symbol}: {e}")
-                        
-                        # Strategy 3: Try to fetch price from market info if available
-                        # Lighter market_stats WebSocket should have provided this, but if not,
-                        # we can try REST API endpoints
-                        if mid_price is None and self.lighter_adapter and hasattr(self.lighter_adapter, 'market_info'):
-                            try:
-                                market = self.lighter_adapter.market_info.get(symbol)
-                                if market:
-                                    # Try to extract price from market info if available
-                                    # (this would require a REST API call, which we skip here to keep it WebSocket-first)
-                                    pass
-                            except Exception as e:
-                                logger.debug(f"Market info check failed for Lighter {symbol}: {e}")
-                        
-                        if mid_price:
-                            self.lighter_adapter._price_cache[symbol] = mid_price
-                            self.lighter_adapter._price_cache_time[symbol] = time.time()
-                            lighter_initialized += 1
-                            logger.info(f"✅ Initialized Lighter {symbol} price: ${mid_price:.4f} (from orderbook)")
-                        else:
-                            lighter_failed += 1
-                        
-                        await asyncio.sleep(0.1)
-                    except Exception as e:
-                        lighter_failed += 1
-                        logger.debug(f"Failed to initialize Lighter price for {symbol}: {e}")
-                
-                if lighter_initialized > 0:
-                    logger.info(f"✅ Initialized {lighter_initialized}/{len(lighter_missing)} missing Lighter prices via REST (failed: {lighter_failed})")
-                elif lighter_missing:
-                    logger.warning(
-                        f"⚠️ Could not initialize Lighter prices via REST ({lighter_failed} failed). "
-                        f"Missing markets: {lighter_missing[:5]}{'...' if len(lighter_missing) > 5 else ''}"
-                    )
-        
-        logger.info("✅ Price initialization complete - now using WebSocket-only updates")
-
     def _lighter_market_id_to_symbol(self, market_id: int) -> Optional[str]:
         """Convert Lighter market ID to symbol"""
         if not self.lighter_adapter or not hasattr(self.lighter_adapter, 'market_info'):
             return None
-        
+
+        # Registry id map (O(1)) instead of a scan per message
+        if hasattr(self.lighter_adapter, '_symbol_for_market_id'):
+            return self.lighter_adapter._symbol_for_market_id(market_id)
+
         for symbol, info in self.lighter_adapter. market_info.items():
             if info.get('i') == market_id or info.get('market_id') == market_id:
                 return symbol
@@ -3183,8 +3127,15 @@ class WebSocketManager:
             for name, conn in self._connections.items()
         }
     
+    def _on_ingest_update(self) -> None:
+        """Ingest pump copied new market data into the adapter caches."""
+        if self.price_bootstrap is not None:
+            self.price_bootstrap.notify()
+
     def is_healthy(self) -> bool:
         """Check if all connections are healthy (connected and responding)"""
+        if self.md_ingest is not None and not self.md_ingest.is_alive():
+            return False
         for conn in self._connections.values():
             if not conn.is_connected:
                 return False
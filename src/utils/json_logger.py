@@ -15,15 +15,23 @@ Usage:
     log_trade("EDEN-USD", "ENTRY", side="LONG", size=150.0, price=0.083)
     log_funding("EDEN-USD", x10=0.05, lighter=-0.02, net=0.03)
     log_error("WebSocket", "Connection timeout", retry_count=3)
+
+Serialisierung und Datei-I/O laufen in einem Hintergrund-Thread (_JSONLogSink):
+log() baut nur das Entry-Dict und legt es in eine Queue. Trade/Order/Error-Events
+werden sofort geflusht, High-Volume-Kategorien (websocket, metric, api) gebatcht
+und bei Überlast (älteste zuerst) verworfen.
 """
 
+import atexit
+import collections
 import json
 import logging
 import os
 import sys
 import threading
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Union
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 from decimal import Decimal
 from enum import Enum
 
@@ -67,6 +75,204 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+class _JSONLogSink:
+    """
+    Queue-backed JSON Lines writer running in a daemon thread.
+    
+    - Batched writes: everything queued since the last wakeup is serialized
+      and written with a single write() call
+    - Flush policy: urgent entries flush immediately, the rest on size
+      (flush_bytes) or time (flush_interval)
+    - Rotation: file.jsonl -> file.jsonl.1 ... file.jsonl.N at max_bytes
+    - Backpressure: only DEBUG entries are droppable; they live in a bounded
+      deque that discards the oldest entry when full. INFO bulk entries are
+      batched but never dropped (trade / audit lines), urgent entries are
+      written immediately
+    """
+    
+    WAKEUP_BATCH = 512  # Wake the writer early once this many bulk entries are queued
+    
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 1.0,
+        flush_bytes: int = 64 * 1024,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_queue: int = 10000,
+        error_logger: Optional[logging.Logger] = None
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._error_logger = error_logger or logging.getLogger("json_logger")
+        
+        self._urgent: Deque[Tuple[float, Dict[str, Any]]] = collections.deque()
+        self._bulk: Deque[Tuple[float, Dict[str, Any]]] = collections.deque()
+        self._droppable: Deque[Tuple[float, Dict[str, Any]]] = collections.deque(maxlen=max(1, max_queue))
+        self._cond = threading.Condition()
+        self._flush_requests: List[threading.Event] = []
+        self._closed = False
+        
+        self._file = None
+        self._file_size = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        
+        self.stats = {"written": 0, "dropped": 0, "batches": 0, "rotations": 0, "errors": 0}
+        
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="json-log-sink", daemon=True)
+        self._thread.start()
+    
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+    
+    def _open(self):
+        try:
+            log_dir = os.path.dirname(self.path)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._file_size = self._file.tell()
+        except Exception as e:
+            self._error_logger.error(f"Failed to open JSON log file: {e}")
+            self._file = None
+    
+    def submit(self, entry: Dict[str, Any], urgent: bool, droppable: bool = False):
+        """Enqueue an entry (called from any thread, never blocks on I/O)."""
+        with self._cond:
+            if self._closed:
+                return
+            if urgent:
+                self._urgent.append((time.time(), entry))
+                self._cond.notify()
+                return
+            if droppable:
+                if len(self._droppable) == self._droppable.maxlen:
+                    self.stats["dropped"] += 1
+                self._droppable.append((time.time(), entry))
+            else:
+                self._bulk.append((time.time(), entry))
+            if (len(self._bulk) + len(self._droppable)) % self.WAKEUP_BATCH == 0:
+                self._cond.notify()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far has been written and flushed."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        with self._cond:
+            self._flush_requests.append(done)
+            self._cond.notify()
+        return done.wait(timeout)
+    
+    def close(self, timeout: float = 5.0):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._file:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                if not (self._urgent or self._flush_requests or self._closed):
+                    self._cond.wait(self.flush_interval)
+                urgent = bool(self._urgent) or bool(self._flush_requests) or self._closed
+                mixed = sum(1 for q in (self._urgent, self._bulk, self._droppable) if q) > 1
+                items = list(self._urgent) + list(self._bulk) + list(self._droppable)
+                self._urgent.clear()
+                self._bulk.clear()
+                self._droppable.clear()
+                requests = self._flush_requests
+                self._flush_requests = []
+                closing = self._closed
+            
+            if items:
+                # Keep file order chronological across the queues
+                if mixed:
+                    items.sort(key=lambda item: item[0])
+                self._write(items)
+            
+            due = (time.monotonic() - self._last_flush) >= self.flush_interval
+            if self._unflushed and (urgent or due or self._unflushed >= self.flush_bytes):
+                self._flush_file()
+            
+            for event in requests:
+                event.set()
+            if closing:
+                return
+    
+    def _write(self, items: List[Tuple[float, Dict[str, Any]]]):
+        if not self._file:
+            return
+        lines = []
+        for ts, entry in items:
+            entry["timestamp"] = datetime.fromtimestamp(ts, timezone.utc).isoformat()
+            try:
+                lines.append(json.dumps(entry, cls=DecimalEncoder, ensure_ascii=False))
+            except Exception as e:
+                self.stats["errors"] += 1
+                self._error_logger.error(f"JSON log serialization failed: {e}")
+        if not lines:
+            return
+        payload = "\n".join(lines) + "\n"
+        try:
+            self._file.write(payload)
+            size = len(payload.encode('utf-8'))
+            self._file_size += size
+            self._unflushed += size
+            self.stats["written"] += len(lines)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            self._error_logger.error(f"JSON log write failed: {e}")
+            return
+        if self.max_bytes and self._file_size >= self.max_bytes:
+            self._rotate()
+    
+    def _flush_file(self):
+        try:
+            if self._file:
+                self._file.flush()
+        except Exception as e:
+            self.stats["errors"] += 1
+            self._error_logger.error(f"JSON log flush failed: {e}")
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+    
+    def _rotate(self):
+        try:
+            self._file.flush()
+            self._file.close()
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            if self.backup_count > 0:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+            self.stats["rotations"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            self._error_logger.error(f"JSON log rotation failed: {e}")
+        self._file = None
+        self._unflushed = 0
+        self._open()
+
+
 class JSONLogger:
     """
     Singleton JSON Logger für strukturierte Logs.
@@ -77,6 +283,7 @@ class JSONLogger:
     - Kategorisierung für einfaches Filtern
     - Thread-safe
     - Sensitive Data Masking
+    - Non-blocking: Serialisierung + I/O im Hintergrund-Thread (_JSONLogSink)
     """
     
     _instance: Optional['JSONLogger'] = None
@@ -85,12 +292,29 @@ class JSONLogger:
     # Patterns für Sensitive Data (API Keys, Private Keys)
     SENSITIVE_KEYS = {'api_key', 'private_key', 'secret', 'token', 'password'}
     
+    # Sofort flushen (niemals verwerfen)
+    URGENT_CATEGORIES = frozenset({
+        LogCategory.TRADE, LogCategory.ORDER, LogCategory.POSITION, LogCategory.FUNDING,
+        LogCategory.ERROR, LogCategory.SHUTDOWN, LogCategory.RECONCILIATION,
+    })
+    # High-Volume: gebatcht, unter Last älteste zuerst verworfen
+    BULK_CATEGORIES = frozenset({LogCategory.WEBSOCKET, LogCategory.METRIC, LogCategory.API})
+    
+    _LEVEL_ORDER = {
+        LogLevel.DEBUG: 0, LogLevel.INFO: 1, LogLevel.WARNING: 2, LogLevel.ERROR: 3, LogLevel.CRITICAL: 4,
+    }
+    
     def __init__(
         self,
         log_file: Optional[str] = None,
         enabled: bool = True,
         min_level: LogLevel = LogLevel.INFO,
-        include_standard_log: bool = True
+        include_standard_log: bool = True,
+        flush_interval: float = 1.0,
+        flush_bytes: int = 64 * 1024,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_queue: int = 10000
     ):
         """
         Initialize JSON Logger.
@@ -100,11 +324,23 @@ class JSONLogger:
             enabled: Whether JSON logging is enabled
             min_level: Minimum log level to record
             include_standard_log: Also log to standard Python logger
+            flush_interval: Max seconds before batched entries are flushed
+            flush_bytes: Flush once this many bytes are buffered
+            max_bytes: Rotate the file at this size (0 = never)
+            backup_count: Number of rotated files to keep
+            max_queue: Max queued DEBUG entries before the oldest are dropped
         """
         self.enabled = enabled
         self.min_level = min_level
         self.include_standard_log = include_standard_log
-        self._file_handler: Optional[Any] = None
+        self._sink: Optional[_JSONLogSink] = None
+        self._sink_options = dict(
+            flush_interval=flush_interval,
+            flush_bytes=flush_bytes,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            max_queue=max_queue,
+        )
         self._standard_logger = logging.getLogger("json_logger")
         
         if log_file is None:
@@ -123,12 +359,13 @@ class JSONLogger:
         cls,
         log_file: Optional[str] = None,
         enabled: bool = True,
-        min_level: LogLevel = LogLevel.INFO
+        min_level: LogLevel = LogLevel.INFO,
+        **sink_options
     ) -> 'JSONLogger':
         """Get or create singleton instance."""
         with cls._lock:
             if cls._instance is None:
-                cls._instance = cls(log_file=log_file, enabled=enabled, min_level=min_level)
+                cls._instance = cls(log_file=log_file, enabled=enabled, min_level=min_level, **sink_options)
             return cls._instance
     
     @classmethod
@@ -140,21 +377,36 @@ class JSONLogger:
                 cls._instance = None
     
     def _open_file(self):
-        """Open log file for appending."""
-        try:
-            self._file_handler = open(self.log_file, 'a', encoding='utf-8')
-        except Exception as e:
-            self._standard_logger.error(f"Failed to open JSON log file: {e}")
-            self._file_handler = None
+        """Start the background sink for the log file."""
+        self._sink = _JSONLogSink(
+            self.log_file,
+            error_logger=self._standard_logger,
+            **self._sink_options
+        )
+        if not self._sink.is_open:
+            self._sink.close()
+            self._sink = None
+            return
+        atexit.register(self.close)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued entries are on disk."""
+        if self._sink:
+            return self._sink.flush(timeout)
+        return True
     
     def close(self):
-        """Close log file."""
-        if self._file_handler:
+        """Drain the queue and close log file."""
+        if self._sink:
             try:
-                self._file_handler.close()
-            except:
+                self._sink.close()
+            except Exception:
                 pass
-            self._file_handler = None
+            self._sink = None
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Sink statistics (written / dropped / batches / rotations / errors)."""
+        return dict(self._sink.stats) if self._sink else {}
     
     def _mask_sensitive(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Mask sensitive data in log entries."""
@@ -172,8 +424,15 @@ class JSONLogger:
     
     def _should_log(self, level: LogLevel) -> bool:
         """Check if level should be logged."""
-        level_order = [LogLevel.DEBUG, LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR, LogLevel.CRITICAL]
-        return level_order.index(level) >= level_order.index(self.min_level)
+        return self._LEVEL_ORDER[level] >= self._LEVEL_ORDER[self.min_level]
+    
+    def _is_urgent(self, category: LogCategory, level: LogLevel) -> bool:
+        """Urgent entries are flushed immediately and never dropped."""
+        if self._LEVEL_ORDER[level] >= self._LEVEL_ORDER[LogLevel.WARNING]:
+            return True
+        if category in self.BULK_CATEGORIES or level == LogLevel.DEBUG:
+            return False
+        return category in self.URGENT_CATEGORIES
     
     def log(
         self,
@@ -194,9 +453,9 @@ class JSONLogger:
         if not self.enabled or not self._should_log(level):
             return
         
-        # Build log entry
+        # Build log entry (timestamp + serialization happen in the sink thread)
         entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": None,
             "level": level.value,
             "category": category.value,
             "event": event,
@@ -207,17 +466,18 @@ class JSONLogger:
             masked_kwargs = self._mask_sensitive(kwargs)
             entry["data"] = masked_kwargs
         
-        # Write to JSON log file
-        if self._file_handler:
-            try:
-                json_line = json.dumps(entry, cls=DecimalEncoder, ensure_ascii=False)
-                self._file_handler.write(json_line + "\n")
-                self._file_handler.flush()
-            except Exception as e:
-                self._standard_logger.error(f"JSON log write failed: {e}")
+        # Hand off to the background sink
+        if self._sink:
+            self._sink.submit(
+                entry,
+                urgent=self._is_urgent(category, level),
+                droppable=level == LogLevel.DEBUG,
+            )
         
-        # Also log to standard logger if enabled
-        if self.include_standard_log:
+        # Also log to standard logger if enabled (skip formatting when filtered out)
+        if self.include_standard_log and self._standard_logger.isEnabledFor(
+            getattr(logging, level.value, logging.INFO)
+        ):
             log_msg = f"[{category.value}] {event}"
             if kwargs:
                 # Format key fields inline
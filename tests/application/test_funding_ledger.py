@@ -0,0 +1,195 @@
+import asyncio
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.funding_ledger import FundingLedger, EXCHANGE_X10, EXCHANGE_LIGHTER
+from src.infrastructure.database import AsyncDatabase, DBConfig, FundingRepository
+
+
+def _trade(symbol, created_at, funding=0.0):
+    return SimpleNamespace(symbol=symbol, created_at=created_at, funding_collected=funding)
+
+
+def _adapters(x10_payments, lighter_by_market):
+    x10 = MagicMock()
+    x10.fetch_funding_payments = AsyncMock(side_effect=lambda symbol=None, from_time=None, strict=False: [
+        p for p in x10_payments() if p["paid_time"] >= from_time
+    ])
+
+    lighter = MagicMock()
+    lighter.market_info = {"BTC-USD": {"i": 1}, "ETH-USD": {"i": 2}}
+
+    async def fetch_position_funding(market_id=None, side="all", limit=100, since_timestamp=None, strict=False):
+        return list(lighter_by_market().get(market_id, []))
+
+    lighter.fetch_position_funding = AsyncMock(side_effect=fetch_position_funding)
+    return x10, lighter
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_then_incremental_dedup():
+    t0 = int(time.time() * 1000) - 3 * 3600 * 1000
+    x10_rows = [
+        {"id": 1, "symbol": "BTC-USD", "funding_fee": 0.10, "paid_time": t0 + 3600_000},
+    ]
+    lighter_rows = {
+        1: [{"funding_id": 77, "timestamp": (t0 + 3600_000) // 1000, "funding_received": 0.05}],
+    }
+    x10, lighter = _adapters(lambda: x10_rows, lambda: lighter_rows)
+    ledger = FundingLedger(x10, lighter, overlap_ms=60_000)
+    trades = [_trade("BTC-USD", t0)]
+
+    payments, bootstrap = await ledger.poll(trades)
+    assert bootstrap is True
+    assert ledger.attribute(trades, payments) == {"BTC-USD": Decimal("0.15")}
+    assert ledger.get_cursor(EXCHANGE_X10) == t0 + 3600_000
+
+    # Same data again: nothing new
+    payments, bootstrap = await ledger.poll(trades)
+    assert bootstrap is False
+    assert payments == []
+
+    # One new X10 payment; X10 is only asked from the cursor (minus overlap)
+    x10_rows.append({"id": 2, "symbol": "BTC-USD", "funding_fee": -0.02, "paid_time": t0 + 7200_000})
+    payments, _ = await ledger.poll(trades)
+    assert [p.payment_id for p in payments] == ["2"]
+    assert ledger.attribute(trades, payments) == {"BTC-USD": Decimal("-0.02")}
+    assert x10.fetch_funding_payments.await_args.kwargs["from_time"] == t0 + 3600_000 - 60_000
+
+
+@pytest.mark.asyncio
+async def test_lighter_ids_scoped_per_market_and_fanned_out():
+    t0 = int(time.time() * 1000) - 3600_000
+    ts = (t0 + 60_000) // 1000
+    lighter_rows = {
+        1: [{"funding_id": 5, "timestamp": ts, "funding_received": 0.01}],
+        2: [{"funding_id": 5, "timestamp": ts, "funding_received": 0.02}],
+    }
+    x10, lighter = _adapters(lambda: [], lambda: lighter_rows)
+    ledger = FundingLedger(x10, lighter)
+    trades = [_trade("BTC-USD", t0), _trade("ETH-USD", t0)]
+
+    payments, _ = await ledger.poll(trades)
+
+    assert lighter.fetch_position_funding.await_count == 2
+    assert {p.payment_id for p in payments if p.exchange == EXCHANGE_LIGHTER} == {"1:5", "2:5"}
+    assert ledger.attribute(trades, payments) == {"BTC-USD": Decimal("0.01"), "ETH-USD": Decimal("0.02")}
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_during_bootstrap_keeps_cursor_unset():
+    t0 = int(time.time() * 1000) - 3 * 3600 * 1000
+    x10_rows = [{"id": 1, "symbol": "BTC-USD", "funding_fee": 0.10, "paid_time": t0 + 3600_000}]
+    lighter_rows = {1: [{"funding_id": 77, "timestamp": (t0 + 3600_000) // 1000, "funding_received": 0.05}]}
+    x10, lighter = _adapters(lambda: x10_rows, lambda: lighter_rows)
+    fetch_x10 = x10.fetch_funding_payments.side_effect
+    x10.fetch_funding_payments.side_effect = RuntimeError("503")
+    ledger = FundingLedger(x10, lighter, overlap_ms=60_000)
+    trades = [_trade("BTC-USD", t0)]
+
+    # Lighter alone must not be reconciled as the trade's total
+    assert await ledger.poll(trades) == ([], False)
+    assert ledger.get_cursor(EXCHANGE_X10) is None
+    assert ledger.needs_bootstrap
+
+    # X10 back: bootstrap again from the oldest trade, full history once
+    x10.fetch_funding_payments.side_effect = fetch_x10
+    payments, bootstrap = await ledger.poll(trades)
+    assert bootstrap is True
+    assert x10.fetch_funding_payments.await_args.kwargs["from_time"] == t0
+    assert ledger.attribute(trades, payments) == {"BTC-USD": Decimal("0.15")}
+    assert await ledger.poll(trades) == ([], False)
+
+
+def test_attribute_ignores_payments_before_trade_open():
+    from src.application.funding_ledger import FundingPayment
+
+    trades = [_trade("BTC-USD", 1_000)]
+    payments = [
+        FundingPayment(EXCHANGE_X10, "a", "BTC-USD", Decimal("1"), 999),
+        FundingPayment(EXCHANGE_X10, "b", "BTC-USD", Decimal("2"), 1_000),
+        FundingPayment(EXCHANGE_X10, "c", "SOL-USD", Decimal("4"), 5_000),
+    ]
+    assert FundingLedger.attribute(trades, payments) == {"BTC-USD": Decimal("2")}
+
+
+@pytest.mark.asyncio
+async def test_repository_bulk_insert_and_cursor_roundtrip(tmp_path):
+    db = AsyncDatabase(DBConfig(db_path=str(tmp_path / "ledger.db"), pool_size=1))
+    await db.initialize()
+    try:
+        repo = FundingRepository(db)
+        rows = [
+            {"exchange": "X10", "payment_id": "1", "symbol": "BTC-USD", "amount": Decimal("0.1"), "paid_time": 1000},
+            {"exchange": "X10", "payment_id": "2", "symbol": "BTC-USD", "amount": Decimal("0.2"), "paid_time": 2000},
+        ]
+        await repo.add_funding_payments(rows)
+        await repo.add_funding_payments(rows[:1])  # duplicate is ignored
+        await repo.save_funding_cursor("X10", 2000, "2")
+        await asyncio.sleep(0.3)
+
+        assert await repo.get_payment_ids_since("X10", 1500) == {"2": 2000}
+        assert await repo.get_funding_cursor("X10") == {"last_paid_time": 2000, "last_payment_id": "2"}
+        count = await db.fetch_one("SELECT COUNT(*) AS n FROM funding_payments")
+        assert count["n"] == 2
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_lighter_http_error_keeps_cursor(monkeypatch):
+    import config
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from src.adapters.lighter_adapter import LighterAdapter
+    from src.infrastructure.http_transport import HostTransport
+
+    t0 = int(time.time() * 1000) - 3 * 3600 * 1000
+    status = {"code": 200}
+
+    async def position_funding(request):
+        if status["code"] != 200:
+            return web.Response(status=status["code"], text="upstream down")
+        return web.json_response({"fundings": [
+            {"market_id": 1, "funding_id": 77, "timestamp": (t0 + 3600_000) // 1000, "change": "0.05"},
+        ]})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/positionFunding", position_funding)
+    server = TestServer(app)
+    await server.start_server()
+    transport = HostTransport("test", str(server.make_url("")))
+    try:
+        monkeypatch.setattr(config, "LIGHTER_BASE_URL", str(server.make_url("")).rstrip("/"))
+        lighter = LighterAdapter()
+        lighter._transport = transport
+        lighter._resolved_account_index = 1
+        lighter.market_info = {"BTC-USD": {"i": 1}}
+        signer = SimpleNamespace(create_auth_token_with_expiry=lambda expiry: ("token", None))
+        monkeypatch.setattr(lighter, "_get_signer", AsyncMock(return_value=signer))
+        x10, _ = _adapters(lambda: [], lambda: {})
+        ledger = FundingLedger(x10, lighter, overlap_ms=60_000)
+        trades = [_trade("BTC-USD", t0)]
+
+        payments, bootstrap = await ledger.poll(trades)
+        assert bootstrap is True and ledger.attribute(trades, payments) == {"BTC-USD": Decimal("0.05")}
+        cursor = ledger.get_cursor(EXCHANGE_LIGHTER)
+        assert cursor == (t0 + 3600_000) // 1000 * 1000
+
+        # HTTP 500 from the real adapter path: not "no payments", the cursor stays put
+        status["code"] = 500
+        assert await ledger.poll(trades) == ([], False)
+        assert ledger.get_cursor(EXCHANGE_LIGHTER) == cursor
+
+        # Outage during the bootstrap: no cursor is invented
+        fresh = FundingLedger(x10, lighter, overlap_ms=60_000)
+        assert await fresh.poll(trades) == ([], False)
+        assert fresh.get_cursor(EXCHANGE_LIGHTER) is None and fresh.needs_bootstrap
+    finally:
+        await transport.close()
+        await server.close()
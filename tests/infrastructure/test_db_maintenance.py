@@ -0,0 +1,151 @@
+import asyncio
+import glob
+import os
+import sqlite3
+import time
+
+import pytest
+
+import config
+from src.infrastructure.database import AsyncDatabase, DBConfig
+from src.infrastructure.db_maintenance import DAY_MS, DatabaseMaintenance, db_maintenance_loop
+
+
+async def _open_db(path):
+    db = AsyncDatabase(DBConfig(db_path=str(path), pool_size=1))
+    await db.initialize()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_retention_prunes_in_chunks_while_writes_continue(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_RETENTION_DAYS", {"execution_log": 30, "pnl_snapshots": 90, "trades": 1})
+    monkeypatch.setattr(config, "DB_PRUNE_CHUNK_ROWS", 50)
+    monkeypatch.setattr(config, "DB_PRUNE_PAUSE_SECONDS", 0.0)
+    db = await _open_db(tmp_path / "prune.db")
+    try:
+        now = int(time.time() * 1000)
+        log_sql = ("INSERT INTO execution_log (symbol, action, exchange, success, timestamp) "
+                   "VALUES (?, 'open', 'X10', 1, ?)")
+        await db.execute_many(log_sql, [("OLD", now - 31 * DAY_MS - i) for i in range(180)])
+        await db.execute_many(log_sql, [("NEW", now - 29 * DAY_MS) for _ in range(5)])
+        snap_sql = ("INSERT INTO pnl_snapshots (timestamp, total_pnl, unrealized_pnl, realized_pnl, "
+                    "funding_pnl, trade_count) VALUES (?, 0, 0, 0, 0, 0)")
+        await db.execute_many(snap_sql, [(now - 91 * DAY_MS,), (now - 89 * DAY_MS,)], wait=True)
+
+        maintenance = DatabaseMaintenance(db)
+        # 'trades' is not a prunable table and is ignored
+        assert maintenance.retention_days() == {"execution_log": 30, "pnl_snapshots": 90}
+
+        # Regular writes keep flowing between the chunks
+        writes = asyncio.gather(*(db.execute(log_sql, ("LIVE", now), wait=True) for _ in range(20)))
+        result, _ = await asyncio.gather(maintenance.prune_expired(now_ms=now), writes)
+        assert result == {"deleted": {"execution_log": 180, "pnl_snapshots": 1}, "complete": True}
+        await asyncio.sleep(0.3)  # wait=True resolves before the batch commit
+
+        rows = await db.fetch_all("SELECT symbol, COUNT(*) AS n FROM execution_log GROUP BY symbol")
+        assert {r["symbol"]: r["n"] for r in rows} == {"NEW": 5, "LIVE": 20}
+        assert (await db.fetch_one("SELECT COUNT(*) AS n FROM pnl_snapshots"))["n"] == 1
+
+        # Exhausted budget: nothing deleted, reported as incomplete
+        await db.execute_many(log_sql, [("OLD", now - 40 * DAY_MS)], wait=True)
+        monkeypatch.setattr(config, "DB_PRUNE_MAX_SECONDS", 0.0)
+        assert (await maintenance.prune_expired(now_ms=now))["complete"] is False
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_and_online_backup(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_VACUUM_PAGES_PER_STEP", 64)
+    monkeypatch.setattr(config, "DB_VACUUM_MIN_FREE_PAGES", 0)
+    monkeypatch.setattr(config, "DB_PRUNE_PAUSE_SECONDS", 0.0)
+    monkeypatch.setattr(config, "DB_BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setattr(config, "DB_BACKUP_KEEP", 1)
+    db = await _open_db(tmp_path / "vacuum.db")
+    try:
+        maintenance = DatabaseMaintenance(db)
+        assert await maintenance._pragma("auto_vacuum") == 2
+
+        await db.execute_many(
+            "INSERT INTO bot_state (key, value, updated_at) VALUES (?, ?, 0)",
+            [(f"k{i}", "x" * 2000) for i in range(300)],
+        )
+        await db.execute("DELETE FROM bot_state WHERE key != 'k0'", wait=True)
+        await asyncio.sleep(0.3)
+        free_before = await maintenance._pragma("freelist_count")
+        assert free_before > 64  # more than one step
+
+        assert await maintenance.incremental_vacuum() == free_before
+        assert await maintenance._pragma("freelist_count") == 0
+
+        assert await maintenance.backup_due()
+        first = await maintenance.backup(str(tmp_path / "backups" / "vacuum_20260101_000000.db"))
+        second = await maintenance.backup()
+        assert not await maintenance.backup_due()
+        # Rotation keeps the newest DB_BACKUP_KEEP files, no .tmp leftovers
+        assert glob.glob(str(tmp_path / "backups" / "*")) == [second["path"]]
+        assert not os.path.exists(first["path"])
+
+        with sqlite3.connect(second["path"]) as copy:
+            assert copy.execute("SELECT key FROM bot_state").fetchall() == [("k0",)]
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_startup_checks_integrity_only_and_loop_runs_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_MAINTENANCE_ENABLED", True)
+    monkeypatch.setattr(config, "DB_MAINTENANCE_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(config, "DB_BACKUP_DIR", str(tmp_path / "backups"))
+    db = await _open_db(tmp_path / "startup.db")
+    try:
+        # initialize(): integrity check, no retention / vacuum / backup on a fresh file
+        await asyncio.sleep(0.3)  # the maintenance_log row goes through the write queue
+        rows = await db.fetch_all("SELECT action FROM maintenance_log")
+        assert [r["action"] for r in rows] == ["INTEGRITY_CHECK"]
+        assert not os.path.exists(tmp_path / "backups")
+
+        loop = asyncio.create_task(db_maintenance_loop(db))
+        try:
+            for _ in range(100):
+                if glob.glob(str(tmp_path / "backups" / "startup_*.db")):
+                    break
+                await asyncio.sleep(0.05)
+            # The first run does not wait for the interval
+            assert len(glob.glob(str(tmp_path / "backups" / "startup_*.db"))) == 1
+        finally:
+            loop.cancel()
+            await asyncio.gather(loop, return_exceptions=True)
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_periodic_run_rechecks_integrity_and_quarantines(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_BACKUP_DIR", str(tmp_path / "backups"))
+    db = await _open_db(tmp_path / "periodic.db")
+    try:
+        maintenance = DatabaseMaintenance(db)
+        quarantined = []
+
+        async def quarantine(problem):
+            quarantined.append(problem)
+
+        monkeypatch.setattr(db, "quarantine_corrupt", quarantine)
+        # Due again: quick_check runs from the periodic run, not only at startup
+        monkeypatch.setattr(db.config, "maintenance_interval_hours", -1)
+        checked = await maintenance.run_once()
+        assert "integrity" not in checked and checked["backup"] is not None
+        await asyncio.sleep(0.3)
+        rows = await db.fetch_all("SELECT action FROM maintenance_log WHERE action = 'INTEGRITY_CHECK'")
+        assert len(rows) == 1
+
+        # A corrupt file is quarantined, nothing is pruned or backed up
+        monkeypatch.setattr(maintenance, "check_integrity", lambda: asyncio.sleep(0, "page 3 corrupt"))
+        assert await maintenance.run_once() == {"timestamp": pytest.approx(time.time(), abs=2),
+                                                 "integrity": "page 3 corrupt"}
+        assert quarantined == ["page 3 corrupt"]
+        assert len(glob.glob(str(tmp_path / "backups" / "*"))) == 1
+    finally:
+        await db.close()
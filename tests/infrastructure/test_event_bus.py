@@ -21,3 +21,81 @@ async def test_event_bus_dispatches():
     await bus.stop()
 
     assert received["id"] == "t1"
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_delay_others():
+    from src.infrastructure.event_bus import EventBus as Bus
+
+    bus = Bus(maxsize=10)
+    fast_seen, slow_seen = [], []
+
+    async def slow(evt):
+        await asyncio.sleep(0.2)
+        slow_seen.append(evt.trade_id)
+
+    async def fast(evt):
+        if evt.trade_id == "t0":
+            raise RuntimeError("handler bug")
+        fast_seen.append((evt.trade_id, asyncio.get_running_loop().time()))
+
+    bus.subscribe(TradeOpened, slow)
+    bus.subscribe(TradeOpened, fast)
+    await bus.start()
+    t0 = asyncio.get_running_loop().time()
+    for i in range(3):
+        await bus.publish(TradeOpened(trade_id=f"t{i}", symbol="BTC-USD", timestamp=datetime.utcnow()))
+    await asyncio.sleep(0.05)
+
+    # Fast handler got everything (despite its own error on t0) long before the slow one finished one event
+    assert [tid for tid, _ in fast_seen] == ["t1", "t2"] and all(t - t0 < 0.05 for _, t in fast_seen)
+    assert slow_seen == []
+    stats = {s["handler"].split(".")[-1]: s for s in bus.get_stats()["subscribers"]}
+    assert stats["fast"]["errors"] == 1 and stats["slow"]["depth"] == 2
+
+    await bus.stop(drain_timeout=1.0)
+    assert slow_seen == ["t0", "t1", "t2"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_policies_and_batch_delivery():
+    from src.infrastructure.event_bus import EventBus as Bus
+    from src.infrastructure.messaging.event_bus import MaintenanceViolation, TradeClosed
+
+    bus = Bus(maxsize=2, block_timeout=0.05)
+    bus.set_policy(TradeOpened, "coalesce", key=lambda e: e.symbol)
+    bus.set_policy(TradeClosed, "drop")
+    opened, closed, violations = [], [], []
+
+    async def on_opened(batch):
+        opened.append([e.trade_id for e in batch])
+
+    async def on_closed(evt):
+        closed.append(evt.trade_id)
+
+    async def on_violation(evt):
+        violations.append(evt.trade_id)
+
+    bus.subscribe(TradeOpened, on_opened, batch_size=10)
+    bus.subscribe(TradeClosed, on_closed)
+    bus.subscribe(MaintenanceViolation, on_violation)
+
+    now = datetime.utcnow()
+    # Not started yet: queues fill up
+    for i, sym in enumerate(["BTC-USD", "ETH-USD", "BTC-USD", "BTC-USD"]):
+        await bus.publish(TradeOpened(trade_id=f"o{i}", symbol=sym, timestamp=now))
+    for i in range(3):
+        await bus.publish(TradeClosed(trade_id=f"c{i}", symbol="BTC-USD", timestamp=now))
+    for i in range(3):  # block: third one waits, times out and is dropped
+        await bus.publish(MaintenanceViolation(trade_id=f"m{i}", symbol="BTC-USD", reason="x", timestamp=now))
+
+    await bus.start()
+    await asyncio.sleep(0.05)
+    await bus.stop()
+
+    assert opened == [["o3", "o1"]]  # latest per symbol, one batch
+    assert closed == ["c0", "c1"] and violations == ["m0", "m1"]
+    stats = bus.get_stats()
+    assert stats["block_timeouts"] == 1
+    by_event = {s["event"]: s for s in stats["subscribers"]}
+    assert by_event["TradeOpened"]["coalesced"] == 2 and by_event["TradeClosed"]["dropped"] == 1
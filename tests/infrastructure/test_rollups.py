@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.database import (
+    AsyncDatabase,
+    DBConfig,
+    FundingRepository,
+    RollupRepository,
+    TradeRepository,
+)
+
+HOUR_MS = 3_600_000
+
+
+async def _open_db(path):
+    db = AsyncDatabase(DBConfig(db_path=str(path), pool_size=1))
+    await db.initialize()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_close_and_funding_triggers_maintain_rollups(tmp_path):
+    db = await _open_db(tmp_path / "rollups.db")
+    try:
+        trades = TradeRepository(db)
+        funding = FundingRepository(db)
+        rollups = RollupRepository(db)
+
+        await trades.add_trade({"symbol": "BTC-USD", "size_usd": 100})
+        await trades.close_trade("BTC-USD", pnl=1.5, funding_collected=0.4, fees=0.1)
+        await trades.add_trade({"symbol": "ETH-USD", "size_usd": 100})
+        await trades.close_trade("ETH-USD", pnl=-0.5, funding_collected=0.1, fees=0.2)
+        # Second close of an already closed symbol does not touch the rollups
+        await trades.close_trade("ETH-USD", pnl=9.0)
+
+        now = int(time.time() * 1000)
+        rows = [
+            {"exchange": "X10", "payment_id": "1", "symbol": "BTC-USD", "amount": 0.3, "paid_time": now},
+            {"exchange": "LIGHTER", "payment_id": "1:7", "symbol": "BTC-USD", "amount": 0.1, "paid_time": now},
+        ]
+        await funding.add_funding_payments(rows)
+        await funding.add_funding_payments(rows[:1])  # duplicate: ignored, not double counted
+        await asyncio.sleep(0.3)
+
+        summary = await rollups.get_pnl_summary()
+        assert summary["trades"] == 2
+        assert summary["wins"] == 1 and summary["losses"] == 1
+        assert summary["win_rate"] == 0.5
+        assert summary["realized_pnl"] == pytest.approx(1.0)
+        assert summary["fees"] == pytest.approx(0.3)
+        assert summary["hold_lt_1h"] == 2
+        assert summary["funding_payments"]["payments"] == 2
+        assert summary["funding_payments"]["amount_x10"] == pytest.approx(0.3)
+        assert summary["funding_payments"]["amount_lighter"] == pytest.approx(0.1)
+
+        btc = await rollups.get_pnl_summary("BTC-USD")
+        assert btc["trades"] == 1 and btc["realized_pnl"] == pytest.approx(1.5)
+
+        day = await rollups.get_pnl_series(bucket="day")
+        assert len(day["items"]) == 1 and day["next_cursor"] is None
+        assert day["items"][0]["bucket_start"] == (now // 86_400_000) * 86_400_000
+
+        symbols = await rollups.get_symbol_totals(limit=1)
+        assert [r["symbol"] for r in symbols["items"]] == ["BTC-USD"]
+        symbols = await rollups.get_symbol_totals(limit=1, cursor=symbols["next_cursor"])
+        assert [r["symbol"] for r in symbols["items"]] == ["ETH-USD"]
+        assert symbols["next_cursor"] is None
+
+        with pytest.raises(ValueError):
+            await rollups.get_funding_series(bucket="week")
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_series_cursor_pagination_and_backfill(tmp_path):
+    path = tmp_path / "backfill.db"
+    db = await _open_db(path)
+    base = 1_700_000_000_000 // HOUR_MS * HOUR_MS
+    try:
+        # Simulate pre-upgrade history: rows written while the rollups were empty
+        for i in range(5):
+            await db.execute(
+                "INSERT INTO trades (symbol, side_x10, side_lighter, size_usd, status, created_at, closed_at, pnl) "
+                "VALUES (?, 'BUY', 'SELL', 10, 'closed', ?, ?, ?)",
+                (f"S{i}-USD", base + i * HOUR_MS - 2 * HOUR_MS, base + i * HOUR_MS, float(i)),
+                wait=True,
+            )
+        await db.execute("DELETE FROM pnl_rollups", wait=True)
+    finally:
+        await db.close()
+
+    db = await _open_db(path)
+    try:
+        rollups = RollupRepository(db)
+        summary = await rollups.get_pnl_summary()
+        assert summary["trades"] == 5
+        assert summary["hold_1h_8h"] == 5
+        assert summary["avg_hold_hours"] == pytest.approx(2.0)
+
+        seen = []
+        cursor = None
+        while True:
+            page = await rollups.get_pnl_series(bucket="hour", limit=2, cursor=cursor)
+            seen.extend(r["bucket_start"] for r in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [base + i * HOUR_MS for i in reversed(range(5))]
+    finally:
+        await db.close()
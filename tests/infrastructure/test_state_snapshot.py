@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from src.core.interfaces import TradeState, TradeStatus
+from src.infrastructure.state_manager import InMemoryStateManager
+
+
+def _trade(symbol, size=100.0):
+    return TradeState(
+        symbol=symbol,
+        side_x10="BUY",
+        side_lighter="SELL",
+        size_usd=size,
+        status=TradeStatus.OPEN,
+        created_at=1_700_000_000_000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_then_deltas_roundtrip(tmp_path):
+    sm = InMemoryStateManager(db_path=str(tmp_path / "trades.db"))
+    await sm.add_trade(_trade("BTC-USD"))
+    await sm.add_trade(_trade("ETH-USD"))
+    await sm.update_balance("X10", 500.0)
+    await sm.set_state("mode", "farm")
+
+    await sm._save_snapshot()  # first snapshot is always a checkpoint
+    ckpt, delta = sm._snapshot_paths()
+    assert ckpt.exists() and delta.read_text() == ""
+
+    # Nothing dirty: no delta written
+    await sm._save_snapshot()
+    assert delta.read_text() == ""
+
+    await sm.add_trade(_trade("SOL-USD", size=50.0))
+    await sm.remove_trade("ETH-USD")
+    await sm._save_snapshot()
+
+    lines = [json.loads(l) for l in delta.read_text().splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["trades"]["ETH-USD"] is None
+    assert lines[0]["trades"]["SOL-USD"]["size_usd"] == 50.0
+    assert "BTC-USD" not in lines[0]["trades"]
+
+    restored = InMemoryStateManager(db_path=str(tmp_path / "trades.db"))
+    assert await restored.load_snapshot()
+    assert set(restored._trades) == {"BTC-USD", "SOL-USD"}
+    assert restored._balances["X10"].available == 500.0
+    assert restored._bot_state == {"mode": "farm"}
+
+
+@pytest.mark.asyncio
+async def test_load_ignores_torn_delta_line_and_reads_legacy(tmp_path):
+    db_path = str(tmp_path / "trades.db")
+    sm = InMemoryStateManager(db_path=db_path)
+    await sm.add_trade(_trade("BTC-USD"))
+    await sm._save_snapshot()
+    await sm.add_trade(_trade("ETH-USD"))
+    await sm._save_snapshot()
+
+    _, delta = sm._snapshot_paths()
+    with open(delta, "a", encoding="utf-8") as f:
+        f.write('{"kind":"delta","seq":99,"trades":{"XRP')
+
+    restored = InMemoryStateManager(db_path=db_path)
+    assert await restored.load_snapshot()
+    assert set(restored._trades) == {"BTC-USD", "ETH-USD"}
+
+    # Legacy single-document snapshot is still accepted
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / "state_snapshot.json").write_text(json.dumps({
+        "timestamp": 0,
+        "trades": {"BTC-USD": _trade("BTC-USD").to_dict()},
+        "balances": {},
+        "bot_state": {"k": 1},
+    }))
+    legacy = InMemoryStateManager(db_path=str(legacy_dir / "trades.db"))
+    assert await legacy.load_snapshot()
+    assert set(legacy._trades) == {"BTC-USD"}
+    assert legacy._bot_state == {"k": 1}
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+
+from src.core.admission import AdmissionGate
+from src.core.market_snapshot import MarketSnapshot
+
+
+def _ready_gate(**balances):
+    gate = AdmissionGate(max_age=30.0)
+    gate.set_positions("x10", {})
+    gate.set_positions("lighter", {"SOL-USD": -1.0})
+    gate.set_balances(balances.get("x10", 100), balances.get("lighter", 100))
+    gate.set_open_trades([{"symbol": "SOL-USD", "size_usd": 150.0}])
+    return gate
+
+
+def test_admit_answers_from_memory_and_reserves_margin(monkeypatch):
+    import config
+    monkeypatch.setattr(config, "MAX_OPEN_TRADES", 5, raising=False)
+    monkeypatch.setattr(config, "MAX_OPEN_POSITIONS", 5, raising=False)
+    monkeypatch.setattr(config, "DESIRED_NOTIONAL_USD", 150.0)
+    monkeypatch.setattr(config, "LEVERAGE_MULTIPLIER", 5.0)
+    monkeypatch.setattr(config, "MAX_TRADE_SIZE_USD", 600.0)
+    gate = _ready_gate(x10=60, lighter=80)
+    gate.set_min_notional("ETH-USD", 10, 20)
+
+    t0 = time.perf_counter()
+    first = gate.admit("ETH-USD")
+    assert time.perf_counter() - t0 < 0.01
+    assert first.ok and first.size_usd == Decimal("150") and first.margin_usd == Decimal("31.5")
+    assert gate.in_flight["X10"] == Decimal("31.5")
+
+    # Same symbol in flight / already open -> rejected without touching margin
+    assert not gate.admit("ETH-USD").ok
+    assert "Lighter" in gate.admit("SOL-USD").reason
+
+    # Margin of the running entry is not available twice: 60 - 31.5 < 31.5
+    second = gate.admit("BTC-USD")
+    assert not second.ok and "Insufficient capital" in second.reason
+
+    gate.release("ETH-USD")
+    assert gate.in_flight == {"X10": Decimal("0"), "Lighter": Decimal("0")}
+
+    # Stream closes SOL, state hook drops the trade -> slot and exposure are free again
+    gate.update_position("lighter", "SOL-USD", 0.0)
+    gate.note_trade_closed("SOL-USD")
+    assert gate.admit("SOL-USD", reserve=False).ok
+
+
+@pytest.mark.asyncio
+async def test_stale_parts_are_refreshed_concurrently_and_older_data_never_wins():
+    class FakeAdapter:
+        def __init__(self, positions, balance):
+            self.market_info = {"ETH-USD": {}}
+            self._positions, self._balance = positions, balance
+            self.calls = []
+
+        async def fetch_open_positions(self):
+            self.calls.append("positions")
+            await asyncio.sleep(0.05)
+            return self._positions
+
+        async def get_available_balance(self):
+            self.calls.append("balance")
+            await asyncio.sleep(0.05)
+            return self._balance
+
+        def min_notional_usd(self, symbol):
+            return 12.0
+
+    async def open_trades():
+        await asyncio.sleep(0.05)
+        return []
+
+    x10 = FakeAdapter([], Decimal("80"))
+    lighter = FakeAdapter([{"symbol": "ETH-USD", "size": 0.3}], Decimal("90"))
+    gate = AdmissionGate(max_age=30.0)
+    assert gate.stale_parts() == ["positions", "balances", "trades"]
+
+    t0 = time.monotonic()
+    await gate.ensure_fresh(lighter, x10, "ETH-USD", get_open_trades=open_trades)
+    assert time.monotonic() - t0 < 0.15
+    assert gate.is_ready() and gate.position_size("lighter", "ETH-USD") == 0.3
+    assert gate._min_notional["ETH-USD"] == Decimal("12.0")
+
+    # A fresh gate makes no REST calls on the entry path
+    await gate.ensure_fresh(lighter, x10, "ETH-USD", get_open_trades=open_trades)
+    assert x10.calls == ["positions", "balance"]
+
+    # An older snapshot does not overwrite newer REST data
+    old = MarketSnapshot(captured_at=time.time() - 60).with_account(
+        balances={"x10": 1.0, "lighter": 1.0}, balances_at=time.time() - 60,
+        positions={"x10": {}, "lighter": {}}, positions_at=time.time() - 60,
+    )
+    gate.ingest_snapshot(old)
+    assert gate.position_size("lighter", "ETH-USD") == 0.3
+    assert gate._balances["x10"] == Decimal("80")
@@ -3,6 +3,7 @@ import asyncio
 import aiohttp
 import pytest
 from src.api_server import DashboardApi
+from src.infrastructure.database import AsyncDatabase, DBConfig, RollupRepository
 from unittest.mock import MagicMock
 from decimal import Decimal
 from datetime import datetime
@@ -22,8 +23,10 @@ class MockParallelExec:
         return {"successful": 10, "failed": 0}
 
 @pytest.mark.asyncio
-async def test_api_endpoints():
+async def test_api_endpoints(tmp_path):
     # Setup
+    db = AsyncDatabase(DBConfig(db_path=str(tmp_path / "api.db"), pool_size=1))
+    await db.initialize()
     state_manager = MockStateManager()
     parallel_exec = MockParallelExec()
     
@@ -34,7 +37,7 @@ async def test_api_endpoints():
     mock_exec.entry_time = datetime.now()
     parallel_exec.active_executions["BTC-USD"] = mock_exec
 
-    api = DashboardApi(state_manager, parallel_exec, time.time())
+    api = DashboardApi(state_manager, parallel_exec, time.time(), rollups=RollupRepository(db))
     
     # Start API
     await api.start()
@@ -56,6 +59,15 @@ async def test_api_endpoints():
                 data = await resp.json()
                 print(data)
                 assert data['session_stats']['successful'] == 10
+                assert data['summary']['trades'] == 0
+
+            async with session.get('http://localhost:8080/pnl/series?bucket=hour&limit=10') as resp:
+                assert resp.status == 200
+                data = await resp.json()
+                assert data == {"items": [], "next_cursor": None}
+
+            async with session.get('http://localhost:8080/funding/series?bucket=week') as resp:
+                assert resp.status == 400
 
             # 3. Test /positions
             async with session.get('http://localhost:8080/positions') as resp:
@@ -69,7 +81,10 @@ async def test_api_endpoints():
                 
     finally:
         await api.stop()
+        await db.close()
 
 if __name__ == "__main__":
     loop = asyncio.new_event_loop()
-    loop.run_until_complete(test_api_endpoints())
+    import tempfile
+    from pathlib import Path
+    loop.run_until_complete(test_api_endpoints(Path(tempfile.mkdtemp())))
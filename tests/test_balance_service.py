@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.balance_service import BalanceService
+
+
+@pytest.mark.asyncio
+async def test_stream_updates_serve_lookups_without_rest():
+    service = BalanceService(max_age=30.0)
+    rest_calls = []
+
+    async def rest_fetch():
+        rest_calls.append(1)
+        return 999.0
+
+    service.update("x10", available=120.0, collateral=150.0, used_margin=30.0)
+    assert await service.get_available("x10", rest_fetch) == 120.0
+    service.update("x10", available=110.0)  # partial update keeps the other fields
+    assert await service.get_available("x10", rest_fetch) == 110.0
+    assert service.get("x10").collateral == 150.0 and not rest_calls
+
+    # Reconnect: updates may be missed -> next lookup goes through REST
+    service.invalidate("x10")
+    assert await service.get_available("x10", rest_fetch) == 999.0
+    assert service.get("x10").source == "rest" and len(rest_calls) == 1
+    assert service.get_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_lookups_share_one_rest_request_and_failures_are_not_cached():
+    service = BalanceService(max_age=0.05)
+    release = asyncio.Event()
+    rest_calls = []
+
+    async def rest_fetch():
+        rest_calls.append(1)
+        await release.wait()
+        return 80.0
+
+    waiters = [asyncio.create_task(service.get_available("lighter", rest_fetch)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(*waiters) == [80.0] * 5
+    assert len(rest_calls) == 1 and service.is_fresh("lighter")
+
+    await asyncio.sleep(0.06)
+
+    async def failing_fetch():
+        return None
+
+    assert await service.get_available("lighter", failing_fetch) is None
+    assert not service.is_fresh("lighter") and service.get("lighter").available == 80.0
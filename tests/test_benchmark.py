@@ -0,0 +1,57 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+import config
+import src.infrastructure.market_registry as market_registry
+from src.infrastructure.benchmark import (
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+    synthetic_workload,
+)
+from src.infrastructure.db_maintenance import DatabaseMaintenance
+from src.infrastructure.market_registry import MarketRegistry
+
+
+@pytest.mark.asyncio
+async def test_synthetic_workload_runs_every_stage(monkeypatch):
+    # The bench env applies market_info to the registry; keep the global one clean
+    monkeypatch.setattr(market_registry, "_default_registry", MarketRegistry())
+    monkeypatch.setattr(config, "DB_MAINTENANCE_ENABLED", True)
+    integrity = AsyncMock(return_value=None)
+    monkeypatch.setattr(DatabaseMaintenance, "check_integrity", integrity)
+    workload = synthetic_workload(symbols=10, depth=5, updates=300, seed=3)
+    assert len(workload.symbols) == 10
+
+    results = {r.name: r for r in await run_benchmarks(workload, scans=2, db_batches=3)}
+    for name, result in results.items():
+        if name == "x10_orderbook" and result.skipped:
+            continue  # X10 SDK not installed
+        assert not result.skipped, f"{name}: {result.detail}"
+        assert result.ops > 0 and result.p50_us <= result.p99_us <= result.max_us
+    assert results["lighter_orderbook"].detail.endswith("gaps=0 resyncs=0")
+    assert "1 opportunities" in results["find_opportunities"].detail
+    # The db_flush scratch database skips the startup maintenance
+    integrity.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_baseline_roundtrip_flags_regressions(tmp_path, monkeypatch):
+    monkeypatch.setattr(market_registry, "_default_registry", MarketRegistry())
+    workload = synthetic_workload(symbols=4, depth=5, updates=100, seed=1)
+    results = await run_benchmarks(workload, stages=["ws_decode", "price_impact"])
+
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, results, workload)
+    baseline = load_baseline(path)
+    assert set(baseline["stages"]) == {"ws_decode", "price_impact"}
+    assert not any(c.regression for c in compare_to_baseline(results, baseline, tolerance=0.01))
+
+    # Baseline twice as fast: latency and throughput both count as regressions
+    stage = baseline["stages"]["price_impact"]
+    stage["p50_us"] /= 2
+    stage["items_per_sec"] *= 2
+    flagged = {(c.stage, c.metric) for c in compare_to_baseline(results, baseline, tolerance=0.25) if c.regression}
+    assert flagged == {("price_impact", "p50_us"), ("price_impact", "items_per_sec")}
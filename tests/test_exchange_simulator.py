@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from src.adapters.lighter_fast_rest import LighterFastRest, LighterFastRestRateLimited
+from src.infrastructure.exchange_simulator import (
+    LIGHTER_TX_CREATE_ORDER,
+    ExchangeSimulator,
+    _Client,
+    SimulatorConfig,
+)
+
+
+async def _next_json(ws, msg_type=None, timeout=2.0):
+    while True:
+        data = json.loads((await ws.receive(timeout=timeout)).data)
+        if msg_type is None or data.get("type") == msg_type:
+            return data
+
+
+@pytest.mark.asyncio
+async def test_lighter_rest_ws_and_rate_limit_injection():
+    sim = await ExchangeSimulator(SimulatorConfig(
+        symbols=3, update_hz=50, seed=1, latency_median_ms=0.5, latency_p99_ms=1.0,
+    )).start()
+    try:
+        overrides = sim.config_overrides()
+        async with aiohttp.ClientSession() as session:
+            async def _session():
+                return session
+
+            rest = LighterFastRest(overrides["LIGHTER_BASE_URL"], _session)
+            details = await rest.order_book_details()
+            assert [d.symbol for d in details.order_book_details] == ["BTC", "ETH", "SIM2"]
+            account = await rest.account(sim.cfg.lighter_account_index)
+            assert account.accounts[0].collateral == pytest.approx(10_000.0)
+
+            async with session.ws_connect(overrides["LIGHTER_WS_URL"]) as ws:
+                assert (await _next_json(ws))["type"] == "connected"
+                await ws.send_str(json.dumps({"type": "subscribe", "channel": "market_stats/all"}))
+                snapshot = await _next_json(ws, "subscribed/market_stats")
+                assert set(snapshot["market_stats"]) == {"0", "1", "2"}
+                update = await _next_json(ws, "update/market_stats")
+                assert float(update["market_stats"]["1"]["mark_price"]) > 0 and update["sim_ts"] > 0
+
+                # Taker buy through the WS jsonapi: reply by id, position pushed on account_all
+                await ws.send_str(json.dumps({"type": "subscribe", "channel": f"account_all/{sim.cfg.lighter_account_index}"}))
+                await _next_json(ws, "subscribed/account_all")
+                ask = sim.markets["ETH-USD"].asks[0][0]
+                tx_info = {"MarketIndex": 1, "BaseAmount": 25000, "Price": int(ask * 1.01 * 100),
+                           "IsAsk": 0, "ClientOrderIndex": 7, "TimeInForce": 0}
+                await ws.send_str(json.dumps({"type": "jsonapi/sendtx", "data": {
+                    "id": "req-1", "tx_type": LIGHTER_TX_CREATE_ORDER, "tx_info": json.dumps(tx_info)}}))
+                pushed = await _next_json(ws, "update/account_all")
+                assert pushed["positions"]["1"]["position"] == "2.5"
+                while True:
+                    reply = await _next_json(ws)
+                    if reply.get("id") == "req-1":
+                        break
+                assert reply["status"] == 1 and reply["hash"].startswith("0x")
+
+            sim.cfg.rate_limit_rate = 1.0
+            with pytest.raises(LighterFastRestRateLimited):
+                await rest.funding_rates()
+        stats = sim.get_stats()
+        assert stats["rest_429"] == 1 and stats["fills"] == 1
+        assert stats["routes"]["/lighter/api/v1/orderBookDetails"]["count"] == 1
+    finally:
+        await sim.stop()
+
+
+@pytest.mark.asyncio
+async def test_x10_partial_fill_pushes_order_trade_and_position():
+    sim = await ExchangeSimulator(SimulatorConfig(
+        symbols=2, update_hz=20, seed=2, latency_median_ms=0.5, latency_p99_ms=1.0,
+        partial_fill_rate=1.0, partial_fill_ratio=0.5,
+    )).start()
+    try:
+        overrides = sim.config_overrides()
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{overrides['X10_STREAM_BASE_URL']}/account") as account_ws, \
+                    session.ws_connect(f"{overrides['X10_STREAM_BASE_URL']}/orderbooks") as book_ws:
+                assert (await _next_json(account_ws, "BALANCE"))["data"]["balance"]
+                snapshot = await _next_json(book_ws, "SNAPSHOT")
+                assert snapshot["data"]["m"] == "BTC-USD" and len(snapshot["data"]["b"]) == sim.cfg.depth
+
+                bid = sim.markets["BTC-USD"].bids[0][0]
+                async with session.post(f"{overrides['X10_API_BASE_URL']}/api/v1/user/order", json={
+                    "id": "ext-1", "market": "BTC-USD", "side": "SELL", "qty": "0.2",
+                    "price": str(round(bid * 0.99, 2)), "timeInForce": "IOC",
+                }) as resp:
+                    assert resp.status == 200
+                    assert (await resp.json())["data"]["externalId"] == "ext-1"
+
+                order = (await _next_json(account_ws, "ORDER"))["data"]["orders"][0]
+                assert order["status"] == "CANCELLED" and float(order["filledQty"]) == pytest.approx(0.1)
+                trade = (await _next_json(account_ws, "TRADE"))["data"]["trades"][0]
+                assert trade["side"] == "SELL" and float(trade["qty"]) == pytest.approx(0.1)
+                position = (await _next_json(account_ws, "POSITION"))["data"]["positions"][0]
+                assert position["market"] == "BTC-USD" and position["side"] == "SHORT"
+
+                delta = await _next_json(book_ws, "DELTA")
+                assert delta["seq"] > snapshot["seq"]
+
+            async with session.get(f"{overrides['X10_API_BASE_URL']}/api/v1/user/positions") as resp:
+                data = (await resp.json())["data"]
+            assert float(data[0]["size"]) == pytest.approx(0.1)
+        await asyncio.sleep(0)
+        assert sim.get_stats()["partial_fills"] == 1
+    finally:
+        await sim.stop()
+
+
+@pytest.mark.asyncio
+async def test_x10_trade_messages_carry_each_fill_increment():
+    sim = ExchangeSimulator(SimulatorConfig(symbols=1, seed=3, partial_fill_rate=1.0, partial_fill_ratio=0.25))
+    sent = []
+
+    async def _capture(client, frames):
+        sent.extend(json.loads(f) for f in frames)
+
+    sim._send_frames = _capture
+    sim._clients.add(_Client(ws=None, request=None, kind="x10:account"))
+    market = sim.markets["BTC-USD"]
+    ask = market.asks[0][0]
+
+    order = sim._submit("x10", "ext-2", "BTC-USD", True, 0.4, ask * 1.01, ioc=False)
+    await sim._push_account("x10", order)
+    market.asks[0][0] = ask - 1.0  # the resting remainder fills at the new best ask
+    await sim._fill_resting_orders()
+    await sim._push_account("x10", order)  # e.g. a cancel echo: no trade is reported twice
+
+    trades = [t for m in sent if m["type"] == "TRADE" for t in m["data"]["trades"]]
+    assert [float(t["qty"]) for t in trades] == pytest.approx([0.1, 0.3])
+    assert [float(t["price"]) for t in trades] == pytest.approx([ask, ask - 1.0])
+    assert [t["isTaker"] for t in trades] == [True, False]
+    assert len({t["id"] for t in trades}) == 2 and order.status == "FILLED"
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+import src.core.state as state
+import src.core.trade_management as tm
+from src.core.exit_pipeline import ExitDecision, ExitPipeline
+
+
+@pytest.mark.asyncio
+async def test_pipeline_one_close_per_symbol_and_bounded_parallelism():
+    running, peak, done = set(), [0], []
+    release_a = asyncio.Event()
+
+    async def executor(decision):
+        running.add(decision.symbol)
+        peak[0] = max(peak[0], len(running))
+        if decision.symbol == "A-USD":
+            await release_a.wait()
+        else:
+            await asyncio.sleep(0.01)
+        running.discard(decision.symbol)
+        done.append(decision.symbol)
+        return True
+
+    pipeline = ExitPipeline(executor, max_concurrent=2)
+    assert pipeline.submit(ExitDecision({"symbol": "A-USD"}, "TAKE_PROFIT"))
+    assert not pipeline.submit(ExitDecision({"symbol": "A-USD"}, "TAKE_PROFIT"))
+    for sym in ("B-USD", "C-USD"):
+        assert pipeline.submit(ExitDecision({"symbol": sym}, "TAKE_PROFIT"))
+
+    # A slow close does not hold back the others
+    await asyncio.sleep(0.1)
+    assert done == ["B-USD", "C-USD"]
+    assert pipeline.in_flight("A-USD")
+
+    release_a.set()
+    await pipeline.drain(timeout=1.0)
+    assert peak[0] == 2
+    stats = pipeline.get_stats()
+    assert (stats["submitted"], stats["duplicates"], stats["closed"], stats["in_flight"]) == (3, 1, 3, 0)
+
+
+@pytest.mark.asyncio
+async def test_manage_open_trades_scores_concurrently_and_hands_off_closes(monkeypatch):
+    trades = [{"symbol": f"S{i}-USD"} for i in range(8)]
+    closed = []
+
+    async def get_open_trades():
+        return trades
+
+    async def get_cached_positions(lighter, x10, force=False):
+        return [], []
+
+    async def evaluate(t, lighter, x10, p_lit, state_manager):
+        await asyncio.sleep(0.05)  # per-trade price/funding/book reads
+        return ExitDecision(t, "TAKE_PROFIT") if t["symbol"] in ("S1-USD", "S5-USD") else None
+
+    async def execute(decision, lighter, x10):
+        await asyncio.sleep(0.2)
+        closed.append(decision.symbol)
+        return True
+
+    monkeypatch.setattr(state, "get_open_trades", get_open_trades)
+    monkeypatch.setattr(tm, "get_cached_positions", get_cached_positions)
+    monkeypatch.setattr(tm, "evaluate_trade_exit", evaluate)
+    monkeypatch.setattr(tm, "execute_trade_exit", execute)
+
+    try:
+        t0 = time.monotonic()
+        await tm.manage_open_trades(None, None, state_manager=object())
+        # 8 evaluations in ~one read latency, closes not awaited inline
+        assert time.monotonic() - t0 < 0.15
+        pipeline = tm.get_exit_pipeline()
+        assert pipeline.active_symbols == {"S1-USD", "S5-USD"}
+
+        # Next cycle skips symbols that are still closing
+        await tm.manage_open_trades(None, None, state_manager=object())
+        assert pipeline.get_stats()["duplicates"] == 0
+
+        await pipeline.drain(timeout=1.0)
+        assert sorted(closed) == ["S1-USD", "S5-USD"]
+    finally:
+        await tm.stop_exit_pipeline()
+
+
+@pytest.mark.asyncio
+async def test_exit_orderbook_prefers_fresh_provider_book(monkeypatch):
+    from decimal import Decimal
+
+    from src.infrastructure.orderbook_provider import OrderbookProvider, OrderbookSnapshot
+
+    provider = OrderbookProvider(max_staleness_seconds=5.0, rest_fallback_enabled=False)
+    monkeypatch.setattr(tm, "get_orderbook_provider", lambda: provider)
+    levels = [(Decimal(100 - i), Decimal(1)) for i in range(8)]
+    provider._x10_orderbooks["A-USD"] = OrderbookSnapshot("A-USD", "x10", levels, levels, time.time())
+    provider._x10_orderbooks["B-USD"] = OrderbookSnapshot("B-USD", "x10", levels, levels, time.time() - 60)
+
+    class Adapter:
+        calls = []
+
+        async def fetch_orderbook(self, symbol, limit=5):
+            self.calls.append(symbol)
+            return {"bids": [[1.0, 1.0]], "asks": [[1.1, 1.0]]}
+
+    adapter = Adapter()
+    fresh = await tm._exit_orderbook(adapter, "A-USD", "x10")
+    assert len(fresh["bids"]) == 5 and float(fresh["bids"][0][0]) == 100.0
+    assert adapter.calls == []
+
+    # Stale book: REST fallback
+    assert (await tm._exit_orderbook(adapter, "B-USD", "x10"))["bids"] == [[1.0, 1.0]]
+    assert adapter.calls == ["B-USD"]
@@ -0,0 +1,73 @@
+import socket
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.adapters.lighter_adapter import LighterAdapter
+from src.infrastructure.http_transport import HostTransport, _tcp_socket_factory
+
+
+@pytest_asyncio.fixture
+async def transport():
+    async def ok(request):
+        return web.json_response({"status": 200, "pad": "x" * 100})
+
+    app = web.Application()
+    app.router.add_get("/", ok)
+    server = TestServer(app)
+    await server.start_server()
+    t = HostTransport("test", str(server.make_url("")), keepalive_timeout=30)
+    try:
+        yield t
+    finally:
+        await t.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_pool_and_requests_reuse_it(transport):
+    assert await transport.warm_up("/", connections=3) == 3
+
+    session = await transport.session()
+    assert await transport.session() is session
+    for _ in range(5):
+        async with session.get(f"{transport.base_url}/") as resp:
+            assert (await resp.json())["status"] == 200
+
+    stats = transport.get_stats()
+    assert stats["requests"] == 8
+    assert stats["connections_new"] == 3
+    assert stats["connections_reused"] == 5
+    assert stats["warm_connections"] == 3
+    assert stats["bytes_in"] > 8 * 100
+    assert stats["latency_ms_p99"] >= stats["latency_ms_p50"] > 0
+
+
+def test_socket_factory_sets_nodelay_and_keepalive():
+    sock = _tcp_socket_factory((socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("127.0.0.1", 0)))
+    try:
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    finally:
+        sock.close()
+
+
+@pytest.mark.asyncio
+async def test_lighter_sdk_client_gets_shared_session(transport):
+    adapter = LighterAdapter()
+    adapter._transport = transport
+
+    own = await HostTransport("own", transport.base_url).session()
+    api_client = SimpleNamespace(rest_client=SimpleNamespace(pool_manager=own))
+
+    await adapter._attach_transport(api_client)
+    assert api_client.rest_client.pool_manager is await transport.session()
+    assert own.closed
+
+    # SDK close() must not close the shared session
+    adapter._detach_transport(api_client)
+    assert api_client.rest_client.pool_manager is None
+    assert not (await adapter._get_session()).closed
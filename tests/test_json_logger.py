@@ -0,0 +1,118 @@
+"""
+Tests for the background JSON log sink (batching, flush policy, rotation, drops).
+"""
+import json
+import os
+import time
+from decimal import Decimal
+
+from src.utils.json_logger import JSONLogger, LogCategory, LogLevel
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_trade_events_are_flushed_promptly(tmp_path):
+    path = str(tmp_path / "bot.jsonl")
+    jl = JSONLogger(log_file=path, include_standard_log=False, flush_interval=60.0)
+    try:
+        jl.trade_entry("BTC-USD", "LONG", Decimal("0.1"), Decimal("50000"), "X10")
+        assert _wait_for(lambda: os.path.getsize(path) > 0)
+
+        entry = _read_lines(path)[0]
+        assert entry["event"] == "TRADE_ENTRY"
+        assert entry["data"]["price"] == 50000.0
+        assert entry["timestamp"]
+    finally:
+        jl.close()
+
+
+def test_bulk_events_are_batched_until_flush(tmp_path):
+    path = str(tmp_path / "bot.jsonl")
+    jl = JSONLogger(log_file=path, include_standard_log=False, min_level=LogLevel.DEBUG, flush_interval=60.0)
+    try:
+        for i in range(10):
+            jl.metric("latency", i, unit="ms")
+        time.sleep(0.1)
+        assert os.path.getsize(path) == 0
+
+        assert jl.flush()
+        lines = _read_lines(path)
+        assert [l["data"]["metric_value"] for l in lines] == list(range(10))
+        assert jl.get_stats()["batches"] == 1
+    finally:
+        jl.close()
+
+
+def test_bulk_queue_drops_oldest_debug_but_keeps_urgent(tmp_path):
+    path = str(tmp_path / "bot.jsonl")
+    jl = JSONLogger(
+        log_file=path, include_standard_log=False, min_level=LogLevel.DEBUG,
+        flush_interval=60.0, max_queue=3
+    )
+    sink = jl._sink
+    try:
+        # Hold the sink lock so nothing is drained while we overfill the queue
+        with sink._cond:
+            for i in range(6):
+                sink._droppable.append((time.time(), {"event": "METRIC", "i": i}))
+        for i in range(6, 9):
+            jl.log(LogCategory.WEBSOCKET, "MESSAGE", level=LogLevel.DEBUG, i=i)
+        jl.error("ws", "boom")
+        assert jl.flush()
+
+        lines = _read_lines(path)
+        assert [l["data"]["i"] for l in lines if l.get("category") == LogCategory.WEBSOCKET.value] == [6, 7, 8]
+        assert any(l["event"] == "ERROR" for l in lines)
+        assert jl.get_stats()["dropped"] == 3
+    finally:
+        jl.close()
+
+
+def test_info_records_survive_queue_overflow(tmp_path):
+    path = str(tmp_path / "bot.jsonl")
+    jl = JSONLogger(
+        log_file=path, include_standard_log=False, min_level=LogLevel.DEBUG,
+        flush_interval=60.0, max_queue=3
+    )
+    sink = jl._sink
+    try:
+        # Writer held off: INFO bulk + DEBUG records, both beyond max_queue
+        with sink._cond:
+            for i in range(10):
+                jl.websocket_event("lighter", "MESSAGE", i=i)
+                jl.log(LogCategory.WEBSOCKET, "FRAME", level=LogLevel.DEBUG, i=i)
+        assert jl.flush()
+
+        lines = _read_lines(path)
+        assert [l["data"]["i"] for l in lines if l["level"] == "INFO"] == list(range(10))
+        assert [l["data"]["i"] for l in lines if l["level"] == "DEBUG"] == [7, 8, 9]
+        assert jl.get_stats()["dropped"] == 7
+    finally:
+        jl.close()
+
+
+def test_rotation(tmp_path):
+    path = str(tmp_path / "bot.jsonl")
+    jl = JSONLogger(log_file=path, include_standard_log=False, max_bytes=200, backup_count=2)
+    try:
+        for i in range(20):
+            jl.log(LogCategory.TRADE, "TRADE_EXIT", symbol="ETH-USD", pnl=i)
+            jl.flush()
+        assert os.path.exists(path + ".1")
+        assert os.path.exists(path + ".2")
+        assert not os.path.exists(path + ".3")
+        assert jl.get_stats()["rotations"] >= 2
+    finally:
+        jl.close()
@@ -0,0 +1,118 @@
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.adapters.lighter_fast_rest import (
+    LighterFastRest,
+    LighterFastRestRateLimited,
+    parse_account,
+    parse_order_book_details,
+)
+
+ACCOUNT_PAYLOAD = {
+    "code": 200,
+    "accounts": [{
+        "index": 42,
+        "collateral": "120.5",
+        "available_balance": "100.0",
+        "total_asset_value": "130.25",
+        "l1_address": "0xabc",
+        "positions": [{
+            "market_id": 1,
+            "symbol": "BTC",
+            "sign": -1,
+            "position": "0.010",
+            "avg_entry_price": "65000.5",
+            "position_value": "650.0",
+            "unrealized_pnl": "-1.25",
+            "realized_pnl": "0.5",
+            "liquidation_price": "90000",
+            "total_funding_paid_out": "-0.12",
+            "allocated_margin": "0",
+            "initial_margin_fraction": "5.00",
+        }],
+    }],
+}
+
+
+def test_parse_account_keeps_sdk_attribute_names():
+    resp = parse_account(ACCOUNT_PAYLOAD)
+    acc = resp.accounts[0]
+    assert acc.total_asset_value == 130.25
+    assert acc.buying_power is None
+
+    pos = acc.positions[0]
+    assert (pos.symbol, pos.sign, pos.position) == ("BTC", -1, 0.01)
+    assert getattr(pos, "total_funding_paid_out") == -0.12
+    assert not hasattr(pos, "__dict__")  # slotted
+
+
+def test_parse_order_book_details_requires_key():
+    resp = parse_order_book_details({"order_book_details": [
+        {"market_id": 7, "symbol": "ETH", "last_trade_price": "3000.1", "open_interest": "12", "size_decimals": 4},
+    ]})
+    m = resp.order_book_details[0]
+    assert (m.market_id, m.symbol, m.last_trade_price, m.mark_price, m.size_decimals) == (7, "ETH", 3000.1, None, 4)
+
+    with pytest.raises(KeyError):
+        parse_order_book_details({"code": 200})
+
+
+@pytest_asyncio.fixture
+async def fast_rest():
+    state = {"status": 200}
+
+    async def account(request):
+        assert request.query["by"] == "index" and request.query["value"] == "42"
+        return web.json_response(ACCOUNT_PAYLOAD, status=state["status"])
+
+    async def funding(request):
+        return web.json_response({"code": 200, "unexpected": []})
+
+    async def nonce(request):
+        return web.json_response({"code": 200, "nonce": 1234})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/account", account)
+    app.router.add_get("/api/v1/funding-rates", funding)
+    app.router.add_get("/api/v1/nextNonce", nonce)
+
+    server = TestServer(app)
+    await server.start_server()
+    session = aiohttp.ClientSession()
+
+    async def get_session():
+        return session
+
+    client = LighterFastRest(str(server.make_url("")), get_session)
+    try:
+        yield client, state
+    finally:
+        await session.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_fast_rest_parses_and_signals_fallback(fast_rest):
+    client, state = fast_rest
+
+    resp = await client.account(42)
+    assert resp.accounts[0].positions[0].avg_entry_price == 65000.5
+    assert await client.next_nonce(42, 3) == 1234
+
+    # Unknown shape -> None (caller uses the SDK)
+    assert await client.funding_rates() is None
+
+    state["status"] = 500
+    assert await client.account(42) is None
+
+    state["status"] = 429
+    with pytest.raises(LighterFastRestRateLimited, match="429"):
+        await client.account(42)
+
+    stats = client.get_stats()
+    assert stats["parsed"] == 2
+    assert stats["fallbacks"] == 2
+    assert stats["rate_limited"] == 1
@@ -0,0 +1,112 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import config
+from src.adapters.lighter_adapter import LighterAdapter
+
+
+class FakeSigner:
+    def sign_create_order(self, **kw):
+        return json.dumps(kw), None
+
+
+def _account(*positions):
+    return SimpleNamespace(accounts=[SimpleNamespace(positions=[
+        SimpleNamespace(symbol=sym, position=str(abs(size)), sign=1 if size > 0 else -1)
+        for sym, size in positions
+    ])])
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    monkeypatch.setattr(config, "LIVE_TRADING", True, raising=False)
+    monkeypatch.setattr(config, "LIGHTER_FLATTEN_VERIFY_DELAY", 0.0, raising=False)
+    a = LighterAdapter()
+    a.market_info = {
+        "BTC-USD": {"i": 1, "sd": 5, "pd": 1, "tick_size": 0.1},
+        "ETH-USD": {"i": 0, "sd": 4, "pd": 2, "tick_size": 0.01},
+        "DOGE-USD": {"i": 3, "sd": 0, "pd": 6, "tick_size": 0.000001},
+    }
+    a._price_cache = {"BTC-USD": 60000.0, "ETH-USD": 3000.0, "DOGE-USD": 0.1}
+    a._resolved_api_key_index = 2
+    a._nonce_pool = list(range(100, 200))
+    a._nonce_pool_fetch_time = time.time()
+    a._nonce_refill_in_progress = False
+
+    async def get_signer():
+        return FakeSigner()
+
+    a._get_signer = get_signer
+    return a
+
+
+@pytest.mark.asyncio
+async def test_flatten_batches_all_markets_and_retries_only_residuals(adapter):
+    batches = []
+    reads = iter([
+        _account(("DOGE", -50)),  # after round 1: DOGE partially filled
+        _account(),               # after round 2: flat
+    ])
+
+    async def send_batch_orders(tx_types, tx_infos):
+        batches.append((tx_types, [json.loads(t) for t in tx_infos]))
+        return True, [f"h{i}" for i in range(len(tx_infos))]
+
+    async def read_account():
+        return next(reads)
+
+    adapter.send_batch_orders = send_batch_orders
+    adapter._read_account = read_account
+    adapter._positions_cache = [{"symbol": "BTC-USD", "size": 0.01}, {"symbol": "XRP-USD", "size": 5}]
+
+    result = await adapter.flatten_positions([
+        {"symbol": "BTC-USD", "size": 0.01},
+        {"symbol": "ETH-USD", "size": -0.5},
+        {"symbol": "DOGE-USD", "size": -100},
+        {"symbol": "SOL-USD", "size": 0.0},
+    ])
+
+    # Round 1: one sendTxBatch with all three markets, consecutive nonces
+    types, orders = batches[0]
+    assert types == [14, 14, 14]
+    assert [o["nonce"] for o in orders] == [100, 101, 102]
+    assert all(o["reduce_only"] and o["order_expiry"] == 0 for o in orders)
+    btc, eth, doge = orders
+    assert (btc["market_index"], btc["base_amount"], btc["is_ask"]) == (1, 1000, True)
+    assert btc["price"] == 585000  # 60000 * 0.975 on the 0.1 tick
+    assert (eth["base_amount"], eth["is_ask"], eth["price"]) == (5000, False, 307500)
+
+    # Round 2: only the DOGE residual, with its remaining size
+    assert len(batches) == 2
+    (_, [retry]) = batches[1]
+    assert (retry["market_index"], retry["base_amount"], retry["nonce"]) == (3, 50, 103)
+
+    assert sorted(result.closed) == ["BTC-USD", "DOGE-USD", "ETH-USD"]
+    assert result.ok and result.rounds == 2 and result.batches == 2
+    assert adapter._positions_cache == [{"symbol": "XRP-USD", "size": 5}]
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_refreshes_nonces_and_reports_residual(adapter, monkeypatch):
+    monkeypatch.setattr(config, "LIGHTER_FLATTEN_MAX_ROUNDS", 2, raising=False)
+    refreshes = []
+
+    async def send_batch_orders(tx_types, tx_infos):
+        return False, []
+
+    async def hard_refresh_nonce():
+        refreshes.append(True)
+
+    async def read_account():
+        return _account(("ETH", 0.5))
+
+    adapter.send_batch_orders = send_batch_orders
+    adapter.hard_refresh_nonce = hard_refresh_nonce
+    adapter._read_account = read_account
+
+    closed, failed = await adapter.close_all_positions_batch()
+    assert (closed, failed) == (0, 1)
+    assert len(refreshes) == 2
@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+from src.infrastructure.market_registry import MarketRegistry, lighter_market_meta
+
+
+def _info(market_id, tick=0.01, sd=4, pd=2):
+    return {"i": market_id, "market_index": market_id, "tick_size": tick, "lot_size": 0.0001,
+            "min_base_amount": 0.01, "min_notional": 10.0, "sd": sd, "pd": pd}
+
+
+def test_refresh_diffs_against_previous_version_and_swaps_atomically():
+    registry = MarketRegistry()
+    first = registry.apply("lighter", [lighter_market_meta(f"S{i}-USD", _info(i)) for i in range(50)])
+    assert first.version == 1 and len(first.added) == 50
+    v1 = registry.current("lighter")
+
+    # Identical refresh: no new version, same object
+    same = registry.apply("lighter", [lighter_market_meta(f"S{i}-USD", _info(i)) for i in range(50)])
+    assert not same and registry.current("lighter") is v1
+
+    # One tick change, one market delisted
+    metas = [lighter_market_meta(f"S{i}-USD", _info(i, tick=0.001 if i == 7 else 0.01)) for i in range(49)]
+    diff = registry.apply("lighter", metas)
+    assert (diff.version, diff.added, diff.changed, diff.removed) == (2, (), ("S7-USD",), ("S49-USD",))
+
+    v2 = registry.current("lighter")
+    # Readers holding v1 still see the complete old version
+    assert v1.by_symbol["S7-USD"].tick_size == Decimal("0.01") and len(v1) == 50
+    assert v2.by_symbol["S7-USD"].tick_size == Decimal("0.001") and len(v2) == 49
+    # Unchanged entries are shared between versions
+    assert v2.by_symbol["S3-USD"] is v1.by_symbol["S3-USD"]
+    assert registry.symbol_for_id("lighter", 7) == "S7-USD" and registry.symbol_for_id("lighter", 49) is None
+
+
+def test_meta_precomputes_integer_scales_and_partial_refresh_keeps_other_markets():
+    registry = MarketRegistry()
+    registry.apply("lighter", [lighter_market_meta("ETH-USD", _info(0, sd=4, pd=2)),
+                               lighter_market_meta("BTC-USD", _info(1, sd=5, pd=1))])
+    eth = registry.get("lighter", "ETH-USD")
+    assert (eth.size_scale, eth.price_scale) == (10_000, 100)
+    assert eth.to_size_int("0.1234") == 1234 and eth.to_price_int(3012.34) == 301234
+    assert registry.symbol_for_id("lighter", 0) == "ETH-USD"  # market_id 0 is a valid id
+
+    diff = registry.apply("lighter", [lighter_market_meta("ETH-USD", _info(0, sd=3, pd=2))], partial=True)
+    assert diff.changed == ("ETH-USD",) and not diff.removed
+    assert registry.get("lighter", "ETH-USD").size_scale == 1000
+    assert registry.get("lighter", "BTC-USD").price_scale == 10
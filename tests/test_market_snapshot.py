@@ -0,0 +1,91 @@
+import asyncio
+import dataclasses
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core import admission, trading
+from src.core.market_snapshot import BookTop, MarketSnapshot, capture_account, capture_quotes
+
+
+class FakeAdapter:
+    def __init__(self, rate, mark, balance, positions):
+        self.market_info = {"ETH-USD": {}, "SOL-USD": {}}
+        self._rate, self._mark, self._balance, self._positions = rate, mark, balance, positions
+        self.calls = []
+
+    async def fetch_funding_rate(self, symbol):
+        return Decimal(self._rate)
+
+    async def fetch_mark_price(self, symbol):
+        return Decimal(self._mark)
+
+    async def get_real_available_balance(self):
+        self.calls.append("balance")
+        await asyncio.sleep(0.05)
+        return self._balance
+
+    async def fetch_open_positions(self):
+        self.calls.append("positions")
+        await asyncio.sleep(0.05)
+        return self._positions
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_captured_once_and_immutable():
+    lighter = FakeAdapter("0.0003", "100.5", 50.0, [{"symbol": "SOL-USD", "size": -2.0}])
+    x10 = FakeAdapter("0.0001", "100.0", 40.0, [])
+
+    snap = await capture_quotes(lighter, x10)
+    assert set(snap.quotes) == {"ETH-USD", "SOL-USD"}
+    q = snap.quote("ETH-USD")
+    assert (q.rate_lighter, q.rate_x10, q.mark_lighter, q.mark_x10) == (
+        Decimal("0.0003"), Decimal("0.0001"), Decimal("100.5"), Decimal("100.0")
+    )
+    assert not snap.positions_fresh() and not snap.balances_fresh()
+
+    t0 = time.monotonic()
+    full = await capture_account(snap, lighter, x10)
+    # balances + positions of both exchanges fetched concurrently
+    assert time.monotonic() - t0 < 0.15
+    assert full.balance("x10") == 40.0 and full.balance("lighter") == 50.0
+    assert full.position_symbols() == {"SOL-USD"} and full.positions_fresh(max_age=5.0)
+
+    top = BookTop.from_orderbook("lighter", "ETH-USD", {"bids": [[100.0, 2.0]], "asks": [[101.0, 1.0]]})
+    with_books = full.with_books([top, None])
+    assert with_books.book("lighter", "ETH-USD").mid == 100.5 and with_books.book_fresh("lighter", "ETH-USD")
+    assert top.bid_depth_usd == 200.0
+    # derived snapshots never change the original
+    assert full.book("lighter", "ETH-USD") is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        full.captured_at = 0
+    with pytest.raises(TypeError):
+        full.quotes["BTC-USD"] = None
+
+
+@pytest.mark.asyncio
+async def test_entry_uses_fresh_snapshot_positions_and_rereads_stale_ones(monkeypatch):
+    lighter, x10 = MagicMock(), MagicMock()
+    lighter.fetch_open_positions = AsyncMock(return_value=[])
+    x10.fetch_open_positions = AsyncMock(return_value=[])
+    opp = {"symbol": "ETH-USD"}
+    monkeypatch.setattr(admission, "_default_gate", admission.AdmissionGate())
+
+    snap = MarketSnapshot(captured_at=time.time()).with_account(positions={"lighter": {"ETH-USD": 0.5}, "x10": {}})
+    assert await trading.execute_trade_parallel(opp, lighter, x10, MagicMock(), snapshot=snap) is False
+    lighter.fetch_open_positions.assert_not_called()
+
+    # Stale positions are re-read; stop right after via an open trade in state
+    async def open_trades():
+        return [{"symbol": "ETH-USD"}]
+
+    state_fns = list(trading._get_state_functions())
+    state_fns[0] = open_trades
+    monkeypatch.setattr(trading, "_get_state_functions", lambda: tuple(state_fns))
+    monkeypatch.setattr(admission, "_default_gate", admission.AdmissionGate())
+    stale = dataclasses.replace(snap, positions_at=time.time() - 60)
+    assert await trading.execute_trade_parallel(opp, lighter, x10, MagicMock(), snapshot=stale) is False
+    lighter.fetch_open_positions.assert_awaited_once()
+    x10.fetch_open_positions.assert_awaited_once()
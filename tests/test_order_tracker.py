@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.order_tracker import OrderStateTracker
+
+
+@pytest.mark.asyncio
+async def test_stream_updates_wake_waiter_without_rest():
+    tracker = OrderStateTracker(rest_interval=10.0)
+    rest_calls = []
+
+    async def rest_check():
+        rest_calls.append(1)
+
+    async def feed():
+        await asyncio.sleep(0.02)
+        tracker.update_order("x10", "42", status="NEW", symbol="ETH-USD")
+        tracker.record_fill("x10", "42", qty=0.4, price=100.0, trade_id="t1")
+        tracker.record_fill("x10", "42", qty=0.4, price=100.0, trade_id="t1")  # duplicate delivery
+        tracker.record_fill("x10", "42", qty=0.6, price=110.0, trade_id="t2")
+        tracker.update_order("x10", "42", status="FILLED")
+        tracker.update_order("x10", "42", status="OPEN")  # late message must not regress
+
+    t0 = time.monotonic()
+    asyncio.create_task(feed())
+    state = await tracker.wait("x10", "42", lambda s: s.filled_qty >= 1.0, timeout=5.0, rest_check=rest_check)
+
+    assert time.monotonic() - t0 < 0.5 and not rest_calls
+    assert state.filled_qty == pytest.approx(1.0) and state.avg_price == pytest.approx(106.0)
+    await asyncio.sleep(0.05)
+    assert tracker.get("x10", "42").status == "FILLED"
+    assert tracker.get_stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_position_fan_out_and_rest_safety_net():
+    tracker = OrderStateTracker(rest_interval=0.05)
+
+    # Lighter: fill is attributed via the position of the order's symbol
+    waiter = asyncio.create_task(
+        tracker.wait("lighter", "0xabc", lambda s: (s.position_size or 0) >= 0.5, timeout=2.0, symbol="SOL-USD")
+    )
+    await asyncio.sleep(0.01)
+    tracker.update_position("lighter", "BTC-USD", 1.0)
+    tracker.update_position("lighter", "SOL-USD", -0.6)
+    state = await waiter
+    assert state.position_size == pytest.approx(0.6) and state.source == "ws"
+
+    # Missed stream message: the REST check feeds the tracker instead
+    async def rest_check():
+        tracker.update_order("x10", "7", status="CANCELLED", source="rest")
+
+    state = await tracker.wait("x10", "7", lambda s: s.is_terminal, timeout=2.0, rest_check=rest_check)
+    assert state.is_dead and state.source == "rest"
+    assert tracker.get_stats()["woken_by_rest"] == 1
+
+    assert await tracker.wait("x10", "8", lambda s: s.is_terminal, timeout=0.05) is None
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.orderbook_provider import OrderbookProvider
+from src.infrastructure.orderbook_refresher import OrderbookRefresher
+
+
+class SlowX10:
+    """REST orderbook with 50ms latency, records order and peak concurrency."""
+
+    def __init__(self):
+        self.calls, self.active, self.peak = [], 0, 0
+
+    async def fetch_orderbook(self, symbol):
+        self.calls.append(symbol)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return {"bids": [[100.0, 1.0]], "asks": [[101.0, 1.0]]}
+
+
+@pytest.mark.asyncio
+async def test_reconnect_refreshes_all_books_concurrently_by_relevance():
+    x10 = SlowX10()
+    provider = OrderbookProvider(x10_adapter=x10)
+    symbols = [f"S{i:02d}-USD" for i in range(40)]
+    for sym in symbols:
+        provider.update_x10_orderbook(sym, [(100, 1)], [(101, 1)])
+
+    refresher = OrderbookRefresher(
+        provider, concurrency={"lighter": 1, "x10": 4}, rps={"lighter": 10.0, "x10": 1000.0}, sweep_interval=0
+    )
+    provider.refresher = refresher
+    refresher.set_relevance(positions={"S30-USD"}, candidates=["S20-USD", "S10-USD"])
+
+    t0 = time.monotonic()
+    provider.invalidate_all(reason="x10 WebSocket reconnect", exchange="x10")
+    assert await refresher.drain(timeout=2.0)
+    elapsed = time.monotonic() - t0
+
+    # 40 x 50ms sequentially would be 2s - 4 workers do it in ~0.5s
+    assert elapsed < 1.0 and x10.peak == 4
+    assert x10.calls[:3] == ["S30-USD", "S20-USD", "S10-USD"]
+    assert sorted(x10.calls) == symbols
+    assert all(provider.is_orderbook_valid(s, "x10")[0] for s in symbols)
+    await refresher.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_for_one_symbol_share_a_request():
+    x10 = SlowX10()
+    provider = OrderbookProvider(x10_adapter=x10)
+
+    results = await asyncio.gather(*(provider.fetch_orderbook_rest_fallback("ETH-USD", "x10") for _ in range(5)))
+    assert x10.calls == ["ETH-USD"]
+    assert all(r is results[0] for r in results)
+    assert provider.get_sync_stats()["rest_shared"] == 4
+
+    refresher = OrderbookRefresher(provider, sweep_interval=0)
+    assert refresher.request("x10", "BTC-USD")
+    assert not refresher.request("x10", "BTC-USD")
+    assert await refresher.drain(timeout=1.0)
+    assert x10.calls == ["ETH-USD", "BTC-USD"]
+    await refresher.stop()
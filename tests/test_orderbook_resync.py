@@ -0,0 +1,81 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.orderbook_provider import OrderbookProvider
+
+
+class FakeLighter:
+    def __init__(self):
+        self.orderbook_cache = {}
+        self._orderbook_cache = {}
+        self.release = asyncio.Event()
+        self.fetches = []
+
+    async def fetch_orderbook(self, symbol, limit=20):
+        self.fetches.append(symbol)
+        await self.release.wait()
+        if symbol == "SOL-USD":
+            return {"bids": [[150.0, 1.0]], "asks": [[151.0, 1.0]]}
+        return {"bids": [[100.0, 1.0], [99.0, 2.0]], "asks": [[101.0, 1.0]]}
+
+
+def _delta(price, size, nonce, begin):
+    return dict(bids=[{"price": str(price), "size": str(size)}], asks=[], sequence=nonce, prev_sequence=begin)
+
+
+@pytest.mark.asyncio
+async def test_gap_resyncs_only_that_symbol_and_replays_buffered_deltas():
+    lighter = FakeLighter()
+    provider = OrderbookProvider(lighter_adapter=lighter)
+    provider.update_lighter_orderbook("ETH-USD", [(100, 1)], [(101, 1)], sequence=10)
+    provider.update_lighter_orderbook("BTC-USD", [(60000, 1)], [(60001, 1)], sequence=5)
+
+    assert provider.apply_lighter_delta("ETH-USD", **_delta(99.5, 3, 11, 10))
+    assert provider._lighter_orderbooks["ETH-USD"].bids[1] == (Decimal("99.5"), Decimal("3"))
+
+    # 11 -> 13: gap, ETH resyncs, deltas during the fetch are buffered
+    assert not provider.apply_lighter_delta("ETH-USD", **_delta(98, 4, 14, 13))
+    await asyncio.sleep(0.01)
+    assert lighter.fetches == ["ETH-USD"]
+    assert not provider.apply_lighter_delta("ETH-USD", **_delta(99, 0, 15, 14))
+    assert provider.is_orderbook_valid("ETH-USD") == (False, "Orderbook resync pending (reconnect/sequence gap)")
+
+    # Other symbols keep trading
+    assert provider.apply_lighter_delta("BTC-USD", **_delta(59999, 2, 6, 5))
+    assert provider.is_orderbook_valid("BTC-USD") == (True, "OK")
+    assert not provider.is_in_cooldown()
+
+    lighter.release.set()
+    snapshot = await provider.get_lighter_orderbook("ETH-USD")
+    # REST snapshot + replay: 98 added, 99 removed
+    assert [b[0] for b in snapshot.bids] == [Decimal("100.0"), Decimal("98")]
+    assert snapshot.sequence == 15
+    assert provider.is_orderbook_valid("ETH-USD") == (True, "OK")
+    assert provider.apply_lighter_delta("ETH-USD", **_delta(97, 1, 16, 15))
+    assert provider.get_sync_stats()["gaps"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_blocks_per_symbol_until_consistent():
+    lighter = FakeLighter()
+    provider = OrderbookProvider(lighter_adapter=lighter)
+    provider.update_lighter_orderbook("ETH-USD", [(100, 1)], [(101, 1)], sequence=10)
+    provider.update_lighter_orderbook("SOL-USD", [(150, 1)], [(151, 1)])
+
+    provider.invalidate_all(reason="lighter WebSocket reconnect", exchange="lighter")
+    assert not provider.is_in_cooldown()
+    assert provider.is_in_cooldown("ETH-USD") and provider.is_in_cooldown("SOL-USD")
+
+    # ETH continues its sequence -> consistent without REST
+    assert provider.apply_lighter_delta("ETH-USD", **_delta(99, 1, 11, 10))
+    assert provider.is_orderbook_valid("ETH-USD") == (True, "OK")
+
+    # SOL has no sequence to prove continuity -> per-symbol resync
+    assert not provider.apply_lighter_delta("SOL-USD", bids=[(149, 1)], asks=[])
+    lighter.release.set()
+    await provider.resync_lighter_symbol("SOL-USD")
+    assert lighter.fetches == ["SOL-USD"]
+    assert provider.is_orderbook_valid("SOL-USD") == (True, "OK")
+    assert [b[0] for b in provider._lighter_orderbooks["SOL-USD"].bids] == [Decimal("150.0"), Decimal("149")]
@@ -1,8 +1,12 @@
 
 import pytest
 import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock
+import config
 from src.parallel_execution import ParallelExecutionManager, ExecutionState
+from src.core.market_snapshot import BookTop, MarketSnapshot
+from src.infrastructure.order_tracker import OrderStateTracker
 
 @pytest.mark.asyncio
 async def test_successful_execution(mock_x10, mock_lighter, mock_db):
@@ -66,3 +70,69 @@ async def test_x10_fail_rollback_lighter(mock_x10, mock_lighter, mock_db):
     await manager.stop()
 
 
+
+
+@pytest.mark.asyncio
+async def test_x10_maker_fill_is_woken_by_stream_not_polling(mock_x10, mock_lighter, mock_db):
+    manager = ParallelExecutionManager(mock_x10, mock_lighter, mock_db)
+    manager._order_tracker = tracker = OrderStateTracker(rest_interval=10.0)
+    mock_x10.open_live_position = AsyncMock(return_value=(True, "m1"))
+
+    async def feed():
+        await asyncio.sleep(0.05)
+        tracker.record_fill("x10", "m1", qty=1.0, price=100.0, symbol="BTC-USD", trade_id="t1")
+
+    t0 = time.monotonic()
+    asyncio.create_task(feed())
+    result = await manager._execute_x10_maker_with_escalation("BTC-USD", "BUY", 1.0, timeout_per_cycle=3.0)
+
+    assert result == (True, "m1", False)
+    assert time.monotonic() - t0 < 0.5
+    # Only the initial position snapshot went over REST
+    assert mock_x10.fetch_open_positions.await_count == 1
+    assert tracker.get("x10", "m1") is None  # forgotten after the fill
+
+
+@pytest.mark.asyncio
+async def test_x10_taker_fill_found_by_rest_safety_net(mock_x10, mock_lighter, mock_db, monkeypatch):
+    monkeypatch.setattr(config, "X10_MAKER_MAX_REQUOTES", 0, raising=False)
+    manager = ParallelExecutionManager(mock_x10, mock_lighter, mock_db)
+    manager._order_tracker = OrderStateTracker(rest_interval=10.0)
+    mock_x10.open_live_position = AsyncMock(side_effect=[(True, "maker"), (True, "taker")])
+    mock_x10.cancel_order = AsyncMock(return_value=True)
+
+    # No stream messages at all: the position shows up only in the REST response after the taker order
+    async def positions():
+        taker_placed = mock_x10.open_live_position.await_count >= 2
+        return [{"symbol": "BTC-USD", "size": 1.0 if taker_placed else 0.0}]
+
+    mock_x10.fetch_open_positions = AsyncMock(side_effect=positions)
+    result = await manager._execute_x10_maker_with_escalation("BTC-USD", "SELL", 1.0, timeout_per_cycle=0.1)
+
+    assert result == (True, "taker", True)
+
+
+@pytest.mark.asyncio
+async def test_entry_mid_uses_fresh_snapshot_book(mock_x10, mock_lighter, mock_db):
+    manager = ParallelExecutionManager(mock_x10, mock_lighter, mock_db)
+    mock_lighter.get_orderbook_mid_price = AsyncMock(return_value=99.0)
+    top = BookTop.from_orderbook("lighter", "BTC-USD", {"bids": [[100.0, 1.0]], "asks": [[101.0, 1.0]]})
+    snapshot = MarketSnapshot(captured_at=time.time()).with_books([top])
+
+    assert await manager._entry_mid(mock_lighter, "lighter", "BTC-USD", snapshot) == 100.5
+    mock_lighter.get_orderbook_mid_price.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_entry_mid_rereads_stale_or_missing_book(mock_x10, mock_lighter, mock_db):
+    manager = ParallelExecutionManager(mock_x10, mock_lighter, mock_db)
+    mock_lighter.get_orderbook_mid_price = AsyncMock(return_value=99.0)
+    mock_x10.get_orderbook_mid_price = AsyncMock(return_value=98.0)
+    stale = BookTop.from_orderbook("lighter", "BTC-USD", {"bids": [[100.0, 1.0]], "asks": [[101.0, 1.0]]},
+                                   captured_at=time.time() - 60)
+    snapshot = MarketSnapshot(captured_at=time.time()).with_books([stale])
+
+    assert await manager._entry_mid(mock_lighter, "lighter", "BTC-USD", snapshot) == 99.0
+    assert await manager._entry_mid(mock_x10, "x10", "BTC-USD", snapshot) == 98.0
+    assert await manager._entry_mid(mock_x10, "x10", "BTC-USD", None) == 98.0
+    mock_lighter.get_orderbook_mid_price.assert_awaited_once_with("BTC-USD")
@@ -0,0 +1,178 @@
+import asyncio
+import csv
+import sqlite3
+
+import pytest
+
+import config
+from src.core.pnl_settlement import PnLSettlementQueue
+from src.core.startup import migrate_database
+from src.core.state import archive_trade_to_history
+from src.infrastructure.database import AsyncDatabase, DBConfig, RollupRepository, TradeRepository
+
+
+class FakeLighter:
+    def __init__(self):
+        self.reads = []
+        self.filled = False
+
+    async def fetch_my_trades(self, symbol, limit=20, force=False):
+        self.reads.append(symbol)
+        return [{"order_id": "7", "price": 101.0, "size": 1.0, "fee": 0.0}] if self.filled else []
+
+
+@pytest.mark.asyncio
+async def test_provisional_row_is_settled_with_batched_history_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_FILE", str(tmp_path / "funding.db"), raising=False)
+    monkeypatch.chdir(tmp_path)
+    await migrate_database()
+
+    db = AsyncDatabase(DBConfig(db_path=config.DB_FILE, pool_size=1))
+    await db.initialize()
+    lighter = FakeLighter()
+
+    async def resolver(job, lighter_view, x10_view):
+        trades = await lighter_view.fetch_my_trades(job.symbol, limit=50, force=True)
+        if not trades:
+            return {"total_pnl": job.provisional["total_net_pnl"], "complete": False}
+        return {"total_pnl": 1.25, "funding_total": 0.5, "price_pnl_total": 1.0, "fees_total": 0.25, "complete": True}
+
+    queue = PnLSettlementQueue(
+        lighter, None, resolver=resolver, retry_base=0.01, batch_window=0.05, trade_repo=TradeRepository(db)
+    )
+    estimate = {"total_net_pnl": 2.0, "funding_pnl": 0.5, "spread_pnl": 1.6, "fees": 0.1}
+    for sym in ("ETH-USD", "ETH-USD", "BTC-USD"):
+        trade = {"symbol": sym, "entry_time": "2026-01-01 00:00:00", "size_usd": 100.0}
+        row_id = await archive_trade_to_history(trade, "TAKE_PROFIT", estimate, provisional=True)
+        queue.enqueue(trade, "TAKE_PROFIT", estimate, row_id)
+
+    # Provisional rows are booked right away, CSV waits for the final numbers
+    assert not (tmp_path / "realized_pnl.csv").exists()
+
+    await asyncio.sleep(0.15)
+    assert queue.pending == 3
+    # One history read per symbol and round, shared by both ETH jobs
+    rounds = queue.get_stats()["rounds"]
+    assert len(lighter.reads) == 2 * rounds
+
+    lighter.filled = True
+    for _ in range(50):
+        if queue.pending == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert queue.pending == 0
+    assert queue.get_stats()["settled"] == 3
+
+    conn = sqlite3.connect(config.DB_FILE)
+    rows = conn.execute("SELECT final_pnl_usd, fees_usd, pnl_status FROM trade_history").fetchall()
+    conn.close()
+    assert rows == [(1.25, 0.25, "FINAL")] * 3
+    with open(tmp_path / "realized_pnl.csv", newline="") as f:
+        assert [r["realised_pnl"] for r in csv.DictReader(f)] == ["1.250000"] * 3
+    await queue.flush()
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_books_best_available_numbers(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_FILE", str(tmp_path / "funding.db"), raising=False)
+    monkeypatch.chdir(tmp_path)
+    await migrate_database()
+
+    async def resolver(job, lighter_view, x10_view):
+        return {"total_pnl": 1.9, "complete": False}
+
+    db = AsyncDatabase(DBConfig(db_path=config.DB_FILE, pool_size=1))
+    await db.initialize()
+    queue = PnLSettlementQueue(None, None, resolver=resolver, batch_window=60.0, trade_repo=TradeRepository(db))
+    estimate = {"total_net_pnl": 2.0, "funding_pnl": 0.5, "spread_pnl": 1.6, "fees": 0.1}
+    trade = {"symbol": "SOL-USD"}
+    queue.enqueue(trade, "MAX_HOLD", estimate, await archive_trade_to_history(trade, "MAX_HOLD", estimate, provisional=True))
+
+    await queue.flush(timeout=1.0)
+    assert queue.pending == 0 and queue.get_stats()["settled_incomplete"] == 1
+    conn = sqlite3.connect(config.DB_FILE)
+    assert conn.execute("SELECT final_pnl_usd, funding_pnl_usd, pnl_status FROM trade_history").fetchall() == [
+        (1.9, 0.5, "FINAL")
+    ]
+    conn.close()
+    await db.close()
+
+
+async def _closed_trade(db, estimate):
+    trades = TradeRepository(db)
+    await trades.add_trade({
+        "symbol": "ETH-USD", "size_usd": 100.0, "entry_price_x10": 100.0, "entry_price_lighter": 100.1,
+        "side_x10": "BUY", "side_lighter": "SELL",
+    })
+    await trades.close_trade("ETH-USD", pnl=estimate["total_net_pnl"],
+                             funding_collected=estimate["funding_pnl"], fees=estimate["fees"])
+    trade = {"symbol": "ETH-USD", "entry_time": "2026-01-01 00:00:00", "size_usd": 100.0}
+    return trades, trade, await archive_trade_to_history(trade, "TAKE_PROFIT", estimate, provisional=True)
+
+
+@pytest.mark.asyncio
+async def test_settlement_corrects_trade_row_and_rollups(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_FILE", str(tmp_path / "funding.db"), raising=False)
+    monkeypatch.chdir(tmp_path)
+    await migrate_database()
+    db = AsyncDatabase(DBConfig(db_path=config.DB_FILE, pool_size=1))
+    await db.initialize()
+    try:
+        estimate = {"total_net_pnl": 2.0, "funding_pnl": 0.5, "spread_pnl": 1.6, "fees": 0.1}
+        trades, trade, row_id = await _closed_trade(db, estimate)
+
+        async def resolver(job, lighter_view, x10_view):
+            return {"total_pnl": -0.75, "funding_total": 0.4, "price_pnl_total": -0.9, "fees_total": 0.25,
+                    "complete": True}
+
+        queue = PnLSettlementQueue(None, None, resolver=resolver, batch_window=0.0, trade_repo=trades)
+        queue.enqueue(trade, "TAKE_PROFIT", estimate, row_id)
+        await queue.flush(timeout=1.0)
+        await asyncio.sleep(0.3)  # wait=True resolves before the batch commit
+
+        row = await db.fetch_one("SELECT pnl, funding_collected, fees FROM trades WHERE symbol = 'ETH-USD'")
+        assert row == {"pnl": -0.75, "funding_collected": 0.4, "fees": 0.25}
+        # The estimate was a win, the settled trade is a loss: counted once, moved over
+        summary = await RollupRepository(db).get_pnl_summary()
+        assert summary["trades"] == 1 and summary["wins"] == 0 and summary["losses"] == 1
+        assert summary["realized_pnl"] == pytest.approx(-0.75)
+        assert summary["fees"] == pytest.approx(0.25)
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_provisional_rows_are_requeued_after_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_FILE", str(tmp_path / "funding.db"), raising=False)
+    monkeypatch.chdir(tmp_path)
+    await migrate_database()
+    db = AsyncDatabase(DBConfig(db_path=config.DB_FILE, pool_size=1))
+    await db.initialize()
+    try:
+        estimate = {"total_net_pnl": 2.0, "funding_pnl": 0.5, "spread_pnl": 1.6, "fees": 0.1}
+        trades, _, row_id = await _closed_trade(db, estimate)
+        # Closed trade of a symbol whose trades row was replaced meanwhile: left alone
+        await archive_trade_to_history({"symbol": "SOL-USD"}, "MAX_HOLD", estimate, provisional=True)
+        await asyncio.sleep(0.3)
+
+        seen = []
+
+        async def resolver(job, lighter_view, x10_view):
+            seen.append(job.trade)
+            return {"total_pnl": 1.5, "complete": True}
+
+        queue = PnLSettlementQueue(None, None, resolver=resolver, batch_window=60.0, trade_repo=trades)
+        assert await queue.requeue_provisional() == 1
+        await queue.flush(timeout=1.0)
+        await asyncio.sleep(0.3)
+
+        assert seen[0]["entry_price_x10"] == 100.0 and seen[0]["side_lighter"] == "SELL"
+        conn = sqlite3.connect(config.DB_FILE)
+        assert conn.execute("SELECT id, final_pnl_usd, pnl_status FROM trade_history ORDER BY id").fetchall() == [
+            (row_id, 1.5, "FINAL"), (row_id + 1, 2.0, "PROVISIONAL")
+        ]
+        assert conn.execute("SELECT pnl FROM trades").fetchall() == [(1.5,)]
+        conn.close()
+    finally:
+        await db.close()
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.price_bootstrap import PriceBootstrap
+
+
+class FakeAdapter:
+    def __init__(self, symbols):
+        self.market_info = {s: {} for s in symbols}
+        self._price_cache, self._price_cache_time = {}, {}
+        self.price_cache = {}
+        self._funding_cache = {}
+        self.orderbook_cache = {}
+        self.bulk_loads = 0
+        self.ready = None  # bootstrap.ready at the time of REST calls
+        self.ready_at_rest = []
+        self.book_fetches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def fetch_mark_price_sync(self, symbol):
+        return self._price_cache.get(symbol, 0.0)
+
+    async def load_market_cache(self, force=False):
+        self.bulk_loads += 1
+        self.ready_at_rest.append(self.ready is not None and self.ready.is_set())
+        for s in self.market_info:
+            self._funding_cache.setdefault(s, 0.0001)
+
+    async def load_funding_rates_and_prices(self):
+        await self.load_market_cache(force=True)
+
+    async def fetch_orderbook(self, symbol, limit=20):
+        self.book_fetches.append(symbol)
+        self.ready_at_rest.append(self.ready is not None and self.ready.is_set())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return {"bids": [[99.0, 1.0]], "asks": [[101.0, 1.0]]}
+
+    def stream(self, symbols):
+        for s in symbols:
+            self._price_cache[s] = 100.0
+            self._funding_cache[s] = 0.0001
+
+
+@pytest.mark.asyncio
+async def test_ready_as_soon_as_streams_cover_the_universe():
+    symbols = [f"S{i}-USD" for i in range(20)]
+    x10, lighter = FakeAdapter(symbols), FakeAdapter(symbols)
+    bootstrap = PriceBootstrap(x10, lighter, coverage=0.9, grace_seconds=5.0)
+
+    async def streams():
+        await asyncio.sleep(0.02)
+        x10.stream(symbols)
+        lighter.stream(symbols[:17])
+        bootstrap.notify()
+        await asyncio.sleep(0.02)
+        lighter.stream(symbols[17:18])  # 18/20 = 90%
+        bootstrap.notify()
+
+    x10.ready = lighter.ready = bootstrap.ready
+
+    t0 = time.monotonic()
+    asyncio.create_task(streams())
+    await bootstrap.run()
+
+    # Tradeable from the streams alone, before any REST
+    assert bootstrap.get_stats()["time_to_ready"] < 0.5 and time.monotonic() - t0 < 0.5
+    assert lighter.ready_at_rest and all(lighter.ready_at_rest)
+    # The remaining 10% are filled afterwards - only on the exchange with gaps
+    assert x10.bulk_loads == 0 and sorted(lighter.book_fetches) == symbols[18:]
+    assert bootstrap.coverage() == 1.0
+
+
+@pytest.mark.asyncio
+async def test_only_gaps_are_filled_with_bulk_then_concurrent_books():
+    symbols = [f"S{i}-USD" for i in range(12)]
+    x10, lighter = FakeAdapter(symbols), FakeAdapter(symbols)
+    x10.stream(symbols)
+    lighter.stream(symbols[:4])
+    for s in symbols[4:]:
+        lighter._funding_cache[s] = 0.0001  # funded, but no price yet
+    bootstrap = PriceBootstrap(x10, lighter, coverage=1.0, grace_seconds=0.05, concurrency=4)
+
+    await bootstrap.run()
+
+    assert x10.bulk_loads == 0 and lighter.bulk_loads == 1
+    assert sorted(lighter.book_fetches) == sorted(symbols[4:]) and not x10.book_fetches
+    assert 1 < lighter.max_in_flight <= 4
+    assert bootstrap.coverage() == 1.0 and bootstrap.ready.is_set()
+    assert lighter._price_cache["S5-USD"] == 100.0
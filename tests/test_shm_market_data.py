@@ -0,0 +1,101 @@
+import multiprocessing
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.md_ingest import MarketDataIngestor, MarketDataIngestProcess
+from src.infrastructure.shm_market_data import MarketDataReader, SharedMarketTable
+
+
+def _writer(name, rounds):
+    table = SharedMarketTable.attach(name)
+    for i in range(1, rounds + 1):
+        # Every field derives from i: a torn read would mix two rounds
+        table.update("x10", "ETH-USD", price=float(i), funding=i / 1e6,
+                     bids=[(i - 0.5, float(i)), (i - 1.0, float(i))], asks=[(i + 0.5, float(i))])
+    table.close()
+
+
+def test_seqlock_reader_never_sees_torn_records_from_writer_process():
+    table = SharedMarketTable.create(slots=8, depth=3)
+    try:
+        proc = multiprocessing.get_context("fork").Process(target=_writer, args=(table.name, 20000))
+        proc.start()
+        reader = MarketDataReader(table)
+        reads = 0
+        while proc.is_alive() or reads == 0:
+            for snap in reader.poll():
+                i = snap.price
+                assert snap.funding == pytest.approx(i / 1e6)
+                assert snap.bids == ((i - 0.5, i), (i - 1.0, i)) and snap.asks == ((i + 0.5, i),)
+                assert snap.bid == i - 0.5 and snap.ask == i + 0.5 and snap.seq % 2 == 0
+                reads += 1
+        proc.join()
+        assert proc.exitcode == 0 and reads > 0
+        assert reader.get("x10", "ETH-USD").price == 20000.0
+        assert table.used == 1
+    finally:
+        table.close()
+
+
+def test_writer_recovers_from_seq_left_odd_by_crashed_writer():
+    table = SharedMarketTable.create(slots=4, depth=1)
+    try:
+        table.update("x10", "ETH-USD", price=1.0)
+        slot = table.slot_for("x10", "ETH-USD")
+        table._seqs[slot] += 1  # previous writer died between "odd" and "even"
+        assert table.read(slot, retries=5) is None
+
+        table.update("x10", "ETH-USD", price=2.0)
+        snap = table.read(slot)
+        assert snap is not None and snap.price == 2.0 and snap.seq % 2 == 0
+    finally:
+        table.close()
+
+
+@pytest.mark.asyncio
+async def test_pump_copies_parsed_stream_data_into_adapter_caches():
+    x10 = SimpleNamespace(_price_cache={}, price_cache={}, _price_cache_time={},
+                          _funding_cache={}, _funding_cache_time={})
+    marks = []
+    lighter = SimpleNamespace(_price_cache={}, _price_cache_time={}, mark_ws_market_stats=lambda: marks.append(1))
+    oi = []
+    ingest = MarketDataIngestProcess(
+        x10, lighter,
+        lighter_symbol={0: "ETH-USD"}.get,
+        oi_tracker=SimpleNamespace(update_from_websocket=lambda *a: oi.append(a)),
+        slots=16, depth=2,
+    )
+    table = ingest.open_table()
+    try:
+        ingestor = MarketDataIngestor(SharedMarketTable.attach(table.name))
+        await ingestor.handle("x10_markprice", {"data": {"m": "BTC/USD", "p": "65000.5"}})
+        await ingestor.handle("x10_funding", {"m": "BTC-USD", "f": "0.0001"})
+        await ingestor.handle("x10_orderbooks", {"type": "SNAPSHOT", "data": {
+            "m": "SOL-USD", "b": [{"p": "99", "q": "5"}, {"p": "98", "q": "1"}, {"p": "97", "q": "1"}],
+            "a": [{"p": "101", "q": "3"}]}})
+        await ingestor.handle("x10_orderbooks", {"type": "DELTA", "data": {
+            "m": "SOL-USD", "b": [{"p": "99", "q": "0"}], "a": [{"p": "100.5", "q": "2"}]}})
+        await ingestor.handle("lighter", {"type": "update/market_stats", "market_stats": {
+            "0": {"market_id": 0, "mark_price": "3000.1", "open_interest": "1234"},
+            "7": {"market_id": 7, "mark_price": "1.0"}}})
+
+        assert ingest.pump() == 4
+        assert x10._price_cache["BTC-USD"] == 65000.5 and x10.price_cache["BTC-USD"] == 65000.5
+        assert x10._funding_cache["BTC-USD"] == 0.0001
+        # Delta removed the best bid and added a better ask; depth capped at 2 levels
+        sol = ingest.reader.get("x10", "SOL-USD")
+        assert sol.bids == ((98.0, 1.0), (97.0, 1.0)) and sol.asks == ((100.5, 2.0), (101.0, 3.0))
+        assert x10._price_cache["SOL-USD"] == pytest.approx((98.0 + 100.5) / 2)  # mid, no trade price
+        assert lighter._price_cache == {"ETH-USD": 3000.1} and oi == [("ETH-USD", "lighter", 1234.0)]
+        assert marks and ingest.get_stats()["unknown_markets"] == 1  # market 7 not in the registry
+
+        # Nothing changed -> nothing copied; an older price never overwrites a newer one
+        assert ingest.pump() == 0
+        x10._price_cache_time["BTC-USD"] = time.time() + 60
+        await ingestor.handle("x10_markprice", {"data": {"m": "BTC/USD", "p": "1"}})
+        assert ingest.pump() == 1 and x10._price_cache["BTC-USD"] == 65000.5
+        ingestor.table.close()
+    finally:
+        await ingest.stop()
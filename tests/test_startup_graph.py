@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.startup_graph import StartupError, StartupGraph
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently_and_deps_are_respected():
+    order = []
+
+    def step(name, delay):
+        async def run():
+            await asyncio.sleep(delay)
+            order.append(name)
+            return name
+        return run
+
+    graph = StartupGraph()
+    graph.add("db", step("db", 0.05))
+    graph.add("markets_x10", step("markets_x10", 0.1))
+    graph.add("markets_lighter", step("markets_lighter", 0.1))
+    graph.add("oi_tracker", step("oi_tracker", 0.0), deps=["markets_x10", "markets_lighter"])
+
+    t0 = time.monotonic()
+    results = await graph.run()
+    elapsed = time.monotonic() - t0
+
+    assert elapsed < 0.18
+    assert order[0] == "db" and order[-1] == "oi_tracker"
+    assert results["oi_tracker"] == "oi_tracker"
+    assert graph.steps["oi_tracker"].waited_s >= 0.09
+
+    table = graph.format_timing_table()
+    for name in ("db", "markets_x10", "markets_lighter", "oi_tracker", "TOTAL"):
+        assert name in table
+
+
+@pytest.mark.asyncio
+async def test_non_critical_failure_does_not_block_dependents():
+    async def boom():
+        raise RuntimeError("no signer")
+
+    async def dependent():
+        return graph.result("signer")
+
+    graph = StartupGraph()
+    graph.add("signer", boom)
+    graph.add("balance", dependent, deps=["signer"])
+
+    results = await graph.run()
+    assert results == {"signer": None, "balance": None}
+    assert graph.steps["signer"].status == "failed"
+    assert graph.steps["balance"].status == "ok"
+
+
+@pytest.mark.asyncio
+async def test_critical_failure_aborts_and_cancels_pending_steps():
+    slow_finished = asyncio.Event()
+
+    async def boom():
+        raise RuntimeError("db locked")
+
+    async def slow():
+        await asyncio.sleep(1.0)
+        slow_finished.set()
+
+    graph = StartupGraph()
+    graph.add("database", boom, critical=True)
+    graph.add("state_manager", slow, deps=["database"])
+    graph.add("markets", slow)
+
+    with pytest.raises(StartupError) as exc_info:
+        await graph.run()
+
+    assert exc_info.value.step == "database"
+    assert not slow_finished.is_set()
+    assert graph.steps["markets"].status == "skipped"
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    async def noop():
+        return None
+
+    graph = StartupGraph()
+    graph.add("a", noop, deps=["missing"])
+    with pytest.raises(ValueError):
+        graph._validate()
+
+    graph = StartupGraph()
+    graph.add("a", noop, deps=["b"])
+    graph.add("b", noop, deps=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        graph._validate()
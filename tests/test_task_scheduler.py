@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.task_scheduler import TaskScheduler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_low_tasks_pause_while_high_priority_work_waits():
+    scheduler = TaskScheduler(max_pause=1.0, budgets={})
+    low_steps = []
+
+    async def background():
+        while True:
+            _busy(0.002)
+            low_steps.append(time.perf_counter())
+            await asyncio.sleep(0)
+
+    async def execution():
+        await asyncio.sleep(0.05)
+        with scheduler.urgent("entry:ETH-USD"):
+            t0 = time.perf_counter()
+            for _ in range(10):
+                await asyncio.sleep(0.005)
+            return t0, time.perf_counter()
+
+    low = asyncio.create_task(scheduler.wrap("cleanup", background(), priority=scheduler.LOW))
+    high = asyncio.create_task(scheduler.wrap("logic_loop", execution(), priority=scheduler.HIGH))
+    t0, t1 = await high
+    await asyncio.sleep(0.02)
+    low.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await low
+
+    # At most the step in flight when the entry started ran during the urgent section
+    assert sum(1 for t in low_steps if t0 < t < t1) <= 1
+    assert low_steps[-1] > t1  # resumed afterwards
+    stats = scheduler.get_stats()["tasks"]
+    assert stats["cleanup"]["pauses"] >= 1 and stats["cleanup"]["cpu_time_ms"] > 0
+    assert stats["logic_loop"]["pauses"] == 0 and stats["logic_loop"]["steps"] >= 11
+
+
+@pytest.mark.asyncio
+async def test_cpu_budget_throttles_background_task_and_exposes_accounting():
+    scheduler = TaskScheduler(window=0.1, budgets={"LOW": 0.2})
+
+    async def stats_job():
+        while True:
+            _busy(0.005)
+            await asyncio.sleep(0)
+
+    async def critical():
+        while True:
+            _busy(0.001)
+            await asyncio.sleep(0)
+
+    low = asyncio.create_task(scheduler.wrap("stats", stats_job(), priority=scheduler.LOW))
+    crit = asyncio.create_task(scheduler.wrap("ws", critical(), priority=scheduler.CRITICAL))
+    await asyncio.sleep(0.5)
+    for task in (low, crit):
+        task.cancel()
+    await asyncio.gather(low, crit, return_exceptions=True)
+
+    stats = scheduler.get_stats()["tasks"]
+    # ~20% of 0.5s plus one step overshoot per window
+    assert stats["stats"]["throttles"] > 0 and stats["stats"]["cpu_time_ms"] < 0.5 * 1000 * 0.2 + 5 * 6
+    assert stats["ws"]["throttles"] == 0 and stats["ws"]["cpu_budget"] is None
+    assert stats["ws"]["cpu_time_ms"] > stats["stats"]["cpu_time_ms"]
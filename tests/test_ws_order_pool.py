@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+from websockets.asyncio.server import serve
+
+from src.adapters.ws_order_client import WebSocketOrderClient, WsOrderConfig
+from src.adapters.ws_order_pool import TimerWheel
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_fires_and_cancels():
+    wheel = TimerWheel(resolution=0.01, slots=8)
+    fired = []
+    wheel.schedule(0.03, lambda: fired.append("a"))
+    cancelled = wheel.schedule(0.03, lambda: fired.append("b"))
+    wheel.schedule(0.12, lambda: fired.append("c"))  # more than one wheel round
+    wheel.cancel(cancelled)
+
+    await asyncio.sleep(0.07)
+    assert fired == ["a"]
+    await asyncio.sleep(0.1)
+    assert fired == ["a", "c"]
+    assert len(wheel) == 0
+    await asyncio.sleep(0.03)
+    assert wheel._task.done()  # idle wheel has no running task
+
+
+@pytest.fixture
+def order_server():
+    state = {"frames": [], "sockets": [], "silent": False}
+
+    async def handler(ws):
+        state["sockets"].append(ws)
+        async for raw in ws:
+            state["frames"].append(raw)
+            if state["silent"]:
+                continue
+            msg = json.loads(raw)
+            await ws.send(json.dumps({"id": msg["data"]["id"], "hash": f"h{len(state['frames'])}", "status": 1}))
+
+    return state, handler
+
+
+@pytest.mark.asyncio
+async def test_tx_info_is_spliced_and_standby_takes_over(order_server):
+    state, handler = order_server
+    async with serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = WebSocketOrderClient(WsOrderConfig(url=f"ws://127.0.0.1:{port}", pool_size=2, health_interval=0.05))
+        try:
+            assert await client.connect()
+            assert len(state["sockets"]) == 2
+
+            tx_info = '{"AccountIndex": 7,  "Nonce":5, "Sig":"0xab"}'
+            result = await client.send_transaction(tx_type=14, tx_info=tx_info)
+            assert result.hash == "h1"
+            # Signed string goes out byte-for-byte (no json round trip)
+            assert state["frames"][0].endswith('"tx_type":14,"tx_info":' + tx_info + "}}")
+
+            # Drop the primary: the standby carries the next order right away
+            await state["sockets"][0].close()
+            await asyncio.sleep(0.02)
+            assert client.is_connected
+            result = await client.send_transaction(tx_type=14, tx_info=tx_info)
+            assert result.hash == "h2"
+            assert client.get_stats()["failovers"] == 1
+
+            # Health loop re-opens the dropped connection
+            await asyncio.sleep(0.2)
+            assert client.get_stats()["primary"] == 0
+            assert len(state["sockets"]) == 3
+        finally:
+            await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_uses_timer_wheel(order_server):
+    state, handler = order_server
+    state["silent"] = True
+    async with serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = WebSocketOrderClient(WsOrderConfig(url=f"ws://127.0.0.1:{port}", pool_size=1, request_timeout=0.1))
+        try:
+            assert await client.connect()
+            tasks_before = len(asyncio.all_tasks())
+            sends = [
+                asyncio.create_task(client.send_transaction(tx_type=14, tx_info='{"Nonce":1}'))
+                for _ in range(20)
+            ]
+            await asyncio.sleep(0.02)
+            # 20 senders + one wheel task, no timeout task per request
+            assert len(asyncio.all_tasks()) - tasks_before == 21
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            assert all("timeout" in str(r) for r in results)
+            assert client.get_stats()["timeouts"] == 20
+            assert client.get_stats()["pending_requests"] == 0
+        finally:
+            await client.disconnect()